@@ -4,6 +4,7 @@
 # Standard Library Imports
 import os
 import sys
+from multiprocessing import freeze_support
 
 """
 * Launcher Funcs
@@ -63,6 +64,7 @@ def launch_gui():
 
 if __name__ == '__main__':
     """Route to a qualified launcher."""
+    freeze_support()
     if 'cli' in sys.argv:
         sys.exit(launch_cli())
     launch_gui()
@@ -13,9 +13,11 @@
 from src.enums.layers import LAYERS
 import src.helpers as psd
 from src.templates import TransformMod, NormalTemplate, ExtendedMod
+from src.utils.filters import ArtPipeline
 
 # Plugin Imports
 from .actions import sketch, pencilsketch
+from .actions import sketchfilter  # Registers the 'pencil_sketch' art filter
 
 """
 * Template Classes
@@ -33,20 +35,25 @@ class SketchTemplate (NormalTemplate):
     * Sketch Action
     """
 
-    @property
-    def art_action(self) -> Optional[Callable]:
-        # Skip action if in test mode
-        if ENV.TEST_MODE:
-            return
-        action = CFG.get_setting(
+    @cached_property
+    def sketch_action(self) -> str:
+        """str: Sketch action chosen in the template settings."""
+        return CFG.get_setting(
             section="ACTION",
             key="Sketch.Action",
             default="Advanced Sketch",
             is_bool=False
         )
-        if action == "Advanced Sketch":
+
+    @property
+    def art_action(self) -> Optional[Callable]:
+        # Skip action if in test mode
+        if ENV.TEST_MODE:
+            return
+        # Fast sketch falls back to the advanced action if its art filter fails
+        if self.sketch_action in ["Advanced Sketch", "Fast Sketch"]:
             return pencilsketch.run
-        if action == "Quick Sketch":
+        if self.sketch_action == "Quick Sketch":
             return sketch.run
         return
 
@@ -57,6 +64,25 @@ def art_action_args(self) -> Optional[dict]:
             return
         return {
             'thr': self.event,
+            **self.sketch_options,
+            'manual_editing': CFG.get_setting(
+                section="ACTION",
+                key="Sketch.Manual.Editing",
+                default=False
+            )
+        }
+
+    @property
+    def art_pipeline(self) -> Optional[ArtPipeline]:
+        # Render the fast sketch without Photoshop
+        if ENV.TEST_MODE or self.sketch_action != "Fast Sketch":
+            return
+        return [('pencil_sketch', self.sketch_options)]
+
+    @property
+    def sketch_options(self) -> dict:
+        """dict: Sketch line and color options shared by the advanced and fast sketch."""
+        return {
             'rough_sketch': CFG.get_setting(
                 section="ACTION",
                 key="Rough.Sketch.Lines",
@@ -71,11 +97,6 @@ def art_action_args(self) -> Optional[dict]:
                 section="ACTION",
                 key="Black.And.White",
                 default=False
-            ),
-            'manual_editing': CFG.get_setting(
-                section="ACTION",
-                key="Sketch.Manual.Editing",
-                default=False
             )
         }
 
@@ -14,6 +14,7 @@
 from ._loader import get_all_plugins, get_all_templates, get_template_map, get_template_map_defaults
 from ._state import AppConstants, AppEnvironment, PATH
 from src.utils.adobe import PhotoshopHandler
+from src.utils.tracing import TRACER
 
 """
 * Globally Loaded Objects
@@ -26,17 +27,28 @@
     validators=[
         Validator('API_GOOGLE', cast=str, default=''),
         Validator('API_AMAZON', cast=str, default=''),
+        Validator('DOWNLOAD_WORKERS', cast=int, default=3),
+        Validator('DOWNLOAD_CONNECTIONS', cast=int, default=4),
+        Validator('DOWNLOAD_BANDWIDTH', cast=float, default=0),
         Validator('PS_ERROR_DIALOG', cast=bool, default=False),
         Validator('PS_VERSION', cast=AppEnvironment.string_or_none, default=None),
+        Validator('PS_MEMORY_BUDGET', cast=int, default=4096),
+        Validator('PRECONDITION_ART', cast=bool, default=False),
+        Validator('ART_CACHE_SIZE', cast=int, default=2048),
         Validator('HEADLESS', cast=bool, default=False),
         Validator('DEV_MODE', cast=bool, default=bool(not hasattr(sys, '_MEIPASS'))),
         Validator('TEST_MODE', cast=bool, default=False),
+        Validator('PROFILE_RENDERS', cast=bool, default=False),
+        Validator('TRACE_SESSION', cast=bool, default=False),
         Validator('VERSION', cast=str, default=get_project_version(PATH.PROJECT_FILE)),
         Validator('FORCE_RELOAD', cast=bool, default=False)
     ],
     apply_default_on_none=True
 )
 
+# Global session tracer
+TRACER.enabled = ENV.TRACE_SESSION
+
 # Global constants object
 CON = AppConstants()
 
@@ -13,6 +13,7 @@
 from src.enums.settings import (
     CollectorMode,
     BorderColor,
+    EdgeFill,
     OutputFileType,
     ScryfallSorting,
     ScryfallUnique,
@@ -41,6 +42,10 @@ def update_definitions(self):
         self.output_file_name = self.file.get(
             section='APP.FILES', option='Output.File.Name',
             fallback='#name (#frame<, #suffix>) [#set] {#num}')
+        self.deferred_encoding = self.file.getboolean('APP.FILES', 'Deferred.Encoding', fallback=False)
+        self.output_quality = self.file.getint('APP.FILES', 'Output.Quality', fallback=95)
+        self.output_webp = self.file.getboolean('APP.FILES', 'Output.WebP', fallback=False)
+        self.output_downscale = self.file.getboolean('APP.FILES', 'Output.Downscale', fallback=False)
 
         # APP - DATA
         self.lang = self.file.get('APP.DATA', 'Scryfall.Language', fallback='en')
@@ -58,6 +63,7 @@ def update_definitions(self):
             'APP.RENDER', 'Generative.Fill', fallback=False)
         self.select_variation = self.file.getboolean('APP.RENDER', 'Select.Variation', fallback=False)
         self.feathered_fill = self.file.getboolean('APP.RENDER', 'Feathered.Fill', fallback=False)
+        self.edge_fill = self.get_option('APP.RENDER', 'Edge.Fill', EdgeFill)
         self.vertical_fullart = self.file.getboolean('APP.RENDER', 'Vertical.Fullart', fallback=False)
 
         # BASE - TEXT
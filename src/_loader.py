@@ -11,14 +11,17 @@
 from functools import cached_property
 import os
 from pathlib import Path
+from threading import Event
 from traceback import print_tb
 from types import ModuleType
 from typing import Optional, TypedDict, NotRequired, Any, Callable, Union
 
 # Third Party Imports
+import requests
 import yarl
-from omnitils.api.gdrive import gdrive_get_metadata, gdrive_download_file
 from omnitils.files import load_data_file, ensure_file, mkdir_full_perms
+from omnitils.files.archive import unpack_archive
+from omnitils.logs import logger
 from omnitils.modules import get_local_module, import_package, import_module_from_path
 from omnitils.strings import normalize_ver
 
@@ -30,7 +33,12 @@
     layout_map_types,
     layout_map_display_condition_dual,
     layout_map_display_condition)
-from src.utils.download import download_cloudfront
+from src.utils.download import (
+    BandwidthLimiter,
+    download_resumable,
+    get_gdrive_media_url,
+    get_gdrive_metadata)
+from src.utils.tracing import TRACER
 
 """
 * Types
@@ -42,6 +50,7 @@ class TemplateUpdate(TypedDict):
     name: NotRequired[str]
     version: NotRequired[str]
     size: NotRequired[int]
+    checksum: NotRequired[str]
 
 
 class TemplateDetails(TypedDict):
@@ -834,6 +843,11 @@ def update_version(self) -> Optional[str]:
         """Optional[str]: Returns the version number of the fetched updated version of this template."""
         return self._update.get('version')
 
+    @property
+    def update_checksum(self) -> Optional[str]:
+        """Optional[str]: Returns the MD5 digest of the fetched updated version of this template."""
+        return self._update.get('checksum')
+
     """
     * Boolean Properties
     """
@@ -898,14 +912,11 @@ def url_amazon(self) -> Optional[yarl.URL]:
         return
 
     @property
-    def url_google_drive(self) -> Optional[yarl.URL]:
-        """yarl.URL: Google Drive download URL for this template."""
+    def url_google_api(self) -> Optional[yarl.URL]:
+        """yarl.URL: Google Drive API download URL for this template, which supports resuming."""
         if self.env.API_GOOGLE and self.update_file and self.google_drive_id:
             with suppress(Exception):
-                # Return Google Drive URL with file ID
-                return yarl.URL(
-                    'https://drive.google.com/uc'
-                ).with_query({'id': self.google_drive_id})
+                return get_gdrive_media_url(self.google_drive_id, self.env.API_GOOGLE)
         return
 
     """
@@ -1010,7 +1021,7 @@ def check_for_update(self) -> bool:
             True if Template needs to be updated, otherwise False.
         """
         # Get our metadata
-        data = gdrive_get_metadata(self.google_drive_id, self.env.API_GOOGLE)
+        data = get_gdrive_metadata(self.google_drive_id, self.env.API_GOOGLE)
         if not data:
             # File couldn't be located on Google Drive
             print(f"{self.name} ({self.file_name}) not found on Google Drive!")
@@ -1020,7 +1031,8 @@ def check_for_update(self) -> bool:
         self._update: TemplateUpdate = {
             'version': data.get('description', 'v1.0.0'),
             'name': data.get('name', self.file_name),
-            'size': data['size']
+            'size': data['size'],
+            'checksum': data.get('md5Checksum')
         }
 
         # Compare the versions
@@ -1048,6 +1060,55 @@ def validate_version(self) -> None:
             del self.con.versions[self.google_drive_id]
             self.con.update_version_tracker()
 
+    def download_update(
+        self,
+        callback: Optional[Callable] = None,
+        limiter: Optional[BandwidthLimiter] = None,
+        connections: int = 1,
+        event: Optional[Event] = None
+    ) -> Optional[Path]:
+        """Download the archive of the latest version, resuming any partial download and verifying it.
+
+        Notes:
+            - The update's checksum is the MD5 digest Google Drive reports for its copy, so only that copy
+                is verified against it. The Amazon S3 copy publishes no checksum and is verified by size.
+
+        Args:
+            callback: Callback method to update progress bar.
+            limiter: Bandwidth limiter shared with other downloads.
+            connections: Maximum number of connections to download the archive over.
+            event: Event which cancels the download when set.
+
+        Returns:
+            Path to the downloaded archive if successful, otherwise None.
+        """
+        # Try Google Drive first, then Amazon S3
+        if not self.url_google_api and not self.url_amazon:
+            logger.error(f"Unable to download {self.update_file}: no Google Drive API key (API_GOOGLE) "
+                         f"or Amazon S3 URL (API_AMAZON) is set")
+            return
+        for source, url, checksum in (
+            ('gdrive', self.url_google_api, self.update_checksum),
+            ('amazon', self.url_amazon, None)
+        ):
+            if not url:
+                continue
+            try:
+                with TRACER.span('download', 'download', file=self.update_file, source=source):
+                    return download_resumable(
+                        url=url,
+                        path=self.path_download,
+                        checksum=checksum,
+                        connections=connections,
+                        limiter=limiter,
+                        callback=callback,
+                        event=event)
+            except InterruptedError:
+                return
+            except (requests.RequestException, OSError) as e:
+                logger.warning(f"Unable to download {self.update_file} ({source}): {e}")
+        return
+
     def update_template(self, callback: Callable) -> bool:
         """Update a given template to the latest version.
 
@@ -1058,24 +1119,10 @@ def update_template(self, callback: Callable) -> bool:
             True if succeeded, False if failed.
         """
         try:
-
-            # Download using Google Drive
-            result = gdrive_download_file(
-                url=self.url_google_drive,
-                path=self.path_download,
-                path_cookies=PATH.LOGS_COOKIES,
-                callback=callback
-            ) if self.google_drive_id else False
-
-            # Google Drive failed or isn't an option, download from Amazon S3
-            if not result:
-                result = download_cloudfront(
-                    url=self.url_amazon,
-                    path=self.path_download,
-                    callback=callback)
-
-            # Return result status
-            return result
+            if path := self.download_update(callback=callback, connections=self.env.DOWNLOAD_CONNECTIONS):
+                with TRACER.span('unpack_archive', 'download', file=path.name):
+                    unpack_archive(path)
+                return True
 
         # Exception caught while downloading / unpacking
         except Exception as e:
@@ -1325,6 +1372,11 @@ def check_for_updates(templates: list[AppTemplate]) -> list[AppTemplate]:
     # Set up our list of templates needing an update
     updates: list[AppTemplate] = []
 
+    # Template versions are read from Google Drive metadata, which requires an API key
+    if templates and not templates[0].env.API_GOOGLE:
+        logger.error("Unable to check for template updates: no Google Drive API key (API_GOOGLE) is set")
+        return updates
+
     # Perform threaded version check requests
     with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
         results: list[tuple[Future, AppTemplate]] = []
@@ -92,6 +92,10 @@ class PATH(DefinedPaths):
     SRC_DATA_HEXPROOF = SRC_DATA / 'hexproof'
     SRC_DATA_CONFIG_INI = SRC_DATA / 'config_ini'
 
+    # Logs Level Directories
+    LOGS_ART_CACHE = LOGS / 'art_cache'
+    LOGS_ENCODE = LOGS / 'encode'
+
     # Data Level Files
     SRC_DATA_ENV = SRC_DATA / 'env.yml'
     SRC_DATA_ENV_DEFAULT = SRC_DATA / 'env.default.yml'
@@ -119,11 +123,15 @@ class PATH(DefinedPaths):
     LOGS_SCAN = (LOGS / 'scan').with_suffix('.jpg')
     LOGS_ERROR = (LOGS / 'error').with_suffix('.txt')
     LOGS_FAILED = (LOGS / 'failed').with_suffix('.txt')
-    LOGS_COOKIES = (LOGS / 'cookies').with_suffix('.json')
+    LOGS_PROFILE = (LOGS / 'profile').with_suffix('.jsonl')
+    LOGS_TRACE = (LOGS / 'trace').with_suffix('.json')
+    LOGS_ART_PROBES = (LOGS / 'art_probes').with_suffix('.json')
+    LOGS_COMPRESSED = (LOGS / 'compressed').with_suffix('.json')
 
     # Generated user data files
     SRC_DATA_USER = SRC_DATA / 'user.yml'
     SRC_DATA_VERSIONS = SRC_DATA / 'versions.yml'
+    SRC_DATA_TYPE_IDS = SRC_DATA / 'type_ids.json'
 
 
 """
@@ -166,6 +174,21 @@ def API_AMAZON(self) -> str:
         """str: Amazon S3 cloudfront URL."""
         return super().API_AMAZON
 
+    @cached_property
+    def DOWNLOAD_WORKERS(self) -> int:
+        """int: Maximum number of template updates downloaded at once."""
+        return max(super().DOWNLOAD_WORKERS, 1)
+
+    @cached_property
+    def DOWNLOAD_CONNECTIONS(self) -> int:
+        """int: Maximum number of connections each template update is downloaded over."""
+        return max(super().DOWNLOAD_CONNECTIONS, 1)
+
+    @cached_property
+    def DOWNLOAD_BANDWIDTH(self) -> float:
+        """float: Combined bandwidth cap in megabytes per second for template updates, unlimited if 0."""
+        return max(super().DOWNLOAD_BANDWIDTH, 0)
+
     """
     * Photoshop
     """
@@ -182,6 +205,21 @@ def PS_VERSION(self) -> Optional[str]:
             return super().PS_VERSION
         return None
 
+    @cached_property
+    def PS_MEMORY_BUDGET(self) -> int:
+        """int: Memory budget in megabytes for template documents kept open between renders."""
+        return super().PS_MEMORY_BUDGET
+
+    @cached_property
+    def PRECONDITION_ART(self) -> bool:
+        """bool: Whether to downscale oversized art and convert unsupported formats before rendering."""
+        return super().PRECONDITION_ART
+
+    @cached_property
+    def ART_CACHE_SIZE(self) -> int:
+        """int: Size limit in megabytes of pre-conditioned, filled, and filtered art kept between sessions."""
+        return super().ART_CACHE_SIZE
+
     """
     * Testing
     """
@@ -201,6 +239,16 @@ def TEST_MODE(self) -> bool:
         """bool: Whether the app is running in testing mode."""
         return super().TEST_MODE
 
+    @cached_property
+    def PROFILE_RENDERS(self) -> bool:
+        """bool: Whether to record render step timings and Photoshop round-trips to the profile log."""
+        return super().PROFILE_RENDERS
+
+    @cached_property
+    def TRACE_SESSION(self) -> bool:
+        """bool: Whether to record a timeline of the session, exported in Chrome trace event format."""
+        return super().TRACE_SESSION
+
     """
     * Experimental
     """
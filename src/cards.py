@@ -14,7 +14,7 @@
 # Local Imports
 from src._config import AppConfig
 from src.console import msg_warn
-from src.enums.mtg import TransformIcons, non_italics_abilities, CardTextPatterns
+from src.enums.mtg import TransformIcons, non_italics_abilities, CardTextPatterns, LayoutScryfall
 from src.schema.colors import ColorObject
 from src.utils import scryfall
 
@@ -140,6 +140,33 @@ def parse_card_info(file_path: Path) -> CardDetails:
     }
 
 
+def is_sibling_face(data: dict, card: CardDetails, other: CardDetails) -> bool:
+    """Check whether two art files provide opposite faces of the same double faced card.
+
+    Args:
+        data: Unprocessed scryfall data fetched for `card`.
+        card: Card details of the art file the data was fetched for.
+        other: Card details of another art file.
+
+    Returns:
+        True if `other` is the opposite face of the same printing, otherwise False.
+    """
+    # Only transform and MDFC cards provide a separate art file for each face
+    if data.get('layout') not in [LayoutScryfall.Transform, LayoutScryfall.MDFC]:
+        return False
+
+    # Art files must name opposite faces
+    faces = [normalize_str(n.get('name', ''), True) for n in data.get('card_faces', [])]
+    name, other_name = normalize_str(card['name'], True), normalize_str(other['name'], True)
+    if name == other_name or name not in faces or other_name not in faces:
+        return False
+
+    # Both files must request the same printing
+    return bool(
+        card.get('set', '').lower() == other.get('set', '').lower()
+        and card.get('number', '') == other.get('number', ''))
+
+
 """
 * Post-processing Data
 """
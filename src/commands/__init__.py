@@ -15,6 +15,7 @@
 from src.commands.docs import docs_cli
 from src.commands.files import compress_cli
 from src.commands.render import render_cli
+from src.commands.sheets import sheets_cli
 from src.commands.test import test_cli
 
 """
@@ -57,6 +58,7 @@ def run_gui():
         'docs': docs_cli,
         'gui': run_gui,
         'render': render_cli,
+        'sheets': sheets_cli,
         'test': test_cli,
     },
     context_settings={
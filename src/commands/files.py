@@ -2,21 +2,96 @@
 * CLI Commands: Files
 """
 # Standard Library
+import json
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 # Third Party Imports
 import click
-from omnitils.files.archive import compress_7z, compress_7z_all
 
 # Local Imports
 from src import PATH
+from src.utils.archive import (
+    ArchiveResult,
+    compress_templates,
+    get_template_files,
+    load_archive_settings)
+from src.utils.encoding import fit_images_to_budget
 
 """
 * Commands: Compression
 """
 
 
+def compress_template_dirs(
+    paths: list[Path],
+    workers: Optional[int] = None,
+    memory: Optional[int] = None,
+    settings: Optional[Path] = None,
+    force: bool = False,
+    report: Optional[Path] = None
+) -> None:
+    """Compress the templates in each directory, printing the time and ratio of each template.
+
+    Args:
+        paths: Paths to the template files or directories containing them.
+        workers: Maximum number of templates to compress at once.
+        memory: Memory available to all compressions together, in megabytes, half the physical memory if not provided.
+        settings: JSON file with per-template word and dictionary sizes, see `load_archive_settings`.
+        force: Compress every template, even those unchanged since their last archive.
+        report: JSON file to save the result of each template to.
+    """
+    file_settings = load_archive_settings(settings) if settings else None
+    results: list[ArchiveResult] = []
+    for path in paths:
+        files = get_template_files(path) if path.is_dir() else [path]
+        results.extend(compress_templates(
+            paths=files,
+            workers=workers,
+            memory=memory,
+            settings=file_settings,
+            force=force,
+            callback=print_archive_result))
+
+    # Save the results
+    if report:
+        with open(report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+def print_archive_result(result: ArchiveResult) -> None:
+    """Print the time and ratio a template was compressed at.
+
+    Args:
+        result: Result of compressing the template.
+    """
+    if not result['archive']:
+        return print(f"{result['file']}: Compression failed! {result['error'] or ''}".rstrip())
+    time = 'unchanged, skipped' if result['skipped'] else f"{result['time']:.1f}s"
+    print(f"{result['file']}: {time} {result['word_size']}/{result['dict_size']} "
+          f"{result['archive_size'] / 1024 / 1024:.1f}/{result['size'] / 1024 / 1024:.1f} MB "
+          f"({result['ratio']:.1%})")
+
+
+def compression_options(func: Callable) -> Callable:
+    """Add the options shared by template compression commands."""
+    for option in reversed([
+        click.option('-W', '--workers', type=click.IntRange(1), default=None,
+                     help="Maximum number of templates to compress at once."),
+        click.option('-M', '--memory', type=click.IntRange(1), default=None,
+                     help="Memory available to all compressions together, in megabytes. "
+                          "Defaults to half the physical memory."),
+        click.option('-S', '--settings', type=click.Path(exists=True, dir_okay=False, path_type=Path),
+                     default=None, help="JSON file of per-template 'word/dict' sizes, e.g. {\"normal.psd\": \"64/768\"}."),
+        click.option('-F', '--force', is_flag=True, default=False,
+                     help="Compress templates even if unchanged since their last archive."),
+        click.option('-R', '--report', type=click.Path(dir_okay=False, path_type=Path), default=None,
+                     help="JSON file to save the time and ratio of each template to.")
+    ]):
+        func = option(func)
+    return func
+
+
 @click.group(
     name='compress',
     help='Command utilities for compressing files.'
@@ -32,19 +107,23 @@ def compress_cli():
 )
 @click.argument('template')
 @click.argument('plugin', required=False)
-def compress_template(template: str, plugin: Optional[str] = None) -> None:
+@compression_options
+def compress_template(template: str, plugin: Optional[str] = None, **kwargs) -> None:
     """Compress a template by name and optionally plugin name.
 
     Args:
         template: Filename of the template, e.g. `normal.psd`
         plugin: Name of the plugin containing the template if required, e.g. MrTeferi
+
+    Keyword Args:
+        See `compress_template_dirs`.
     """
     path = Path(PATH.PLUGINS, plugin, 'templates') if plugin else PATH.TEMPLATES
     path = path / template
     if not path.is_file():
         print(f"I couldn't find a template named '{template}' at this path:\n{str(path)}")
         return
-    compress_7z(path)
+    compress_template_dirs([path], **kwargs)
 
 
 @compress_cli.command(
@@ -52,17 +131,21 @@ def compress_template(template: str, plugin: Optional[str] = None) -> None:
     help='Compress all Photoshop template files (PSD/PSB) in a given plugin.'
 )
 @click.argument('plugin')
-def compress_plugin(plugin: str) -> None:
+@compression_options
+def compress_plugin(plugin: str, **kwargs) -> None:
     """Compress all templates in a specific plugin.
 
     Args:
         plugin: Name of the plugin, e.g. MrTeferi
+
+    Keyword Args:
+        See `compress_template_dirs`.
     """
     path = PATH.PLUGINS / plugin / 'templates'
     if not path.is_dir():
         print(f"I couldn't find a plugin named '{plugin}'")
         return
-    compress_7z_all(path)
+    compress_template_dirs([path], **kwargs)
 
 
 @compress_cli.command(
@@ -70,21 +153,50 @@ def compress_plugin(plugin: str) -> None:
     help='Compress all Photoshop template files (PSD/PSB) in the entire app, plugins optional.'
 )
 @click.option('-P', '--plugins', is_flag=True, default=False, help="Compress built-in plugins as well.")
-def compress_all(plugins: bool = False) -> None:
+@compression_options
+def compress_all(plugins: bool = False, **kwargs) -> None:
     """Compress all templates.
 
     Args:
         plugins: Compress built-in plugins as well if True, otherwise skip them.
-    """
-    # Compress main templates folder
-    compress_7z_all(PATH.TEMPLATES)
 
-    # Compress plugins if requested
+    Keyword Args:
+        See `compress_template_dirs`.
+    """
+    # Compress main templates folder, and plugins if requested
+    paths = [PATH.TEMPLATES]
     if plugins:
-        plugins = [
+        paths.extend([
             Path(PATH.PLUGINS, p, 'templates')
-            for p in ['Investigamer', 'SilvanMTG']]
-        [compress_7z_all(p) for p in plugins]
+            for p in ['Investigamer', 'SilvanMTG']])
+    compress_template_dirs(paths, **kwargs)
+
+
+@compress_cli.command(
+    name='budget',
+    help='Encode all rendered card images to fit a file size budget, saved to "out/budget".'
+)
+@click.argument('megabytes', type=float)
+@click.option('-Q', '--floor', type=click.IntRange(1, 100), default=80, help="Minimum quality allowed.")
+@click.option('-W', '--webp', is_flag=True, default=False, help="Encode WEBP images instead of JPEG.")
+def compress_budget(megabytes: float, floor: int = 80, webp: bool = False) -> None:
+    """Encode all rendered card images to fit a file size budget.
+
+    Args:
+        megabytes: Maximum file size of each image, in megabytes.
+        floor: Minimum quality allowed.
+        webp: Encode WEBP images instead of JPEG if True.
+    """
+    images = [p for p in PATH.OUT.iterdir() if p.suffix.lower() in ['.png', '.jpg', '.jpeg']]
+    results = fit_images_to_budget(
+        paths=images,
+        output=PATH.OUT / 'budget',
+        budget=int(megabytes * 1024 * 1024),
+        floor=floor,
+        fmt='webp' if webp else 'jpg')
+    for r in results:
+        print(f"{Path(r['file']).name}: {r['width']}px Q{r['quality']} {r['size'] / 1024:.0f} KB"
+              f"{'' if r['fits'] else ' (over budget)'}")
 
 
 # Export CLI
@@ -0,0 +1,67 @@
+"""
+* CLI Commands: Print Sheets
+"""
+# Standard Library Imports
+from pathlib import Path
+from typing import Optional
+
+# Third Party Imports
+import click
+
+# Local Imports
+from src import PATH
+from src.utils.sheets import PAGE_SIZES, get_sheet_spec, impose_sheets
+
+"""
+* Commands
+"""
+
+
+@click.command(
+    name='sheets',
+    help='Impose all rendered card images onto print sheets, saved to "out/sheets".'
+)
+@click.option('-P', '--page', type=click.Choice(list(PAGE_SIZES)), default='letter', help="Page size.")
+@click.option('-R', '--rows', type=int, default=3, help="Rows of cards on each sheet.")
+@click.option('-C', '--cols', type=int, default=3, help="Columns of cards on each sheet.")
+@click.option('-D', '--dpi', type=int, default=600, help="Resolution of each sheet.")
+@click.option('-B', '--bleed', type=float, default=0.0, help="Bleed kept around each card, in inches.")
+@click.option('--no-marks', is_flag=True, default=False, help="Don't draw cut marks.")
+@click.option('--duplex', is_flag=True, default=False, help="Follow each sheet with a sheet of back faces.")
+@click.option('--back', type=click.Path(exists=True, dir_okay=False), help="Image printed behind single-faced cards.")
+@click.option('--offset', type=(float, float), default=(0.0, 0.0), help="Shift of back sheets in inches, X then Y.")
+@click.option('--png', is_flag=True, default=False, help="Write a PNG image per sheet instead of a PDF file.")
+def sheets_cli(
+    page: str = 'letter',
+    rows: int = 3,
+    cols: int = 3,
+    dpi: int = 600,
+    bleed: float = 0.0,
+    no_marks: bool = False,
+    duplex: bool = False,
+    back: Optional[str] = None,
+    offset: tuple[float, float] = (0.0, 0.0),
+    png: bool = False
+) -> None:
+    """Impose all rendered card images onto print sheets."""
+    images = sorted(p for p in PATH.OUT.iterdir() if p.suffix.lower() in ['.png', '.jpg', '.jpeg'])
+    if not images:
+        return print('No card images found!')
+    try:
+        spec = get_sheet_spec(
+            page=page, rows=rows, cols=cols, dpi=dpi, bleed=bleed,
+            marks=not no_marks, duplex=duplex, back_offset=offset)
+    except ValueError as e:
+        return print(e)
+    for path in impose_sheets(
+        paths=images,
+        output=PATH.OUT / 'sheets',
+        spec=spec,
+        fmt='png' if png else 'pdf',
+        back=Path(back) if back else None
+    ):
+        print(f'Saved: {path}')
+
+
+# Export CLI
+__all__ = ['sheets_cli']
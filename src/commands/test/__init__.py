@@ -1,12 +1,20 @@
 """
 * CLI Commands: Testing
 """
+# Standard Library Imports
+from pathlib import Path
+from typing import Optional
+
 # Third Party
 import click
 
 # Local Imports
 from src import CONSOLE, PATH
-from src.commands.test import frame_logic, text_logic
+from src.commands.test import (
+    adobe_caches, art_filters, art_images, documents, download, edge_fill, frame_logic, geometry, layer_changes,
+    output_encoding, print_sheets, profiling, showcases, sketch_filter, template_archives, text_fitting,
+    text_logic, text_metrics)
+from src.utils.fill import FILL_METHODS
 
 """
 * Commands
@@ -51,6 +59,158 @@ def test_text_logic():
     text_logic.test_all_cases()
 
 
+@click.command(
+    short_help='Test resumable, multi-connection, and queued downloads against a local file host.',
+    help='Test resumable, multi-connection, and queued downloads against a local HTTP server standing in '
+         'for Google Drive and Amazon S3, including dropped connections, cancelled downloads, checksum '
+         'mismatches, and the bandwidth cap.')
+def test_downloads():
+    """Run all download tests."""
+    download.test_all_downloads()
+
+
+@click.command(
+    short_help='Test layer index lookups and template document sessions against stand-in documents.',
+    help='Test layer index lookups and template document sessions against a stand-in for the Photoshop '
+         'document object model, including ambiguous names, layers duplicated or renamed after the index '
+         'was built, documents reused after a cancelled render, and snapshots which can\'t be selected.')
+def test_documents():
+    """Run all document tests."""
+    documents.test_all_documents()
+
+
+@click.command(
+    short_help='Test the offline ability layout solvers with synthetic measurements.',
+    help='Test the offline ability layout solvers used by Planeswalker, Saga, and Class templates with '
+         'synthetic measurements, comparing them with layers moved and measured one at a time.')
+def test_geometry():
+    """Run all layout geometry tests."""
+    geometry.test_all_geometry()
+
+
+@click.command(
+    short_help='Test the offline text layout estimator with synthetic and shipped fonts.',
+    help='Test the offline text layout estimator used to fit rules text with fonts built with known advance '
+         'widths, covering line wrapping, paragraph spacing, styled ranges, and font size fitting, then with '
+         'the rules text fonts shipped with the app.')
+def test_text_metrics():
+    """Run all text metrics tests."""
+    text_metrics.test_all_text_metrics()
+
+
+@click.command(
+    short_help='Test the fast sketch art filter against reference outputs of a fixed image.',
+    help='Test the fast sketch art filter of the Sketch template on a fixed synthetic image with each sketch '
+         'option, checking its output is usable, repeatable, and within a few levels of the reference output '
+         'recorded for it. The filter approximates the sketch action, it isn\'t compared with Photoshop.')
+def test_sketch_filter():
+    """Run all sketch filter tests."""
+    sketch_filter.test_all_sketch_filter()
+
+
+
+@click.command(
+    short_help='Time the offline edge fill against Photoshop\'s content aware fill, requires Photoshop.',
+    help='Time the offline edge fill and Photoshop\'s content aware fill on the same art, each filling a card '
+         'sized canvas around an art window and including its art import. Logs the time of each through the '
+         'render profiler, and how many times faster the offline fill is.')
+@click.option('-A', '--art', type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None,
+              help="Art image to fill, a generated image is used if not provided.")
+@click.option('-M', '--method', type=click.Choice(list(FILL_METHODS)), default='diffuse',
+              help="Offline fill method to time.")
+def test_edge_fill(art: Optional[Path] = None, method: str = 'diffuse'):
+    """Run the edge fill timing test."""
+    edge_fill.test_edge_fill_timing(art, method)
+
+
+@click.command(
+    short_help='Test the render profiler and session tracer.',
+    help='Test the render profiler\'s card records, step, task, round-trip, and text fitting statistics, batch '
+         'summaries averaged per template and render method, the session tracer\'s spans across threads and '
+         'their Chrome trace export, and the cost of recording calls left in the code while either is disabled.')
+def test_profiling():
+    """Run all profiling tests."""
+    profiling.test_all_profiling()
+
+
+@click.command(
+    short_help='Test layer change set batching and ordering against stand-in layers.',
+    help='Test layer change sets against stand-in layers, checking consecutive changes of the same kind are '
+         'committed in one action, mask copies and queued functions see every change queued before them, '
+         'rejected batches fall back to one layer at a time, and nothing is committed after an error.')
+def test_layer_changes():
+    """Run all layer change set tests."""
+    layer_changes.test_all_layer_changes()
+
+
+@click.command(
+    short_help='Test font size fitting against synthetic text with known measurements.',
+    help='Test the bisection used to fit text to a width or height against synthetic text with known '
+         'measurements, checking it fits the same size as stepping down the size grid one step at a time, and '
+         'counting the measurements each makes.')
+def test_text_fitting():
+    """Run all text fitting tests."""
+    text_fitting.test_all_text_fitting()
+
+
+@click.command(
+    short_help='Tests Photoshop caches offline.',
+    help='Tests the action descriptor and layer bounds caches against stand-in descriptors and layers.')
+def test_caches():
+    """Tests the Photoshop caches offline."""
+    adobe_caches.test_all_adobe_caches()
+
+
+@click.command(
+    short_help='Tests art image probing and framing offline.',
+    help='Tests image header probing, art framing predicted without Photoshop, and art pre-conditioning.')
+def test_art_images():
+    """Tests art image handling offline."""
+    art_images.test_all_art_images()
+
+
+@click.command(
+    short_help='Tests output encoding offline.',
+    help='Tests encoding rendered images in the background, to fit a file size budget, and compressing them once.')
+def test_output_encoding():
+    """Tests output encoding offline."""
+    output_encoding.test_all_output_encoding()
+
+
+@click.command(
+    short_help='Tests showcase rendering offline.',
+    help='Tests showcase frames drawn with Pillow around generated card images.')
+def test_showcases():
+    """Tests showcase rendering offline."""
+    showcases.test_all_showcases()
+
+
+@click.command(
+    short_help='Tests print sheet imposition offline.',
+    help='Tests print sheet layouts, duplex face pairing, and imposing generated card images as PNG and PDF '
+         'sheets.')
+def test_print_sheets():
+    """Tests print sheet imposition offline."""
+    print_sheets.test_all_print_sheets()
+
+
+@click.command(
+    short_help='Tests art filter pipelines offline.',
+    help='Tests art filter pipelines applied to generated art, their cached results, and the filter queue.')
+def test_art_filters():
+    """Tests art filter pipelines offline."""
+    art_filters.test_all_art_filters()
+
+
+@click.command(
+    short_help='Tests template archiving offline.',
+    help='Tests compressing generated templates as 7z archives within a memory budget, skipping unchanged '
+         'templates.')
+def test_template_archives():
+    """Tests template archiving offline."""
+    template_archives.test_all_template_archives()
+
+
 """
 * Command Groups
 """
@@ -61,7 +221,23 @@ def test_text_logic():
     help='Commands that test app functionality.',
     commands={
         'logic.frame': test_frame_logic,
-        'logic.text': test_text_logic
+        'logic.text': test_text_logic,
+        'downloads': test_downloads,
+        'documents': test_documents,
+        'geometry': test_geometry,
+        'text.metrics': test_text_metrics,
+        'sketch': test_sketch_filter,
+        'fill': test_edge_fill,
+        'profiling': test_profiling,
+        'changes': test_layer_changes,
+        'text.fitting': test_text_fitting,
+        'caches': test_caches,
+        'images': test_art_images,
+        'encoding': test_output_encoding,
+        'showcase': test_showcases,
+        'sheets': test_print_sheets,
+        'filters': test_art_filters,
+        'archive': test_template_archives
     }
 )
 def test_cli():
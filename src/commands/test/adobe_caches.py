@@ -0,0 +1,232 @@
+"""
+* Tests: Photoshop Caches
+* Action descriptor and layer bounds caching tested with stand-in descriptors and layers, counting the
+* descriptors built and layers measured in Photoshop.
+"""
+# Standard Library Imports
+from random import Random
+from time import perf_counter
+
+# Third Party Imports
+from photoshop.api._layerSet import LayerSet
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.helpers.descriptors import get_value_key
+from src.utils.adobe import BoundsCache, DescriptorCache
+
+"""
+* Test Utils
+"""
+
+# Seed of the simulated batch, and how many cache lookups are timed
+CACHE_SEED = 3501
+CACHE_LOOKUPS = 100000
+
+
+class StandInDescriptor:
+    """Descriptor recording the values put on it, each put a Photoshop round-trip."""
+
+    def __init__(self, *values):
+        self.values = values
+
+
+def get_builder(built: list[tuple]):
+    """Get a function making builders, which record each descriptor they build in a shared list.
+
+    Args:
+        built: List each built descriptor's values are added to.
+
+    Returns:
+        Function taking descriptor values and returning a builder for them.
+    """
+    def make(*values):
+        def build() -> StandInDescriptor:
+            built.append(values)
+            return StandInDescriptor(*values)
+        return build
+    return make
+
+
+class StandInLayer:
+    """Art layer counting each time its bounds are measured, one Photoshop round-trip each."""
+
+    def __init__(self, bounds: tuple[int, int, int, int]):
+        self._bounds, self.measured = bounds, 0
+
+    def measure(self) -> tuple[int, int, int, int]:
+        self.measured += 1
+        return self._bounds
+
+
+class StandInGroup(LayerSet):
+    """Layer group, measured in place of a Photoshop group object."""
+
+    def __init__(self):
+        pass
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_descriptors_reused() -> str:
+    """Build each descriptor once per key, returning the same descriptor on every later lookup."""
+    built: list[tuple] = []
+    cache, build = DescriptorCache(), get_builder(built)
+    black = cache.get(('RGBColor', 0, 0, 0), build(0, 0, 0))
+    assert cache.get(('RGBColor', 0, 0, 0), build(0, 0, 0)) is black, 'Cached descriptor was not reused'
+    assert cache.get(('RGBColor', 255, 255, 255), build(255, 255, 255)) is not black, 'Keys were confused'
+    assert built == [(0, 0, 0), (255, 255, 255)], f'Built {built}'
+    assert cache.stats == {'hits': 1, 'builds': 2}, f'Recorded {cache.stats}'
+
+    # Cleared descriptors are built again
+    cache.clear()
+    assert cache.get(('RGBColor', 0, 0, 0), build(0, 0, 0)) is not black, 'Cleared descriptor was reused'
+    return f"{cache.stats['builds']} builds"
+
+
+def test_descriptors_evicted() -> str:
+    """Discard the least recently used descriptor once the cache reaches its limit."""
+    built: list[tuple] = []
+    cache, build = DescriptorCache(limit=3), get_builder(built)
+    for n in (1, 2, 3):
+        cache.get(n, build(n))
+    cache.get(1, build(1))
+    cache.get(4, build(4))
+    assert list(cache.items) == [3, 1, 4], f'Kept {list(cache.items)}'
+    cache.get(2, build(2))
+    assert built == [(1,), (2,), (3,), (4,), (2,)], f'Built {built}'
+    return f'{len(cache.items)} kept'
+
+
+def test_descriptor_keys() -> str:
+    """Make equal keys for values which build the same descriptor, whatever their container types."""
+    stops = [
+        {'color': [255, 0, 0], 'location': 0, 'midpoint': 50},
+        {'color': [0, 0, 255], 'location': 4096, 'midpoint': 50}]
+    reordered = [
+        {'midpoint': 50, 'location': 0, 'color': (255, 0, 0)},
+        {'midpoint': 50, 'location': 4096, 'color': (0, 0, 255)}]
+    key = get_value_key(stops)
+    assert hash(key) == hash(get_value_key(reordered)) and key == get_value_key(reordered), \
+        'Equal gradients made different keys'
+    assert key != get_value_key(stops[::-1]), 'Reversed gradient made the same key'
+    assert get_value_key('#ff0000') == '#ff0000', 'Color notation was changed'
+    return 'lists, tuples, and dicts'
+
+
+def test_descriptor_cost() -> str:
+    """Count the descriptors built over a batch of cards sharing a palette, timing each cached lookup."""
+    rng, built = Random(CACHE_SEED), []
+    cache, build = DescriptorCache(), get_builder(built)
+    palette = [('RGBColor', rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(24)]
+
+    # 100 cards, each applying 40 colors for its text, pinlines, and symbols
+    for _ in range(100):
+        for _ in range(40):
+            color = rng.choice(palette)
+            cache.get(color, build(*color[1:]))
+    assert len(built) <= len(palette), f'Built {len(built)} descriptors for {len(palette)} colors'
+
+    # Cached lookups cost microseconds, a built RGB descriptor costs three round-trips
+    start, key = perf_counter(), palette[0]
+    for _ in range(CACHE_LOOKUPS):
+        cache.get(key, StandInDescriptor)
+    per_lookup = (perf_counter() - start) / CACHE_LOOKUPS * 1e6
+    assert per_lookup < 10, f'Cached lookup costs {per_lookup:.2f}us'
+    return f'{len(built)} descriptors built for 4000 colors, {per_lookup:.2f}us per cached lookup'
+
+
+def test_bounds_scope() -> str:
+    """Reuse measurements only within a scope, discarding them once the outermost scope exits."""
+    cache, layer = BoundsCache(), StandInLayer((0, 0, 10, 10))
+    cache.get(layer, 'bounds', layer.measure)
+    cache.get(layer, 'bounds', layer.measure)
+    assert layer.measured == 2 and not cache.items, 'Measurement was cached outside a scope'
+    with cache.scope():
+        with cache.scope():
+            assert cache.get(layer, 'bounds', layer.measure) == (0, 0, 10, 10), 'Measurement is wrong'
+        cache.get(layer, 'bounds', layer.measure)
+        cache.get(layer, 'boundsNoEffects', layer.measure)
+        assert layer.measured == 4 and cache.items, 'Nested scope discarded its measurements'
+    assert not cache.active and not cache.items, 'Measurements outlived their scope'
+    assert cache.stats == {'hits': 1, 'measures': 2}, f'Recorded {cache.stats}'
+    return f'{layer.measured} measurements'
+
+
+def test_bounds_changed() -> str:
+    """Discard the measurements of a changed art layer and every group, keeping those of other art layers."""
+    cache, group = BoundsCache(), StandInGroup()
+    a, b = StandInLayer((0, 0, 10, 10)), StandInLayer((5, 5, 20, 20))
+    with cache.scope():
+        cache.get(a, 'bounds', a.measure)
+        cache.get(b, 'bounds', b.measure)
+        cache.get(group, 'bounds', lambda: (0, 0, 20, 20))
+        cache.changed(layer=a)
+        assert [v[0] for v in cache.items.values()] == [b], 'Wrong measurements were discarded'
+
+        # Layers known by ID are discarded by ID, even through another object for the same layer
+        cache.get(StandInLayer((0, 0, 1, 1)), 'bounds', a.measure, layer_id=7)
+        cache.changed(layer=StandInLayer((0, 0, 1, 1)), layer_id=7)
+        assert ('bounds', 7) not in cache.items, 'Measurement keyed by ID was kept'
+
+        # Any action or changed group marks every measurement stale
+        cache.changed()
+        cache.get(b, 'bounds', b.measure)
+        cache.changed(layer=group)
+        cache.get(b, 'bounds', b.measure)
+    assert a.measured == 2 and b.measured == 3, f'Measured a {a.measured} and b {b.measured} times'
+    return 'art layers, groups, and IDs'
+
+
+def test_bounds_identity() -> str:
+    """Never reuse a measurement for a different layer object, even one with the same Python ID."""
+    cache, a = BoundsCache(), StandInLayer((0, 0, 10, 10))
+    with cache.scope():
+        cache.get(a, 'bounds', a.measure)
+        key = ('bounds', None, id(a))
+        cache.items[key] = (StandInLayer((0, 0, 1, 1)), cache.epoch, (0, 0, 1, 1))
+        assert cache.get(a, 'bounds', a.measure) == (0, 0, 10, 10), 'Another layer\'s measurement was reused'
+    return 'checked by identity'
+
+
+def test_bounds_cost() -> str:
+    """Count the measurements made positioning a card's layers, timing each cached lookup."""
+    cache = BoundsCache()
+    layers = [StandInLayer((i, i, i + 100, i + 50)) for i in range(12)]
+    with cache.scope():
+        # Each layer is measured by several helpers, e.g. when aligning, scaling, and positioning text
+        for _ in range(5):
+            for layer in layers:
+                cache.get(layer, 'bounds', layer.measure)
+        cache.changed(layer=layers[0])
+        for layer in layers:
+            cache.get(layer, 'bounds', layer.measure)
+        measured = sum(n.measured for n in layers)
+        assert measured == len(layers) + 1, f'Measured {measured} times'
+
+        start, layer = perf_counter(), layers[-1]
+        for _ in range(CACHE_LOOKUPS):
+            cache.get(layer, 'bounds', layer.measure)
+        per_lookup = (perf_counter() - start) / CACHE_LOOKUPS * 1e6
+    assert per_lookup < 10, f'Cached lookup costs {per_lookup:.2f}us'
+    return f'{measured} measurements for {6 * len(layers)} lookups, {per_lookup:.2f}us per cached lookup'
+
+
+def test_all_adobe_caches() -> bool:
+    """Run every Photoshop cache test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_descriptors_reused,
+        test_descriptors_evicted,
+        test_descriptor_keys,
+        test_descriptor_cost,
+        test_bounds_scope,
+        test_bounds_changed,
+        test_bounds_identity,
+        test_bounds_cost])
@@ -0,0 +1,180 @@
+"""
+* Tests: Art Filters
+* Art filter pipelines applied to generated art files, cached by contents and pipeline, and queued ahead of the
+* render thread.
+"""
+# Standard Library Imports
+import os
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, sleep
+from unittest.mock import patch
+
+# Third Party Imports
+from PIL import ExifTags, Image
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.filters import (
+    ART_FILTERS,
+    ArtFilterQueue,
+    ArtPipeline,
+    apply_art_pipeline,
+    get_pipeline_key,
+    register_art_filter)
+
+"""
+* Test Utils
+"""
+
+# Pipeline applied when timing, sharpening then adjusting the art as a template might
+TIMED_PIPELINE: ArtPipeline = [('unsharp_mask', {'radius': 3}), ('enhance', {'contrast': 1.2, 'saturation': 0.8})]
+
+
+def save_art(path: Path, size: tuple[int, int] = (96, 64), **kwargs) -> Path:
+    """Save a gradient art image.
+
+    Args:
+        path: Path to save the image to.
+        size: Width and height of the image.
+        kwargs: Keyword arguments passed to `Image.save`, e.g. dpi.
+
+    Returns:
+        Path to the saved image.
+    """
+    gradient = Image.linear_gradient('L').resize(size)
+    Image.merge('RGB', (gradient, gradient.transpose(Image.Transpose.ROTATE_180), gradient)).save(path, **kwargs)
+    return path
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_filter_registry(path: Path) -> str:
+    """Apply every registered filter to an RGB image, letting registration replace a filter by name."""
+    with Image.open(save_art(path / 'art.png')) as art:
+        img = art.convert('RGB')
+    for name, func in ART_FILTERS.items():
+        result = func(img)
+        assert result.size == img.size and result.mode == 'RGB', f'Filter {name} returned {result.mode}'
+    with patch.dict(ART_FILTERS):
+        @register_art_filter('grayscale')
+        def _replaced(image: Image.Image) -> Image.Image:
+            return image
+        assert ART_FILTERS['grayscale'] is _replaced, 'Filter was not replaced'
+    assert ART_FILTERS['grayscale'] is not _replaced, 'Registry was not restored'
+    return f'{len(ART_FILTERS)} filters'
+
+
+def test_pipeline_key(_path: Path) -> str:
+    """Identify pipelines by their filters in order, whatever order their parameters are given in."""
+    a: ArtPipeline = [('enhance', {'contrast': 1.2, 'saturation': 0.8}), ('grayscale', {})]
+    b: ArtPipeline = [('enhance', {'saturation': 0.8, 'contrast': 1.2}), ('grayscale', {})]
+    assert get_pipeline_key(a) == get_pipeline_key(b), 'Parameter order changed the key'
+    assert get_pipeline_key(a) != get_pipeline_key(a[::-1]), 'Filter order did not change the key'
+    assert get_pipeline_key(a) != get_pipeline_key([('enhance', {'contrast': 1.3}), ('grayscale', {})]), \
+        'Parameters did not change the key'
+    return get_pipeline_key(a)
+
+
+def test_apply_pipeline(path: Path) -> str:
+    """Filter art into a cached PNG, keeping its resolution and orientation, reused until the art changes."""
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = 6
+    art = save_art(path / 'art.jpg', dpi=(300, 300), exif=exif, quality=95)
+    pipeline: ArtPipeline = [('grayscale', {}), ('posterize', {'bits': 2})]
+    out = apply_art_pipeline(art, pipeline, path)
+    with Image.open(out) as img:
+        assert img.size == (64, 96), 'Orientation was not applied'
+        assert round(img.info['dpi'][0]) == 300, 'Resolution was not kept'
+        assert len(img.getcolors()) <= 4, 'Pipeline was not applied'
+
+    # Results are reused until the art changes, and touched so they're evicted last
+    os.utime(out, ns=(0, 0))
+    assert apply_art_pipeline(art, pipeline, path) == out and out.stat().st_mtime > 0, 'Result was not reused'
+    save_art(art, dpi=(300, 300), quality=80)
+    assert apply_art_pipeline(art, pipeline, path) != out, 'Result of changed art was reused'
+    try:
+        apply_art_pipeline(art, [('missing', {})], path)
+        raise AssertionError('Unknown filter was applied')
+    except KeyError:
+        pass
+    assert not list(path.glob('*.tmp.png')), 'Temporary file was left behind'
+    return out.name
+
+
+def test_filter_queue(path: Path) -> str:
+    """Filter each art and pipeline pair once however often it's queued, raising errors when resolved."""
+    applied, lock = [], Lock()
+    art = save_art(path / 'art.png')
+
+    def _count(img: Image.Image, label: str = '') -> Image.Image:
+        with lock:
+            applied.append(label)
+        return img
+
+    def _fail(img: Image.Image) -> Image.Image:
+        raise ValueError('Filter failed')
+
+    queue = ArtFilterQueue(path, workers=2)
+    with patch.dict(ART_FILTERS, {'count': _count, 'fail': _fail}):
+        try:
+            a, b = [('count', {'label': 'a'})], [('count', {'label': 'b'})]
+            first = queue.submit(art, a)
+            assert queue.submit(str(art), a) is first and queue.submit(art, b) is not first, 'Queue keys are wrong'
+            assert queue.resolve(art, a) == first.result() and queue.resolve(art, b).is_file(), 'Art not filtered'
+            assert sorted(applied) == ['a', 'b'], f'Applied {applied}'
+            try:
+                queue.resolve(art, [('fail', {})])
+                raise AssertionError('Filter error was not raised')
+            except ValueError:
+                pass
+        finally:
+            queue.shutdown()
+    assert not queue.futures and queue._executor is None, 'Queue was not shut down'
+    return f'{len(applied)} filtered'
+
+
+def test_filter_timing(path: Path) -> str:
+    """Time filtering art on the render thread, compared with resolving art queued ahead and reusing results."""
+    arts = [save_art(path / f'{i}.png', (3000 + i, 2200)) for i in range(2)]
+
+    # Filter the first art on the render thread
+    start = perf_counter()
+    apply_art_pipeline(arts[0], TIMED_PIPELINE, path)
+    inline = perf_counter() - start
+
+    # Queue the second, and wait for it after rendering the first, which Photoshop does in its own process
+    queue = ArtFilterQueue(path)
+    try:
+        queue.submit(arts[1], TIMED_PIPELINE)
+        sleep(inline)
+        start = perf_counter()
+        queue.resolve(arts[1], TIMED_PIPELINE)
+        queued = perf_counter() - start
+    finally:
+        queue.shutdown()
+
+    # Reuse the result in a later session
+    start = perf_counter()
+    apply_art_pipeline(arts[0], TIMED_PIPELINE, path)
+    cached = perf_counter() - start
+    assert cached < inline / 10, f'Reusing took {cached * 1000:.0f}ms, filtering {inline * 1000:.0f}ms'
+    return (f'{inline * 1000:.0f}ms inline, {queued * 1000:.1f}ms waiting when queued, '
+            f'{cached * 1000:.1f}ms when cached')
+
+
+def test_all_art_filters() -> bool:
+    """Run every art filter test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_filter_registry,
+        test_pipeline_key,
+        test_apply_pipeline,
+        test_filter_queue,
+        test_filter_timing], temp_dir=True)
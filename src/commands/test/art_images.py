@@ -0,0 +1,268 @@
+"""
+* Tests: Art Images
+* Image headers probed from generated files, art framing predicted without Photoshop, compared with the
+* frame_layer scale and alignment it replaces, and oversized art pre-conditioned ahead of rendering.
+"""
+# Standard Library Imports
+import os
+from pathlib import Path
+from time import perf_counter, sleep
+
+# Third Party Imports
+from PIL import ExifTags, Image
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.images import (
+    ArtPreconditioner,
+    Box,
+    ImageHeader,
+    ImageProbeCache,
+    apply_frame_transform,
+    evict_art_cache,
+    get_frame_transform,
+    get_placed_box,
+    get_psd_canvas,
+    precondition_art,
+    probe_image)
+
+"""
+* Test Utils
+"""
+
+# How many times each image is probed or decoded when timed
+PROBE_RUNS = 20
+
+# Template canvas art is pre-conditioned for, and how many cards are rendered from pre-conditioned art
+CANVAS = (1000, 750)
+PRECONDITION_CARDS = 4
+
+
+def save_art(path: Path, size: tuple[int, int], mode: str = 'RGB', **kwargs) -> Path:
+    """Save a gradient test image.
+
+    Args:
+        path: Path to save the image to, its suffix decides the format.
+        size: Width and height of the image.
+        mode: Image mode.
+        kwargs: Keyword arguments passed to `Image.save`, e.g. dpi.
+
+    Returns:
+        Path to the saved image.
+    """
+    img = Image.linear_gradient('L').resize(size).convert(mode)
+    img.save(path, **kwargs)
+    return path
+
+
+def decode_image(path: Path) -> None:
+    """Decode every pixel of an image, as Photoshop does when placing it."""
+    with Image.open(path) as img:
+        img.load()
+
+
+def frame_box(box: Box, ref: Box, smallest: bool = False, scale: float = 100) -> Box:
+    """Frame a box within a reference the way frame_layer does: scale around its center, then align centers.
+
+    Args:
+        box: Bounds of the layer to frame.
+        ref: Bounds of the reference frame.
+        smallest: Whether to scale to the smallest or largest edge.
+        scale: Percentage of the reference size to scale to.
+
+    Returns:
+        Bounds of the framed layer.
+    """
+    action = min if smallest else max
+    factor = scale / 100 * action((ref[2] - ref[0]) / (box[2] - box[0]), (ref[3] - ref[1]) / (box[3] - box[1]))
+    w, h = (box[2] - box[0]) * factor, (box[3] - box[1]) * factor
+    left, top = (ref[0] + ref[2] - w) / 2, (ref[1] + ref[3] - h) / 2
+    return left, top, left + w, top + h
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_probe_image(path: Path) -> str:
+    """Read dimensions, resolution, and transparency from file headers, timed against decoding the image."""
+    jpg = save_art(path / 'art.jpg', (3000, 2200), dpi=(300, 300), quality=95)
+    png = save_art(path / 'alpha.png', (64, 48), mode='RGBA')
+    (path / 'broken.jpg').write_bytes(b'not an image')
+    assert probe_image(jpg) == ImageHeader(width=3000, height=2200, dpi=300.0, alpha=False), 'JPEG header is wrong'
+    assert probe_image(png) == ImageHeader(width=64, height=48, dpi=72.0, alpha=True), 'PNG header is wrong'
+    assert probe_image(path / 'broken.jpg') is None and probe_image(path / 'missing.jpg') is None, \
+        'Unreadable image was probed'
+
+    # Probing reads the header, decoding reads every pixel
+    timings = []
+    for func in (probe_image, decode_image):
+        start = perf_counter()
+        for _ in range(PROBE_RUNS):
+            func(jpg)
+        timings.append((perf_counter() - start) / PROBE_RUNS * 1000)
+    assert timings[0] < timings[1] / 10, f'Probing took {timings[0]:.2f}ms, decoding {timings[1]:.2f}ms'
+    return f'{timings[0]:.2f}ms per probe, {timings[1]:.1f}ms per decode'
+
+
+def test_probe_cache(path: Path) -> str:
+    """Reuse probed headers across sessions until the file changes, saving only when something was probed."""
+    art, saved = save_art(path / 'art.png', (200, 100)), path / 'probes.json'
+    cache = ImageProbeCache(saved)
+    assert cache.get(art)['width'] == 200 and cache.dirty, 'Image was not probed'
+    cache.save()
+    assert saved.is_file() and not cache.dirty, 'Cache was not saved'
+
+    # A new session reuses the saved header without reading the image
+    cache = ImageProbeCache(saved)
+    art_key = ImageProbeCache.get_key(art)
+    cache.items[art_key]['width'] = 1
+    assert cache.get(art)['width'] == 1 and not cache.dirty, 'Saved header was not reused'
+    mtime = saved.stat().st_mtime_ns
+    cache.save()
+    assert saved.stat().st_mtime_ns == mtime, 'Unchanged cache was saved'
+
+    # Replacing the file discards its entry
+    save_art(art, (300, 100))
+    os.utime(art, ns=(art.stat().st_atime_ns, art.stat().st_mtime_ns + 10 ** 9))
+    assert cache.get(art)['width'] == 300, 'Header of a replaced file was reused'
+    assert cache.get(path / 'missing.png') is None, 'Missing file was probed'
+    return f'{len(cache.items)} entries'
+
+
+def test_placed_box(_path: Path) -> str:
+    """Predict the placed size from the image and document resolutions, fitted to the canvas and centered."""
+    header = ImageHeader(width=600, height=400, dpi=150, alpha=False)
+    assert get_placed_box(header, (3000, 2000), 300) == (900, 600, 2100, 1400), 'Resolution was not applied'
+    assert get_placed_box(header, (1000, 1000), 300, resize_to_canvas=False) == (-100, 100, 1100, 900), \
+        'Oversized image was resized'
+    left, top, right, bottom = get_placed_box(header, (1000, 1000), 300)
+    assert (left, right) == (0, 1000) and round(bottom - top, 6) == round(1000 * 2 / 3, 6), \
+        'Oversized image was not fitted to the canvas'
+    return 'scaled, fitted, and centered'
+
+
+def test_frame_transform(_path: Path) -> str:
+    """Predict the same framed bounds as scaling and aligning the layer, for wide, tall, and offset boxes."""
+    ref = (120, 240, 2880, 2000)
+    boxes = [(0, 0, 4000, 2000), (500, 100, 1100, 1900), (-300, 700, 2700, 3100), (1400, 1000, 1600, 1200)]
+    for box in boxes:
+        for smallest in (False, True):
+            for scale in (100, 80):
+                framed = apply_frame_transform(box, *get_frame_transform(box, ref, smallest, scale))
+                expected = frame_box(box, ref, smallest, scale)
+                assert all(abs(a - b) < 1e-6 for a, b in zip(framed, expected)), \
+                    f'Framed {box} at {framed}, expected {expected}'
+    return f'{len(boxes) * 4} cases'
+
+
+def test_precondition_art(path: Path) -> str:
+    """Downscale oversized art to the canvas plus a margin, reusing the intermediate until the source changes."""
+    cache_dir = path / 'cache'
+    cache_dir.mkdir()
+    art = save_art(path / 'art.jpg', (4000, 3000), quality=95)
+    small = save_art(path / 'small.png', (1100, 800))
+    out = precondition_art(art, CANVAS, cache_dir)
+    assert out.parent == cache_dir and out.suffix == '.jpg', f'Wrote {out}'
+    assert probe_image(out)['width'] == 1250 and probe_image(out)['height'] == 938, 'Art was not reduced'
+    assert precondition_art(small, CANVAS, cache_dir) == small, 'Art without a margin to spare was reduced'
+
+    # Intermediates are reused, and touched so they're evicted last
+    os.utime(out, ns=(0, 0))
+    assert precondition_art(art, CANVAS, cache_dir) == out and out.stat().st_mtime > 0, 'Intermediate not reused'
+    save_art(art, (4000, 2000), quality=95)
+    os.utime(art, ns=(art.stat().st_atime_ns, art.stat().st_mtime_ns + 10 ** 9))
+    assert precondition_art(art, CANVAS, cache_dir) != out, 'Intermediate of a replaced file was reused'
+    assert not list(cache_dir.glob('*.tmp*')), 'Temporary file was left behind'
+    return f'{probe_image(out)["width"]}x{probe_image(out)["height"]}'
+
+
+def test_precondition_formats(path: Path) -> str:
+    """Apply EXIF orientation, convert unsupported formats, and read template canvases from PSD headers."""
+    cache_dir = path / 'cache'
+    cache_dir.mkdir()
+
+    # A quarter turn swaps the width and height the art is reduced by
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = 6
+    art = save_art(path / 'rotated.jpg', (3000, 4000), exif=exif)
+    out = precondition_art(art, CANVAS, cache_dir)
+    assert (probe_image(out)['width'], probe_image(out)['height']) == (1250, 938), 'Orientation was not applied'
+
+    # Unsupported formats are converted even if they don't need to be reduced
+    webp = save_art(path / 'art.webp', (800, 600), mode='RGBA')
+    out = precondition_art(webp, CANVAS, cache_dir, convert=('WEBP',))
+    assert out.suffix == '.png' and probe_image(out)['width'] == 800, 'WebP was not converted'
+    assert precondition_art(webp, CANVAS, cache_dir) == webp, 'Supported format was converted'
+
+    # Canvas height comes first in the header
+    psd = path / 'template.psd'
+    psd.write_bytes(b'8BPS' + bytes(10) + (2000).to_bytes(4, 'big') + (1500).to_bytes(4, 'big') + bytes(4))
+    assert get_psd_canvas(psd) == (1500, 2000), 'PSD canvas is wrong'
+    assert get_psd_canvas(webp) is None, 'Canvas read from an image'
+    return 'orientation, conversion, PSD canvas'
+
+
+def test_evict_cache(path: Path) -> str:
+    """Remove the least recently used files until the cache fits its size limit."""
+    for i in range(5):
+        (file := path / f'{i}.png').write_bytes(bytes(400 * 1024))
+        os.utime(file, ns=(i * 10 ** 9, i * 10 ** 9))
+    os.utime(path / '0.png')
+    assert evict_art_cache(path, limit=1) == 3, 'Wrong number of files removed'
+    assert sorted(p.name for p in path.iterdir()) == ['0.png', '4.png'], 'Recently used files were removed'
+    assert evict_art_cache(path / 'missing', limit=1) == 0, 'Missing cache was evicted'
+    return '3 removed'
+
+
+def test_preconditioner(path: Path) -> str:
+    """Pre-condition queued art while earlier cards render, timing how long each card waits for its art."""
+    cache_dir = path / 'cache'
+    cache_dir.mkdir()
+    arts = [save_art(path / f'{i}.jpg', (4000 + i, 3000), quality=95) for i in range(PRECONDITION_CARDS)]
+
+    # Time pre-conditioning on the render thread, then use it as a stand-in render time
+    start = perf_counter()
+    precondition_art(save_art(path / 'timed.jpg', (4000, 3000), quality=95), CANVAS, cache_dir)
+    render = perf_counter() - start
+
+    preconditioner, waited = ArtPreconditioner(cache_dir), 0
+    try:
+        for art in arts:
+            preconditioner.submit(art, CANVAS)
+        for art in arts:
+            start = perf_counter()
+            resolved = preconditioner.resolve(art)
+            waited += perf_counter() - start
+            assert resolved.parent == cache_dir, f'Card rendered from {resolved}'
+            sleep(render)
+        assert preconditioner.resolve(path / 'unqueued.jpg') == path / 'unqueued.jpg', 'Unqueued art was changed'
+
+        # Art which fails to pre-condition is rendered from the original
+        failed = ArtPreconditioner(path / 'missing')
+        failed.submit(arts[0], CANVAS)
+        assert failed.resolve([arts[0]]) == [arts[0]], 'Failed art was not rendered from the original'
+        failed.shutdown()
+    finally:
+        preconditioner.shutdown()
+    inline = render * PRECONDITION_CARDS
+    assert waited < inline, f'Waited {waited:.2f}s for art, {inline:.2f}s inline'
+    return f'{waited * 1000:.0f}ms waiting for {PRECONDITION_CARDS} cards, {inline * 1000:.0f}ms inline'
+
+
+def test_all_art_images() -> bool:
+    """Run every art image test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_probe_image,
+        test_probe_cache,
+        test_placed_box,
+        test_frame_transform,
+        test_precondition_art,
+        test_precondition_formats,
+        test_evict_cache,
+        test_preconditioner], temp_dir=True)
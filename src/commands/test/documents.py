@@ -0,0 +1,285 @@
+"""
+* Tests: Documents
+* Layer index lookups and template document sessions tested against a stand-in for the Photoshop
+* document object model.
+"""
+# Standard Library Imports
+from itertools import count
+from pathlib import Path
+from typing import Any, Optional
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.adobe import DocumentSessionManager, LayerIndex
+
+"""
+* Stand-in Document Object Model
+"""
+
+# Layer IDs assigned in creation order, like Photoshop does
+LAYER_IDS = count(1)
+
+
+class StandInLayers:
+    """Named collection of a group's art layers or layer groups, counting every lookup made through it."""
+
+    def __init__(self, parent: 'StandInLayer', group: bool):
+        self.parent, self.group = parent, group
+
+    def __getitem__(self, name: str) -> 'StandInLayer':
+        """Find the topmost layer with this name, like Photoshop's DOM does."""
+        self.parent.document.walks += 1
+        for layer in self.parent.layers:
+            if layer.name == name and layer.is_group == self.group:
+                return layer
+        raise KeyError(name)
+
+
+class StandInLayer:
+    """Art layer or layer group in a stand-in document."""
+
+    def __init__(self, name: str, parent: Optional['StandInLayer'] = None, is_group: bool = False):
+        self.name, self.parent, self.is_group = name, parent, is_group
+        self.id = next(LAYER_IDS)
+        self.layers: list[StandInLayer] = []
+        self.document = parent.document if parent else self
+
+    @property
+    def artLayers(self) -> StandInLayers:
+        return StandInLayers(self, group=False)
+
+    @property
+    def layerSets(self) -> StandInLayers:
+        return StandInLayers(self, group=True)
+
+    def add(self, name: str, is_group: bool = False) -> 'StandInLayer':
+        """Add a layer to the bottom of this group."""
+        self.layers.append(layer := StandInLayer(name, self, is_group))
+        return layer
+
+    def duplicate(self) -> 'StandInLayer':
+        """Duplicate this layer above itself, keeping its name like Photoshop's DOM does."""
+        copy = StandInLayer(self.name, self.parent, self.is_group)
+        self.parent.layers.insert(self.parent.layers.index(self), copy)
+        return copy
+
+    def describe(self) -> dict:
+        """Describe this layer in Generator JSON format."""
+        desc = {'id': self.id, 'name': self.name, 'visible': True, 'bounds': {}}
+        if self.is_group:
+            desc.update(type='layerSection', layers=[n.describe() for n in self.layers])
+        else:
+            desc.update(type='layer')
+        return desc
+
+
+class StandInDocument(StandInLayer):
+    """Stand-in document, counting the layer walks made through the DOM and recording edits made by a render."""
+
+    def __init__(self, name: str = 'Document'):
+        self.walks = 0
+        self.describable = True
+        self.closed = False
+        self.edits: list[str] = []
+        self.snapshot: Optional[list[str]] = None
+        super().__init__(name)
+
+    @property
+    def name(self) -> str:
+        """str: Document name, like Photoshop's DOM it can't be read once the document is closed."""
+        if self.closed:
+            raise OSError('Document is closed')
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
+
+    def close(self, *_args) -> None:
+        self.closed = True
+
+
+class StandInApp:
+    """Stand-in Photoshop application, loading stand-in documents."""
+
+    def __init__(self, docref: Optional[StandInDocument] = None):
+        self.activeDocument = docref
+        self.document_epoch = 0
+
+    def load(self, path: str) -> None:
+        self.activeDocument = StandInDocument(Path(path).name)
+
+    def purge(self, *_args) -> None:
+        pass
+
+
+class StandInIndex(LayerIndex):
+    """Layer index which reads its layer tree from a stand-in document rather than a Photoshop action."""
+
+    def query(self) -> dict:
+        if not self.docref.describable:
+            raise OSError('Document description unavailable')
+        return {'layers': [n.describe() for n in self.docref.layers]}
+
+
+class StandInSession(DocumentSessionManager):
+    """Document session which takes and selects snapshots of stand-in documents rather than running Photoshop actions."""
+
+    def __init__(self):
+        super().__init__(app=StandInApp())
+
+    def make_snapshot(self, docref: Any) -> None:
+        docref.snapshot = list(docref.edits)
+
+    def select_snapshot(self, docref: Any) -> bool:
+        if docref.snapshot is None:
+            return False
+        docref.edits = list(docref.snapshot)
+        return True
+
+
+def get_stand_in_document() -> StandInDocument:
+    """StandInDocument: Document with a nested group, a unique layer, and two layers sharing a name."""
+    doc = StandInDocument()
+    text = doc.add('Text and Icons', is_group=True)
+    text.add('Rules Text')
+    text.add('Mana Cost')
+    legal = text.add('Legal', is_group=True)
+    legal.add('Artist')
+    doc.add('Shadow')
+    doc.add('Shadow')
+    doc.add('Background')
+    return doc
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_index_lookup() -> str:
+    """Find nested layers and groups through the index, reusing resolved objects."""
+    doc = get_stand_in_document()
+    index = StandInIndex(StandInApp(doc), doc)
+    artist = index.lookup('Artist', ['Text and Icons', 'Legal'])
+    assert artist is doc.layers[0].layers[2].layers[0], 'Nested layer not found'
+    assert index.lookup('Legal', 'Text and Icons', LayerIndex.KIND_GROUP) is doc.layers[0].layers[2], \
+        'Nested group not found'
+    assert index.lookup('Legal', 'Text and Icons', LayerIndex.KIND_LAYER) is None, 'Group found as a layer'
+    walks = doc.walks
+    assert index.lookup('Artist', ['Text and Icons', 'Legal']) is artist, 'Cached layer changed'
+    assert doc.walks == walks, 'Cached layer was resolved again'
+    return f"{index.stats['hits']} hits, {doc.walks} walks"
+
+
+def test_index_ambiguous() -> str:
+    """Leave lookups of layers sharing a name to the fallback walk."""
+    doc = get_stand_in_document()
+    index = StandInIndex(StandInApp(doc), doc)
+    assert index.lookup('Shadow') is None, 'Ambiguous layer was returned'
+    assert index.lookup('Missing') is None, 'Missing layer was returned'
+    assert index.lookup('Background') is doc.layers[-1], 'Unique layer not found'
+    return f"{index.stats['misses']} misses"
+
+
+def test_index_duplicate() -> str:
+    """Stop returning a duplicated layer once the index is invalidated, its name is no longer unique."""
+    doc = get_stand_in_document()
+    index = StandInIndex(StandInApp(doc), doc)
+    rules = index.lookup('Rules Text', 'Text and Icons')
+    rules.duplicate()
+    index.invalidate()
+    assert index.lookup('Rules Text', 'Text and Icons') is None, 'Stale layer returned after a duplicate'
+    return f"{index.stats['builds']} builds"
+
+
+def test_index_rename() -> str:
+    """Find a renamed layer by its new name once the index is invalidated."""
+    doc = get_stand_in_document()
+    index = StandInIndex(StandInApp(doc), doc)
+    cost = index.lookup('Mana Cost', 'Text and Icons')
+    cost.name = 'Expansion Symbol'
+    index.invalidate()
+    assert index.lookup('Mana Cost', 'Text and Icons') is None, 'Stale layer returned after a rename'
+    assert index.lookup('Expansion Symbol', 'Text and Icons') is cost, 'Renamed layer not found'
+    return f"{index.stats['builds']} builds"
+
+
+def test_index_unavailable() -> str:
+    """Disable the index when the document can't be described, every lookup falls back."""
+    doc = get_stand_in_document()
+    doc.describable = False
+    index = StandInIndex(StandInApp(doc), doc)
+    assert index.lookup('Background') is None, 'Unavailable index returned a layer'
+    assert not index.available, 'Index was not disabled'
+    return 'disabled'
+
+
+def test_session_restore() -> str:
+    """Restore a template document between renders, reusing it rather than loading it again."""
+    session = StandInSession()
+    doc = session.open('normal.psd')
+    doc.edits.append('Rendered card')
+    assert session.restore('normal.psd'), 'Document was not restored'
+    assert not doc.edits, 'Render edits were kept'
+    assert session.open('normal.psd') is doc, 'Document was not reused'
+    assert session.stats['loads'] == 1, 'Document was loaded again'
+    return f"{session.stats['restores']} restores, {session.stats['reuses']} reuses"
+
+
+def test_session_cancelled() -> str:
+    """Restore a template document left dirty by a cancelled render when it's reused."""
+    session = StandInSession()
+    doc = session.open('normal.psd')
+    doc.edits.append('Cancelled card')
+    assert session.open('normal.psd') is doc, 'Document was not reused'
+    assert not doc.edits, 'Cancelled render edits were kept'
+    return f"{session.stats['restores']} restores"
+
+
+def test_session_hold() -> str:
+    """Keep the rendered state of a template document held open for an art swap."""
+    session = StandInSession()
+    doc = session.open('normal.psd')
+    doc.edits.append('Rendered card')
+    session.hold('normal.psd')
+    assert session.open('normal.psd') is doc, 'Document was not reused'
+    assert doc.edits == ['Rendered card'], 'Held document was restored'
+    assert session.restore('normal.psd') and not doc.edits, 'Document was not restored after the swap'
+    return f"{session.stats['restores']} restores"
+
+
+def test_session_reload() -> str:
+    """Reload a template document whose snapshot can't be selected, rather than rendering over it."""
+    session = StandInSession()
+    doc = session.open('normal.psd')
+    doc.edits.append('Rendered card')
+    doc.snapshot = None
+    assert session.restore('normal.psd'), 'Document was not reloaded'
+    assert doc.closed, 'Dirty document was kept open'
+    reloaded = session.open('normal.psd')
+    assert reloaded is not doc and not reloaded.edits, 'Document was not reloaded clean'
+
+    # A dirty document whose snapshot is lost is reloaded when reused
+    reloaded.edits.append('Cancelled card')
+    reloaded.snapshot = None
+    assert session.open('normal.psd') is not reloaded, 'Dirty document was reused'
+    return f"{session.stats['reloads']} reloads, {session.stats['loads']} loads"
+
+
+def test_all_documents() -> bool:
+    """Run every document test against stand-in documents.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_index_lookup,
+        test_index_ambiguous,
+        test_index_duplicate,
+        test_index_rename,
+        test_index_unavailable,
+        test_session_restore,
+        test_session_cancelled,
+        test_session_hold,
+        test_session_reload])
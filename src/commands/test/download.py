@@ -0,0 +1,202 @@
+"""
+* Tests: Downloads
+* Resumable, multi-connection, and queued downloads tested against a local stand-in for the file hosts.
+"""
+# Standard Library Imports
+import hashlib
+import os
+import re
+import sys
+import zipfile
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Optional
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.download import DownloadQueue, download_resumable
+
+"""
+* Local File Host
+"""
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serves in-memory files with byte range support, optionally dropping connections part way
+    through a response to simulate an unreliable host."""
+    server: 'LocalFileHost'
+
+    def do_GET(self) -> None:
+        data = self.server.files.get(self.path.lstrip('/').split('?')[0])
+        if data is None:
+            return self.send_error(404)
+
+        # Serve the requested range if supported
+        start, end = 0, len(data) - 1
+        m = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if m and self.server.ranges:
+            start, end = int(m.group(1)), min(int(m.group(2) or end), end)
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(data)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes' if self.server.ranges else 'none')
+        self.end_headers()
+
+        # Send the body, dropping the connection early if requested
+        body = data[start:end + 1]
+        if self.server.drop_after and len(body) > self.server.drop_after:
+            body = body[:self.server.drop_after]
+            self.close_connection = True
+        with self.server.lock:
+            self.server.requests += 1
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Silence request logging."""
+        pass
+
+
+class LocalFileHost(ThreadingHTTPServer):
+    """Local HTTP server standing in for Google Drive and Amazon S3, serving files from memory."""
+    daemon_threads = True
+
+    def __init__(self, files: dict[str, bytes], ranges: bool = True, drop_after: Optional[int] = None):
+        """
+        Args:
+            files: File contents keyed by URL path.
+            ranges: Whether byte range requests are served.
+            drop_after: Bytes sent before each response's connection is dropped, never dropped if not provided.
+        """
+        super().__init__(('127.0.0.1', 0), RangeRequestHandler)
+        self.files, self.ranges, self.drop_after = files, ranges, drop_after
+        self.requests = 0
+        self.lock = Lock()
+        Thread(target=self.serve_forever, daemon=True).start()
+
+    def url(self, name: str) -> str:
+        """str: URL a served file can be downloaded from."""
+        return f'http://127.0.0.1:{self.server_address[1]}/{name}'
+
+    def handle_error(self, request, client_address) -> None:
+        """Ignore clients closing their connection early, downloads are cancelled on purpose."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        super().__exit__(*args)
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_download_resume(path: Path) -> str:
+    """Download a file from a host that drops every connection, resuming each time."""
+    data = os.urandom(3 * 1024 * 1024)
+    with LocalFileHost({'a.bin': data}, drop_after=1024 * 1024) as host:
+        out = download_resumable(host.url('a.bin'), path / 'a.bin', checksum=hashlib.md5(data).hexdigest())
+        assert out.read_bytes() == data, 'Downloaded file does not match'
+        return f'{host.requests} requests'
+
+
+def test_download_connections(path: Path) -> str:
+    """Download a file over several connections at once."""
+    data = os.urandom(64 * 1024 * 1024)
+    with LocalFileHost({'b.bin': data}) as host:
+        s = perf_counter()
+        out = download_resumable(host.url('b.bin'), path / 'b.bin', connections=4)
+        assert out.read_bytes() == data, 'Downloaded file does not match'
+        return f'{host.requests - 1} connections, {perf_counter() - s:.2f}s'
+
+
+def test_download_cancelled(path: Path) -> str:
+    """Cancel a download part way through, then resume it from its saved progress."""
+    data = os.urandom(32 * 1024 * 1024)
+    event = Event()
+
+    def cancel(done: int, _total: int) -> None:
+        if done >= 10 * 1024 * 1024:
+            event.set()
+
+    with LocalFileHost({'c.bin': data}) as host:
+        try:
+            download_resumable(host.url('c.bin'), path / 'c.bin', callback=cancel, event=event)
+            raise AssertionError('Download was not cancelled')
+        except InterruptedError:
+            pass
+        assert (path / 'c.bin.part.json').is_file(), 'Progress was not saved'
+        resumed = []
+        out = download_resumable(host.url('c.bin'), path / 'c.bin', callback=lambda d, _: resumed.append(d))
+        assert out.read_bytes() == data, 'Downloaded file does not match'
+        assert resumed[0] > 8 * 1024 * 1024, 'Download started over'
+        return f'resumed at {resumed[0] // (1024 * 1024)} MB'
+
+
+def test_download_checksum(path: Path) -> str:
+    """Discard a download which doesn't match its expected checksum."""
+    with LocalFileHost({'d.bin': os.urandom(1024 * 1024)}) as host:
+        try:
+            download_resumable(host.url('d.bin'), path / 'd.bin', checksum='0' * 32)
+            raise AssertionError('Mismatched download was accepted')
+        except OSError:
+            pass
+        assert not (path / 'd.bin').exists() and not (path / 'd.bin.part').exists(), 'Mismatched file was kept'
+        return 'rejected'
+
+
+def test_download_no_ranges(path: Path) -> str:
+    """Download a file from a host which doesn't serve byte ranges."""
+    data = os.urandom(4 * 1024 * 1024)
+    with LocalFileHost({'e.bin': data}, ranges=False) as host:
+        out = download_resumable(host.url('e.bin'), path / 'e.bin', connections=4)
+        assert out.read_bytes() == data, 'Downloaded file does not match'
+        return f'{host.requests - 1} connections'
+
+
+def test_download_queue(path: Path) -> str:
+    """Download and unpack several archives at once under a shared bandwidth cap."""
+    files, rate = {}, 4 * 1024 * 1024
+    for i in range(3):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as z:
+            z.writestr(f'template_{i}.psd', os.urandom(3 * 1024 * 1024))
+        files[f'template_{i}.zip'] = buffer.getvalue()
+
+    with LocalFileHost(files) as host:
+        queue = DownloadQueue(workers=3, bandwidth=rate, connections=2)
+        s = perf_counter()
+        futures = [
+            queue.submit(partial(download_resumable, host.url(name), path / name))
+            for name in files]
+        assert all(f.result() for f in futures), 'A download failed'
+        elapsed = perf_counter() - s
+        queue.shutdown()
+    assert all((path / f'template_{i}.psd').is_file() for i in range(3)), 'An archive was not unpacked'
+
+    # Allow for the one second burst the limiter banks
+    expected = sum(len(d) for d in files.values()) / rate - 1
+    assert elapsed >= expected * 0.8, f'Bandwidth cap exceeded: {elapsed:.2f}s'
+    return f'{elapsed:.2f}s at {rate // (1024 * 1024)} MB/s'
+
+
+def test_all_downloads() -> bool:
+    """Run every download test against a local file host.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_download_resume,
+        test_download_connections,
+        test_download_cancelled,
+        test_download_checksum,
+        test_download_no_ranges,
+        test_download_queue], temp_dir=True)
@@ -0,0 +1,133 @@
+"""
+* Tests: Edge Fill
+* Times the offline edge fill against Photoshop's content aware fill on the same art, requires Photoshop.
+"""
+# Standard Library Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
+
+# Third Party Imports
+import numpy as np
+from photoshop.api import SaveOptions
+from PIL import Image
+
+# Local Imports
+from src import APP, CONSOLE
+import src.helpers as psd
+from src.utils.fill import fill_art_edges
+from src.utils.profiling import RenderProfiler
+
+"""
+* Test Settings
+"""
+
+# Canvas size and resolution of the test document, matching the card templates
+FILL_CANVAS = (3264, 4440)
+FILL_RESOLUTION = 800
+
+# Art window the art is framed to, leaving the bottom of the canvas to be filled
+FILL_REFERENCE = (0, 0, 3264, 2600)
+
+"""
+* Test Utils
+"""
+
+
+def get_test_art(path: Path) -> Path:
+    """Path: Save a 1600x1000 art image with color gradients and seeded noise, for timing without real art."""
+    ys, xs = np.mgrid[0:1000, 0:1600].astype(np.float32)
+    noise = np.random.default_rng(0).normal(0, 12, (1000, 1600, 3))
+    art = np.stack([xs / 1599 * 255, ys / 999 * 255, np.full_like(xs, 96)], axis=2) + noise
+    path = path / 'art.png'
+    Image.fromarray(np.clip(np.rint(art), 0, 255).astype(np.uint8), mode='RGB').save(path)
+    return path
+
+
+def fill_in_photoshop(art: Path, profiler: RenderProfiler) -> None:
+    """Import art framed to the art window of a new document, then fill the canvas with content aware fill.
+
+    Args:
+        art: Path to the art image.
+        profiler: Profiler recording the import and fill as tasks of the current step.
+    """
+    docref = APP.documents.add(*FILL_CANVAS, FILL_RESOLUTION, 'Edge Fill Test')
+    try:
+        with profiler.task('import'):
+            layer = psd.import_art_framed(
+                layer=docref.artLayers.add(),
+                path=art,
+                ref=psd.get_dimensions_from_bounds(FILL_REFERENCE),
+                docref=docref)
+        with profiler.task('fill_edges'):
+            psd.content_aware_fill_edges(layer=layer)
+    finally:
+        docref.close(SaveOptions.DoNotSaveChanges)
+
+
+def fill_offline(art: Path, method: str, cache_dir: Path, profiler: RenderProfiler) -> None:
+    """Extend art to cover the canvas of a new document, then import it framed to the extended bounds.
+
+    Args:
+        art: Path to the art image.
+        method: Offline fill method, a key of `FILL_METHODS`.
+        cache_dir: Empty directory the extended art is written to.
+        profiler: Profiler recording the fill and import as tasks of the current step.
+    """
+    docref = APP.documents.add(*FILL_CANVAS, FILL_RESOLUTION, 'Edge Fill Test')
+    try:
+        with profiler.task('fill_edges'):
+            path, box = fill_art_edges(
+                path=art,
+                ref=FILL_REFERENCE,
+                canvas=FILL_CANVAS,
+                method=method,
+                cache_dir=cache_dir)
+        with profiler.task('import'):
+            psd.import_art_framed(
+                layer=docref.artLayers.add(),
+                path=path,
+                ref=psd.get_dimensions_from_bounds(box),
+                docref=docref)
+    finally:
+        docref.close(SaveOptions.DoNotSaveChanges)
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_edge_fill_timing(art: Optional[Path] = None, method: str = 'diffuse') -> Optional[float]:
+    """Time the offline edge fill and Photoshop's content aware fill on the same art, including the art
+    import of each, and log how many times faster the offline fill is.
+
+    Args:
+        art: Path to the art image, a generated image is used if not provided.
+        method: Offline fill method, a key of `FILL_METHODS`.
+
+    Returns:
+        Photoshop's time divided by the offline time, or None if either fill failed.
+    """
+    profiler = RenderProfiler(enabled=True)
+    with TemporaryDirectory() as temp:
+        art = art or get_test_art(Path(temp))
+        profiler.start_card(card=art.name, template='EdgeFillTest')
+        try:
+            with profiler.step('photoshop'):
+                fill_in_photoshop(art, profiler)
+            with profiler.step(method):
+                fill_offline(art, method, Path(temp), profiler)
+        except Exception as e:
+            profiler.end_card(success=False)
+            CONSOLE.error(f'FAILED: test_edge_fill_timing ({e})')
+            return
+        card = profiler.end_card(success=True)
+
+    # Log each step, then the ratio
+    for name, step in card['steps'].items():
+        tasks = ', '.join(f'{k} {v:.2f}s' for k, v in step['tasks'].items())
+        CONSOLE.info(f'{name}: {step["time"]:.2f}s ({tasks})')
+    ratio = card['steps']['photoshop']['time'] / max(card['steps'][method]['time'], 1e-6)
+    CONSOLE.info(f'PASSED: test_edge_fill_timing ({method} fill is {ratio:.1f}x faster than content aware fill)')
+    return ratio
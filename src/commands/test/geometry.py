@@ -0,0 +1,150 @@
+"""
+* Tests: Layout Geometry
+* Offline layout solvers tested with synthetic measurements against the measure-and-move steps they replace.
+"""
+# Standard Library Imports
+from typing import Optional, Union
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.geometry import (
+    Bounds,
+    get_center_y,
+    get_height,
+    solve_between,
+    solve_divider,
+    solve_positions,
+    solve_spread,
+    solve_stack,
+    verify_positions)
+
+"""
+* Synthetic Layers
+"""
+
+
+class SyntheticLayer:
+    """Layer with measured bounds, moved by whole pixels like Photoshop moves layers."""
+
+    def __init__(self, top: int, height: int):
+        self.bounds: Bounds = (0, top, 100, top + height)
+
+    def translate(self, _dx: int, dy: Union[int, float]) -> None:
+        self.bounds = (self.bounds[0], self.bounds[1] + round(dy), self.bounds[2], self.bounds[3] + round(dy))
+
+
+def get_layers(heights: list[int], top: int = 0) -> list[SyntheticLayer]:
+    """list[SyntheticLayer]: Layers of the given heights, placed on top of one another."""
+    return [SyntheticLayer(top + i * 7, h) for i, h in enumerate(heights)]
+
+
+def space_layers_apart(layers: list[SyntheticLayer], gap: Union[int, float]) -> None:
+    """Stack layers by measuring each one after the layer above it moves, as `space_layers_apart` does."""
+    for i in range(len(layers) - 1):
+        layers[i + 1].translate(0, (layers[i].bounds[3] + gap) - layers[i + 1].bounds[1])
+
+
+def spread_layers_over_reference(
+    layers: list[SyntheticLayer],
+    ref: Bounds,
+    gap: Optional[Union[int, float]] = None,
+    inside_gap: Optional[Union[int, float]] = None
+) -> None:
+    """Spread layers by measuring each one after moving the first, as `spread_layers_over_reference` does."""
+    total_space = get_height(ref) - sum(get_height(n.bounds) for n in layers)
+    outside_gap = gap or total_space / (len(layers) + 1)
+    layers[0].translate(0, (ref[1] + outside_gap) - layers[0].bounds[1])
+    if gap and not inside_gap:
+        inside_gap = (total_space - (2 * gap)) / (len(layers) - 1)
+    elif not gap:
+        inside_gap = outside_gap
+    space_layers_apart(layers, inside_gap)
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_solve_stack() -> str:
+    """Stack layers with a fractional gap, matching layers moved and measured one at a time."""
+    heights, gap = [41, 87, 12, 63, 30], 17.4
+    expected = get_layers(heights)
+    space_layers_apart(expected, gap)
+    layers = get_layers(heights)
+    deltas = solve_stack([n.bounds for n in layers], gap)
+    for layer, delta in zip(layers, deltas):
+        layer.translate(0, delta)
+    assert [n.bounds for n in layers] == [n.bounds for n in expected], 'Stacked positions differ'
+    assert solve_positions([n.bounds for n in get_layers(heights)], deltas) == [n.bounds for n in layers], \
+        'Solved positions drifted from moved layers'
+    return f'{len(heights)} layers'
+
+
+def test_solve_spread() -> str:
+    """Spread layers across a reference with uniform, fixed, and fixed inside gaps."""
+    ref: Bounds = (0, 400, 100, 1500)
+    heights = [133, 71, 205, 96]
+    for gap, inside_gap in [(None, None), (64, None), (55.3, 81.9)]:
+        expected = get_layers(heights)
+        spread_layers_over_reference(expected, ref, gap, inside_gap)
+        layers = get_layers(heights)
+        deltas = solve_spread([n.bounds for n in layers], ref, gap, inside_gap)
+        for layer, delta in zip(layers, deltas):
+            layer.translate(0, delta)
+        assert [n.bounds for n in layers] == [n.bounds for n in expected], f'Spread positions differ, gap={gap}'
+        assert layers[0].bounds[1] >= ref[1] and layers[-1].bounds[3] <= ref[3], f'Spread overflows, gap={gap}'
+    return '3 gap modes'
+
+
+def test_solve_between() -> str:
+    """Center a layer between the layers above and below it."""
+    bounds, above, below = (0, 10, 100, 31), (0, 100, 100, 180), (0, 260, 100, 300)
+    moved = solve_positions([bounds], [solve_between(bounds, above, below)])[0]
+    assert get_center_y(moved) == get_center_y((0, above[3], 0, below[1])), 'Layer not centered'
+    return f'center {get_center_y(moved)}'
+
+
+def test_solve_divider() -> str:
+    """Center a divider line between two layers without rounding."""
+    bounds, above, below = (0, 10, 100, 21), (0, 100, 100, 181), (0, 260, 100, 300)
+    moved = solve_positions([bounds], [solve_divider(bounds, above, below)])[0]
+    assert (moved[1] + moved[3]) / 2 == (above[3] + below[1]) / 2, 'Divider not centered'
+    return f'center {(moved[1] + moved[3]) / 2}'
+
+
+def test_verify_positions() -> str:
+    """Measure only the last layer when it's where it was solved to be, otherwise every layer."""
+    layers = get_layers([50, 60, 70])
+    deltas = solve_stack([n.bounds for n in layers], 20)
+    solved = solve_positions([n.bounds for n in layers], deltas)
+    for layer, delta in zip(layers, deltas):
+        layer.translate(0, delta)
+
+    measured: list[int] = []
+
+    def measure(i: int) -> Bounds:
+        measured.append(i)
+        return layers[i].bounds
+
+    assert verify_positions(solved, measure) == solved and measured == [2], 'Solved positions were measured again'
+    layers[1].translate(0, 5)
+    layers[2].translate(0, 5)
+    measured.clear()
+    result = verify_positions(solved, measure)
+    assert result == [n.bounds for n in layers] and len(measured) == 3, 'Drifted positions were not measured again'
+    return 'drift detected'
+
+
+def test_all_geometry() -> bool:
+    """Run every layout geometry test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_solve_stack,
+        test_solve_spread,
+        test_solve_between,
+        test_solve_divider,
+        test_verify_positions])
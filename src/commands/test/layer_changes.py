@@ -0,0 +1,175 @@
+"""
+* Tests: Layer Changes
+* Layer change sets tested against stand-in layers, recording each action they would send to Photoshop.
+"""
+# Standard Library Imports
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from unittest.mock import patch
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.helpers import changes
+from src.helpers.changes import LayerChangeSet
+from src.utils.adobe import PS_EXCEPTIONS
+
+"""
+* Stand-in Layers
+"""
+
+
+class StandInLayer:
+    """Layer recording each visibility change made to it directly, one Photoshop round-trip each."""
+
+    def __init__(self, name: str, actions: list[tuple]):
+        self.name, self.actions = name, actions
+        self._visible = False
+        self.mask, self.vector_mask = False, False
+
+    @property
+    def visible(self) -> bool:
+        return self._visible
+
+    @visible.setter
+    def visible(self, value: bool) -> None:
+        self.actions.append(('visible' if value else 'hidden', self.name))
+        self._visible = value
+
+
+@contextmanager
+def record_actions(fail_batches: bool = False) -> Iterator[list[tuple]]:
+    """Record the actions a change set sends, in place of the Photoshop helpers it calls.
+
+    Args:
+        fail_batches: Reject every batched action, as Photoshop would reject an invalid layer reference.
+
+    Yields:
+        List of recorded actions, each a tuple of the action name and the names of the layers it changed.
+    """
+    actions: list[tuple] = []
+
+    def batched(name: str, attr: str, value: bool):
+        def action(layers: list[StandInLayer], *args, **kwargs) -> None:
+            if fail_batches:
+                raise PS_EXCEPTIONS[0]('Batched action rejected')
+            actions.append((name, *[x.name for x in layers]))
+            for layer in layers:
+                setattr(layer, '_visible' if attr == 'visible' else attr, value)
+        return action
+
+    def single(name: str, attr: str):
+        def action(layer: StandInLayer, *args) -> None:
+            actions.append((name, *[x.name for x in (layer, *args)]))
+            setattr(layer if not args else args[0], attr, True)
+        return action
+
+    def set_visible_layers(layers: list[StandInLayer], visible: bool = True) -> None:
+        batched('show' if visible else 'hide', 'visible', visible)(layers)
+
+    def set_layer_masks(layers: list[StandInLayer], vector: bool = False, enabled: bool = True) -> None:
+        batched('vector_masks' if vector else 'masks', 'vector_mask' if vector else 'mask', enabled)(layers)
+
+    with patch.object(changes, 'set_visible_layers', set_visible_layers), \
+            patch.object(changes, 'set_layer_masks', set_layer_masks), \
+            patch.object(changes, 'enable_mask', single('mask', 'mask')), \
+            patch.object(changes, 'enable_vector_mask', single('vector_mask', 'vector_mask')), \
+            patch.object(changes, 'copy_layer_mask', single('copy_mask', 'mask')), \
+            patch.object(changes, 'copy_vector_mask', single('copy_vector_mask', 'vector_mask')):
+        yield actions
+
+
+def get_layers(actions: list[tuple], count: int) -> list[StandInLayer]:
+    """list[StandInLayer]: Hidden layers named 'a', 'b', 'c', and so on, recording changes to a shared list."""
+    return [StandInLayer(chr(ord('a') + i), actions) for i in range(count)]
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_changes_batched() -> str:
+    """Commit consecutive changes of the same kind in one action, a lone change with a single layer call."""
+    with record_actions() as actions:
+        a, b, c, d, e, f, g = get_layers(actions, 7)
+        with LayerChangeSet() as change_set:
+            change_set.show(a, b, None).hide(c).show(d)
+            change_set.enable_mask(e, f).enable_vector_mask(g)
+        assert actions == [
+            ('show', 'a', 'b'),
+            ('hidden', 'c'),
+            ('visible', 'd'),
+            ('masks', 'e', 'f'),
+            ('vector_mask', 'g')], f'Committed {actions}'
+        assert a.visible and b.visible and d.visible and e.mask and f.mask and g.vector_mask, 'Changes were lost'
+        assert not change_set.changes, 'Change set was not cleared'
+    return f'{len(actions)} actions'
+
+
+def test_changes_ordering() -> str:
+    """Commit mask copies and queued functions in turn, so they see every change queued before them."""
+    seen: list[tuple[str, bool]] = []
+    with record_actions() as actions:
+        a, b, c, d, e = get_layers(actions, 5)
+        with LayerChangeSet() as change_set:
+            change_set.show(a, b).copy_mask(a, c).show(d)
+            change_set.then(lambda x: seen.append((x.name, a.visible and c.mask and d.visible)), e)
+            change_set.copy_mask(b, e, vector=True).show(e)
+        assert actions == [
+            ('show', 'a', 'b'),
+            ('copy_mask', 'a', 'c'),
+            ('visible', 'd'),
+            ('copy_vector_mask', 'b', 'e'),
+            ('visible', 'e')], f'Committed {actions}'
+        assert seen == [('e', True)], 'Queued function ran before the changes queued ahead of it'
+    return f'{len(actions)} actions'
+
+
+def test_changes_fallback() -> str:
+    """Apply changes one layer at a time when a batched action is rejected."""
+    with record_actions(fail_batches=True) as actions:
+        a, b, c = get_layers(actions, 3)
+        with LayerChangeSet() as change_set:
+            change_set.show(a, b, c)
+        assert actions == [('visible', 'a'), ('visible', 'b'), ('visible', 'c')], f'Committed {actions}'
+    return 'one layer at a time'
+
+
+def test_changes_error() -> str:
+    """Commit nothing when the block queuing changes raises, keeping the queued changes."""
+    with record_actions() as actions:
+        a, = get_layers(actions, 1)
+        change_set: Optional[LayerChangeSet] = None
+        try:
+            with LayerChangeSet() as change_set:
+                change_set.show(a)
+                raise ValueError('Render failed')
+        except ValueError:
+            pass
+        assert not actions and not a.visible, 'Changes were committed after an error'
+        assert change_set.changes, 'Queued changes were discarded'
+    return 'nothing committed'
+
+
+def test_changes_round_trips() -> str:
+    """Count the actions a typical frame setup sends, compared with changing one layer at a time."""
+    with record_actions() as actions:
+        layers = get_layers(actions, 24)
+        with LayerChangeSet() as change_set:
+            change_set.show(*layers[:10]).hide(*layers[10:14]).enable_mask(*layers[14:20]).show(*layers[20:])
+        assert len(actions) == 4, f'Committed {len(actions)} actions'
+    return f'{len(actions)} actions for {len(layers)} layer changes'
+
+
+def test_all_layer_changes() -> bool:
+    """Run every layer change set test against stand-in layers.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_changes_batched,
+        test_changes_ordering,
+        test_changes_fallback,
+        test_changes_error,
+        test_changes_round_trips])
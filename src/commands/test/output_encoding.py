@@ -0,0 +1,318 @@
+"""
+* Tests: Output Encoding
+* Rendered images encoded from generated lossless intermediates, in the background encoder pool and to fit a
+* file size budget, then compressed in a process pool once.
+"""
+# Standard Library Imports
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from threading import Event
+from time import perf_counter
+from unittest.mock import patch
+
+# Third Party Imports
+from PIL import Image
+from omnitils.img import downscale_image_by_width
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils import encoding
+from src.utils.encoding import (
+    CompressionManifest,
+    EncodeOptions,
+    OutputEncoder,
+    encode_image,
+    fit_image_to_budget,
+    fit_images_to_budget,
+    get_encoded_size,
+    get_file_hash,
+    search_quality)
+
+"""
+* Test Utils
+"""
+
+# Size of the generated renders, matching a card rendered at 800 DPI
+RENDER_SIZE = (2176, 2970)
+
+# How many renders are queued when timing the encoder pool
+ENCODE_CARDS = 4
+
+# Widths tried when fitting the generated renders to a budget, and the quality floor
+BUDGET_TEST_WIDTHS = (1000, 600)
+BUDGET_FLOOR = 80
+
+# Settings images are compressed with, and how many are compressed
+COMPRESS_SETTINGS = {'max_width': 1088, 'optimize': True, 'quality': 95}
+COMPRESS_IMAGES = 6
+
+
+def save_render(path: Path, size: tuple[int, int] = RENDER_SIZE) -> Path:
+    """Save a lossless render, as Photoshop does before its deliverables are encoded.
+
+    Args:
+        path: Path to save the render to.
+        size: Width and height of the render.
+
+    Returns:
+        Path to the saved render.
+    """
+    img = Image.radial_gradient('L').resize(size).convert('RGB')
+    img.save(path, dpi=(800, 800), compress_level=1)
+    return path
+
+
+def save_detailed_render(path: Path, size: tuple[int, int] = (1200, 1640)) -> Path:
+    """Save a lossless render with fine detail, whose encoded size depends strongly on quality.
+
+    Args:
+        path: Path to save the render to.
+        size: Width and height of the render.
+
+    Returns:
+        Path to the saved render.
+    """
+    bands = [Image.blend(Image.linear_gradient('L').resize(size), Image.effect_noise(size, sigma), 0.5)
+             for sigma in (10, 20, 30)]
+    Image.merge('RGB', bands).save(path, compress_level=1)
+    return path
+
+
+def scan_quality(img: Image.Image, budget: int, floor: int) -> int:
+    """Step down from the highest quality with full size encodes until the image fits, as a budget search
+    would without bisection or trial encodes.
+
+    Args:
+        img: Decoded image at its final width.
+        budget: Maximum size in bytes.
+        floor: Lowest quality allowed.
+
+    Returns:
+        Highest quality within the budget, or the floor.
+    """
+    for quality in range(100, floor, -1):
+        if get_encoded_size(img, 'jpg', quality) <= budget:
+            return quality
+    return floor
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_encode_image(path: Path) -> str:
+    """Encode every deliverable and a downscaled copy, keeping the resolution and removing the intermediate."""
+    source = save_render(path / 'render.tmp.png', (544, 744))
+    outputs = encode_image(source, path / 'Island.jpg', EncodeOptions(
+        formats=['jpg', 'webp'], quality=90, downscale=272))
+    assert [p.relative_to(path).as_posix() for p in outputs] == [
+        'Island.jpg', 'Island.webp', 'downscaled/Island.jpg'], f'Encoded {outputs}'
+    assert not source.exists(), 'Intermediate was not removed'
+    with Image.open(outputs[0]) as img:
+        assert img.size == (544, 744) and round(img.info['dpi'][0]) == 800, 'Resolution was not kept'
+    with Image.open(outputs[2]) as img:
+        assert img.width == 272, 'Copy was not downscaled'
+    return f'{len(outputs)} files'
+
+
+def test_encode_failure(path: Path) -> str:
+    """Keep the lossless render as a PNG when a deliverable fails to encode."""
+    source = save_render(path / 'a.tmp.png', (64, 88))
+    try:
+        encode_image(source, path / 'a.jpg', EncodeOptions(formats=['jpg', 'bad'], quality=90, downscale=None))
+        raise AssertionError('Encoding error was not raised')
+    except ValueError:
+        pass
+    assert not source.exists() and (path / 'a.png').is_file(), 'Lossless render was not kept'
+
+    # A PNG deliverable already keeps the render
+    source = save_render(path / 'b.tmp.png', (64, 88))
+    try:
+        encode_image(source, path / 'b.jpg', EncodeOptions(formats=['png', 'bad'], quality=90, downscale=None))
+    except ValueError:
+        pass
+    assert not source.exists() and (path / 'b.png').is_file(), 'Intermediate was left beside the PNG'
+    return 'render kept'
+
+
+def test_encoder_backlog(path: Path) -> str:
+    """Block submitting once the backlog is full, reporting each render which failed to encode."""
+    release, started = Event(), []
+
+    def _encode(source: Path, output: Path, options: EncodeOptions) -> list[Path]:
+        started.append(output.name)
+        release.wait(5)
+        if output.stem == 'bad':
+            raise OSError('Disk full')
+        return [output]
+
+    options = EncodeOptions(formats=['jpg'], quality=90, downscale=None)
+    encoder = OutputEncoder(workers=1, backlog=2)
+    with patch.object(encoding, 'encode_image', _encode):
+        encoder.submit(path, path / 'a.jpg', options)
+        encoder.submit(path, path / 'bad.jpg', options)
+        assert not encoder._slots.acquire(blocking=False), 'Backlog was not full'
+        release.set()
+        encoder.submit(path, path / 'c.jpg', options)
+        failed = encoder.join()
+    assert started == ['a.jpg', 'bad.jpg', 'c.jpg'], f'Encoded {started}'
+    assert [(p.name, str(e)) for p, e in failed] == [('bad.jpg', 'Disk full')], f'Failed {failed}'
+    assert not encoder.pending, 'Pending renders were not cleared'
+    return f'{len(started)} encoded, {len(failed)} failed'
+
+
+def test_encoder_timing(path: Path) -> str:
+    """Time how long the render thread spends handing off renders, compared with encoding them inline."""
+    options = EncodeOptions(formats=['jpg', 'webp'], quality=95, downscale=None)
+    sources = [save_render(path / f'{i}.tmp.png') for i in range(ENCODE_CARDS + 1)]
+
+    # Encode one render on the render thread
+    start = perf_counter()
+    encode_image(sources[-1], path / 'inline.jpg', options)
+    inline = perf_counter() - start
+
+    # Hand off the rest to the encoder pool
+    encoder, handoff = OutputEncoder(backlog=ENCODE_CARDS), 0
+    for i, source in enumerate(sources[:-1]):
+        start = perf_counter()
+        encoder.submit(source, path / f'{i}.jpg', options)
+        handoff += perf_counter() - start
+    assert not encoder.join(), 'Renders failed to encode'
+    assert all((path / f'{i}.webp').is_file() for i in range(ENCODE_CARDS)), 'Deliverables are missing'
+    handoff /= ENCODE_CARDS
+    assert handoff < inline / 10, f'Handing off took {handoff * 1000:.1f}ms, encoding {inline * 1000:.0f}ms'
+    return f'{handoff * 1000:.2f}ms per render handed off, {inline * 1000:.0f}ms encoding inline'
+
+
+def test_search_quality(_path: Path) -> str:
+    """Bisect the same quality as a scan down from the ceiling, measuring far fewer qualities."""
+    measured = []
+
+    def _measure(quality: int) -> float:
+        measured.append(quality)
+        return 1000 + quality ** 2
+
+    for budget in range(1000, 12000, 250):
+        measured.clear()
+        found = search_quality(_measure, budget, floor=BUDGET_FLOOR)
+        expected = next((q for q in range(100, BUDGET_FLOOR - 1, -1) if 1000 + q ** 2 <= budget), None)
+        assert found == expected, f'Found {found} for {budget}, expected {expected}'
+        assert len(measured) <= 7, f'Measured {len(measured)} qualities for {budget}'
+    assert search_quality(lambda q: q, budget=100, floor=90) == 100, 'Ceiling was not tried first'
+    return 'matches a linear scan, at most 7 measurements'
+
+
+def test_fit_budget(path: Path) -> str:
+    """Encode at the highest quality within the budget, timed against a scan of full size encodes."""
+    source = save_detailed_render(path / 'render.png')
+    with Image.open(source) as img:
+        img.load()
+        scaled = img.resize((1000, round(img.height * 1000 / img.width)), Image.Resampling.LANCZOS)
+    budget = get_encoded_size(scaled, 'jpg', 90) + 1000
+
+    start = perf_counter()
+    result = fit_image_to_budget(source, path, budget, floor=BUDGET_FLOOR, widths=BUDGET_TEST_WIDTHS)
+    fitted = perf_counter() - start
+    start = perf_counter()
+    expected = scan_quality(scaled, budget, BUDGET_FLOOR)
+    scanned = perf_counter() - start
+
+    assert result['fits'] and result['width'] == 1000, f'Fitted {result}'
+    assert result['size'] == Path(result['output']).stat().st_size <= budget, 'Reported size is wrong'
+    assert expected - 2 <= result['quality'] <= expected, f'Fitted quality {result["quality"]}, best is {expected}'
+    return f'quality {result["quality"]} in {fitted:.2f}s, a full size scan took {scanned:.2f}s'
+
+
+def test_fit_fallbacks(path: Path) -> str:
+    """Drop to a smaller width only when the floor exceeds the budget, writing the smallest width otherwise."""
+    source = save_detailed_render(path / 'render.png')
+    with Image.open(source) as img:
+        img.load()
+        small = img.resize((600, round(img.height * 600 / img.width)), Image.Resampling.LANCZOS)
+    budget = get_encoded_size(small, 'jpg', BUDGET_FLOOR) + 1000
+    result = fit_image_to_budget(source, path, budget, floor=BUDGET_FLOOR, widths=BUDGET_TEST_WIDTHS)
+    assert result['fits'] and result['width'] == 600, f'Fitted {result}'
+
+    result = fit_image_to_budget(source, path, 1000, floor=BUDGET_FLOOR, fmt='webp', widths=BUDGET_TEST_WIDTHS)
+    assert not result['fits'] and result['quality'] == BUDGET_FLOOR and result['width'] == 600,         f'Over budget image was written with {result}'
+    assert result['output'].endswith('.webp'), 'Format was not used'
+    return 'smaller width, then the floor'
+
+
+def test_fit_images_report(path: Path) -> str:
+    """Fit every image in a worker pool, reporting each image in order including those which failed."""
+    a, b = save_render(path / 'a.png', (400, 540)), save_render(path / 'b.png', (400, 540))
+    (broken := path / 'broken.png').write_bytes(b'not an image')
+    results = fit_images_to_budget([a, broken, b], path / 'budget', budget=200000, floor=BUDGET_FLOOR)
+    assert [Path(r['file']).name for r in results] == ['a.png', 'broken.png', 'b.png'], 'Results are out of order'
+    assert results[0]['fits'] and results[2]['fits'], 'Images did not fit'
+    assert results[1]['output'] is None and not results[1]['fits'], 'Broken image was not reported'
+    report = json.loads((path / 'budget' / 'budget.json').read_text())
+    assert report['budget'] == 200000 and report['images'] == results, 'Report is wrong'
+    return f'{len(results)} images reported'
+
+
+def test_compression_manifest(path: Path) -> str:
+    """Skip images unchanged since they were compressed with the same settings, across sessions."""
+    art, saved = save_render(path / 'art.png', (64, 88)), path / 'compressed.json'
+    manifest = CompressionManifest(saved)
+    assert not manifest.is_compressed(art, COMPRESS_SETTINGS), 'New image was skipped'
+    manifest.add(art, COMPRESS_SETTINGS)
+    manifest.add(path / 'missing.png', COMPRESS_SETTINGS)
+    manifest.save()
+    assert saved.is_file() and not manifest.dirty, 'Manifest was not saved'
+
+    # A new session skips the same image, unless its settings or contents changed
+    manifest = CompressionManifest(saved)
+    assert list(manifest.items) == [get_file_hash(art)], 'Entries are keyed wrong'
+    assert manifest.is_compressed(art, COMPRESS_SETTINGS), 'Compressed image was not skipped'
+    assert not manifest.is_compressed(art, {**COMPRESS_SETTINGS, 'quality': 90}), 'New settings were skipped'
+    save_render(art, (64, 90))
+    assert not manifest.is_compressed(art, COMPRESS_SETTINGS), 'Modified image was skipped'
+    assert not manifest.is_compressed(path / 'missing.png', COMPRESS_SETTINGS), 'Missing image was skipped'
+    return f'{len(manifest.items)} entry'
+
+
+def test_compress_pool(path: Path) -> str:
+    """Compress images in a process pool running the downscale directly, timing a later run which skips them."""
+    images = [save_render(path / f'{i}.png') for i in range(COMPRESS_IMAGES)]
+    manifest, downscale = CompressionManifest(), partial(downscale_image_by_width, **COMPRESS_SETTINGS)
+
+    # First run compresses every image
+    start = perf_counter()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for img, result in zip(images, executor.map(downscale, images)):
+            assert result == path / 'compressed' / f'{img.stem}.jpg', f'Compressed to {result}'
+            manifest.add(img, COMPRESS_SETTINGS)
+    compressed = perf_counter() - start
+    with Image.open(path / 'compressed' / '0.jpg') as img:
+        assert img.width == COMPRESS_SETTINGS['max_width'], 'Image was not downscaled'
+
+    # Later runs hash each image and skip it
+    start = perf_counter()
+    queue = [img for img in images if not manifest.is_compressed(img, COMPRESS_SETTINGS)]
+    skipped = perf_counter() - start
+    assert not queue, f'{len(queue)} unchanged images were compressed again'
+    return f'{COMPRESS_IMAGES} images compressed in {compressed:.2f}s, skipped in {skipped * 1000:.0f}ms'
+
+
+def test_all_output_encoding() -> bool:
+    """Run every output encoding test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_encode_image,
+        test_encode_failure,
+        test_encoder_backlog,
+        test_encoder_timing,
+        test_search_quality,
+        test_fit_budget,
+        test_fit_fallbacks,
+        test_fit_images_report,
+        test_compression_manifest,
+        test_compress_pool], temp_dir=True)
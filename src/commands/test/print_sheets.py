@@ -0,0 +1,191 @@
+"""
+* Tests: Print Sheets
+* Print sheet layouts, duplex face pairing, and sheets imposed from generated card images as strip-composed PNG
+* images and PDF pages.
+"""
+# Standard Library Imports
+import os
+import re
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+# Third Party Imports
+from PIL import Image, ImageChops, ImageDraw
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.sheets import (
+    CARD_RENDER,
+    SheetCard,
+    SheetSpec,
+    get_cut_marks,
+    get_sheet_cards,
+    get_sheet_pages,
+    get_sheet_slots,
+    get_sheet_spec,
+    impose_sheets,
+    load_card_image,
+    to_pixels)
+
+"""
+* Test Utils
+"""
+
+# Resolution of the generated card images, and how many are imposed when timed
+CARD_DPI = 300
+SHEET_CARDS = 18
+
+
+def save_cards(path: Path, names: list[str]) -> list[Path]:
+    """Save a rendered card image for each name, each a different color, saved one second apart.
+
+    Args:
+        path: Directory to save the card images to.
+        names: Name of each card image, without an extension.
+
+    Returns:
+        Paths to the saved card images, in the order given.
+    """
+    size = (to_pixels(CARD_RENDER[0], CARD_DPI), to_pixels(CARD_RENDER[1], CARD_DPI))
+    paths = []
+    for i, name in enumerate(names):
+        img = Image.new('RGB', size, ((i * 67) % 256, (i * 131) % 256, 200))
+        img.save(p := path / f'{name}.jpg', quality=95)
+        os.utime(p, ns=(i * 10 ** 9, i * 10 ** 9))
+        paths.append(p)
+    return paths
+
+
+def compose_sheet(faces: list[Optional[Path]], spec: SheetSpec, back: bool = False) -> Image.Image:
+    """Compose a whole sheet in memory, as a reference for the strip-composed sheet.
+
+    Args:
+        faces: Image for each slot of the sheet.
+        spec: Sheet layout.
+        back: Whether this is a back sheet.
+
+    Returns:
+        Sheet image.
+    """
+    dpi = spec['dpi']
+    sheet = Image.new('RGB', (to_pixels(spec['page'][0], dpi), to_pixels(spec['page'][1], dpi)), (255, 255, 255))
+    for face, slot in zip(faces, get_sheet_slots(spec, back)):
+        if face:
+            box = [to_pixels(v, dpi) for v in slot]
+            sheet.paste(load_card_image(face, (box[2] - box[0], box[3] - box[1]), spec['bleed']), box[:2])
+    stroke = max(1, to_pixels(1 / 300, dpi))
+    for mark in get_cut_marks(spec, back):
+        ImageDraw.Draw(sheet).line([to_pixels(v, dpi) for v in mark], fill=(0, 0, 0), width=stroke)
+    return sheet
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_sheet_layout(_path: Path) -> str:
+    """Center the card grid on the page, with cut marks at each trim line, rejecting grids which don't fit."""
+    spec = get_sheet_spec('Letter', bleed=0.0)
+    slots = get_sheet_slots(spec)
+    assert len(slots) == 9 and slots[0] == (0.5, 0.25, 3.0, 3.75), f'First slot is {slots[0]}'
+    assert abs(slots[0][0] - (8.5 - slots[-1][2])) < 1e-9, 'Grid is not centered'
+    assert len(get_cut_marks(spec)) == 16, 'Shared trim lines were marked twice'
+
+    # Bleed separates each trim line, back sheets are shifted by the offset
+    spec = get_sheet_spec('a4', rows=2, cols=2, bleed=0.125, back_offset=(0.1, -0.05))
+    assert len(get_cut_marks(spec)) == 16, 'Trim lines inside the bleed were not marked'
+    front, back = get_sheet_slots(spec)[0], get_sheet_slots(spec, back=True)[0]
+    assert abs(back[0] - front[0] - 0.1) < 1e-9 and abs(back[1] - front[1] + 0.05) < 1e-9, 'Back was not shifted'
+    assert not get_cut_marks(get_sheet_spec(marks=False)), 'Marks were drawn when disabled'
+
+    for kwargs in ({'page': 'tabloid'}, {'rows': 4}, {'bleed': 0.2}):
+        try:
+            get_sheet_spec(**kwargs)
+            raise AssertionError(f'Layout {kwargs} was accepted')
+        except ValueError:
+            pass
+    return 'letter and A4'
+
+
+def test_sheet_duplex(path: Path) -> str:
+    """Pair faces differing only by card name, mirroring back faces so they line up when flipped."""
+    front, other, back, alt, single, odd = save_cards(path, [
+        'Delver of Secrets (Normal) [MID] {51}',
+        'Island (Normal) [MID] {270}',
+        'Insectile Aberration (Normal) [MID] {51}',
+        'Island (Borderless) [MID] {270}',
+        'Plains (Normal) [MID] {268}',
+        'custom card'])
+    cards = get_sheet_cards([front, other, back, alt, single, odd], duplex=True)
+    assert cards[0] == SheetCard(front=front, back=back), 'Faces were not paired'
+    assert [c['front'] for c in cards] == [front, other, alt, single, odd], 'Cards are out of order'
+    assert all(c['back'] is None for c in cards[1:]), 'Single-faced cards were paired'
+    assert len(get_sheet_cards([front, back], duplex=False)) == 2, 'Faces were paired without duplex'
+
+    # The back of each card is mirrored across the row
+    spec = get_sheet_spec(rows=2, cols=3, duplex=True)
+    pages = get_sheet_pages(cards, spec, back=odd)
+    assert [is_back for _, is_back in pages] == [False, True], 'Back sheet is missing'
+    assert pages[1][0][:3] == [odd, odd, back] and pages[1][0][3:] == [None, odd, odd], \
+        f'Back faces are {[p.name if p else None for p in pages[1][0]]}'
+    return f'{len(cards)} cards, 1 pair'
+
+
+def test_png_sheet(path: Path) -> str:
+    """Compose PNG sheets one strip at a time, matching the sheet composed whole."""
+    cards = save_cards(path, [f'Card {i} (Normal) [TST] {{{i}}}' for i in range(7)])
+    spec = get_sheet_spec(dpi=150, bleed=0.03)
+    paths = impose_sheets(cards, path / 'png', spec, fmt='png', workers=2)
+    assert [p.name for p in paths] == ['sheet_001.png'], f'Wrote {paths}'
+    with Image.open(paths[0]) as img:
+        assert img.size == (1275, 1650) and round(img.info['dpi'][0]) == 150, 'Sheet size is wrong'
+        expected = compose_sheet(get_sheet_pages(get_sheet_cards(cards), spec)[0][0], spec)
+        assert not ImageChops.difference(img.convert('RGB'), expected).getbbox(), 'Strips differ from the sheet'
+    return f'{len(paths)} sheet'
+
+
+def test_pdf_sheets(path: Path) -> str:
+    """Write a page per sheet and back sheet, with a valid cross-reference table."""
+    cards = save_cards(path, [f'Card {i} (Normal) [TST] {{{i}}}' for i in range(11)])
+    spec = get_sheet_spec(dpi=150, duplex=True)
+    pdf = impose_sheets(cards, path / 'pdf', spec, back=cards[0], workers=1)[0]
+    data = pdf.read_bytes()
+    assert data.startswith(b'%PDF-1.4') and data.rstrip().endswith(b'%%EOF'), 'File is not a PDF'
+    assert re.search(rb'/Type /Pages /Kids \[[^]]+] /Count 4', data), 'Page count is wrong'
+    assert data.count(b'/Subtype /Image') == 22, 'Card images are missing'
+
+    # Every cross-reference entry points at its object
+    xref = int(data[data.rindex(b'startxref') + 9:].split()[0])
+    count, entries = int(data[xref:].split()[2]), data[xref:].split(b'\n')[3:]
+    for n, entry in enumerate(entries[:count - 1], start=1):
+        offset = int(entry.split()[0])
+        assert data[offset:].startswith(f'{n} 0 obj'.encode()), f'Object {n} is not at {offset}'
+    return f'{len(data) // 1024}KB'
+
+
+def test_sheet_timing(path: Path) -> str:
+    """Time imposing sheets at print resolution as PNG images and as a PDF."""
+    cards = save_cards(path, [f'Card {i} (Normal) [TST] {{{i}}}' for i in range(SHEET_CARDS)])
+    spec = get_sheet_spec(dpi=CARD_DPI)
+    timings = []
+    for fmt in ('png', 'pdf'):
+        start = perf_counter()
+        impose_sheets(cards, path / fmt, spec, fmt=fmt)
+        timings.append((perf_counter() - start) / (SHEET_CARDS // 9))
+    return f'{timings[0]:.2f}s per PNG sheet, {timings[1]:.2f}s per PDF page at {CARD_DPI} DPI'
+
+
+def test_all_print_sheets() -> bool:
+    """Run every print sheet test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_sheet_layout,
+        test_sheet_duplex,
+        test_png_sheet,
+        test_pdf_sheets,
+        test_sheet_timing], temp_dir=True)
@@ -0,0 +1,221 @@
+"""
+* Tests: Profiling
+* Render profiler records and batch summaries, session trace spans and their Chrome trace export, and the cost
+* of recording either while disabled.
+"""
+# Standard Library Imports
+import json
+from pathlib import Path
+from threading import Thread
+from time import perf_counter, sleep
+from types import SimpleNamespace
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.profiling import RenderProfiler, profile_render
+from src.utils.tracing import SpanTracer
+
+"""
+* Test Utils
+"""
+
+# Recording calls timed while the profiler is disabled
+DISABLED_CALLS = 100000
+
+
+class StandInTemplate:
+    """Template with a profiled render method, rendering a stand-in card."""
+
+    def __init__(self, profiler: RenderProfiler, success: bool = True):
+        self.app = SimpleNamespace(profiler=profiler)
+        self.layout = 'Island [TST] #001'
+        self.success = success
+
+    @profile_render
+    def execute(self) -> bool:
+        with self.app.profiler.step('load_artwork'), self.app.profiler.task('import_art'):
+            sleep(0.002)
+        return self.success
+
+    @profile_render
+    def execute_art_swap(self) -> bool:
+        with self.app.profiler.step('load_artwork'):
+            sleep(0.001)
+        return self.success
+
+
+def add_card(profiler: RenderProfiler, template: str, time: float, method: str = 'execute', success: bool = True):
+    """Record a finished card with a fixed render time, rather than timing a real render.
+
+    Args:
+        profiler: Profiler to record the card in.
+        template: Name of the template class.
+        time: Render time of the card, in seconds.
+        method: Template method rendering the card.
+        success: Whether the card rendered successfully.
+    """
+    profiler.start_card(card='Card', template=template, method=method)
+    with profiler.step('render'):
+        pass
+    profiler.end_card(success=success)
+    profiler.cards[-1]['time'] = time
+    profiler.cards[-1]['steps']['render']['time'] = time
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_profiler_card(path: Path) -> str:
+    """Record the steps, tasks, round-trips, and text fits of a card, writing it to the profile log."""
+    profiler = RenderProfiler(enabled=True, path=path / 'profile.jsonl')
+    timed = profiler.timed('executeAction')(lambda: sleep(0.001))
+    profiler.start_card(card='Island', template='NormalTemplate')
+    with profiler.step('text'):
+        with profiler.task('format_text'):
+            timed()
+            timed()
+        profiler.fit('scale_text_to_height', 6)
+    with profiler.step('text'):
+        profiler.fit('scale_text_to_height', 4)
+    card = profiler.end_card(success=True)
+
+    step = card['steps']['text']
+    assert card['success'] and card['time'] >= step['time'] >= 0.002, 'Card time is wrong'
+    assert step['calls']['executeAction']['count'] == 2, 'Round-trips were not counted'
+    assert step['tasks']['format_text'] >= 0.002, 'Task was not timed'
+    assert step['fits']['scale_text_to_height'] == {'count': 2, 'measurements': 10}, 'Text fits were not counted'
+    assert '_start' not in card, 'Start time was written'
+    records = [json.loads(line) for line in (path / 'profile.jsonl').read_text().splitlines()]
+    assert records == [card], 'Card was not written to the profile log'
+    return f"{card['time'] * 1000:.1f}ms"
+
+
+def test_profiler_summary(path: Path) -> str:
+    """Aggregate cards per template, averaging full and art swap renders separately."""
+    profiler = RenderProfiler(enabled=True, path=path / 'profile.jsonl')
+    add_card(profiler, 'NormalTemplate', 4.0)
+    add_card(profiler, 'NormalTemplate', 6.0, success=False)
+    add_card(profiler, 'NormalTemplate', 1.0, method='execute_art_swap')
+    add_card(profiler, 'BasicLandTemplate', 2.0)
+    batch = profiler.end_batch()
+
+    normal = batch['templates']['NormalTemplate']
+    assert normal['cards'] == 3 and normal['failed'] == 1, 'Cards were not counted'
+    assert normal['average'] == round(11 / 3, 4) and normal['steps']['render'] == round(11 / 3, 4), \
+        'Averages are wrong'
+    assert normal['methods'] == {
+        'execute': {'cards': 2, 'average': 5.0},
+        'execute_art_swap': {'cards': 1, 'average': 1.0}}, 'Render methods were not averaged separately'
+    assert normal['art_swap_speedup'] == 5.0, 'Art swap speedup is wrong'
+    assert 'art_swap_speedup' not in batch['templates']['BasicLandTemplate'], 'Speedup recorded without swaps'
+    assert not profiler.cards and profiler.end_batch() is None, 'Batch was not cleared'
+    assert json.loads((path / 'profile.jsonl').read_text().splitlines()[-1]) == batch, 'Batch was not written'
+    return f"{normal['art_swap_speedup']}x art swap speedup"
+
+
+def test_profiler_decorator(_path: Path) -> str:
+    """Record each call of a profiled template method as a card, including failed renders."""
+    profiler = RenderProfiler(enabled=True)
+    StandInTemplate(profiler).execute()
+    StandInTemplate(profiler).execute_art_swap()
+    StandInTemplate(profiler, success=False).execute()
+    methods = [(c['method'], c['success']) for c in profiler.cards]
+    assert methods == [('execute', True), ('execute_art_swap', True), ('execute', False)], \
+        f'Recorded {methods}'
+    assert profiler.cards[0]['template'] == 'StandInTemplate', 'Template was not named'
+    assert 'import_art' in profiler.cards[0]['steps']['load_artwork']['tasks'], 'Task was not recorded'
+    return f'{len(profiler.cards)} cards'
+
+
+def test_profiler_disabled(_path: Path) -> str:
+    """Record nothing while disabled, timing the cost of each recording call left in a render."""
+    profiler = RenderProfiler(enabled=False)
+    template = StandInTemplate(profiler)
+    assert template.execute() and not profiler.cards, 'Disabled profiler recorded a card'
+    assert profiler.end_batch() is None, 'Disabled profiler wrote a batch'
+
+    # Step, task, and round-trip contexts are no-ops while disabled
+    start = perf_counter()
+    for _ in range(DISABLED_CALLS):
+        with profiler.step('text'), profiler.task('format_text'), profiler.call('executeAction'):
+            pass
+    per_call = (perf_counter() - start) / DISABLED_CALLS * 1e6
+    assert per_call < 10, f'Disabled recording costs {per_call:.2f}us'
+    return f'{per_call:.2f}us per step, task, and round-trip while disabled'
+
+
+def test_tracer_spans(_path: Path) -> str:
+    """Record nested spans and instant events on each thread, naming every thread that recorded one."""
+    tracer = SpanTracer(enabled=True)
+    with tracer.span('render_all', 'batch', cards=2):
+        with tracer.span('render', 'render'):
+            sleep(0.002)
+        tracer.instant('cancelled', 'render')
+        worker = Thread(target=lambda: tracer.traced(cat='download')(sleep)(0.001), name='download_1')
+        worker.start()
+        worker.join()
+
+    spans = {e['name']: e for e in tracer.events}
+    outer, inner = spans['render_all'], spans['render']
+    assert outer['ph'] == inner['ph'] == 'X' and spans['cancelled']['ph'] == 'i', 'Event phases are wrong'
+    assert outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur'], \
+        'Nested span is outside its parent'
+    assert inner['dur'] >= 2000, 'Span duration is not in microseconds'
+    assert outer['args'] == {'cards': '2'}, 'Span details were not recorded as text'
+    assert spans['sleep']['tid'] != outer['tid'], 'Worker span was recorded on the main thread'
+    assert tracer._threads[spans['sleep']['tid']] == 'download_1', 'Worker thread was not named'
+    return f'{len(tracer.events)} events on {len(tracer._threads)} threads'
+
+
+def test_tracer_export(path: Path) -> str:
+    """Export recorded spans as a Chrome trace with a thread name event per thread, nothing if disabled."""
+    tracer = SpanTracer(enabled=True)
+    assert tracer.export(path / 'empty.json') is None, 'Empty trace was exported'
+    with tracer.span('render', 'render'):
+        pass
+    assert tracer.export(path / 'trace.json') == path / 'trace.json', 'Trace was not exported'
+    trace = json.loads((path / 'trace.json').read_text())
+    meta = [e for e in trace['traceEvents'] if e['ph'] == 'M']
+    assert trace['displayTimeUnit'] == 'ms', 'Display unit is wrong'
+    assert [e['name'] for e in meta] == ['thread_name'] and meta[0]['args']['name'], 'Thread was not named'
+    assert [e['name'] for e in trace['traceEvents'] if e['ph'] == 'X'] == ['render'], 'Span was not exported'
+
+    # A disabled tracer exports nothing
+    disabled = SpanTracer(enabled=False)
+    with disabled.span('render'):
+        pass
+    assert disabled.export(path / 'disabled.json') is None and not disabled.events, 'Disabled tracer recorded'
+    return f"{len(trace['traceEvents'])} events"
+
+
+def test_tracer_cost(_path: Path) -> str:
+    """Time the cost of a span left in the code, while disabled and while recording."""
+    disabled, enabled = SpanTracer(enabled=False), SpanTracer(enabled=True)
+    costs = []
+    for tracer in (disabled, enabled):
+        start = perf_counter()
+        for _ in range(DISABLED_CALLS):
+            with tracer.span('measure', 'text'):
+                pass
+        costs.append((perf_counter() - start) / DISABLED_CALLS * 1e6)
+    assert not disabled.events and len(enabled.events) == DISABLED_CALLS, 'Spans were not recorded as expected'
+    assert costs[0] < 5, f'Disabled span costs {costs[0]:.2f}us'
+    return f'{costs[0]:.2f}us per span disabled, {costs[1]:.2f}us recording'
+
+
+def test_all_profiling() -> bool:
+    """Run every profiling test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_profiler_card,
+        test_profiler_summary,
+        test_profiler_decorator,
+        test_profiler_disabled,
+        test_tracer_spans,
+        test_tracer_export,
+        test_tracer_cost], temp_dir=True)
@@ -0,0 +1,133 @@
+"""
+* Tests: Showcases
+* Showcase frames drawn with Pillow around generated card images, checking the rounded corners, shadow, and the
+* card visible through the frame.
+"""
+# Standard Library Imports
+from pathlib import Path
+from time import perf_counter
+
+# Third Party Imports
+from PIL import Image
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.showcase import (
+    SHOWCASE_COLOR,
+    SHOWCASE_INSET,
+    SHOWCASE_WIDTH,
+    get_rounded_mask,
+    get_showcase_overlay,
+    render_showcase,
+    render_showcases)
+
+"""
+* Test Utils
+"""
+
+# Size of a card rendered at 1200 DPI, and the color of the generated cards
+CARD_SIZE = (SHOWCASE_WIDTH, 4448)
+CARD_COLOR = (200, 40, 40)
+
+# How many showcases are rendered when timed
+SHOWCASE_CARDS = 4
+
+
+def save_card(path: Path, size: tuple[int, int] = CARD_SIZE) -> Path:
+    """Save a solid card image.
+
+    Args:
+        path: Path to save the card image to.
+        size: Width and height of the card image.
+
+    Returns:
+        Path to the saved card image.
+    """
+    Image.new('RGB', size, CARD_COLOR).save(path, dpi=(1200, 1200), compress_level=1)
+    return path
+
+
+def is_near(a: tuple[int, ...], b: tuple[int, ...], tolerance: int = 3) -> bool:
+    """bool: Whether two colors differ by no more than a tolerance in every channel, allowing for JPEG loss."""
+    return all(abs(x - y) <= tolerance for x, y in zip(a, b))
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_rounded_mask(_path: Path) -> str:
+    """Draw an inset rounded rectangle, anti-aliased along its corners."""
+    mask = get_rounded_mask((400, 300), (20, 10), 40)
+    assert mask.getpixel((200, 150)) == 255 and mask.getpixel((25, 150)) == 255, 'Inside is not opaque'
+    assert mask.getpixel((10, 150)) == 0 and mask.getpixel((200, 5)) == 0, 'Inset is not clear'
+    assert mask.getpixel((22, 12)) == 0, 'Corner is not rounded'
+    partial = [v for v in mask.crop((20, 10, 60, 50)).getdata() if 0 < v < 255]
+    assert len(partial) > 20, 'Corner is not anti-aliased'
+    return f'{len(partial)} anti-aliased corner pixels'
+
+
+def test_showcase_overlay(_path: Path) -> str:
+    """Draw the frame once per size, with a shadow cast down and to the right of the card."""
+    size = (816, 1112)
+    frame, mask = get_showcase_overlay(size)
+    assert get_showcase_overlay(size) == (frame, mask), 'Frame was drawn again for the same size'
+    plain, plain_mask = get_showcase_overlay(size, shadow=False)
+    assert plain.getcolors() == [(size[0] * size[1], SHOWCASE_COLOR)], 'Frame without a shadow is not plain'
+    assert list(mask.getdata()) == list(plain_mask.getdata()), 'Shadow changed the card mask'
+
+    # The shadow is darker just outside the card's right edge than just outside its left edge
+    inset, middle = round(SHOWCASE_INSET[0] * size[0] / SHOWCASE_WIDTH), size[1] // 2
+    left, right = frame.getpixel((inset - 3, middle))[0], frame.getpixel((size[0] - inset + 3, middle))[0]
+    assert right < left - 5, f'Shadow is {right} on the right, {left} on the left'
+    assert frame.getpixel((5, middle)) == SHOWCASE_COLOR, 'Shadow reached the edge of the frame'
+    return f'shadow {SHOWCASE_COLOR[0] - right} darker on the right, {SHOWCASE_COLOR[0] - left} on the left'
+
+
+def test_render_showcase(path: Path) -> str:
+    """Show the card through the rounded frame, keeping its size and resolution."""
+    card = save_card(path / 'Island.png', (816, 1112))
+    out = render_showcase(card, path)
+    assert out == path / 'Island.jpg', f'Saved to {out}'
+    with Image.open(out) as img:
+        assert img.size == (816, 1112) and round(img.info['dpi'][0]) == 1200, 'Size or resolution changed'
+        assert is_near(img.getpixel((408, 556)), CARD_COLOR), 'Card is not visible through the frame'
+        assert img.getpixel((45, 45))[0] < SHOWCASE_COLOR[0] + 3, 'Corner is not rounded'
+        assert is_near(img.getpixel((60, 60)), CARD_COLOR), 'Rounded corner cut too far into the card'
+    return out.name
+
+
+def test_render_showcases(path: Path) -> str:
+    """Render showcases in a worker pool, timing each card once the frame for its size is drawn."""
+    cards = [save_card(path / f'{i}.png') for i in range(SHOWCASE_CARDS)]
+    (broken := path / 'broken.png').write_bytes(b'not an image')
+    get_showcase_overlay.cache_clear()
+
+    # The first card of a size draws its frame
+    (path / 'first').mkdir()
+    start = perf_counter()
+    render_showcase(cards[0], path / 'first')
+    first = perf_counter() - start
+
+    # Later cards reuse it
+    start = perf_counter()
+    results = render_showcases([*cards[1:], broken], path / 'showcases')
+    per_card = (perf_counter() - start) / (SHOWCASE_CARDS - 1)
+    assert [p for p, _ in results] == [*cards[1:], broken], 'Results are out of order'
+    assert all(e is None for _, e in results[:-1]) and results[-1][1], 'Errors were not reported per card'
+    assert len(list((path / 'showcases').glob('*.jpg'))) == SHOWCASE_CARDS - 1, 'Showcases are missing'
+    return f'{first:.2f}s for the first card, {per_card:.2f}s per card after'
+
+
+def test_all_showcases() -> bool:
+    """Run every showcase test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_rounded_mask,
+        test_showcase_overlay,
+        test_render_showcase,
+        test_render_showcases], temp_dir=True)
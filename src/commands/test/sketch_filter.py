@@ -0,0 +1,120 @@
+"""
+* Tests: Sketch Filter
+* Smoke and regression tests for the Investigamer plugin's fast sketch art filter, run on a fixed synthetic image.
+* The filter approximates the advanced sketch action, these tests guard against unintended changes to its output
+* rather than measuring parity with Photoshop.
+"""
+# Standard Library Imports
+from types import ModuleType
+
+# Third Party Imports
+import numpy as np
+from omnitils.modules import import_module_from_path
+from PIL import Image
+
+# Local Imports
+from src import PATH
+from src.commands.test.utility import run_tests
+from src.utils.filters import ART_FILTERS
+
+"""
+* Reference Outputs
+"""
+
+# Mean of each 4x4 block of the filtered test image's luminosity, rounded to whole levels, for each option set.
+# Recorded from this filter, not from Photoshop renders of the action.
+SKETCH_REFERENCE: dict[str, list[int]] = {
+    'default': [121, 111, 126, 178, 129, 156, 193, 188, 145, 161, 193, 196, 82, 86, 204, 207],
+    'rough': [121, 111, 123, 175, 129, 153, 191, 186, 145, 159, 191, 196, 76, 79, 204, 207],
+    'draft': [121, 111, 124, 174, 129, 152, 188, 188, 141, 158, 193, 196, 82, 84, 204, 207],
+    'black_and_white': [121, 111, 126, 178, 129, 156, 193, 188, 145, 161, 194, 197, 83, 86, 205, 208]}
+
+# Largest difference from a reference block mean allowed, in levels
+SKETCH_TOLERANCE = 2
+
+# Option sets the filter is tested with
+SKETCH_OPTIONS: dict[str, dict[str, bool]] = {
+    'default': {},
+    'rough': {'rough_sketch': True},
+    'draft': {'draft_sketch': True},
+    'black_and_white': {'black_and_white': True}}
+
+"""
+* Test Utils
+"""
+
+
+def get_sketch_filter() -> ModuleType:
+    """ModuleType: The plugin's sketch filter module, loaded directly so the plugin's templates aren't loaded."""
+    return import_module_from_path(
+        name='sketchfilter',
+        path=PATH.PLUGINS / 'Investigamer' / 'py' / 'actions' / 'sketchfilter.py')
+
+
+def get_test_image() -> Image.Image:
+    """Image: Fixed 128x96 art image with color gradients, a solid disc, and fine stripes."""
+    ys, xs = np.mgrid[0:96, 0:128].astype(np.float32)
+    r, g, b = xs / 127 * 255, ys / 95 * 255, np.full_like(xs, 96)
+    disc = (xs - 80) ** 2 + (ys - 40) ** 2 < 24 ** 2
+    r, g, b = np.where(disc, 220, r), np.where(disc, 40, g), np.where(disc, 40, b)
+    stripes = (ys > 70) & (xs < 60) & (xs.astype(int) % 4 < 2)
+    r, g, b = np.where(stripes, 10, r), np.where(stripes, 10, g), np.where(stripes, 10, b)
+    return Image.fromarray(np.rint(np.stack([r, g, b], axis=2)).astype(np.uint8), mode='RGB')
+
+
+def get_block_means(img: Image.Image) -> list[int]:
+    """list[int]: Mean luminosity of each block in a 4x4 grid over an image, rounded to whole levels."""
+    return [int(n) for n in np.asarray(img.convert('L').reduce((img.width // 4, img.height // 4))).flatten()]
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_sketch_smoke() -> str:
+    """Filter the test image with every option set, checking the output image is a usable sketch."""
+    module, img = get_sketch_filter(), get_test_image()
+    assert ART_FILTERS.get('pencil_sketch') is module.filter_pencil_sketch, 'Art filter was not registered'
+    for name, options in SKETCH_OPTIONS.items():
+        out = module.filter_pencil_sketch(img, **options)
+        assert out.mode == 'RGB' and out.size == img.size, f'Output is {out.mode} {out.size}, options={name}'
+        px = np.asarray(out)
+        assert px.std() > 1, f'Output is blank, options={name}'
+        if options.get('black_and_white'):
+            assert (px[:, :, 0] == px[:, :, 1]).all() and (px[:, :, 1] == px[:, :, 2]).all(), \
+                'Black and white output has color'
+    return f'{len(SKETCH_OPTIONS)} option sets'
+
+
+def test_sketch_repeatable() -> str:
+    """Filter the test image twice with seeded noise and waves, expecting identical output."""
+    module, img = get_sketch_filter(), get_test_image()
+    options = {'rough_sketch': True, 'draft_sketch': True}
+    first, second = module.filter_pencil_sketch(img, **options), module.filter_pencil_sketch(img, **options)
+    assert first.tobytes() == second.tobytes(), 'Output changed between runs'
+    return 'identical'
+
+
+def test_sketch_regression() -> str:
+    """Compare the filtered test image with reference block means recorded for each option set."""
+    module, img = get_sketch_filter(), get_test_image()
+    worst = 0
+    for name, options in SKETCH_OPTIONS.items():
+        means = get_block_means(module.filter_pencil_sketch(img, **options))
+        diff = max(abs(a - b) for a, b in zip(means, SKETCH_REFERENCE[name]))
+        assert diff <= SKETCH_TOLERANCE, f'Output differs by {diff} levels, options={name}'
+        worst = max(worst, diff)
+    return f'within {worst} levels'
+
+
+def test_all_sketch_filter() -> bool:
+    """Run every sketch filter test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_sketch_smoke,
+        test_sketch_repeatable,
+        test_sketch_regression])
@@ -0,0 +1,152 @@
+"""
+* Tests: Template Archives
+* Generated template files compressed as 7z archives in parallel, within a memory budget, skipping templates
+* unchanged since their last archive.
+"""
+# Standard Library Imports
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from random import Random
+from threading import Lock
+from time import perf_counter, sleep
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.utils.archive import (
+    DEFAULT_DICT_SIZE,
+    DEFAULT_WORD_SIZE,
+    PY7ZR_DICT_SIZE,
+    ArchiveResult,
+    MemoryBudget,
+    compress_templates,
+    get_archive_memory,
+    get_archive_settings,
+    load_archive_settings)
+
+"""
+* Test Utils
+"""
+
+# Seed of the generated template contents, and the size of each template in megabytes
+TEMPLATE_SEED = 4901
+TEMPLATE_SIZES = {'large.psd': 3, 'normal.psd': 2, 'small.psb': 1}
+
+
+def save_templates(path: Path) -> list[Path]:
+    """Save template files of repetitive binary data, which compresses the way layered documents do.
+
+    Args:
+        path: Directory to save the templates to.
+
+    Returns:
+        Paths to the saved templates, smallest first.
+    """
+    rng, paths = Random(TEMPLATE_SEED), []
+    for name, size in sorted(TEMPLATE_SIZES.items(), key=lambda n: n[1]):
+        blocks = [rng.randbytes(4096) for _ in range(16)]
+        (p := path / name).write_bytes(b''.join(rng.choice(blocks) for _ in range(size * 256)))
+        paths.append(p)
+    return paths
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_archive_settings(path: Path) -> str:
+    """Use per-file word and dictionary sizes when given, estimating the memory each compression needs."""
+    (settings_file := path / 'settings.json').write_text(json.dumps({'normal.psd': '64/768', 'bad.psd': '1/2'}))
+    settings = load_archive_settings(settings_file)
+    assert get_archive_settings(path / 'normal.psd', settings) == ('64', '768'), 'Settings were not used'
+    assert get_archive_settings(path / 'other.psd', settings) == (DEFAULT_WORD_SIZE, DEFAULT_DICT_SIZE), \
+        'Defaults were not used'
+    try:
+        get_archive_settings(path / 'bad.psd', settings)
+        raise AssertionError('Unknown settings were accepted')
+    except ValueError:
+        pass
+    assert get_archive_memory('768', use_7zip=True) > get_archive_memory('64', use_7zip=True), \
+        'Larger dictionaries were not estimated to use more memory'
+    assert get_archive_memory('768', use_7zip=False) == get_archive_memory(str(PY7ZR_DICT_SIZE), use_7zip=True), \
+        'py7zr estimate did not use its own dictionary size'
+    return f"{get_archive_memory('768', use_7zip=True)}MB for a 768MB dictionary"
+
+
+def test_memory_budget(_path: Path) -> str:
+    """Run jobs together only while their reservations fit the budget, running an oversized job alone."""
+    budget, lock, peak, running = MemoryBudget(limit=100), Lock(), [0, 0], []
+
+    def _job(name: str, size: int) -> None:
+        with budget.reserve(size):
+            with lock:
+                running.append(name)
+                if len(running) > 1:
+                    peak[:] = max(peak[0], budget.used), max(peak[1], len(running))
+                assert budget.used <= budget.limit or running == [name], f'{name} ran alongside {running}'
+            sleep(0.02)
+            with lock:
+                running.remove(name)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        jobs = [executor.submit(_job, f'job{i}', size) for i, size in enumerate([40, 40, 40, 150, 30, 60])]
+        for job in jobs:
+            job.result()
+    assert peak[0] <= budget.limit and peak[1] > 1 and budget.used == 0, f'Shared reservations peaked at {peak[0]}MB'
+    return f'up to {peak[1]} jobs sharing {peak[0]}MB of {budget.limit}MB'
+
+
+def test_compress_templates(path: Path) -> str:
+    """Compress every template, reporting unknown settings per template, in the order given."""
+    templates = save_templates(path)
+    completed: list[ArchiveResult] = []
+    settings = {'small.psb': '1/2'}
+    results = compress_templates(templates, memory=1024, workers=2, settings=settings, callback=completed.append)
+    assert [r['file'] for r in results] == [p.name for p in templates], 'Results are out of order'
+    assert len(completed) == len(templates), 'Callback was not called for every template'
+    assert results[0]['error'] and not results[0]['archive'], 'Unknown settings were not reported'
+    for result in results[1:]:
+        assert not result['error'] and Path(result['archive']).is_file(), f"{result['file']} was not archived"
+        assert 0 < result['ratio'] < 0.5 and result['time'] > 0, f"{result['file']} ratio is {result['ratio']}"
+    manifest = json.loads((path / '.compressed' / 'manifest.json').read_text())
+    assert len(manifest) == 2, 'Archived templates were not recorded'
+    return f"ratio {results[-1]['ratio']:.3f}"
+
+
+def test_compress_skipped(path: Path) -> str:
+    """Skip templates unchanged since their last archive, timing a repeated run against the first."""
+    templates = save_templates(path)
+
+    start = perf_counter()
+    compress_templates(templates, memory=1024)
+    first = perf_counter() - start
+    start = perf_counter()
+    results = compress_templates(templates, memory=1024)
+    repeated = perf_counter() - start
+    assert all(r['skipped'] and r['archive_size'] for r in results), 'Unchanged templates were compressed again'
+
+    # Changed templates, and every template when forced, are compressed again
+    with open(templates[0], 'ab') as f:
+        f.write(b'edited')
+    os.utime(templates[0])
+    results = compress_templates(templates, memory=1024)
+    assert [r['skipped'] for r in results] == [False, True, True], 'Changed template was skipped'
+    assert not any(r['skipped'] for r in compress_templates(templates, memory=1024, force=True)), \
+        'Forced compression skipped templates'
+    assert repeated < first / 5, f'Repeated run took {repeated:.2f}s, first run {first:.2f}s'
+    return f'{first:.2f}s compressing, {repeated * 1000:.0f}ms when unchanged'
+
+
+def test_all_template_archives() -> bool:
+    """Run every template archive test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_archive_settings,
+        test_memory_budget,
+        test_compress_templates,
+        test_compress_skipped], temp_dir=True)
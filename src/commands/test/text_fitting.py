@@ -0,0 +1,151 @@
+"""
+* Tests: Text Fitting
+* Font size fitting tested against synthetic text whose measurements are known, compared with the linear scan
+* down the step grid it replaced.
+"""
+# Standard Library Imports
+from random import Random
+from typing import Callable, Optional
+
+# Local Imports
+from src.commands.test.utility import run_tests
+from src.helpers.text import estimate_fit_size, fit_font_size
+
+"""
+* Test Utils
+"""
+
+# Seed of the random fitting cases, and how many are tested
+FIT_SEED = 3301
+FIT_CASES = 500
+
+
+class SyntheticText:
+    """Text whose measured height grows with the square of its font size, as wrapping paragraph text does."""
+
+    def __init__(self, font_size: float):
+        self.size = font_size
+        self.measurements = 0
+
+    def apply(self, size: float) -> None:
+        self.size = size
+
+    def height(self) -> float:
+        self.measurements += 1
+        return self.size ** 2
+
+
+def scan_font_size(fits: Callable[[float], bool], font_size: float, step: float) -> float:
+    """Step down from the starting font size until the text fits, as text was fitted before bisection.
+
+    Args:
+        fits: Function which returns whether the text fits at a given font size.
+        font_size: Starting font size, assumed not to fit.
+        step: Font size decrement.
+
+    Returns:
+        The first font size on the step grid at which the text fits, or the smallest size on the grid.
+    """
+    last = max(int(font_size / step) - 1, 1)
+    for m in range(1, last + 1):
+        if fits(font_size - m * step):
+            return font_size - m * step
+    return font_size - last * step
+
+
+def fit_case(
+    font_size: float,
+    limit: float,
+    step: float,
+    estimate: Optional[float]
+) -> tuple[float, float, int, int]:
+    """Fit synthetic text to a height limit with bisection and with a linear scan.
+
+    Args:
+        font_size: Starting font size.
+        limit: Height the text must fit within.
+        step: Smallest font size increment to consider.
+        estimate: Estimated fitted font size passed to the bisection.
+
+    Returns:
+        Font size fitted by bisection, font size found by the scan, and the measurements each made.
+    """
+    text, scanned = SyntheticText(font_size), SyntheticText(font_size)
+    fitted = fit_font_size(
+        apply=text.apply,
+        fits=lambda: text.height() <= limit,
+        font_size=font_size,
+        step=step,
+        estimate=estimate)
+    assert text.size == fitted, f'Fitted {fitted} but left the text at {text.size}'
+
+    def _fits(size: float) -> bool:
+        scanned.apply(size)
+        return scanned.height() <= limit
+
+    expected = scan_font_size(_fits, font_size, step)
+    return fitted, expected, text.measurements, scanned.measurements
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_fit_estimates() -> str:
+    """Estimate the fitted size of single line and wrapping text from one measurement."""
+    assert estimate_fit_size(12, 200, 100) == 6, 'Single line estimate is wrong'
+    assert estimate_fit_size(12, 400, 100, exponent=2) == 6, 'Paragraph estimate is wrong'
+    assert estimate_fit_size(12, 50, 100) == 12 and estimate_fit_size(12, 0, 100) == 12, \
+        'Text that fits was scaled'
+    return 'single line and paragraph'
+
+
+def test_fit_matches_scan() -> str:
+    """Fit the same size as the linear scan, with exact, high, low, and missing estimates."""
+    rng = Random(FIT_SEED)
+    for i in range(FIT_CASES):
+        font_size, step = rng.uniform(6, 16), rng.choice([0.1, 0.2])
+        limit = rng.uniform(1, (font_size - step) ** 2)
+        estimate = rng.choice([
+            None,
+            estimate_fit_size(font_size, font_size ** 2, limit, exponent=2),
+            rng.uniform(step, font_size)])
+        fitted, expected, _, _ = fit_case(font_size, limit, step, estimate)
+        assert abs(fitted - expected) < 1e-9, f'Case {i} fitted {fitted:.2f}, scan found {expected:.2f}'
+    return f'{FIT_CASES} cases'
+
+
+def test_fit_nothing_fits() -> str:
+    """Keep the smallest size on the grid when no size fits."""
+    fitted, expected, _, _ = fit_case(font_size=2, limit=0, step=0.2, estimate=1)
+    assert abs(fitted - expected) < 1e-9 and fitted > 0, f'Fitted {fitted}'
+    return f'{fitted:.1f}pt'
+
+
+def test_fit_measurements() -> str:
+    """Count the measurements made by bisection and by the scan, each one a Photoshop round-trip, with estimates
+    up to 10% off."""
+    rng = Random(FIT_SEED)
+    bisected, scanned = 0, 0
+    for _ in range(FIT_CASES):
+        font_size, step = rng.uniform(8, 12), 0.2
+        limit = rng.uniform(0.3, 0.95) * font_size ** 2
+        estimate = estimate_fit_size(font_size, font_size ** 2, limit, exponent=2) * rng.uniform(0.9, 1.1)
+        _, _, a, b = fit_case(font_size, limit, step, estimate)
+        bisected, scanned = bisected + a, scanned + b
+    assert bisected < scanned / 2, f'Bisection made {bisected} measurements, the scan made {scanned}'
+    return f'{bisected / FIT_CASES:.1f} measurements per fit, the linear scan made {scanned / FIT_CASES:.1f}'
+
+
+def test_all_text_fitting() -> bool:
+    """Run every text fitting test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_fit_estimates,
+        test_fit_matches_scan,
+        test_fit_nothing_fits,
+        test_fit_measurements])
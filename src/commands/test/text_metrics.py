@@ -0,0 +1,156 @@
+"""
+* Tests: Text Metrics
+* Offline text layout estimates tested against synthetic fonts with known advance widths, and the fonts shipped
+* with the app.
+"""
+# Standard Library Imports
+from pathlib import Path
+
+# Third Party Imports
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+# Local Imports
+from src import PATH
+from src.commands.test.utility import run_tests
+from src.enums.mtg import CardFonts
+from src.utils.text_metrics import (
+    TextLayoutEstimator,
+    TextStyles,
+    get_font_index,
+    get_font_metrics)
+
+"""
+* Synthetic Fonts
+"""
+
+# Characters mapped by every synthetic font
+SYNTHETIC_CHARS = 'abcdefghijklmnopqrstuvwxyz '
+
+
+def build_font(path: Path, name: str, advance: int, space: int = 250) -> None:
+    """Build a font where every letter has the same advance width, measured in 1000 units per em.
+
+    Args:
+        path: Path to save the font file to.
+        name: PostScript name of the font.
+        advance: Advance width of every letter, and the fallback glyph.
+        space: Advance width of the space character.
+    """
+    glyphs = ['.notdef', *[f'g{ord(c)}' for c in SYNTHETIC_CHARS]]
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphs)
+    fb.setupCharacterMap({ord(c): f'g{ord(c)}' for c in SYNTHETIC_CHARS})
+    fb.setupGlyf({g: TTGlyphPen(None).glyph() for g in glyphs})
+    fb.setupHorizontalMetrics({g: (space if g == 'g32' else advance, 0) for g in glyphs})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({'familyName': name, 'styleName': 'Regular', 'psName': name})
+    fb.setupOS2()
+    fb.setupPost()
+    fb.save(str(path))
+
+
+def get_synthetic_estimator(fonts_dir: Path) -> TextLayoutEstimator:
+    """TextLayoutEstimator: Estimator with 500 unit letters, 600 unit italics, 550 unit bold, and 1000 unit mana."""
+    styles = TextStyles(regular='Test-Regular', italic='Test-Italic', bold='Test-Bold', mana='Test-Mana')
+    for (style, name), advance in zip(styles.items(), [500, 600, 550, 1000]):
+        build_font(fonts_dir / f'{style}.ttf', name, advance)
+    estimator = TextLayoutEstimator.from_fonts(fonts_dir, styles)
+    assert estimator, 'Synthetic fonts were not found'
+    return estimator
+
+
+"""
+* Test Funcs
+"""
+
+
+def test_font_metrics(path: Path) -> str:
+    """Index fonts by PostScript name and measure mapped and unmapped characters."""
+    build_font(path / 'a.ttf', 'Test-Regular', 500)
+    (path / 'broken.ttf').write_bytes(b'not a font')
+    assert get_font_index(path) == {'Test-Regular': path / 'a.ttf'}, 'Font index is wrong'
+    metrics = get_font_metrics(path, 'Test-Regular')
+    assert metrics.advance('a') == 500 and metrics.advance(' ') == 250, 'Mapped advance is wrong'
+    assert metrics.advance('—') == 500, 'Unmapped advance did not fall back on .notdef'
+    assert metrics.measure('ab cd', 12) == 2250 * 12 / 1000, 'Measured width is wrong'
+    assert get_font_metrics(path, 'Missing') is None, 'Missing font was found'
+    assert TextLayoutEstimator.from_fonts(path, TextStyles(
+        regular='Test-Regular', italic='Missing', bold='Test-Regular', mana='Test-Regular')) is None, \
+        'Estimator was made without every font'
+    return f'{metrics.units} units per em'
+
+
+def test_layout_wrap(path: Path) -> str:
+    """Wrap words greedily at spaces, breaking paragraphs at carriage returns."""
+    estimator = get_synthetic_estimator(path)
+
+    # Letters are 5pt and spaces 2.5pt at 10pt, two words fill a line exactly
+    est = estimator.layout('abcd efgh ijkl', size=10, width=42.5)
+    assert est['lines'] == 2 and est['height'] == 20, f'Wrapped {est["lines"]} lines'
+    assert est['widest'] == 42.5, f'Widest line measured {est["widest"]}'
+
+    # Each paragraph starts on a new line, spaced apart
+    est = estimator.layout('abcd\refgh ijkl mnop', size=10, width=42.5, leading=12, paragraph_space=3)
+    assert est['lines'] == 3 and est['height'] == 39, f'Paragraphs measured {est["height"]}'
+    est = estimator.layout('abcd\refgh', size=10, width=100, paragraph_space=3, space_before={5: 8})
+    assert est['height'] == 28, 'Paragraph space override was not used'
+    return f'{est["lines"]} lines'
+
+
+def test_layout_styles(path: Path) -> str:
+    """Measure italic, bold, and mana symbol characters with their own fonts."""
+    estimator = get_synthetic_estimator(path)
+    text = 'abcd efgh ijkl'
+    assert estimator.layout(text, size=10, width=100)['widest'] == 65, 'Regular width is wrong'
+    assert estimator.layout(text, size=10, width=100, italics=[(5, 9)])['widest'] == 69, 'Italic width is wrong'
+    assert estimator.layout(text, size=10, width=100, bold=(0, 4))['widest'] == 67, 'Bold width is wrong'
+    assert estimator.layout(text, size=10, width=100, symbols=[(0, ['W', 'U'])])['widest'] == 75, \
+        'Mana symbol width is wrong'
+    return 'italic, bold, mana'
+
+
+def test_fit_size(path: Path) -> str:
+    """Find the largest font size on the step grid that fits, matching a scan down from the starting size."""
+    estimator = get_synthetic_estimator(path)
+    text = 'abcd efgh ijkl mnop\rqrst uvwx yz abc defg hij'
+    width, height, size, step = 120, 60, 14, 0.2
+    fitted = estimator.fit_size(text, size=size, width=width, height=height, step=step, leading=16)
+
+    # Scan the grid down from the starting size
+    scanned = size
+    for i in range(int(size / step)):
+        scanned = size - i * step
+        if estimator.layout(text, size=scanned, width=width, leading=16 * scanned / size)['height'] <= height:
+            break
+    assert fitted == scanned, f'Fitted {fitted}, scanned {scanned}'
+    assert estimator.fit_size('abc', size=size, width=width, height=height) == size, 'Fitting text was scaled'
+    return f'{fitted:.1f}pt'
+
+
+def test_shipped_fonts(_path: Path) -> str:
+    """Load the rules text fonts shipped with the app and estimate a rules text block with them."""
+    estimator = TextLayoutEstimator.from_fonts(PATH.FONTS, TextStyles(
+        regular=CardFonts.RULES,
+        italic=CardFonts.RULES_ITALIC,
+        bold=CardFonts.RULES_BOLD,
+        mana=CardFonts.MANA))
+    assert estimator, f'Rules text fonts not found in {PATH.FONTS}'
+    text = 'Flying\rWhen this creature enters, draw a card.\rIt soars above the clouds, untouched.'
+    est = estimator.layout(text, size=9, width=200, leading=9, italics=[(47, len(text))])
+    assert est['lines'] >= 3 and 0 < est['widest'] <= 200, f'Estimated {est["lines"]} lines'
+    return f'{est["lines"]} lines'
+
+
+def test_all_text_metrics() -> bool:
+    """Run every text metrics test.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    return run_tests([
+        test_font_metrics,
+        test_layout_wrap,
+        test_layout_styles,
+        test_fit_size,
+        test_shipped_fonts], temp_dir=True)
@@ -3,8 +3,10 @@
 * For contributors and plugin development.
 """
 # Standard Library Imports
-from contextlib import suppress
-from typing import Optional, Union
+from contextlib import nullcontext, suppress
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable, Optional, Union
 from _ctypes import COMError
 from xml.dom import minidom
 import warnings
@@ -28,7 +30,7 @@
 import xml.etree.ElementTree as ET
 
 # Local Imports
-from src import APP, TEMPLATES
+from src import APP, CONSOLE, TEMPLATES
 import src.helpers as psd
 from src.utils.adobe import LayerContainer
 
@@ -43,6 +45,33 @@
 TAN = [245, 235, 210]
 BLACK = [0, 0, 0]
 
+"""
+* Test Runners
+"""
+
+
+def run_tests(tests: list[Callable[..., str]], temp_dir: bool = False) -> bool:
+    """Run a list of test functions, logging whether each passed.
+
+    Args:
+        tests: Test functions, each returns a short summary of its result or raises if it fails.
+        temp_dir: Pass each test a temporary directory, removed once the test finishes.
+
+    Returns:
+        True if every test passed, otherwise False.
+    """
+    passed = True
+    for test in tests:
+        with TemporaryDirectory() if temp_dir else nullcontext() as temp:
+            try:
+                result = test(Path(temp)) if temp_dir else test()
+                CONSOLE.info(f'PASSED: {test.__name__} ({result})')
+            except Exception as e:
+                CONSOLE.error(f'FAILED: {test.__name__} ({e})')
+                passed = False
+    return passed
+
+
 """
 * Template Design Testing
 """
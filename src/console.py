@@ -17,6 +17,7 @@
 # Local Imports
 from src._config import AppConfig
 from src._state import AppEnvironment, PATH
+from src.utils.tracing import TRACER
 
 """
 * Enums
@@ -261,7 +262,8 @@ def update(
         else:
             msg = msg + end + '[>]'
             self.continue_next_line = True
-        self.logger.info(msg)
+        with TRACER.span('console.update', 'console'):
+            self.logger.info(msg)
         if exception:
             self.log_exception(exception)
 
@@ -23,6 +23,17 @@ def Default(self) -> str:
         return self.JPG
 
 
+class EdgeFill (StrConstant):
+    Photoshop = "photoshop"
+    Mirror = "mirror"
+    Blur = "blur"
+    Diffuse = "diffuse"
+
+    @cached_property
+    def Default(self) -> str:
+        return self.Photoshop
+
+
 class ScryfallSorting (StrConstant):
     Released = "released"
     Set = "set"
@@ -58,11 +58,16 @@
 from src.layouts import (
     layout_map,
     assign_layout,
+    assign_layouts,
     join_dual_card_layouts,
+    sort_render_queue,
     NormalLayout)
 from src.templates import BaseTemplate
 from src.utils.adobe import get_photoshop_error_message, PhotoshopHandler, PS_EXCEPTIONS
+from src.utils.download import DownloadQueue
 from src.utils.hexapi import update_hexproof_cache, get_api_key
+from src.utils.images import ArtPreconditioner, get_psd_canvas
+from src.utils.tracing import TRACER
 from src.utils.fonts import check_app_fonts
 
 
@@ -214,6 +219,19 @@ def _render_lock(self) -> Lock:
         """Lock: Thread locking mechanism for render operations."""
         return Lock()
 
+    @cached_property
+    def preconditioner(self) -> ArtPreconditioner:
+        """ArtPreconditioner: Downscales and converts queued art in worker threads ahead of rendering."""
+        return ArtPreconditioner(cache_dir=PATH.LOGS_ART_CACHE, workers=max(cpu_count() - 1, 1))
+
+    @cached_property
+    def downloads(self) -> DownloadQueue:
+        """DownloadQueue: Downloads and unpacks template updates, several at once under a shared bandwidth cap."""
+        return DownloadQueue(
+            workers=self.env.DOWNLOAD_WORKERS,
+            bandwidth=int(self.env.DOWNLOAD_BANDWIDTH * 1024 * 1024),
+            connections=self.env.DOWNLOAD_CONNECTIONS)
+
     @cached_property
     def _dropped_files(self) -> list[Path]:
         """list[Path]: Tracks files dragged and dropped onto the app window."""
@@ -319,7 +337,21 @@ def wrapper(self, *args):
                         return
 
                 # Call the function
-                result = func(self, *args)
+                with TRACER.span(func.__name__, 'batch'):
+                    result = func(self, *args)
+
+                # Cancel any art still being pre-conditioned or filtered, wait for output still being encoded
+                self.preconditioner.shutdown()
+                self.app.art_filters.shutdown()
+                for path, error in self.app.encoder.join():
+                    self.console.update(
+                        msg_error(f'Unable to encode output image, kept a lossless PNG: {path.name}'),
+                        exception=error)
+
+                # Write render profile aggregated per template, export session trace, persist caches and trim cached art
+                self.app.profiler.end_batch()
+                self.app.save_caches()
+                TRACER.export(PATH.LOGS_TRACE)
 
                 # Enable buttons / close document on exit
                 self.reset(enable_buttons=True, close_document=True)
@@ -350,8 +382,8 @@ def get_art_files(self, folder: Path = PATH.ART) -> list[Path]:
         # Check for webp files
         files_webp = [Path(folder, f) for f in all_files if f.endswith('.webp') and not f.startswith('!')]
 
-        # Check if Photoshop version supports webp
-        if files_webp and not self.app.supports_webp:
+        # Check if Photoshop version supports webp, or webp will be converted before rendering
+        if files_webp and not (self.app.supports_webp() or self.env.PRECONDITION_ART):
             self.console.update(msg_warn('Skipped WEBP image, WEBP requires Photoshop ^23.2.0'))
         elif files_webp:
             files.extend(files_webp)
@@ -382,20 +414,52 @@ def select_art(self) -> list[Path]:
         # No files selected
         return []
 
+    def precondition_art(self, layouts: dict[str, dict[str, list[NormalLayout]]]) -> None:
+        """Queue the art of every card to be pre-conditioned in render order, ahead of the render thread.
+
+        Args:
+            layouts: Cards mapped to their template PSD path and layout type.
+        """
+        convert = () if self.app.supports_webp() else ('WEBP',)
+        for path, class_map in layouts.items():
+            canvas = get_psd_canvas(path) or PhotoshopHandler.DIMS_1200
+            for card in sort_render_queue([c for cards in class_map.values() for c in cards]):
+                for art in card.art_file if isinstance(card.art_file, list) else [card.art_file]:
+                    self.preconditioner.submit(Path(art), canvas=canvas, convert=convert)
+
+    def queue_art_filters(self, cards: list[NormalLayout], loaded_class: type[BaseTemplate]) -> None:
+        """Queue the art of each card to be filtered with its template's art pipeline, ahead of the render thread.
+
+        Notes:
+            - Must be called with the template's config loaded, pipelines are usually configurable.
+
+        Args:
+            cards: Cards rendered with this template class.
+            loaded_class: Template class the cards are rendered with.
+        """
+        for card in cards:
+            try:
+                loaded_class(card).queue_art_pipeline()
+            except Exception as e:
+                # Pipeline is queued again when the card renders
+                self.console.log_exception(e)
+
     """
     * Photoshop Utilities
     """
 
     def close_document(self) -> None:
-        """Close Photoshop document if current document reference exists.."""
-        if isinstance(self.docref, Document):
-            try:
+        """Close every template document kept open by the render session, as well as the
+        current document reference if it exists outside the session."""
+        try:
+            self.app.session.close_all()
+            if isinstance(self.docref, Document) and self.app.session.is_open(self.docref):
                 self.docref.close(SaveOptions.DoNotSaveChanges)
                 self.app.purge(PurgeTarget.AllCaches)
-            except Exception as e:
-                # Document wasn't available
-                print("Couldn't close corresponding document!")
-                self.console.log_exception(e)
+        except Exception as e:
+            # Document wasn't available
+            print("Couldn't close corresponding document!")
+            self.console.log_exception(e)
         self.current_render = None
 
     """
@@ -423,11 +487,10 @@ def render_all(self, target: bool = False, files: Optional[list[Path]] = None) -
                 "No art images found!" if target else "No art images selected!")
 
         # Run through each file, assigning layout
-        with ThreadPoolExecutor(max_workers=cpu_count()) as pool:
-            cards = pool.map(assign_layout, files)
+        cards = assign_layouts(files, workers=cpu_count())
 
         # Join dual card layouts
-        cards = join_dual_card_layouts(list(cards))
+        cards = join_dual_card_layouts(cards)
 
         # Remove failed strings
         layouts: dict[str, dict[str, list[NormalLayout]]] = {}
@@ -468,10 +531,18 @@ def render_all(self, target: bool = False, files: Optional[list[Path]] = None) -
             ):
                 return
 
+        # Pre-condition art in the background while rendering
+        if self.env.PRECONDITION_ART:
+            self.precondition_art(layouts)
+
         # Render in batches separated by PSD file
         self.console.update()
         times: list[float] = []
+        swap_times: list[float] = []
         for (i), (_path, class_map) in enumerate(layouts.items()):
+
+            # Load each template class used with this PSD
+            classes: dict[str, type[BaseTemplate]] = {}
             for layout, cards in class_map.items():
 
                 # Initialize the template's python class module
@@ -501,27 +572,46 @@ def render_all(self, target: bool = False, files: Optional[list[Path]] = None) -
 
                     # Cancel render process
                     return
+                classes[layout] = loaded_class
 
-                # Load constants and config for this template
+                # Filter art in the background while rendering
                 self.cfg.load(temps[layout]['config'])
-                self.con.reload()
+                self.queue_art_filters(cards, loaded_class)
 
-                # Render each card with this PSD and class
-                for c in cards:
-                    result = self.start_render(c, temps[layout], loaded_class)
-                    if self.thread_cancelled:
-                        return
-                    if result is not None:
-                        times.append(result)
+            # Render faces of the same card back to back, and identical cards consecutively
+            cards = sort_render_queue([
+                c for layout, cards in class_map.items()
+                if layout in classes for c in cards])
 
-            # Render group complete
-            self.close_document()
+            # Render each card with this PSD
+            previous: Optional[BaseTemplate] = None
+            for n, c in enumerate(cards):
+                layout = c.card_class
 
-        # Report the average render time
+                # Load constants and config for this template
+                if n == 0 or cards[n - 1].card_class != layout:
+                    self.cfg.load(temps[layout]['config'])
+                    self.con.reload()
+
+                # Hold the document open if next card can swap the art
+                hold = bool((n + 1) < len(cards) and cards[n + 1].art_swap_key == c.art_swap_key)
+                result = self.start_render(c, temps[layout], classes[layout], previous=previous, hold=hold)
+                if self.thread_cancelled:
+                    return
+                if result is not None:
+                    (swap_times if self.current_render.art_swapped else times).append(result)
+                previous = self.current_render if (hold and result is not None) else None
+
+        # Report the average render time, and how much faster art swap renders were
         self.console.update(msg_success('Renders Completed!'))
         if times:
             avg = round(sum(times) / len(times), 1)
             self.console.update(f'Average time: {avg} seconds')
+        if swap_times:
+            avg_swap = sum(swap_times) / len(swap_times)
+            speedup = f', {sum(times) / len(times) / avg_swap:.1f}x faster' if times and avg_swap else ''
+            self.console.update(f'Art swap renders: {len(swap_times)}, '
+                                f'average time: {round(avg_swap, 1)} seconds{speedup}')
 
     @render_process_wrapper
     def render_custom(self, template: TemplateDetails, scryfall: dict) -> None:
@@ -714,7 +804,9 @@ def start_render(
         template: TemplateDetails,
         loaded_class: type[BaseTemplate],
         reload_config: bool = False,
-        reload_constants: bool = False
+        reload_constants: bool = False,
+        previous: Optional[BaseTemplate] = None,
+        hold: bool = False
     ) -> Optional[float]:
         """Execute a render job using a given card layout, template, and template class.
 
@@ -724,6 +816,9 @@ def start_render(
             loaded_class: Python class loaded from the template's module which executes the render operation.
             reload_config: Whether to reload the config object for this render, defaults to False.
             reload_constants: Whether to reload the constants object for this render, defaults to False.
+            previous: Template object of the previous render if its document was held open, allowing
+                this card to be rendered by swapping the art if its card data is identical.
+            hold: Whether to hold the rendered document open for an art swap render of the next card.
 
         Returns:
             True if render queue should continue, False if the remaining renders have been cancelled.
@@ -741,19 +836,28 @@ def start_render(
         # Catch any unexpected render exceptions
         try:
 
-            # Set the PSD location of the template
+            # Set the PSD location of the template, then create the template class object
             card.template_file = template['object'].path_psd
-
-            # Create the template class object
             self.current_render = loaded_class(card)
 
+            # Art pipelines filter the original art, other templates wait for pre-conditioned art
+            if not self.current_render.art_pipeline:
+                card.art_file = self.preconditioner.resolve(card.art_file)
+
             # Run a cancellation await in a separate thread using executor
             with ThreadPoolExecutor() as executor:
                 executor.submit(self.console.start_await_cancel, self.current_render.event)
 
-            # Render the card
+            # Render the card, swapping the art in the previous document if possible
             start_time = self.timer
-            result = self.current_render.execute()
+            self.current_render.hold_render = hold and self.current_render.is_art_swap_supported
+            with TRACER.span('start_render', 'render', card=card.display_name, template=template['name']):
+                if previous and self.current_render.can_swap_art(previous):
+                    result = self.current_render.execute_art_swap(previous)
+                else:
+                    if previous:
+                        previous.reset()
+                    result = self.current_render.execute()
             timed = round(self.timer - start_time, 1)
 
             # Return execution time if successful
@@ -998,6 +1102,9 @@ def on_stop(self) -> None:
         """Called when the app is closed."""
         if self.thread and isinstance(self.thread, Event):
             self.thread.set()
+        if 'downloads' in self.__dict__:
+            self.downloads.shutdown()
+        TRACER.export(PATH.LOGS_TRACE)
 
     """
     * App Updates
@@ -21,6 +21,7 @@
 from src._state import AppEnvironment, PATH
 from src.gui._state import get_root_app
 from src.gui.utils import HoverButton
+from src.utils.tracing import TRACER
 
 
 class GUIConsole(BoxLayout):
@@ -169,8 +170,9 @@ def update(
             end: String to append at the end of the message, adds a newline if not provided.
         """
         # Add message to the output label
-        self.output.text = f"{self.current_output}{msg}{end}"
-        self.ids.viewport.scroll_y = 0
+        with TRACER.span('console.update', 'console'):
+            self.output.text = f"{self.current_output}{msg}{end}"
+            self.ids.viewport.scroll_y = 0
         if exception:
             self.log_exception(exception)
 
@@ -266,6 +268,7 @@ def await_choice(self, thr: Event, msg: Optional[str] = None, end: str = "\n") -
         self.start_await()
 
         # Cancel the current thread or continue based on user signal
+        TRACER.instant('console.await_choice', 'console')
         if thr:
             self.cancel_thread(thr) if not self.running else self.start_await_cancel(thr)
         return self.running
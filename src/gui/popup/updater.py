@@ -47,6 +47,12 @@ def check_for_updates(self):
         """Runs the check_for_updates core function and fills the update dictionary."""
         self.updates: list[AppTemplate] = check_for_updates(self.main.templates)
 
+    def download_all(self) -> None:
+        """Download every available update, the download queue limits how many run at once."""
+        for entry in list(self.entries.values()):
+            if not entry.downloading:
+                ak.start(entry.download_update(entry.ids.download))
+
     async def populate_updates(self):
         """Load the list of updates available."""
 
@@ -76,6 +82,7 @@ async def populate_updates(self):
 
 class UpdateEntry(BoxLayout, GlobalAccess):
     def __init__(self, parent: UpdatePopup, template: AppTemplate, bg_color: str, **kwargs):
+        self.downloading = False
         self.bg_color = bg_color
         self.name = template.name
         self.status = msg_success(template.update_version)
@@ -89,14 +96,16 @@ async def download_update(self, download: BoxLayout) -> None:
         Args:
             download: Layout object containing the download progress bar or status.
         """
+        self.downloading = True
         self.progress = UpdateProgress(self.template.update_size)
         download.clear_widgets()
         download.add_widget(self.progress)
-        result = await ak.run_in_thread(
-            lambda: self.template.update_template(
-                self.progress.update_progress
-            ), daemon=True)
+        future = self.main.downloads.submit(
+            self.template.download_update,
+            callback=self.progress.update_progress)
+        result = await ak.run_in_thread(future.result, daemon=True)
         await ak.sleep(.5)
+        self.downloading = False
 
         # Success
         if result:
@@ -114,9 +123,8 @@ async def mark_updated(self):
         self.template.mark_updated()
 
         # Remove this widget
-        entry = self.root.entries[str(self.template.path_psd)]
+        entry = self.root.entries.pop(str(self.template.path_psd))
         self.root.ids.container.remove_widget(entry)
-        del entry
 
 
 class UpdateProgress(ProgressBar, GlobalAccess):
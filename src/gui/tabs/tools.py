@@ -3,14 +3,13 @@
 """
 # Standard Library Imports
 import os
-from functools import cached_property
+from functools import cached_property, partial
 from pathlib import Path
 from typing import Callable
 from threading import Event
-from concurrent.futures import ThreadPoolExecutor as Pool, as_completed
+from concurrent.futures import ProcessPoolExecutor as Pool, as_completed
 
 # Third Party Imports
-from photoshop.api._document import Document
 from kivy.lang import Builder
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
@@ -20,16 +19,15 @@
 from src._state import PATH
 from src.gui._state import GlobalAccess
 from src.utils.adobe import get_photoshop_error_message
-from src.helpers import import_art, reset_document, save_document_jpeg, close_document
+from src.utils.encoding import CompressionManifest, fit_images_to_budget
+from src.utils.sheets import get_sheet_spec, impose_sheets
+from src.utils.showcase import render_showcases
+from src.utils.tracing import TRACER
 
 
 class ToolsPanel(BoxLayout, GlobalAccess):
     Builder.load_file(os.path.join(PATH.SRC_DATA_KV, "tools.kv"))
 
-    class PSD:
-        """PSD tool paths."""
-        Showcase: Path = PATH.TEMPLATES / 'tools' / 'showcase.psd'
-
     @cached_property
     def toggle_buttons(self) -> list[Button]:
         """Add tool buttons."""
@@ -38,7 +36,14 @@ def toggle_buttons(self) -> list[Button]:
             self.ids.generate_showcases,
             self.ids.compress_renders,
             self.ids.compress_renders_target,
-            self.ids.compress_arts]
+            self.ids.compress_arts,
+            self.ids.budget_renders,
+            self.ids.impose_sheets]
+
+    @cached_property
+    def manifest(self) -> CompressionManifest:
+        """CompressionManifest: Settings each image was compressed with, used to skip unchanged images."""
+        return CompressionManifest(PATH.LOGS_COMPRESSED)
 
     @staticmethod
     def process_wrapper(func) -> Callable:
@@ -63,7 +68,9 @@ def wrapper(self: 'ToolsPanel', *args):
             # Reset
             self.main.disable_buttons()
             self.console.clear()
-            result = func(self, *args)
+            with TRACER.span(func.__name__, 'tools'):
+                result = func(self, *args)
+            TRACER.export(PATH.LOGS_TRACE)
             self.main.enable_buttons()
             return result
         return wrapper
@@ -76,10 +83,6 @@ def render_showcases(self, target: bool = False) -> None:
             target: If true, select target images with Photoshop file select.
         """
 
-        # Ensure showcase folder exists
-        path = PATH.OUT / 'showcase'
-        path.mkdir(mode=777, parents=True, exist_ok=True)
-
         # Targeted or all images?
         images = self.main.select_art() if target else self.get_images(PATH.OUT)
 
@@ -92,24 +95,15 @@ def render_showcases(self, target: bool = False) -> None:
             self.console.update("No card images found!")
             return
 
-        # Open the showcase tool
-        self.app.load(str(self.PSD.Showcase))
-        docref: Document = self.app.activeDocument
-
-        # Open each image and save with border crop
-        for img in images:
-            img_path = path / img.name
-            import_art(
-                layer=docref.activeLayer,
-                path=img,
-                docref=docref)
-            save_document_jpeg(
-                path=img_path,
-                docref=docref)
-            reset_document(
-                docref=docref)
-        close_document(
-            docref=docref)
+        # Frame each image with rounded corners and a border crop
+        with TRACER.span('showcase', 'tools', images=len(images)):
+            results = render_showcases(
+                paths=images,
+                output=PATH.OUT / 'showcase',
+                shadow=self.ids.showcase_shadow.active)
+        for img, error in results:
+            if error:
+                self.console.update(f'Unable to render showcase: {img.name}', exception=error)
 
     @process_wrapper
     def compress_renders(self) -> None:
@@ -135,20 +129,87 @@ def compress_target(self):
         self.compress_images(images)
 
     def compress_images(self, images: list[Path]) -> None:
-        """Compress a list of images.
+        """Compress a list of images in a process pool, skipping images already compressed with the same settings.
+
+        Notes:
+            - Images are submitted in chunks, progress is reported and cancellation is checked after each chunk.
+            - Workers run `downscale_image_by_width` directly, so they never import the app.
 
         Args:
             images: A list of image paths.
         """
-        with Pool(max_workers=(os.cpu_count() - 1) or 1) as executor:
-            quality = self.ids.compress_quality.text
-            tasks = [executor.submit(
-                downscale_image_by_width, img, **{
-                    'max_width': 2176 if self.ids.compress_dpi.active else 3264,
-                    'optimize': True,
-                    'quality': int(quality) if quality.isnumeric() else 95,
-                }) for img in images]
-            [n.result() for n in as_completed(tasks)]
+        quality = self.ids.compress_quality.text
+        settings = {
+            'max_width': 2176 if self.ids.compress_dpi.active else 3264,
+            'optimize': True,
+            'quality': int(quality) if quality.isnumeric() else 95}
+
+        # Skip images unchanged since they were compressed with these settings
+        queue = [img for img in images if not self.manifest.is_compressed(img, settings)]
+        if skipped := len(images) - len(queue):
+            self.console.update(f'Skipping {skipped} images already compressed with these settings.')
+        if not queue:
+            return
+
+        # Compress each chunk of images, allowing the user to cancel between chunks
+        thr, done = Event(), 0
+        workers = (os.cpu_count() - 1) or 1
+        chunk = workers * 4
+        downscale = partial(downscale_image_by_width, **settings)
+        self.console.start_await_cancel(thr)
+        try:
+            with Pool(max_workers=workers) as executor:
+                for i in range(0, len(queue), chunk):
+                    if thr.is_set():
+                        break
+                    with TRACER.span('compress_chunk', 'tools', images=len(queue[i:i + chunk])):
+                        tasks = {executor.submit(downscale, img): img for img in queue[i:i + chunk]}
+                        for task in as_completed(tasks):
+                            try:
+                                task.result()
+                                self.manifest.add(tasks[task], settings)
+                            except Exception as e:
+                                self.console.update(f'Unable to compress: {tasks[task].name}', exception=e)
+                    done += len(tasks)
+                    self.console.update(f'Compressed {done}/{len(queue)} images')
+        finally:
+            self.manifest.save()
+            self.console.end_await()
+
+    @process_wrapper
+    def budget_renders(self) -> None:
+        """Utility definition for encoding all rendered card images to fit a file size budget."""
+        if not (images := self.get_images(PATH.OUT)):
+            self.console.update('No card images found!')
+            return
+        budget, floor = self.ids.budget_size.text, self.ids.budget_floor.text
+        try:
+            budget = int(float(budget) * 1024 * 1024)
+        except ValueError:
+            self.console.update('Enter a file size budget in megabytes!')
+            return
+        results = fit_images_to_budget(
+            paths=images,
+            output=PATH.OUT / 'budget',
+            budget=budget,
+            floor=int(floor) if floor.isnumeric() else 80,
+            fmt='webp' if self.ids.budget_webp.active else 'jpg')
+        if over := [Path(r['file']).name for r in results if not r['fits']]:
+            self.console.update('Unable to fit within budget at the minimum quality:\n' + '\n'.join(over))
+        self.console.update(f'Encoded {len(results) - len(over)}/{len(results)} images within budget!')
+
+    @process_wrapper
+    def impose_sheets(self) -> None:
+        """Utility definition for imposing all rendered card images onto 3x3 print sheets."""
+        if not (images := sorted(self.get_images(PATH.OUT))):
+            self.console.update('No card images found!')
+            return
+        spec = get_sheet_spec(
+            page='a4' if self.ids.sheets_a4.active else 'letter',
+            duplex=self.ids.sheets_duplex.active)
+        with TRACER.span('impose_sheets', 'tools', images=len(images)):
+            paths = impose_sheets(paths=images, output=PATH.OUT / 'sheets', spec=spec)
+        self.console.update(f"Print sheets saved to: {', '.join(p.name for p in paths)}")
 
     """
     * File Utils
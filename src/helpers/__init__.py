@@ -4,6 +4,7 @@
 from src.helpers.actions import *
 from src.helpers.adjustments import *
 from src.helpers.bounds import *
+from src.helpers.changes import *
 from src.helpers.colors import *
 from src.helpers.descriptors import *
 from src.helpers.design import *
@@ -12,7 +12,8 @@
 
 # Local Imports
 from src import APP
-from src.helpers.colors import get_color, apply_color, add_color_to_gradient, rgb_black
+from src.helpers.colors import apply_color, get_gradient_color_list
+from src.helpers.descriptors import get_value_key
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -60,18 +61,25 @@ def create_color_layer(
     docref = docref or APP.activeDocument
     if layer:
         docref.activeLayer = layer
-    desc1 = ActionDescriptor()
-    ref1 = ActionReference()
-    desc2 = ActionDescriptor()
-    desc3 = ActionDescriptor()
-    ref1.putClass(sID("contentLayer"))
-    desc1.putReference(sID("target"), ref1)
-    desc2.putBoolean(sID("group"), kwargs.get('clipped', True))
-    desc2.putEnumerated(sID("color"), sID("color"), sID("blue"))
-    apply_color(desc3, color)
-    desc2.putObject(sID("type"), sID("solidColorLayer"), desc3)
-    desc1.putObject(sID("using"), sID("contentLayer"), desc2)
-    APP.executeAction(sID("make"), desc1, NO_DIALOG)
+    clipped = kwargs.get('clipped', True)
+
+    def _build() -> ActionDescriptor:
+        desc1 = ActionDescriptor()
+        ref1 = ActionReference()
+        desc2 = ActionDescriptor()
+        desc3 = ActionDescriptor()
+        ref1.putClass(sID("contentLayer"))
+        desc1.putReference(sID("target"), ref1)
+        desc2.putBoolean(sID("group"), clipped)
+        desc2.putEnumerated(sID("color"), sID("color"), sID("blue"))
+        apply_color(desc3, color)
+        desc2.putObject(sID("type"), sID("solidColorLayer"), desc3)
+        desc1.putObject(sID("using"), sID("contentLayer"), desc2)
+        return desc1
+
+    # Reuse the action for any layer with the same color
+    action = APP.descriptors.get(('makeSolidColorLayer', get_value_key(color), clipped), _build)
+    APP.executeAction(sID("make"), action, NO_DIALOG)
     layer = docref.activeLayer
     if 'blend_mode' in kwargs:
         layer.blendMode = kwargs['blend_mode']
@@ -103,48 +111,48 @@ def create_gradient_layer(
     docref = docref or APP.activeDocument
     if layer:
         docref.activeLayer = layer
-    desc1 = ActionDescriptor()
-    ref1 = ActionReference()
-    desc2 = ActionDescriptor()
-    desc3 = ActionDescriptor()
-    desc4 = ActionDescriptor()
-    color_list = ActionList()
-    list2 = ActionList()
-    desc9 = ActionDescriptor()
-    desc10 = ActionDescriptor()
-    ref1.putClass(sID("contentLayer"))
-    desc1.putReference(sID("target"),  ref1)
-    desc2.putBoolean(sID("group"), kwargs.get('clipped', True))
-    desc3.putEnumerated(
-        sID("gradientsInterpolationMethod"),
-        sID("gradientInterpolationMethodType"),
-        sID("perceptual"))
-    desc3.putUnitDouble(sID("angle"), sID("angleUnit"), kwargs.get('rotation', 0))
-    desc3.putEnumerated(sID("type"), sID("gradientType"), sID("linear"))
-    desc3.putUnitDouble(sID("scale"), sID("percentUnit"), kwargs.get('scale', 100))
-    desc4.putEnumerated(sID("gradientForm"), sID("gradientForm"), sID("customStops"))
-    desc4.putDouble(sID("interfaceIconFrameDimmed"),  4096)
-    for c in colors:
-        add_color_to_gradient(
-            color_list,
-            get_color(c.get('color', rgb_black())),
-            int(c.get('location', 0)),
-            int(c.get('midpoint', 50))
-        )
-    desc4.putList(sID("colors"),  color_list)
-    desc9.putUnitDouble(sID("opacity"), sID("percentUnit"),  100)
-    desc9.putInteger(sID("location"),  0)
-    desc9.putInteger(sID("midpoint"),  50)
-    list2.putObject(sID("transferSpec"),  desc9)
-    desc10.putUnitDouble(sID("opacity"), sID("percentUnit"),  100)
-    desc10.putInteger(sID("location"),  4096)
-    desc10.putInteger(sID("midpoint"),  50)
-    list2.putObject(sID("transferSpec"),  desc10)
-    desc4.putList(sID("transparency"),  list2)
-    desc3.putObject(sID("gradient"), sID("gradientClassEvent"),  desc4)
-    desc2.putObject(sID("type"), sID("gradientLayer"),  desc3)
-    desc1.putObject(sID("using"), sID("contentLayer"),  desc2)
-    APP.executeAction(sID("make"), desc1,  NO_DIALOG)
+    clipped, rotation, scale = kwargs.get('clipped', True), kwargs.get('rotation', 0), kwargs.get('scale', 100)
+
+    def _build() -> ActionDescriptor:
+        desc1 = ActionDescriptor()
+        ref1 = ActionReference()
+        desc2 = ActionDescriptor()
+        desc3 = ActionDescriptor()
+        desc4 = ActionDescriptor()
+        list2 = ActionList()
+        desc9 = ActionDescriptor()
+        desc10 = ActionDescriptor()
+        ref1.putClass(sID("contentLayer"))
+        desc1.putReference(sID("target"),  ref1)
+        desc2.putBoolean(sID("group"), clipped)
+        desc3.putEnumerated(
+            sID("gradientsInterpolationMethod"),
+            sID("gradientInterpolationMethodType"),
+            sID("perceptual"))
+        desc3.putUnitDouble(sID("angle"), sID("angleUnit"), rotation)
+        desc3.putEnumerated(sID("type"), sID("gradientType"), sID("linear"))
+        desc3.putUnitDouble(sID("scale"), sID("percentUnit"), scale)
+        desc4.putEnumerated(sID("gradientForm"), sID("gradientForm"), sID("customStops"))
+        desc4.putDouble(sID("interfaceIconFrameDimmed"),  4096)
+        desc4.putList(sID("colors"), get_gradient_color_list(colors))
+        desc9.putUnitDouble(sID("opacity"), sID("percentUnit"),  100)
+        desc9.putInteger(sID("location"),  0)
+        desc9.putInteger(sID("midpoint"),  50)
+        list2.putObject(sID("transferSpec"),  desc9)
+        desc10.putUnitDouble(sID("opacity"), sID("percentUnit"),  100)
+        desc10.putInteger(sID("location"),  4096)
+        desc10.putInteger(sID("midpoint"),  50)
+        list2.putObject(sID("transferSpec"),  desc10)
+        desc4.putList(sID("transparency"),  list2)
+        desc3.putObject(sID("gradient"), sID("gradientClassEvent"),  desc4)
+        desc2.putObject(sID("type"), sID("gradientLayer"),  desc3)
+        desc1.putObject(sID("using"), sID("contentLayer"),  desc2)
+        return desc1
+
+    # Reuse the action for any layer with the same gradient, e.g. the same pinlines on every card
+    action = APP.descriptors.get(
+        ('makeGradientLayer', get_value_key(colors), clipped, rotation, scale), _build)
+    APP.executeAction(sID("make"), action,  NO_DIALOG)
     layer = docref.activeLayer
     if 'blend_mode' in kwargs:
         layer.blendMode = kwargs['blend_mode']
@@ -3,7 +3,8 @@
 """
 # Standard Library Imports
 from contextlib import suppress
-from typing import Union, TypedDict
+from functools import wraps
+from typing import Union, TypedDict, Optional, ContextManager, Callable
 
 # Third Party Imports
 from photoshop.api import DialogModes
@@ -14,6 +15,7 @@
 from src import APP
 from src.helpers.descriptors import get_layer_action_ref
 from src.helpers.document import undo_action
+from src.helpers.layers import get_layer_index
 from src.utils.adobe import PS_EXCEPTIONS
 
 # QOL Definitions
@@ -46,11 +48,80 @@ class TextboxDimensions(TypedDict):
     height: int
 
 
+"""
+* Bounds Cache
+"""
+
+
+def bounds_scope() -> ContextManager:
+    """Context manager which reuses layer measurements made within its body until a layer may have moved.
+
+    Note:
+        Every `executeAction` call marks measurements stale. Code within the scope which moves or edits
+        a layer through its object model, e.g. `translate`, `resize`, or setting `textItem` properties,
+        must call `invalidate_bounds` afterward.
+
+    Returns:
+        Context manager caching layer measurements.
+    """
+    return APP.bounds.scope()
+
+
+def reuse_bounds(func: Callable) -> Callable:
+    """Decorator which runs the wrapped function within a bounds scope.
+
+    Args:
+        func: Function which measures layers repeatedly, and invalidates bounds after moving one.
+
+    Returns:
+        The wrapped function.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with APP.bounds.scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def invalidate_bounds(layer: Union[ArtLayer, LayerSet, None] = None) -> None:
+    """Mark cached layer measurements stale after a layer moves, resizes, or changes its contents.
+
+    Args:
+        layer: Art layer which changed, marks every measurement stale if not provided or a group.
+    """
+    if layer is None:
+        return APP.bounds.changed()
+    APP.bounds.changed(layer=layer, layer_id=get_cached_layer_id(layer))
+
+
+def get_cached_layer_id(layer: Union[ArtLayer, LayerSet]) -> Optional[int]:
+    """Optional[int]: ID of a layer if the active layer index knows it, used to key cached measurements."""
+    if index := get_layer_index():
+        return index.get_id(layer)
+    return
+
+
 """
 * Dimensions and Bounds
 """
 
 
+def get_layer_bounds(layer: Union[ArtLayer, LayerSet]) -> LayerBounds:
+    """Returns the bounds of a given layer, reusing a cached measurement within a bounds scope.
+
+    Args:
+        layer: A layer object
+
+    Returns:
+        Pixel location left, top, right, bottom.
+    """
+    return APP.bounds.get(
+        layer=layer,
+        kind='bounds',
+        measure=lambda: tuple(layer.bounds),
+        layer_id=get_cached_layer_id(layer))
+
+
 def get_dimensions_from_bounds(bounds: LayerBounds) -> type[LayerDimensions]:
     """Compute width and height based on a set of bounds given.
 
@@ -80,7 +151,7 @@ def get_layer_dimensions(layer: Union[ArtLayer, LayerSet]) -> type[LayerDimensio
     Returns:
         Dict containing height, width, and positioning locations.
     """
-    return get_dimensions_from_bounds(layer.bounds)
+    return get_dimensions_from_bounds(get_layer_bounds(layer))
 
 
 def get_layer_width(layer: Union[ArtLayer, LayerSet]) -> Union[float, int]:
@@ -92,7 +163,7 @@ def get_layer_width(layer: Union[ArtLayer, LayerSet]) -> Union[float, int]:
     Returns:
         int: Width of the layer in pixels.
     """
-    bounds = layer.bounds
+    bounds = get_layer_bounds(layer)
     return int(bounds[2]-bounds[0])
 
 
@@ -105,7 +176,7 @@ def get_layer_height(layer: Union[ArtLayer, LayerSet]) -> Union[float, int]:
     Returns:
         int: Height of the layer in pixels.
     """
-    bounds = layer.bounds
+    bounds = get_layer_bounds(layer)
     return int(bounds[3]-bounds[1])
 
 
@@ -115,7 +186,24 @@ def get_layer_height(layer: Union[ArtLayer, LayerSet]) -> Union[float, int]:
 
 
 def get_bounds_no_effects(layer: Union[ArtLayer, LayerSet]) -> LayerBounds:
-    """Returns the bounds of a given layer without its effects applied.
+    """Returns the bounds of a given layer without its effects applied, reusing a cached measurement
+    within a bounds scope.
+
+    Args:
+        layer: A layer object
+
+    Returns:
+        list: Pixel location top left, top right, bottom left, bottom right.
+    """
+    return APP.bounds.get(
+        layer=layer,
+        kind='boundsNoEffects',
+        measure=lambda: measure_bounds_no_effects(layer),
+        layer_id=get_cached_layer_id(layer))
+
+
+def measure_bounds_no_effects(layer: Union[ArtLayer, LayerSet]) -> LayerBounds:
+    """Measures the bounds of a given layer without its effects applied.
 
     Args:
         layer: A layer object
@@ -137,7 +225,7 @@ def get_bounds_no_effects(layer: Union[ArtLayer, LayerSet]) -> LayerBounds:
             bounds.getInteger(sID('right')),
             bounds.getInteger(sID('bottom')))
     # Fallback to layer object bounds property
-    return layer.bounds
+    return tuple(layer.bounds)
 
 
 def get_dimensions_no_effects(layer: Union[ArtLayer, LayerSet]) -> type[LayerDimensions]:
@@ -162,6 +250,10 @@ def get_width_no_effects(layer: Union[ArtLayer, LayerSet]) -> int:
     Returns:
         int: Width of the layer in pixels.
     """
+    if APP.bounds.active:
+        # Reuse the cached bounds measurement
+        bounds = get_bounds_no_effects(layer)
+        return bounds[2] - bounds[0]
     with suppress(Exception):
         # Try getting bounds no effects
         d = get_layer_action_ref(layer)
@@ -179,6 +271,10 @@ def get_height_no_effects(layer: Union[ArtLayer, LayerSet]) -> int:
     Returns:
         int: Height of the layer in pixels.
     """
+    if APP.bounds.active:
+        # Reuse the cached bounds measurement
+        bounds = get_bounds_no_effects(layer)
+        return bounds[3] - bounds[1]
     with suppress(Exception):
         # Try getting bounds no effects
         d = get_layer_action_ref(layer)
@@ -204,6 +300,7 @@ def check_textbox_overflow(layer: ArtLayer) -> bool:
     # Create a test layer to check the difference
     height = get_layer_dimensions(layer)['height']
     layer.textItem.height = 1000
+    invalidate_bounds()
     dif = get_layer_dimensions(layer)['height'] - height
     undo_action()
     if dif > 0:
@@ -0,0 +1,236 @@
+"""
+* Helpers: Layer Change Sets
+"""
+# Standard Library Imports
+from typing import Union, Callable
+
+# Third Party Imports
+from photoshop.api import DialogModes, ActionDescriptor, ActionReference, ActionList
+from photoshop.api._artlayer import ArtLayer
+from photoshop.api._layerSet import LayerSet
+
+# Local Imports
+from src import APP
+from src.helpers.layers import get_layer_index
+from src.helpers.masks import copy_layer_mask, copy_vector_mask, enable_mask, enable_vector_mask
+from src.utils.adobe import PS_EXCEPTIONS
+
+# QOL Definitions
+sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
+NO_DIALOG = DialogModes.DisplayNoDialogs
+
+"""
+* Batched Actions
+"""
+
+
+def get_layer_id(layer: Union[ArtLayer, LayerSet]) -> int:
+    """Get a layer's ID, using the active layer index to avoid a round-trip where possible.
+
+    Args:
+        layer: ArtLayer or LayerSet object.
+
+    Returns:
+        The layer's ID.
+    """
+    if (index := get_layer_index()) and (layer_id := index.get_id(layer)):
+        return layer_id
+    return layer.id
+
+
+def get_layer_reference_list(layers: list[Union[ArtLayer, LayerSet]]) -> ActionList:
+    """Build an action list containing a reference to each layer.
+
+    Args:
+        layers: ArtLayer or LayerSet objects to reference.
+
+    Returns:
+        ActionList of layer references.
+    """
+    ref_list = ActionList()
+    for layer in layers:
+        ref = ActionReference()
+        ref.putIdentifier(sID('layer'), get_layer_id(layer))
+        ref_list.putReference(ref)
+    return ref_list
+
+
+def set_visible_layers(layers: list[Union[ArtLayer, LayerSet]], visible: bool = True) -> None:
+    """Show or hide multiple layers in a single action.
+
+    Args:
+        layers: ArtLayer or LayerSet objects to change.
+        visible: Whether to show or hide the layers.
+    """
+    desc1 = ActionDescriptor()
+    desc1.putList(sID('target'), get_layer_reference_list(layers))
+    APP.executeAction(sID('show' if visible else 'hide'), desc1, NO_DIALOG)
+
+
+def set_layer_masks(layers: list[Union[ArtLayer, LayerSet]], vector: bool = False, enabled: bool = True) -> None:
+    """Enable or disable the layer mask or vector mask of multiple layers in a single action.
+
+    Args:
+        layers: ArtLayer or LayerSet objects to change.
+        vector: Whether to change vector masks instead of layer masks.
+        enabled: Whether to enable or disable the masks.
+    """
+    desc1 = ActionDescriptor()
+    desc2 = ActionDescriptor()
+    desc1.putList(sID('target'), get_layer_reference_list(layers))
+    desc2.putBoolean(sID('vectorMaskEnabled' if vector else 'userMaskEnabled'), enabled)
+    desc1.putObject(sID('to'), sID('layer'), desc2)
+    APP.executeAction(sID('set'), desc1, NO_DIALOG)
+
+
+"""
+* Change Sets
+"""
+
+
+class LayerChangeSet:
+    """Collects layer visibility and mask changes, then commits them in as few actions as possible.
+
+    Notes:
+        - Changes are committed in the order they were queued. Consecutive changes of the same kind,
+            e.g. layers to show, or layer masks to enable, are committed together in a single action.
+        - Mask copies are committed one action per copy, and functions queued with `then` are called
+            in turn, so anything queued after them sees their result.
+        - If a batched action fails, its changes are applied one layer at a time instead.
+    """
+    SHOW = 'show'
+    HIDE = 'hide'
+    MASK = 'mask'
+    VECTOR_MASK = 'vector_mask'
+    COPY = 'copy'
+    FUNC = 'func'
+
+    def __init__(self):
+        self.changes: list[tuple[str, tuple]] = []
+
+    def __enter__(self) -> 'LayerChangeSet':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+    """
+    * Queuing Changes
+    """
+
+    def add(self, kind: str, *layers: Union[ArtLayer, LayerSet, None]) -> 'LayerChangeSet':
+        """Queue a batchable change for each layer, empty layer references are skipped."""
+        self.changes.extend((kind, (x,)) for x in layers if x)
+        return self
+
+    def show(self, *layers: Union[ArtLayer, LayerSet, None]) -> 'LayerChangeSet':
+        """Queue layers to be made visible, empty layer references are skipped."""
+        return self.add(self.SHOW, *layers)
+
+    def hide(self, *layers: Union[ArtLayer, LayerSet, None]) -> 'LayerChangeSet':
+        """Queue layers to be hidden, empty layer references are skipped."""
+        return self.add(self.HIDE, *layers)
+
+    def enable_mask(self, *layers: Union[ArtLayer, LayerSet, None]) -> 'LayerChangeSet':
+        """Queue layers to have their layer mask enabled, empty layer references are skipped."""
+        return self.add(self.MASK, *layers)
+
+    def enable_vector_mask(self, *layers: Union[ArtLayer, LayerSet, None]) -> 'LayerChangeSet':
+        """Queue layers to have their vector mask enabled, empty layer references are skipped."""
+        return self.add(self.VECTOR_MASK, *layers)
+
+    def copy_mask(
+        self,
+        layer_from: Union[ArtLayer, LayerSet],
+        layer_to: Union[ArtLayer, LayerSet],
+        vector: bool = False
+    ) -> 'LayerChangeSet':
+        """Queue a layer mask or vector mask to be copied from one layer to another.
+
+        Args:
+            layer_from: Layer to copy from.
+            layer_to: Layer to copy to.
+            vector: Whether to copy the vector mask instead of the layer mask.
+        """
+        self.changes.append((self.COPY, (layer_from, layer_to, vector)))
+        return self
+
+    def then(self, func: Callable, layer: Union[ArtLayer, LayerSet, None] = None) -> 'LayerChangeSet':
+        """Queue a function to call with a layer once the changes queued before it are committed.
+
+        Args:
+            func: Function to call.
+            layer: Layer to pass to the function.
+        """
+        self.changes.append((self.FUNC, (func, layer)))
+        return self
+
+    """
+    * Committing Changes
+    """
+
+    @staticmethod
+    def apply(
+        layers: list[Union[ArtLayer, LayerSet]],
+        batched: Callable[[list], None],
+        fallback: Callable[[Union[ArtLayer, LayerSet]], None]
+    ) -> None:
+        """Apply a change to a list of layers in one batched action, falling back to one layer at a time.
+
+        Args:
+            layers: Layers to change.
+            batched: Function applying the change to every layer at once.
+            fallback: Function applying the change to a single layer.
+        """
+        if not layers:
+            return
+        if len(layers) > 1:
+            try:
+                return batched(layers)
+            except PS_EXCEPTIONS:
+                pass
+        for layer in layers:
+            fallback(layer)
+
+    def commit_batch(self, kind: str, layers: list[Union[ArtLayer, LayerSet]]) -> None:
+        """Commit a run of consecutive changes of the same kind.
+
+        Args:
+            kind: Kind of change, e.g. `SHOW` or `MASK`.
+            layers: Layers to change.
+        """
+        if kind == self.SHOW:
+            self.apply(layers, lambda x: set_visible_layers(x, True), lambda x: setattr(x, 'visible', True))
+        elif kind == self.HIDE:
+            self.apply(layers, lambda x: set_visible_layers(x, False), lambda x: setattr(x, 'visible', False))
+        elif kind == self.MASK:
+            self.apply(layers, lambda x: set_layer_masks(x, vector=False), enable_mask)
+        elif kind == self.VECTOR_MASK:
+            self.apply(layers, lambda x: set_layer_masks(x, vector=True), enable_vector_mask)
+
+    def commit(self) -> None:
+        """Commit every queued change in order, then clear the change set."""
+        kind, batch = None, []
+        for change, args in [*self.changes, (None, ())]:
+            # Extend the current run of batchable changes
+            if change == kind and change not in (self.COPY, self.FUNC):
+                batch.extend(args)
+                continue
+
+            # Commit the current run, then start the next
+            self.commit_batch(kind, batch)
+            kind, batch = change, []
+            if change == self.COPY:
+                layer_from, layer_to, vector = args
+                (copy_vector_mask if vector else copy_layer_mask)(layer_from, layer_to)
+            elif change == self.FUNC:
+                func, layer = args
+                func(layer)
+            else:
+                batch.extend(args)
+        self.clear()
+
+    def clear(self) -> None:
+        """Discard every queued change."""
+        self.changes.clear()
@@ -11,7 +11,8 @@
 # Local Imports
 from src import APP, CON
 from src.enums.layers import LAYERS
-from src.schema.colors import pinlines_color_map, ColorObject
+from src.helpers.descriptors import get_value_key
+from src.schema.colors import pinlines_color_map, ColorObject, GradientColor
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -273,6 +274,70 @@ def get_pinline_gradient(
     return color_map.get(colors, [0, 0, 0])
 
 
+"""
+* Color Descriptors
+"""
+
+
+def get_rgb_descriptor(color: list[int]) -> ActionDescriptor:
+    """Get a reusable RGB color descriptor, built once per unique color.
+
+    Args:
+        color: List of integers for R, G, B.
+
+    Returns:
+        RGBColor action descriptor.
+    """
+    def _build() -> ActionDescriptor:
+        ad = ActionDescriptor()
+        ad.putDouble(sID("red"), color[0])
+        ad.putDouble(sID("green"), color[1])
+        ad.putDouble(sID("blue"), color[2])
+        return ad
+    return APP.descriptors.get(('RGBColor', *color[:3]), _build)
+
+
+def get_cmyk_descriptor(color: list[int]) -> ActionDescriptor:
+    """Get a reusable CMYK color descriptor, built once per unique color.
+
+    Args:
+        color: List of integers for C, M, Y, K.
+
+    Returns:
+        CMYKColorClass action descriptor.
+    """
+    def _build() -> ActionDescriptor:
+        ad = ActionDescriptor()
+        ad.putDouble(sID("cyan"), color[0])
+        ad.putDouble(sID("magenta"), color[1])
+        ad.putDouble(sID("yellowColor"), color[2])
+        ad.putDouble(sID("black"), color[3])
+        return ad
+    return APP.descriptors.get(('CMYKColorClass', *color[:4]), _build)
+
+
+def get_gradient_color_list(colors: list[Union[dict, GradientColor]]) -> ActionList:
+    """Get a reusable list of gradient color stops, built once per unique gradient.
+
+    Args:
+        colors: Gradient color dicts or GradientColor objects, each with a color, location, and midpoint.
+
+    Returns:
+        ActionList of gradient color stops.
+    """
+    def _build() -> ActionList:
+        color_list = ActionList()
+        for c in colors:
+            c = c if isinstance(c, dict) else dict(c)
+            add_color_to_gradient(
+                action_list=color_list,
+                color=get_color(c.get('color', [0, 0, 0])),
+                location=int(c.get('location', 0)),
+                midpoint=int(c.get('midpoint', 50)))
+        return color_list
+    return APP.descriptors.get(('colorStops', get_value_key(colors)), _build)
+
+
 """
 * Applying Color Objects
 """
@@ -286,11 +351,7 @@ def apply_rgb_from_list(action: ActionDescriptor, color: list[int], color_type:
         color: List of integers for R, G, B.
         color_type: Color action descriptor type, defaults to 'color'.
     """
-    ad = ActionDescriptor()
-    ad.putDouble(sID("red"), color[0])
-    ad.putDouble(sID("green"), color[1])
-    ad.putDouble(sID("blue"), color[2])
-    action.putObject(sID(color_type), sID("RGBColor"), ad)
+    action.putObject(sID(color_type), sID("RGBColor"), get_rgb_descriptor(color))
 
 
 def apply_cmyk_from_list(action: ActionDescriptor, color: list[int], color_type: str = 'color') -> None:
@@ -301,12 +362,7 @@ def apply_cmyk_from_list(action: ActionDescriptor, color: list[int], color_type:
         color: List of integers for R, G, B.
         color_type: Color action descriptor type, defaults to 'color'.
     """
-    ad = ActionDescriptor()
-    ad.putDouble(sID("cyan"), color[0])
-    ad.putDouble(sID("magenta"), color[1])
-    ad.putDouble(sID("yellowColor"), color[2])
-    ad.putDouble(sID("black"), color[3])
-    action.putObject(sID(color_type), sID("CMYKColorClass"), ad)
+    action.putObject(sID(color_type), sID("CMYKColorClass"), get_cmyk_descriptor(color))
 
 
 def apply_rgb(action: ActionDescriptor, c: SolidColor, color_type: str = 'color') -> None:
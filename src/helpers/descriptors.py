@@ -2,10 +2,11 @@
 * Helpers: PS Object Descriptors
 """
 # Standard Library Imports
-from typing import Union
+from typing import Union, Any, Hashable
 
 # Third Party Imports
-from photoshop.api import DialogModes, ActionReference
+from omnitils.schema import Schema
+from photoshop.api import DialogModes, ActionReference, ColorModel, SolidColor
 from photoshop.api._artlayer import ArtLayer
 from photoshop.api._layerSet import LayerSet
 
@@ -33,3 +34,30 @@ def get_layer_action_ref(layer: Union[ArtLayer, LayerSet]) -> ActionReference:
     ref = ActionReference()
     ref.putIdentifier(sID('layer'), layer.id)
     return APP.executeActionGet(ref)
+
+
+"""
+* Descriptor Cache Keys
+"""
+
+
+def get_value_key(value: Any) -> Hashable:
+    """Convert a value used to build an action descriptor into a hashable cache key.
+
+    Args:
+        value: Color notation, SolidColor, schema model, or a list or dict of these.
+
+    Returns:
+        Hashable key which is equal for any two values that build the same descriptor.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(get_value_key(n) for n in value)
+    if isinstance(value, dict):
+        return tuple(sorted(((k, get_value_key(v)) for k, v in value.items()), key=lambda n: str(n[0])))
+    if isinstance(value, Schema):
+        return type(value).__name__, tuple((k, get_value_key(v)) for k, v in value)
+    if isinstance(value, SolidColor):
+        if value.model == ColorModel.CMYKModel:
+            return 'CMYK', value.cmyk.cyan, value.cmyk.magenta, value.cmyk.yellow, value.cmyk.black
+        return 'RGB', value.rgb.red, value.rgb.green, value.rgb.blue
+    return value
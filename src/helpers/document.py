@@ -4,6 +4,7 @@
 # Standard Library Imports
 from pathlib import Path
 from typing import Optional, Union
+from uuid import uuid4
 
 # Third Party Imports
 from photoshop.api import (
@@ -23,9 +24,10 @@
 from photoshop.api._document import Document
 
 # Local Imports
-from src import APP
-from src.helpers.layers import create_new_layer
-from src.utils.adobe import PS_EXCEPTIONS
+from src import APP, PATH
+from src.helpers.layers import create_new_layer, invalidate_layer_index
+from src.utils.adobe import DocumentMetrics, PS_EXCEPTIONS
+from src.utils.encoding import EncodeOptions
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -79,7 +81,8 @@ def import_art(
     layer: ArtLayer,
     path: Union[str, Path],
     name: str = 'Layer 1',
-    docref: Optional[Document] = None
+    docref: Optional[Document] = None,
+    transform: Optional[tuple[float, float, float]] = None
 ) -> ArtLayer:
     """Imports an art file into the active layer.
 
@@ -88,6 +91,8 @@ def import_art(
         path: Image file to import.
         name: Name of the new layer.
         docref: Reference document if provided, otherwise use active.
+        transform: Scale percentage, horizontal offset, and vertical offset applied while placing the image,
+            relative to its default placement.
 
     Returns:
         Imported art layer.
@@ -96,7 +101,17 @@ def import_art(
     docref = docref or APP.activeDocument
     docref.activeLayer = layer
     desc.putPath(sID('target'), str(path))
+    if transform:
+        percent, dx, dy = transform
+        desc2 = ActionDescriptor()
+        desc.putEnumerated(sID('freeTransformCenterState'), sID('quadCenterState'), sID('QCSAverage'))
+        desc2.putUnitDouble(sID('horizontal'), sID('pixelsUnit'), dx)
+        desc2.putUnitDouble(sID('vertical'), sID('pixelsUnit'), dy)
+        desc.putObject(sID('offset'), sID('offset'), desc2)
+        desc.putUnitDouble(sID('width'), sID('percentUnit'), percent)
+        desc.putUnitDouble(sID('height'), sID('percentUnit'), percent)
     APP.executeAction(sID('placeEvent'), desc)
+    invalidate_layer_index()
     docref.activeLayer.name = name
     return docref.activeLayer
 
@@ -123,6 +138,7 @@ def import_svg(
     docref = docref or APP.activeDocument
     desc.putPath(sID('target'), str(path))
     APP.executeAction(sID('placeEvent'), desc)
+    invalidate_layer_index()
 
     # Position the layer if needed
     if ref and placement:
@@ -168,6 +184,7 @@ def paste_file(
 
     # Paste the image into the specific layer
     docref.paste()
+    invalidate_layer_index()
     return docref.activeLayer
 
 
@@ -320,6 +337,25 @@ def get_document(name: str) -> Optional[Document]:
         return
 
 
+def get_document_metrics(docref: Optional[Document] = None) -> DocumentMetrics:
+    """Get the canvas size and resolution of a document, reusing the values read for the active template
+    document when it is still active.
+
+    Args:
+        docref: Document to measure, uses the active template document or active document if not provided.
+
+    Returns:
+        Dict containing width, height, and resolution.
+    """
+    if not docref and (metrics := APP.session.active_metrics):
+        return metrics
+    docref = docref or APP.activeDocument
+    return DocumentMetrics(
+        width=int(docref.width),
+        height=int(docref.height),
+        resolution=float(docref.resolution))
+
+
 """
 * Resize Document
 """
@@ -393,6 +429,31 @@ def save_document_jpeg(path: Path, optimize: bool = True, docref: Optional[Docum
         raise OSError from e
 
 
+def save_document_deferred(path: Path, options: EncodeOptions, docref: Optional[Document] = None) -> None:
+    """Save the current document as an uncompressed PNG, then encode the requested output files from it
+    in the background.
+
+    Notes:
+        - Returns as soon as Photoshop has written the PNG, unless the background encoders are behind.
+        - Call `APP.encoder.join` to wait for every queued output file.
+
+    Args:
+        path: Path of the rendered image, its extension is replaced for each output format.
+        options: Output formats, quality, and downscaled width.
+        docref: Current active document. Use active if not provided.
+    """
+    docref = docref or APP.activeDocument
+    source = (PATH.LOGS_ENCODE / uuid4().hex).with_suffix('.png')
+    png_options = PNGSaveOptions()
+    png_options.compression = 0
+    png_options.interlaced = False
+    docref.saveAs(
+        file_path=str(source),
+        options=png_options,
+        asCopy=True)
+    APP.encoder.submit(source=source, path=path, options=options)
+
+
 def save_document_psd(path: Path, docref: Optional[Document] = None) -> None:
     """Save the current document as a PSD.
 
@@ -11,7 +11,8 @@
 
 # Local Imports
 from src import APP
-from src.helpers.colors import apply_color, get_color, add_color_to_gradient
+from src.helpers.colors import apply_color, get_color, get_gradient_color_list
+from src.helpers.descriptors import get_value_key
 from src.enums.adobe import Stroke
 from src.schema.adobe import EffectBevel, EffectColorOverlay, EffectDropShadow, EffectGradientOverlay, EffectStroke, \
     LayerEffects
@@ -160,8 +161,23 @@ def apply_fx(layer: Union[ArtLayer, LayerSet], effects: list[LayerEffects]) -> N
         layer: Layer or Layer Set object.
         effects: List of effects to apply.
     """
-    # Set up the main action
+    # Target the active layer, apply the effects action
     APP.activeDocument.activeLayer = layer
+    main_action = APP.descriptors.get(
+        ('setLayerEffects', get_value_key(effects)),
+        lambda: get_fx_action(effects))
+    APP.executeAction(sID("set"), main_action, NO_DIALOG)
+
+
+def get_fx_action(effects: list[LayerEffects]) -> ActionDescriptor:
+    """Build an action which sets multiple layer effects on the active layer.
+
+    Args:
+        effects: List of effects to apply.
+
+    Returns:
+        Action descriptor for a 'set' action.
+    """
     main_action = ActionDescriptor()
     fx_action = ActionDescriptor()
     main_ref = ActionReference()
@@ -182,9 +198,9 @@ def apply_fx(layer: Union[ArtLayer, LayerSet], effects: list[LayerEffects]) -> N
         elif isinstance(fx, EffectStroke):
             apply_fx_stroke(fx_action, fx)
 
-    # Apply all fx actions
+    # Add all fx actions
     main_action.putObject(sID("to"), sID("layerEffects"), fx_action)
-    APP.executeAction(sID("set"), main_action, NO_DIALOG)
+    return main_action
 
 
 def apply_fx_bevel(action: ActionDescriptor, fx: EffectBevel) -> None:
@@ -268,20 +284,12 @@ def apply_fx_gradient_overlay(action: ActionDescriptor, fx: EffectGradientOverla
     d3 = ActionDescriptor()
     d4 = ActionDescriptor()
     d5 = ActionDescriptor()
-    color_list = ActionList()
     transparency_list = ActionList()
     d1.putEnumerated(sID("mode"), sID("blendMode"), sID("normal"))
     d1.putUnitDouble(sID("opacity"), sID("percentUnit"),  fx.opacity)
     d2.putEnumerated(sID("gradientForm"), sID("gradientForm"), sID("customStops"))
     d2.putDouble(sID("interfaceIconFrameDimmed"),  fx.size)
-    for c in fx.colors:
-        add_color_to_gradient(
-            action_list=color_list,
-            color=get_color(c.color),
-            location=c.location,
-            midpoint=c.midpoint
-        )
-    d2.putList(sID("colors"),  color_list)
+    d2.putList(sID("colors"), get_gradient_color_list(fx.colors))
     d3.putUnitDouble(sID("opacity"), sID("percentUnit"),  100)
     d3.putInteger(sID("location"),  0)
     d3.putInteger(sID("midpoint"),  50)
@@ -13,18 +13,37 @@
 
 # Local Imports
 from src import APP, ENV
-from src.utils.adobe import LayerContainer, LayerContainerTypes, ReferenceLayer, PS_EXCEPTIONS
+from src.utils.adobe import LayerContainer, LayerContainerTypes, LayerIndex, ReferenceLayer, PS_EXCEPTIONS
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
 NO_DIALOG = DialogModes.DisplayNoDialogs
 
 
+"""
+* Layer Index
+"""
+
+
+def get_layer_index() -> Optional[LayerIndex]:
+    """Optional[LayerIndex]: Layer index of the active template document, if one is available."""
+    with suppress(Exception):
+        return APP.session.active_index
+    return
+
+
+def invalidate_layer_index() -> None:
+    """Mark the active template's layer index stale after the structure of the document changes."""
+    if index := get_layer_index():
+        index.invalidate()
+
+
 """
 * Searching Layers
 """
 
 
+@APP.profiler.timed('getLayer')
 def getLayer(
     name: str,
     group: Union[str, None, list[str], LayerContainerTypes, Iterable[LayerContainerTypes]] = None
@@ -38,6 +57,9 @@ def getLayer(
     Returns:
         Layer object requested
     """
+    # Check the layer index before walking the document
+    if (index := get_layer_index()) and (layer := index.lookup(name, group, LayerIndex.KIND_LAYER)):
+        return layer
     try:
         # LayerSet provided?
         if not group:
@@ -73,6 +95,7 @@ def getLayer(
     return
 
 
+@APP.profiler.timed('getLayerSet')
 def getLayerSet(
     name: str,
     group: Union[str, None, list[str], LayerContainerTypes, Iterable[LayerContainerTypes]] = None
@@ -86,6 +109,9 @@ def getLayerSet(
     Returns:
         Group object requested.
     """
+    # Check the layer index before walking the document
+    if (index := get_layer_index()) and (layer_set := index.lookup(name, group, LayerIndex.KIND_GROUP)):
+        return layer_set
     try:
         # Was LayerSet provided?
         if not group:
@@ -175,6 +201,7 @@ def create_new_layer(layer_name: Optional[str] = None) -> ArtLayer:
 
     # Move the layer below
     layer.moveAfter(active_layer)
+    invalidate_layer_index()
     return layer
 
 
@@ -202,6 +229,7 @@ def merge_layers(layers: list[ArtLayer] = None, name: Optional[str] = None) -> A
 
     # Merge layers and return result
     APP.executeAction(sID("mergeLayersNew"), None, NO_DIALOG)
+    invalidate_layer_index()
     if name:
         APP.activeDocument.activeLayer.name = name
     return APP.activeDocument.activeLayer
@@ -244,6 +272,7 @@ def group_layers(
     desc1.putInteger(sID("layerSectionEnd"), 1)
     desc1.putString(cID('Nm  '), name)
     APP.executeAction(cID('Mk  '), desc1, NO_DIALOG)
+    invalidate_layer_index()
     return APP.activeDocument.activeLayer
 
 
@@ -263,6 +292,7 @@ def duplicate_group(name: str) -> LayerSet:
     desc241.putString(sID("name"), name)
     desc241.putInteger(sID("version"),  5)
     APP.executeAction(sID("duplicate"), desc241, NO_DIALOG)
+    invalidate_layer_index()
     return APP.activeDocument.activeLayer
 
 
@@ -275,6 +305,7 @@ def merge_group(group: Optional[LayerSet] = None) -> None:
     if group:
         APP.activeDocument.activeLayer = group
     APP.executeAction(sID("mergeLayersNew"), None, NO_DIALOG)
+    invalidate_layer_index()
 
 
 """
@@ -293,6 +324,7 @@ def smart_layer(layer: Union[ArtLayer, LayerSet] = None, docref: Optional[Docume
     if layer:
         docref.activeLayer = layer
     APP.executeAction(sID("newPlacedLayer"), None, NO_DIALOG)
+    invalidate_layer_index()
     return docref.activeLayer
 
 
@@ -307,6 +339,7 @@ def edit_smart_layer(layer: Optional[ArtLayer] = None, docref: Optional[Document
         docref = docref or APP.activeDocument
         docref.activeLayer = layer
     APP.executeAction(sID("placedLayerEditContents"), None, NO_DIALOG)
+    APP.document_changed()
 
 
 def unpack_smart_layer(layer: Optional[ArtLayer] = None, docref: Optional[Document] = None) -> None:
@@ -320,6 +353,7 @@ def unpack_smart_layer(layer: Optional[ArtLayer] = None, docref: Optional[Docume
         docref = docref or APP.activeDocument
         docref.activeLayer = layer
     APP.executeAction(sID("placedLayerConvertToLayers"), None, NO_DIALOG)
+    invalidate_layer_index()
 
 
 """
@@ -3,6 +3,7 @@
 """
 # Standard Library Imports
 import math
+from pathlib import Path
 from typing import Optional, Union
 
 # Third Party Imports
@@ -16,17 +17,22 @@
 from src import APP
 from src.enums.adobe import Dimensions
 from src.helpers.bounds import (
+    get_layer_bounds,
     get_layer_dimensions,
     get_dimensions_from_bounds,
     LayerDimensions,
     get_layer_width,
-    get_layer_height)
+    get_layer_height,
+    invalidate_bounds,
+    reuse_bounds)
+from src.helpers.document import get_document_metrics, import_art
 from src.helpers.selection import (
     select_overlapping,
     check_selection_bounds,
     select_bounds)
 from src.helpers.text import get_font_size, set_text_size_and_leading
 from src.utils.adobe import ReferenceLayer
+from src.utils.images import apply_frame_transform, get_frame_transform, get_placed_box
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -74,6 +80,7 @@ def align(
 
     # Shift location using the position difference
     layer.translate(x, y)
+    invalidate_bounds(layer)
 
 
 def align_all(
@@ -152,10 +159,11 @@ def position_between_layers(
         docref: Document reference, use active if not provided.
     """
     docref = docref or APP.activeDocument
-    bounds = (0, top_layer.bounds[3], docref.width, bottom_layer.bounds[1])
+    bounds = (0, get_layer_bounds(top_layer)[3], docref.width, get_layer_bounds(bottom_layer)[1])
     align_vertical(layer, get_dimensions_from_bounds(bounds))
 
 
+@reuse_bounds
 def position_dividers(
     dividers: list[Union[ArtLayer, LayerSet]],
     layers: list[Union[ArtLayer, LayerSet]],
@@ -163,11 +171,15 @@ def position_dividers(
 ) -> None:
     """Positions a list of dividers between a list of layers.
 
+    Note:
+        Each layer is only measured once, since moving a divider doesn't move the layers around it.
+
     Args:
         dividers: Divider layers to position, should contain 1 fewer objects than layers param.
         layers: Layers to position the dividers between.
         docref: Document reference, use active if not provided.
     """
+    docref = docref or APP.activeDocument
     for i in range(len(layers) - 1):
         position_between_layers(
             layer=dividers[i],
@@ -176,6 +188,7 @@ def position_dividers(
             docref=docref)
 
 
+@reuse_bounds
 def spread_layers_over_reference(
     layers: list[ArtLayer],
     ref: ReferenceLayer,
@@ -192,27 +205,26 @@ def spread_layers_over_reference(
         inside_gap: Gap between each layer, calculated using leftover space if not provided.
         outside_matching: If enabled, will enforce top and bottom gap to match.
     """
-    # Get reference dimensions if not provided
+    # Get reference dimensions, space left over after the height of every layer if gaps need calculating
     height = ref.dims['height']
+    total_space = height - sum(
+        [get_layer_height(layer) for layer in layers]) if not (gap and inside_gap) else 0
 
     # Calculate outside gap if not provided
     outside_gap = gap
     if not gap:
-        total_space = height - sum(
-            [get_layer_dimensions(layer)['height'] for layer in layers])
         outside_gap = total_space / (len(layers) + 1)
 
     # Position the top layer relative to the reference
-    delta = (ref.bounds[1] + outside_gap) - layers[0].bounds[1]
+    delta = (ref.bounds[1] + outside_gap) - get_layer_bounds(layers[0])[1]
     layers[0].translate(0, delta)
+    invalidate_bounds(layers[0])
 
     # Calculate inside gap if not provided
     if gap and not inside_gap:
-        # Calculate the inside gap
+        # Calculate the inside gap, translating the top layer doesn't change its height
         ignored = 2 if outside_matching else 1
         spaces = len(layers) - 1 if outside_matching else len(layers)
-        total_space = height - sum(
-            [get_layer_dimensions(layer)['height'] for layer in layers])
         inside_gap = (total_space - (ignored * gap)) / spaces
     elif not gap:
         # Use the outside gap uniformly
@@ -222,6 +234,7 @@ def spread_layers_over_reference(
     space_layers_apart(layers, inside_gap)
 
 
+@reuse_bounds
 def space_layers_apart(layers: list[Union[ArtLayer, LayerSet]], gap: Union[int, float]) -> None:
     """Position list of layers apart using a given gap.
 
@@ -231,8 +244,9 @@ def space_layers_apart(layers: list[Union[ArtLayer, LayerSet]], gap: Union[int,
     """
     # Position each layer relative to the one above it
     for i in range((len(layers) - 1)):
-        delta = (layers[i].bounds[3] + gap) - layers[i + 1].bounds[1]
+        delta = (get_layer_bounds(layers[i])[3] + gap) - get_layer_bounds(layers[i + 1])[1]
         layers[i + 1].translate(0, delta)
+        invalidate_bounds(layers[i + 1])
 
 
 """
@@ -240,6 +254,7 @@ def space_layers_apart(layers: list[Union[ArtLayer, LayerSet]], gap: Union[int,
 """
 
 
+@reuse_bounds
 def frame_layer(
     layer: Union[ArtLayer, LayerSet],
     ref: Union[ArtLayer, LayerSet, type[LayerDimensions]],
@@ -268,11 +283,13 @@ def frame_layer(
         (ref_dim['width'] / layer_dim['width']),
         (ref_dim['height'] / layer_dim['height']))
     layer.resize(scale, scale, anchor)
+    invalidate_bounds(layer)
 
     # Default alignments are center horizontal and vertical
     align(alignments or [Dimensions.CenterX, Dimensions.CenterY], layer, ref_dim)
 
 
+@reuse_bounds
 def frame_layer_by_height(
     layer: Union[ArtLayer, LayerSet],
     ref: Union[ArtLayer, LayerSet, type[LayerDimensions]],
@@ -295,11 +312,13 @@ def frame_layer_by_height(
     # Scale the layer to fit the height of the reference
     scale = scale * (ref_dim['height'] / get_layer_height(layer))
     layer.resize(scale, scale, anchor)
+    invalidate_bounds(layer)
 
     # Default alignments are center horizontal and vertical
     align(alignments or [Dimensions.CenterX, Dimensions.CenterY], layer, ref_dim)
 
 
+@reuse_bounds
 def frame_layer_by_width(
     layer: Union[ArtLayer, LayerSet],
     ref: Union[ArtLayer, LayerSet, type[LayerDimensions]],
@@ -322,11 +341,64 @@ def frame_layer_by_width(
     # Scale the layer to fit the height of the reference
     scale = scale * (ref_dim['width'] / get_layer_width(layer))
     layer.resize(scale, scale, anchor)
+    invalidate_bounds(layer)
 
     # Default alignments are center horizontal and vertical
     align(alignments or [Dimensions.CenterX, Dimensions.CenterY], layer, ref_dim)
 
 
+def import_art_framed(
+    layer: ArtLayer,
+    path: Union[str, Path],
+    ref: Union[ArtLayer, LayerSet, type[LayerDimensions]],
+    smallest: bool = False,
+    scale: int = 100,
+    docref: Optional[Document] = None
+) -> ArtLayer:
+    """Import an art file, scaled and centered within the bounds of a reference, as `frame_layer` would.
+
+    Notes:
+        - Where the art's placement can be predicted from its file header, the art is scaled and
+            positioned by the place action itself, then measured once to verify the result.
+        - Art with transparency, or whose placement can't be predicted or verified, is imported
+            normally and framed with `frame_layer`.
+
+    Args:
+        layer: Layer to make active and receive the image.
+        path: Image file to import.
+        ref: Reference frame to position within.
+        smallest: Whether to scale to smallest or largest edge.
+        scale: Percentage of the reference size to scale to, defaults to 100.
+        docref: Reference document if provided, otherwise use active.
+
+    Returns:
+        Imported art layer.
+    """
+    header = APP.art_probes.get(path)
+    resize = APP.place_resizes_to_canvas
+    if header and not header['alpha'] and resize is not None:
+        # Predict where the art is placed, then place it framed
+        metrics = get_document_metrics()
+        placed = get_placed_box(
+            header=header,
+            canvas=(metrics['width'], metrics['height']),
+            resolution=metrics['resolution'],
+            resize_to_canvas=resize)
+        ref_dim = ref if isinstance(ref, dict) else get_layer_dimensions(ref)
+        ref_bounds = (ref_dim['left'], ref_dim['top'], ref_dim['right'], ref_dim['bottom'])
+        transform = get_frame_transform(placed, ref_bounds, smallest=smallest, scale=scale)
+        layer = import_art(layer=layer, path=path, docref=docref, transform=transform)
+
+        # Verify the prediction, reframe normally if it missed
+        expected = apply_frame_transform(placed, *transform)
+        if all(abs(a - b) <= 2 for a, b in zip(get_layer_bounds(layer), expected)):
+            return layer
+    else:
+        layer = import_art(layer=layer, path=path, docref=docref)
+    frame_layer(layer=layer, ref=ref, smallest=smallest, scale=scale)
+    return layer
+
+
 """
 * Positioning by Reference
 """
@@ -377,10 +449,12 @@ def clear_reference_vertical(
     # Check if selection is empty, if not translate our layer to clear the reference
     if delta < 0:
         layer.translate(0, delta)
+        invalidate_bounds(layer)
         return delta
     return 0
 
 
+@reuse_bounds
 def clear_reference_vertical_multi(
     text_layers: list[ArtLayer],
     ref: ReferenceLayer,
@@ -421,7 +495,7 @@ def clear_reference_vertical_multi(
     # Calculate inside gap
     total_space = ref.dims['height'] - sum([get_layer_height(layer) for layer in text_layers])
     if not uniform_gap:
-        inside_gap = ((total_space - space) - (ref.bounds[3] - layers[-1].bounds[1])) / movable
+        inside_gap = ((total_space - space) - (ref.bounds[3] - get_layer_bounds(layers[-1])[1])) / movable
     else:
         inside_gap = total_space / (len(layers) + 1)
     leftover = (inside_gap - space) * movable
@@ -446,6 +520,7 @@ def clear_reference_vertical_multi(
         for n, lyr in enumerate(layers):
             move_y = delta * ((len(layers) - n)/len(layers))
             lyr.translate(0, move_y)
+            invalidate_bounds(lyr)
         return
 
     # Layer gap would be too small, need to resize text then shift upward
@@ -2,7 +2,7 @@
 * Helpers: Text Items
 """
 # Standard Library Imports
-from typing import Union, Optional, Any
+from typing import Union, Optional, Any, Callable
 
 # Third Party Imports
 from photoshop.api import (
@@ -22,7 +22,8 @@
     get_layer_height,
     get_layer_width,
     get_textbox_width,
-    get_width_no_effects)
+    get_width_no_effects,
+    invalidate_bounds)
 from src.helpers.document import pixels_to_points
 from src.utils.adobe import PS_EXCEPTIONS
 
@@ -512,6 +513,112 @@ def set_font(layer: ArtLayer, font_name: str) -> None:
         font_name:  Name of the font to set.
     """
     layer.textItem.font = APP.fonts.getByName(font_name).postScriptName
+    invalidate_bounds()
+
+
+"""
+* Fitting Font Size
+"""
+
+
+def estimate_fit_size(
+    font_size: float,
+    measured: Union[int, float],
+    limit: Union[int, float],
+    exponent: float = 1
+) -> float:
+    """Estimate the font size at which a text layer will fit a dimension, without measuring the text again.
+
+    Args:
+        font_size: Current font size of the text.
+        measured: Current measurement of the text in the fitted dimension.
+        limit: Measurement the text must fit within.
+        exponent: How the measurement grows with font size, 1 for a single line of text,
+            2 for paragraph text which wraps to more lines as it grows.
+
+    Returns:
+        Estimated font size.
+    """
+    if measured <= 0:
+        return font_size
+    return font_size * min(limit / measured, 1) ** (1 / exponent)
+
+
+def fit_font_size(
+    apply: Callable[[float], None],
+    fits: Callable[[], bool],
+    font_size: float,
+    step: float,
+    estimate: Optional[float] = None,
+    kind: str = 'fit_font_size'
+) -> float:
+    """Find the largest font size, on a grid of `step` increments below the starting size, at which the text fits.
+
+    Notes:
+        - The starting size is assumed not to fit.
+        - The search is bracketed around the estimated size, then narrowed by bisection, so the number of
+            measurements grows with the log of the distance between the starting and fitted sizes.
+        - The number of measurements made is recorded by the render profiler.
+
+    Args:
+        apply: Function which applies a font size to the text.
+        fits: Function which measures the text and returns whether it fits.
+        font_size: Starting font size of the text.
+        step: Smallest font size increment to consider.
+        estimate: Estimated font size at which the text will fit, starts one step down if not provided.
+        kind: Name of the fitting operation, used when recording measurements.
+
+    Returns:
+        The fitted font size, which is applied to the text.
+    """
+    # Grid positions are counted in steps below the starting size, the starting size never fits
+    last = max(int(font_size / step) - 1, 1)
+    seed = 1 if estimate is None else min(max(round((font_size - estimate) / step), 1), last)
+    fail, fit, applied, measurements = 0, None, None, 0
+
+    def _test(m: int) -> bool:
+        nonlocal applied, measurements
+        apply(font_size - m * step)
+        applied, measurements = m, measurements + 1
+        return fits()
+
+    # Bracket the fitted size, starting from the estimate
+    delta = 1
+    if _test(seed):
+        fit = seed
+        while fit - fail > 1:
+            probe = max(fit - delta, fail + 1)
+            if not _test(probe):
+                fail = probe
+                break
+            fit, delta = probe, delta * 2
+    else:
+        fail = seed
+        while fail < last:
+            probe = min(fail + delta, last)
+            if _test(probe):
+                fit = probe
+                break
+            fail, delta = probe, delta * 2
+
+    # Nothing fits, keep the smallest size
+    if fit is None:
+        APP.profiler.fit(kind, measurements)
+        return font_size - applied * step
+
+    # Narrow the bracket
+    while fit - fail > 1:
+        mid = (fit + fail) // 2
+        if _test(mid):
+            fit = mid
+        else:
+            fail = mid
+
+    # Ensure the fitted size is the one applied
+    if applied != fit:
+        apply(font_size - fit * step)
+    APP.profiler.fit(kind, measurements)
+    return font_size - fit * step
 
 
 """
@@ -534,6 +641,7 @@ def ensure_visible_reference(reference: ArtLayer) -> Optional[TextItem]:
         if reference.bounds == (0, 0, 0, 0):
             TI = reference.textItem
             TI.contents = "."
+            invalidate_bounds()
             return TI
     return None
 
@@ -562,6 +670,7 @@ def scale_text_right_overlap(layer: ArtLayer, reference: ArtLayer, gap: int = 30
         # Reset reference
         if ref_TI:
             ref_TI.contents = ''
+            invalidate_bounds()
         return
 
     # Make our first check if scaling is necessary
@@ -584,11 +693,13 @@ def scale_text_right_overlap(layer: ArtLayer, reference: ArtLayer, gap: int = 30
 
         # Shift baseline up to keep text centered vertically
         layer.textItem.baselineShift = (old_size * 0.3) - (font_size * 0.3)
+        invalidate_bounds()
 
     # Fix corrected reference layer
     if ref_TI:
         # Reset reference
         ref_TI.contents = ''
+        invalidate_bounds()
 
 
 def scale_text_left_overlap(layer: ArtLayer, reference: ArtLayer, gap: int = 30) -> None:
@@ -615,6 +726,7 @@ def scale_text_left_overlap(layer: ArtLayer, reference: ArtLayer, gap: int = 30)
         # Reset reference
         if ref_TI:
             ref_TI.contents = ''
+            invalidate_bounds()
         return
 
     # Make our first check if scaling is necessary
@@ -637,10 +749,12 @@ def scale_text_left_overlap(layer: ArtLayer, reference: ArtLayer, gap: int = 30)
 
         # Shift baseline up to keep text centered vertically
         layer.textItem.baselineShift = (old_size * 0.3) - (font_size * 0.3)
+        invalidate_bounds()
 
     # Fix corrected reference layer
     if ref_TI:
         ref_TI.contents = ''
+        invalidate_bounds()
 
 
 def scale_text_to_width(
@@ -664,30 +778,20 @@ def scale_text_to_width(
     """
     # Cancel if we're already within expected bounds
     width = width - APP.scale_by_dpi(spacing)
-    continue_scaling = bool(width < get_layer_width(layer))
-    if not continue_scaling:
+    measured = get_layer_width(layer)
+    if not width < measured:
         return
 
-    # Establish starting size and half step
+    # Establish starting size, fit to the nearest half step
     if font_size is None:
         font_size = get_font_size(layer)
-    half_step = step / 2
-
-    # Step down font and lead sizes by the step size, and update those sizes in the layer
-    while continue_scaling:
-        font_size -= step
-        set_text_size_and_leading(layer, font_size, font_size)
-        continue_scaling = bool(width < get_layer_width(layer))
-
-    # Increase by a half step
-    font_size += half_step
-    set_text_size_and_leading(layer, font_size, font_size)
-
-    # Revert if half step still exceeds reference
-    if width < get_layer_width(layer):
-        font_size -= half_step
-        set_text_size_and_leading(layer, font_size, font_size)
-    return font_size
+    return fit_font_size(
+        apply=lambda size: set_text_size_and_leading(layer, size, size),
+        fits=lambda: not width < get_layer_width(layer),
+        font_size=font_size,
+        step=step / 2,
+        estimate=estimate_fit_size(font_size, measured, width),
+        kind='scale_text_to_width')
 
 
 def scale_text_to_height(
@@ -695,7 +799,8 @@ def scale_text_to_height(
     height: int,
     spacing: int = 64,
     step: float = 0.4,
-    font_size: Optional[float] = None
+    font_size: Optional[float] = None,
+    estimate: Optional[Callable[[float, float], Optional[float]]] = None
 ) -> Optional[float]:
     """Resize a given text layer's font size/leading until it fits inside a reference width.
 
@@ -705,36 +810,29 @@ def scale_text_to_height(
         spacing: Amount of DPI adjusted spacing to pad the height.
         step: Amount to step font size down by in each check.
         font_size: The starting font size if pre-calculated.
+        estimate: Function which estimates the fitted font size for a given height in pixels and starting
+            font size, e.g. from an offline text layout estimate. Only called if scaling is necessary, the
+            estimate is made from the current height if not provided or if it returns None.
 
     Returns:
         Font size if font size is calculated during operation, otherwise None.
     """
     # Cancel if we're already within expected bounds
     height = height - APP.scale_by_dpi(spacing)
-    continue_scaling = bool(height < get_layer_height(layer))
-    if not continue_scaling:
+    measured = get_layer_height(layer)
+    if not height < measured:
         return
 
-    # Establish starting size and half step
+    # Establish starting size, fit to the nearest half step
     if font_size is None:
         font_size = get_font_size(layer)
-    half_step = step / 2
-
-    # Step down font and lead sizes by the step size, and update those sizes in the layer
-    while continue_scaling:
-        font_size -= step
-        set_text_size_and_leading(layer, font_size, font_size)
-        continue_scaling = bool(height < get_layer_height(layer))
-
-    # Increase by a half step
-    font_size += half_step
-    set_text_size_and_leading(layer, font_size, font_size)
-
-    # Revert if half step still exceeds reference
-    if height < get_layer_height(layer):
-        font_size -= half_step
-        set_text_size_and_leading(layer, font_size, font_size)
-    return font_size
+    return fit_font_size(
+        apply=lambda size: set_text_size_and_leading(layer, size, size),
+        fits=lambda: not height < get_layer_height(layer),
+        font_size=font_size,
+        step=step / 2,
+        estimate=(estimate and estimate(height, font_size)) or estimate_fit_size(font_size, measured, height, exponent=2),
+        kind='scale_text_to_height')
 
 
 def scale_text_to_width_textbox(
@@ -749,15 +847,22 @@ def scale_text_to_width_textbox(
         font_size: Starting font size, calculated if not provided (slower execution time).
         step: Amount of points to step down each iteration.
     """
-    # Get the starting font size
-    if font_size is None:
-        font_size = get_font_size(layer)
+    # Cancel if already within the bounding box
     ref = get_textbox_width(layer) + 1
+    measured = get_width_no_effects(layer)
+    if not measured > ref:
+        return
 
-    # Continue to reduce the size until within the bounding box
-    while get_width_no_effects(layer) > ref:
-        font_size -= step
-        set_text_size_and_leading(layer, font_size, font_size)
+    # Get the starting font size, fit to the nearest step
+    if font_size is None:
+        font_size = get_font_size(layer)
+    fit_font_size(
+        apply=lambda size: set_text_size_and_leading(layer, size, size),
+        fits=lambda: not get_width_no_effects(layer) > ref,
+        font_size=font_size,
+        step=step,
+        estimate=estimate_fit_size(font_size, measured, ref),
+        kind='scale_text_to_width_textbox')
 
 
 def scale_text_layers_to_height(
@@ -782,26 +887,16 @@ def scale_text_layers_to_height(
     # Establish font size
     if font_size is None:
         font_size = get_font_size(text_layers[0])
-    half_step = step / 2
-
-    # Compare height of all 3 elements vs total reference height
-    while total_layer_height > ref_height:
-        total_layer_height = 0
-        font_size -= step
-        for i, layer in enumerate(text_layers):
-            set_text_size_and_leading(layer, font_size, font_size)
-            total_layer_height += get_layer_height(layer)
-
-    # Increase by a half step
-    font_size += half_step
-    total_layer_height = 0
-    for i, layer in enumerate(text_layers):
-        set_text_size_and_leading(layer, font_size, font_size)
-        total_layer_height += get_layer_height(layer)
-
-    # If out of bounds, revert half step
-    if total_layer_height > ref_height:
-        font_size -= half_step
-        for i, layer in enumerate(text_layers):
-            set_text_size_and_leading(layer, font_size, font_size)
-    return font_size
+
+    def _apply(size: float) -> None:
+        for layer in text_layers:
+            set_text_size_and_leading(layer, size, size)
+
+    # Compare height of all elements vs total reference height, fit to the nearest half step
+    return fit_font_size(
+        apply=_apply,
+        fits=lambda: sum([get_layer_height(layer) for layer in text_layers]) <= ref_height,
+        font_size=font_size,
+        step=step / 2,
+        estimate=estimate_fit_size(font_size, total_layer_height, ref_height, exponent=2),
+        kind='scale_text_layers_to_height')
@@ -2,7 +2,10 @@
 * Card Layout Data
 """
 # Standard Library Imports
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from datetime import date, datetime
+from threading import Lock
 from typing import Optional, Match, Union, Type, ForwardRef
 from os import path as osp
 from pathlib import Path
@@ -13,10 +16,17 @@
 
 # Local Imports
 from src import CFG, CON, CONSOLE, ENV, PATH
-from src.cards import CardDetails, FrameDetails, get_card_data, parse_card_info, process_card_data
+from src.cards import (
+    CardDetails,
+    FrameDetails,
+    get_card_data,
+    is_sibling_face,
+    parse_card_info,
+    process_card_data)
 from src.console import msg_error, msg_success
 from src.utils.hexapi import get_watermark_svg, get_watermark_svg_from_set
 from src.utils.scryfall import get_cards_oracle
+from src.utils.tracing import TRACER
 from src.enums.layers import LAYERS
 from src.enums.mtg import (
     CardTextPatterns,
@@ -59,12 +69,97 @@ def assign_layout(filename: Path) -> str | ForwardRef('CardLayout'):
     """
     # Get basic card information
     card = parse_card_info(filename)
-    name_failed = osp.basename(str(card.get('file', 'None')))
 
     # Get scryfall data for the card
-    scryfall = get_card_data(card, cfg=CFG, logger=CONSOLE)
+    with TRACER.span('get_card_data', 'scryfall', card=card['name']):
+        scryfall = get_card_data(card, cfg=CFG, logger=CONSOLE)
     if not scryfall:
+        name_failed = osp.basename(str(card.get('file', 'None')))
         return msg_error(name_failed, reason="Scryfall search failed")
+    with TRACER.span('get_layout', 'scryfall', card=card['name']):
+        return get_layout(card, scryfall)
+
+
+def assign_layouts(files: list[Path], workers: Optional[int] = None) -> list[str | ForwardRef('CardLayout')]:
+    """Assign layout objects to a list of cards, fetching Scryfall data only once for double faced
+    cards when art is provided for both faces.
+
+    Notes:
+        - Files which request the same set and collector number are assigned in turn by a single worker,
+            so the opposite face of a double faced card is claimed before its own lookup starts.
+
+    Args:
+        files: Paths to the art files, filenames support optional tags.
+        workers: Maximum number of threads used to fetch Scryfall data.
+
+    Returns:
+        Layout object, or failure string, for each file in the order given.
+    """
+    cards: dict[Path, CardDetails] = {f: parse_card_info(f) for f in files}
+    results: dict[Path, Union[str, CardLayout, None]] = {}
+    lock = Lock()
+
+    def _assign(path: Path) -> None:
+        """Assign a layout to this file and any sibling faces which haven't been resolved yet."""
+        with lock:
+            if path in results:
+                return
+        card = cards[path]
+
+        # Get scryfall data for the card
+        with TRACER.span('get_card_data', 'scryfall', card=card['name']):
+            scryfall = get_card_data(card, cfg=CFG, logger=CONSOLE)
+        if not scryfall:
+            name_failed = osp.basename(str(card.get('file', 'None')))
+            with lock:
+                results.setdefault(path, msg_error(name_failed, reason="Scryfall search failed"))
+            return
+
+        # Claim any sibling faces, they share this card's data
+        with lock:
+            siblings = [
+                p for p, c in cards.items()
+                if p not in results and p != path
+                and is_sibling_face(scryfall, card, c)]
+            results.update({p: None for p in siblings})
+
+        # Create a layout for each face
+        with TRACER.span('get_layout', 'scryfall', card=card['name'], siblings=len(siblings)):
+            layouts = {p: get_layout(cards[p], deepcopy(scryfall)) for p in siblings}
+            layouts[path] = get_layout(card, scryfall)
+        with lock:
+            results.update({p: lay for p, lay in layouts.items() if p != path})
+            results.setdefault(path, layouts[path])
+
+    def _assign_group(paths: list[Path]) -> None:
+        """Assign a layout to each file in a group of possible sibling faces, one after another."""
+        for p in paths:
+            _assign(p)
+
+    # Group files requesting the same printing, they may be faces of the same card
+    groups: dict[Union[tuple[str, str], Path], list[Path]] = {}
+    for f, c in cards.items():
+        key = (c['set'].lower(), c['number']) if c.get('set') and c.get('number') else f
+        groups.setdefault(key, []).append(f)
+
+    # Fetch card data in parallel
+    with TRACER.span('assign_layouts', 'scryfall', files=len(files)):
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scryfall') as pool:
+            list(pool.map(_assign_group, groups.values()))
+    return [results[f] for f in files]
+
+
+def get_layout(card: CardDetails, scryfall: dict) -> str | ForwardRef('CardLayout'):
+    """Create a layout object from parsed art file details and unprocessed Scryfall data.
+
+    Args:
+        card: Card details pulled from the art image filename.
+        scryfall: Unprocessed Scryfall data, modified in place during processing.
+
+    Returns:
+        str | CardLayout: Layout object for this card, or a failure string.
+    """
+    name_failed = osp.basename(str(card.get('file', 'None')))
     scryfall = process_card_data(scryfall, card)
 
     # Instantiate layout object
@@ -121,6 +216,25 @@ def join_dual_card_layouts(layouts: list[Union[str, 'CardLayout']]):
     return [*normal, *add]
 
 
+def sort_render_queue(layouts: list['CardLayout']) -> list['CardLayout']:
+    """Order layouts sharing a template so that faces of the same card render back to back, front face
+    first, and cards which differ only by art, artist, or creator render consecutively.
+
+    Args:
+        layouts: List of layout objects which share a template document.
+
+    Returns:
+        Reordered list of layout objects, otherwise preserving the order given.
+    """
+    cards: dict[str, dict[tuple, list[CardLayout]]] = {}
+    for n in layouts:
+        cards.setdefault(n.scryfall.get('id') or str(n), {}).setdefault(n.art_swap_key, []).append(n)
+    return [
+        n for faces in cards.values()
+        for group in sorted(faces.values(), key=lambda g: not g[0].is_front)
+        for n in group]
+
+
 """
 * Layout Classes
 """
@@ -174,6 +288,18 @@ def art_file(self) -> Path:
         """Path: Art image file path."""
         return self.file['file']
 
+    @cached_property
+    def art_swap_key(self) -> tuple:
+        """tuple: Render relevant card identity, shared by cards which differ only by art, artist, or creator."""
+        return (
+            self.card_class,
+            self.scryfall.get('id'),
+            self.set,
+            self.collector_number_raw,
+            self.name_raw,
+            self.lang,
+            bool(self.creator))
+
     @cached_property
     def scryfall_scan(self) -> str:
         """Scryfall large image scan, if available."""
@@ -36,10 +36,12 @@
     OutputFileType,
     CollectorPromo,
     WatermarkMode,
-    BorderColor)
+    BorderColor,
+    EdgeFill)
 from src.enums.mtg import CardTextPatterns
 from src.frame_logic import is_multicolor_string
 import src.helpers as psd
+from src.helpers.bounds import LayerDimensions
 from src.helpers.effects import LayerEffects
 from src.schema.adobe import EffectColorOverlay, EffectGradientOverlay, EffectBevel
 from src.schema.colors import watermark_color_map, basic_watermark_color_map, ColorObject, GradientColor
@@ -56,6 +58,11 @@
     PS_EXCEPTIONS,
     ReferenceLayer,
     try_photoshop)
+from src.utils.encoding import EncodeOptions
+from src.utils.fill import fill_art_edges
+from src.utils.filters import ArtPipeline
+from src.utils.profiling import profile_render
+from src.utils.tracing import TRACER
 
 """
 * Template Classes
@@ -78,6 +85,11 @@ def __init__(self, layout: Any, **kwargs):
         self.layout = layout
         self._text = []
 
+        # Art swap state
+        self.hold_render: bool = False
+        self.art_swapped: bool = False
+        self.art_layers_loaded: list[ArtLayer] = []
+
     """
     * Template Class Routing
     """
@@ -132,8 +144,9 @@ def pre_render_methods(self) -> list[Callable]:
 
         Methods:
             `process_layout_data`: Processes layout data before it is used to generate the card.
+            `queue_art_pipeline`: Starts filtering the art file while the template loads.
         """
-        return [self.process_layout_data]
+        return [self.process_layout_data, self.queue_art_pipeline]
 
     @property
     def frame_layer_methods(self) -> list[Callable]:
@@ -254,12 +267,29 @@ def RGB_WHITE(self) -> SolidColor:
     @cached_property
     def save_mode(self) -> Callable:
         """Callable: Function called to save the rendered image."""
+        if CFG.deferred_encoding and CFG.output_file_type in [OutputFileType.JPG, OutputFileType.PNG]:
+            return self.save_deferred
         if CFG.output_file_type == OutputFileType.PNG:
             return psd.save_document_png
         if CFG.output_file_type == OutputFileType.PSD:
             return psd.save_document_psd
         return psd.save_document_jpeg
 
+    def save_deferred(self, path: Path, docref: Optional[Document] = None) -> None:
+        """Save a lossless copy of the rendered image, encoding the output files in the background.
+
+        Args:
+            path: Path of the rendered image.
+            docref: Open Photoshop document. Use active if not provided.
+        """
+        psd.save_document_deferred(
+            path=path,
+            options=EncodeOptions(
+                formats=[str(CFG.output_file_type), *(['webp'] if CFG.output_webp else [])],
+                quality=min(max(CFG.output_quality, 1), 100),
+                downscale=PhotoshopHandler.DIMS_800[0] if CFG.output_downscale else None),
+            docref=docref)
+
     @cached_property
     def output_directory(self) -> Path:
         """PathL Directory to save the rendered image."""
@@ -760,6 +790,34 @@ def art_action_args(self) -> Optional[dict]:
         """Args to pass to art_action."""
         return
 
+    @property
+    def art_pipeline(self) -> Optional[ArtPipeline]:
+        """Optional[ArtPipeline]: Named art filters applied to the art file in a worker thread before it's
+        loaded, see `src.utils.filters`. If the pipeline fails, `art_action` is used instead."""
+        return
+
+    def queue_art_pipeline(self) -> None:
+        """Queue the art file to be filtered if this template uses an art pipeline."""
+        if self.art_pipeline:
+            APP.art_filters.submit(self.layout.art_file, self.art_pipeline)
+
+    def get_filtered_art(self, art_file: Union[str, Path]) -> Optional[Path]:
+        """Wait for an art file to be filtered with this template's art pipeline.
+
+        Args:
+            art_file: Path to the art file.
+
+        Returns:
+            Path to the filtered art, or None if the template has no art pipeline or the pipeline failed.
+        """
+        if not self.art_pipeline:
+            return
+        try:
+            return APP.art_filters.resolve(art_file, self.art_pipeline)
+        except Exception as e:
+            self.console.update(msg_warn("Art filters failed, falling back to the art action!"), exception=e)
+            return
+
     def load_artwork(
         self,
         art_file: Optional[str | Path] = None,
@@ -786,30 +844,44 @@ def load_artwork(
         if ENV.TEST_MODE and self.is_fullart:
             art_file = PATH.SRC_IMG / "test-fa.jpg"
 
+        # Apply art filters, skipping the art action if they succeed
+        action = self.art_action
+        if filtered := self.get_filtered_art(art_file):
+            art_file, action = filtered, None
+
+        # Extend the art offline if an edge fill method other than Photoshop is used
+        ref = art_reference
+        filled = False
+        if self.is_edge_fill_offline and not action:
+            if extended := self.get_filled_art(art_file, art_reference):
+                art_file, ref = extended
+                filled = True
+
         # Import art file
-        if self.art_action:
+        if action:
             # Use action pipeline
             art_layer = psd.paste_file(
                 layer=art_layer,
                 path=art_file,
-                action=self.art_action,
+                action=action,
                 action_args=self.art_action_args,
                 docref=self.docref)
+            # Frame the artwork
+            psd.frame_layer(
+                layer=art_layer,
+                ref=art_reference)
         else:
-            # Use traditional pipeline
-            art_layer = psd.import_art(
+            # Use traditional pipeline, framing the artwork as it's placed
+            art_layer = psd.import_art_framed(
                 layer=art_layer,
                 path=art_file,
+                ref=ref,
                 docref=self.docref)
         self.active_layer = art_layer
-
-        # Frame the artwork
-        psd.frame_layer(
-            layer=art_layer,
-            ref=art_reference)
+        self.art_layers_loaded.append(art_layer)
 
         # Perform content aware fill if needed
-        if self.is_content_aware_enabled:
+        if self.is_content_aware_enabled and not filled:
 
             # Perform a generative fill
             if CFG.generative_fill:
@@ -826,9 +898,58 @@ def load_artwork(
                 return
 
             # Perform a content aware fill
-            psd.content_aware_fill_edges(
-                layer=art_layer,
-                feather=CFG.feathered_fill)
+            with self.app.profiler.task('fill_edges:photoshop'), TRACER.span(
+                'fill_edges', 'task', mode=EdgeFill.Photoshop
+            ):
+                psd.content_aware_fill_edges(
+                    layer=art_layer,
+                    feather=CFG.feathered_fill)
+
+    @property
+    def edge_fill(self) -> str:
+        """str: Method used to fill empty space around the art, see `EdgeFill`. Templates may override
+        this to prefer a method regardless of the user's setting."""
+        return CFG.edge_fill
+
+    @cached_property
+    def is_edge_fill_offline(self) -> bool:
+        """bool: Whether empty space around the art is filled before the art is imported, rather than
+        with Photoshop's content aware fill."""
+        return bool(
+            self.is_content_aware_enabled
+            and not CFG.generative_fill
+            and self.edge_fill != EdgeFill.Photoshop)
+
+    def get_filled_art(
+        self,
+        art_file: Union[str, Path],
+        art_reference: ReferenceLayer
+    ) -> Optional[tuple[Path, type[LayerDimensions]]]:
+        """Extend an art file so it covers the document canvas once framed, see `src.utils.fill`.
+
+        Args:
+            art_file: Path to the art file.
+            art_reference: Reference layer the art is framed to.
+
+        Returns:
+            Path to the extended art and the dimensions to frame it to, or None if the art
+            couldn't be extended.
+        """
+        metrics = psd.get_document_metrics()
+        try:
+            with self.app.profiler.task(f'fill_edges:{self.edge_fill}'), TRACER.span(
+                'fill_edges', 'task', mode=self.edge_fill
+            ):
+                path, box = fill_art_edges(
+                    path=Path(art_file),
+                    ref=psd.get_layer_bounds(art_reference),
+                    canvas=(metrics['width'], metrics['height']),
+                    method=self.edge_fill,
+                    cache_dir=PATH.LOGS_ART_CACHE)
+        except Exception as e:
+            self.console.update(msg_warn("Edge fill failed, falling back to Content Aware Fill!"), exception=e)
+            return
+        return path, psd.get_dimensions_from_bounds(box)
 
     def paste_scryfall_scan(self, rotate: bool = False, visible: bool = True) -> Optional[ArtLayer]:
         """Downloads the card's scryfall scan, pastes it into the document next to the active layer,
@@ -1006,6 +1127,7 @@ def load_expansion_symbol(self) -> None:
             # Rename and reset property
             svg.name = 'Expansion Symbol'
             self.expansion_symbol_layer = svg
+            psd.invalidate_layer_index()
 
         except Exception as e:
             return self.log('Expansion symbol disabled due to an error.', e)
@@ -1215,10 +1337,22 @@ def check_photoshop(self) -> None:
             raise OSError(check)
         self.check_photoshop()
 
+    def load_template(self) -> None:
+        """Open the PSD template, reusing the document if it's still open from a previous render."""
+        self.app.session.open(self.layout.template_file)
+
+    def finish_render(self) -> None:
+        """Reset the document, unless it's being held open for an art swap render of the next card."""
+        if self.hold_render:
+            self.app.session.hold(self.layout.template_file)
+            self.console.end_await()
+            return
+        self.reset()
+
     def reset(self) -> None:
         """Reset the document, purge the cache, end await."""
         try:
-            if self.docref:
+            if not self.app.session.restore(self.layout.template_file) and self.docref:
                 psd.reset_document(self.docref)
         except PS_EXCEPTIONS:
             pass
@@ -1247,6 +1381,7 @@ def run_tasks(
             warning: bool = False,
             args: Union[Iterable[Any], None] = None,
             kwargs: Optional[dict] = None,
+            step: Optional[str] = None
     ) -> bool:
         """Run a list of functions, checking for thread cancellation and exceptions on each.
 
@@ -1256,6 +1391,8 @@ def run_tasks(
             warning: Warn the user if True, otherwise raise error.
             args: Optional arguments to pass to the func. Empty tuple if not provided.
             kwargs: Optional keyword arguments to pass to the func. Empty dict if not provided.
+            step: Name of the render step these functions are recorded under when profiling renders.
+                Uses the error message if not provided.
 
         Returns:
             True if tasks completed, False if exception occurs or thread is cancelled.
@@ -1264,24 +1401,28 @@ def run_tasks(
         # Default args and kwargs
         args = args or ()
         kwargs = kwargs or {}
+        profiler = self.app.profiler
 
         # Execute each function
-        for func in funcs:
-            # Check if thread was cancelled
-            if self.event.is_set():
-                return False
-            try:
-                # Run the task
-                func(*args, **kwargs)
-            except Exception as e:
-                # Raise error or warning
-                if not warning:
-                    self.raise_error(message=message, error=e)
+        with profiler.step(step or message), TRACER.span(step or message, 'render'):
+            for func in funcs:
+                # Check if thread was cancelled
+                if self.event.is_set():
+                    return False
+                try:
+                    # Run the task
+                    name = getattr(func, '__name__', repr(func))
+                    with profiler.task(name), TRACER.span(name, 'task'):
+                        func(*args, **kwargs)
+                except Exception as e:
+                    # Raise error or warning
+                    if not warning:
+                        self.raise_error(message=message, error=e)
+                        return False
+                    self.raise_warning(message=message, error=e)
+                # Once again, check if thread was cancelled
+                if self.event.is_set():
                     return False
-                self.raise_warning(message=message, error=e)
-            # Once again, check if thread was cancelled
-            if self.event.is_set():
-                return False
         return True
 
     def raise_error(self, message: str, error: Optional[Exception] = None) -> None:
@@ -1531,6 +1672,7 @@ def rules_text_and_pt_layers(self) -> None:
     * Execution Sequence
     """
 
+    @profile_render
     def execute(self) -> bool:
         """Perform actions to render the card using this template.
 
@@ -1542,29 +1684,32 @@ def execute(self) -> bool:
         # Preliminary Photoshop check
         if not self.run_tasks(
             funcs=[self.check_photoshop],
-            message="Unable to reach Photoshop!"
+            message="Unable to reach Photoshop!",
+            step='check_photoshop'
         ):
             return False
 
         # Pre-process layout data
         if not self.run_tasks(
             funcs=self.pre_render_methods,
-            message="Pre-processing layout data failed!"
+            message="Pre-processing layout data failed!",
+            step='pre_render'
         ):
             return False
 
         # Load in the PSD template
         if not self.run_tasks(
-            funcs=[self.app.load],
+            funcs=[self.load_template],
             message="PSD template failed to load!",
-            args=[str(self.layout.template_file)]
+            step='load_template'
         ):
             return False
 
         # Load in artwork and frame it
         if not self.run_tasks(
             funcs=[self.load_artwork],
-            message="Unable to load artwork!"
+            message="Unable to load artwork!",
+            step='load_artwork'
         ):
             return False
 
@@ -1573,34 +1718,39 @@ def execute(self) -> bool:
             self.run_tasks(
                 funcs=[self.paste_scryfall_scan],
                 message="Couldn't import Scryfall scan, continuing without it!",
-                warning=True)
+                warning=True,
+                step='scryfall_scan')
 
         # Add expansion symbol
         self.run_tasks(
             funcs=[self.load_expansion_symbol],
             message="Unable to generate expansion symbol!",
-            warning=True)
+            warning=True,
+            step='expansion_symbol')
 
         # Add watermark
         if CFG.enable_basic_watermark and self.is_basic_land:
             # Basic land watermark
             if not self.run_tasks(
                 funcs=[self.create_basic_watermark],
-                message="Unable to generate basic land watermark!"
+                message="Unable to generate basic land watermark!",
+                step='watermark'
             ):
                 return False
         elif CFG.watermark_mode is not WatermarkMode.Disabled:
             # Normal watermark
             if not self.run_tasks(
                 funcs=[self.create_watermark],
-                message="Unable to generate watermark!"
+                message="Unable to generate watermark!",
+                step='watermark'
             ):
                 return False
 
         # Enable layers to build our frame
         if not self.run_tasks(
             funcs=self.frame_layer_methods,
-            message="Enabling layers failed!"
+            message="Enabling layers failed!",
+            step='frame_layers'
         ):
             return False
 
@@ -1611,14 +1761,16 @@ def execute(self) -> bool:
                 self.format_text_layers,
                 *self.post_text_methods
             ],
-            message="Formatting text layers failed!"
+            message="Formatting text layers failed!",
+            step='text_layers'
         ):
             return False
 
         # Specific hooks
         if not self.run_tasks(
             funcs=self.hooks,
-            message="Encountered an error during triggered hooks step!"
+            message="Encountered an error during triggered hooks step!",
+            step='hooks'
         ):
             return False
 
@@ -1630,21 +1782,171 @@ def execute(self) -> bool:
         if not self.run_tasks(
             funcs=[self.save_mode],
             message="Error during file save process!",
-            kwargs={'path': self.output_file_name, 'docref': self.docref}
+            kwargs={'path': self.output_file_name, 'docref': self.docref},
+            step='save'
         ):
             return False
 
         # Post save methods
         if not self.run_tasks(
             funcs=self.post_save_methods,
-            message="Image saved, but an error was encountered during the post-save step!"
+            message="Image saved, but an error was encountered during the post-save step!",
+            step='post_save'
         ):
             return False
 
         # Reset document, return success
         if not ENV.TEST_MODE:
             self.console.update(f"[b]{self.output_file_name.stem}[/b] rendered successfully!")
-        self.reset()
+        self.finish_render()
+        return True
+
+    """
+    * Art Swap Sequence
+    """
+
+    @property
+    def is_art_swap_supported(self) -> bool:
+        """bool: Governs whether a document rendered by this template can be reused for the next card
+        if their card data is identical, replacing only the artwork and artist credit. Templates opt in,
+        since any layer drawn from the artwork or collector info would be left over from the previous card."""
+        return False
+
+    def can_swap_art(self, previous: 'BaseTemplate') -> bool:
+        """Check whether this card can be rendered by swapping the art in a previous card's held document.
+
+        Args:
+            previous: Template object which rendered the previous card.
+
+        Returns:
+            True if an art swap render is possible, otherwise False.
+        """
+        if not all([
+            self.is_art_swap_supported,
+            previous.hold_render,
+            previous.art_layers_loaded,
+            type(self) is type(previous),
+            not CFG.exit_early
+        ]):
+            return False
+        if self.layout.template_file != previous.layout.template_file:
+            return False
+        if self.layout.art_swap_key != previous.layout.art_swap_key:
+            return False
+        if CFG.generative_fill and self.is_content_aware_enabled:
+            return False
+        return self.is_art_vertical == previous.is_art_vertical
+
+    def swap_collector_info(self, previous: 'BaseTemplate') -> None:
+        """Replace the artist credit and creator name written by a previous render.
+
+        Args:
+            previous: Template object which rendered the previous card.
+        """
+        # Ignore this step if legal layer not present
+        if not self.legal_group:
+            return
+
+        # If creator is specified add the text
+        if self.layout.creator and self.text_layer_creator:
+            self.text_layer_creator.textItem.contents = self.layout.creator
+
+        # Replace the artist in any visible credit layer
+        if self.layout.artist == previous.layout.artist:
+            return
+        for layer in [
+            psd.getLayer(LAYERS.ARTIST, self.legal_group),
+            psd.getLayer(LAYERS.BOTTOM, [self.legal_group, LAYERS.COLLECTOR])
+        ]:
+            if layer and layer.visible:
+                psd.replace_text(layer, previous.layout.artist, self.layout.artist)
+
+    def remove_art_layers(self, previous: 'BaseTemplate') -> None:
+        """Remove every art layer loaded by a previous render.
+
+        Args:
+            previous: Template object which rendered the previous card.
+        """
+        for layer in previous.art_layers_loaded:
+            layer.delete()
+        previous.art_layers_loaded.clear()
+        psd.invalidate_layer_index()
+
+    @profile_render
+    def execute_art_swap(self, previous: 'BaseTemplate') -> bool:
+        """Render this card using the document held open by the previous render, replacing only
+        the artwork and artist credit.
+
+        Args:
+            previous: Template object which rendered the previous card and held its document open.
+
+        Notes:
+            - Only called when `can_swap_art` returns True for the previous template object.
+            - Never override this method!
+        """
+        self.art_swapped = True
+
+        # Pre-process layout data
+        if not self.run_tasks(
+            funcs=self.pre_render_methods,
+            message="Pre-processing layout data failed!",
+            step='pre_render'
+        ):
+            return False
+
+        # Activate the held document, remove the previous artwork
+        if not self.run_tasks(
+            funcs=[self.load_template],
+            message="Unable to load template!",
+            step='load_template'
+        ):
+            return False
+        if not self.run_tasks(
+            funcs=[self.remove_art_layers],
+            message="Unable to remove previous artwork!",
+            args=[previous],
+            step='load_template'
+        ):
+            return False
+
+        # Load in artwork and frame it
+        if not self.run_tasks(
+            funcs=[self.load_artwork],
+            message="Unable to load artwork!",
+            step='load_artwork'
+        ):
+            return False
+
+        # Replace artist credit and creator name
+        if not self.run_tasks(
+            funcs=[self.swap_collector_info],
+            message="Unable to replace the artist credit!",
+            args=[previous],
+            step='text_layers'
+        ):
+            return False
+
+        # Save the document
+        if not self.run_tasks(
+            funcs=[self.save_mode],
+            message="Error during file save process!",
+            kwargs={'path': self.output_file_name, 'docref': self.docref},
+            step='save'
+        ):
+            return False
+
+        # Post save methods
+        if not self.run_tasks(
+            funcs=self.post_save_methods,
+            message="Image saved, but an error was encountered during the post-save step!",
+            step='post_save'
+        ):
+            return False
+
+        # Reset document, return success
+        if not ENV.TEST_MODE:
+            self.console.update(f"[b]{self.output_file_name.stem}[/b] rendered successfully!")
+        self.finish_render()
         return True
 
 
@@ -1692,6 +1994,11 @@ def is_fullart(self) -> bool:
         """Colorless cards use Fullart reference."""
         return self.is_colorless
 
+    @property
+    def is_art_swap_supported(self) -> bool:
+        """bool: Normal templates only draw the artist from collector info, which an art swap replaces."""
+        return True
+
     """
     * Text Layer Methods
     """
@@ -1720,26 +2027,25 @@ def rules_text_and_pt_layers(self) -> None:
 
     def enable_frame_layers(self) -> None:
         """Enable layers which make-up the frame of the card."""
+        changes = psd.LayerChangeSet()
 
         # Twins
-        if self.twins_layer:
-            self.twins_layer.visible = True
+        changes.show(self.twins_layer)
 
         # PT Box
-        if self.is_creature and self.pt_layer:
-            self.pt_layer.visible = True
+        if self.is_creature:
+            changes.show(self.pt_layer)
 
         # Pinlines
-        if self.pinlines_layer:
-            self.pinlines_layer.visible = True
+        changes.show(self.pinlines_layer)
 
         # Color Indicator
-        if self.is_type_shifted and self.color_indicator_layer:
-            self.color_indicator_layer.visible = True
+        if self.is_type_shifted:
+            changes.show(self.color_indicator_layer)
 
         # Background
-        if self.background_layer:
-            self.background_layer.visible = True
+        changes.show(self.background_layer)
+        changes.commit()
 
         # Legendary crown
         if self.is_legendary and self.crown_layer:
@@ -1749,10 +2055,11 @@ def enable_crown(self) -> None:
         """Enable layers which make-up the Legendary crown."""
 
         # Enable crown and legendary border
-        self.crown_layer.visible = True
+        changes = psd.LayerChangeSet().show(self.crown_layer)
         if self.border_group and isinstance(self.border_group, LayerContainer):
-            psd.getLayer(LAYERS.NORMAL_BORDER, self.border_group).visible = False
-            psd.getLayer(LAYERS.LEGENDARY_BORDER, self.border_group).visible = True
+            changes.hide(psd.getLayer(LAYERS.NORMAL_BORDER, self.border_group))
+            changes.show(psd.getLayer(LAYERS.LEGENDARY_BORDER, self.border_group))
+        changes.commit()
 
         # Call hollow crown step
         if self.is_hollow_crown:
@@ -1761,11 +2068,9 @@ def enable_crown(self) -> None:
 
     def enable_hollow_crown(self, shadows: Optional[ArtLayer] = None) -> None:
         """Enable the hollow legendary crown."""
-        if shadows:
-            psd.enable_mask(shadows)
-        psd.enable_mask(self.crown_layer.parent)
-        psd.enable_mask(self.pinlines_layer.parent)
-        self.crown_shadow_layer.visible = True
+        with psd.LayerChangeSet() as changes:
+            changes.enable_mask(shadows, self.crown_layer.parent, self.pinlines_layer.parent)
+            changes.show(self.crown_shadow_layer)
 
 
 class NormalEssentialsTemplate(NormalTemplate):
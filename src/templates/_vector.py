@@ -345,6 +345,8 @@ def enable_frame_layers(self) -> None:
 
     def enable_shape_layers(self) -> None:
         """Enable required vector shape layers provided by `enabled_shapes`."""
+        changes = psd.LayerChangeSet()
+
         def _enable_shape(_shapes: Union[LayerObjectTypes, list[LayerObjectTypes], None]) -> None:
             for x in _shapes:
                 if not x:
@@ -352,11 +354,13 @@ def _enable_shape(_shapes: Union[LayerObjectTypes, list[LayerObjectTypes], None]
                 if isinstance(x, list):
                     _enable_shape(x)
                 else:
-                    x.visible = True
+                    changes.show(x)
         _enable_shape(self.enabled_shapes)
+        changes.commit()
 
     def enable_layer_masks(self) -> None:
         """Enable or copy required layer masks provided by `enabled_masks`."""
+        changes = psd.LayerChangeSet()
 
         # For each mask enabled, apply it based on given notation
         for mask in [m for m in self.enabled_masks if m]:
@@ -367,24 +371,26 @@ def enable_layer_masks(self) -> None:
                 # Copy to a layer?
                 if layer := mask.get('layer'):
                     # Copy normal or vector mask to layer
-                    func = psd.copy_vector_mask if mask.get('vector') else psd.copy_layer_mask
-                    func(mask.get('mask'), layer)
+                    changes.copy_mask(mask.get('mask'), layer, vector=bool(mask.get('vector')))
                 else:
                     # Enable normal or vector mask
                     layer = mask.get('mask')
-                    func = psd.enable_vector_mask if mask.get('vector') else psd.enable_mask
+                    func = changes.enable_vector_mask if mask.get('vector') else changes.enable_mask
                     func(layer)
 
                 # Apply extra functions
-                [f(layer) for f in mask.get('funcs', [])]
+                [changes.then(f, layer) for f in mask.get('funcs', [])]
 
             # List notation, copy from one layer to another
             elif isinstance(mask, list):
-                psd.copy_layer_mask(*mask)
+                changes.copy_mask(*mask)
 
             # Single layer to enable mask on
             elif isinstance(mask, LayerObject):
-                psd.enable_mask(mask)
+                changes.enable_mask(mask)
+
+        # Commit mask changes in the order they were declared
+        changes.commit()
 
     def enable_crown(self) -> None:
         """Enable the Legendary crown, only called if card is Legendary."""
@@ -410,13 +416,13 @@ def enable_hollow_crown(self, **kwargs) -> None:
             vector_masks (list[ArtLayer | LayerSet]): List of layers containing vector masks to enable.
         """
 
-        # Layer masks to enable
-        for m in kwargs.get('masks', []):
-            psd.enable_mask(m)
+        with psd.LayerChangeSet() as changes:
+
+            # Layer masks to enable
+            changes.enable_mask(*kwargs.get('masks', []))
 
-        # Vector masks to enable
-        for m in kwargs.get('vector_masks', []):
-            psd.enable_vector_mask(m)
+            # Vector masks to enable
+            changes.enable_vector_mask(*kwargs.get('vector_masks', []))
 
         # Enable shadow
         if self.crown_shadow_layer:
@@ -23,6 +23,11 @@ class BasicLandUnstableTemplate (BorderlessMod, BaseTemplate):
     """
     template_suffix = 'Unstable'
 
+    @property
+    def is_art_swap_supported(self) -> bool:
+        """bool: The frame layer is chosen by card name, only the art and artist differ between prints."""
+        return True
+
     """
     * Layer Groups
     """
@@ -56,6 +61,11 @@ class BasicLandTherosTemplate (FullartMod, BaseTemplate):
     """
     template_suffix = 'Theros'
 
+    @property
+    def is_art_swap_supported(self) -> bool:
+        """bool: The frame layer is chosen by card name, only the art and artist differ between prints."""
+        return True
+
     @cached_property
     def text_group(self) -> Optional[LayerSet]:
         """Text layers are in the document root."""
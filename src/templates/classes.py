@@ -18,6 +18,7 @@
 from src.templates._cosmetic import VectorNyxMod
 from src.templates._vector import VectorTemplate
 from src.text_layers import FormattedTextField, TextField
+from src.utils.geometry import get_height, solve_between, solve_positions, solve_spread, verify_positions
 
 """
 * Modifier Classes
@@ -149,6 +150,7 @@ def text_layers_classes(self) -> None:
             stage = self.stage_group if i == 0 else self.stage_group.duplicate()
             cost, level = [*stage.artLayers][:2]
             self.stage_layers.append(stage)
+            psd.invalidate_layer_index()
 
             # Add text layers to be formatted
             self.text.extend([
@@ -175,7 +177,8 @@ def layer_positioning_classes(self) -> None:
         # Core vars
         spacing = self.app.scale_by_dpi(80)
         spaces = len(self.line_layers) - 1
-        divider_height = psd.get_layer_height(self.stage_layers[0])
+        stage_bounds = [psd.get_layer_bounds(n) for n in self.stage_layers]
+        divider_height = get_height(stage_bounds[0])
         ref_height = self.textbox_reference.dims['height']
         spacing_total = (spaces * (spacing + divider_height)) + (spacing * 2)
         total_height = ref_height - spacing_total
@@ -185,23 +188,27 @@ def layer_positioning_classes(self) -> None:
             text_layers=self.line_layers,
             ref_height=total_height)
 
-        # Get the exact gap between each layer left over
-        layer_heights = sum([psd.get_layer_height(lyr) for lyr in self.line_layers])
+        # Get the exact gap between each layer left over, measuring each line once
+        bounds = [psd.get_layer_bounds(lyr) for lyr in self.line_layers]
+        layer_heights = sum([get_height(b) for b in bounds])
         gap = (ref_height - layer_heights) * (spacing / spacing_total)
         inside_gap = (ref_height - layer_heights) * ((spacing + divider_height) / spacing_total)
 
         # Space Class lines evenly apart
-        psd.spread_layers_over_reference(
-            layers=self.line_layers,
-            ref=self.textbox_reference,
+        deltas = solve_spread(
+            bounds=bounds,
+            ref=self.textbox_reference.bounds,
             gap=gap,
             inside_gap=inside_gap)
+        for layer, delta in zip(self.line_layers, deltas):
+            layer.translate(0, delta)
+        bounds = verify_positions(
+            solved=solve_positions(bounds, deltas),
+            measure=lambda i: psd.get_layer_bounds(self.line_layers[i]))
 
         # Position a class stage between each ability line
-        psd.position_dividers(
-            dividers=self.stage_layers,
-            layers=self.line_layers,
-            docref=self.docref)
+        for i, stage in enumerate(self.stage_layers[:len(bounds) - 1]):
+            stage.translate(0, solve_between(stage_bounds[i], bounds[i], bounds[i + 1]))
 
 
 """
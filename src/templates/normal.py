@@ -336,6 +336,11 @@ def is_extended(self) -> bool:
             key='Extended.Art',
             default=False)
 
+    @property
+    def is_art_swap_supported(self) -> bool:
+        """bool: Collector info is aligned to the artist credit, so it can't be swapped in place."""
+        return False
+
     @cached_property
     def is_align_collector_left(self) -> bool:
         """CollectorAlign: Which collector alignment to use."""
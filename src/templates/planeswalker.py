@@ -3,7 +3,7 @@
 """
 # Standard Library Imports
 from functools import cached_property
-from typing import Optional, Callable
+from typing import Optional, Callable, Union
 
 # Third Party Imports
 from photoshop.api import ElementPlacement, ColorBlendMode
@@ -21,6 +21,13 @@
 from src.templates.transform import TransformMod
 import src.text_layers as text_classes
 from src.utils.adobe import ReferenceLayer
+from src.utils.geometry import (
+    Bounds,
+    solve_align_vertical,
+    solve_divider,
+    solve_positions,
+    solve_spread,
+    verify_positions)
 
 """
 * Template Classes
@@ -249,12 +256,18 @@ def pw_layer_positioning(self) -> None:
             text_layers=self.ability_layers,
             ref_height=total_height)
 
-        # Space abilities evenly apart
+        # Space abilities evenly apart, solved from a single measurement of each ability
         uniform_gap = True if len(self.ability_layers) < 3 or not self.layout.loyalty else False
-        psd.spread_layers_over_reference(
-            layers=self.ability_layers,
-            ref=self.textbox_reference,
+        bounds = [psd.get_layer_bounds(n) for n in self.ability_layers]
+        deltas = solve_spread(
+            bounds=bounds,
+            ref=self.textbox_reference.bounds,
             gap=spacing if not uniform_gap else None)
+        for layer, delta in zip(self.ability_layers, deltas):
+            layer.translate(0, delta)
+        bounds = verify_positions(
+            solved=solve_positions(bounds, deltas),
+            measure=lambda i: psd.get_layer_bounds(self.ability_layers[i]))
 
         # Adjust text to avoid loyalty badge
         if self.layout.loyalty and self.loyalty_reference:
@@ -267,26 +280,28 @@ def pw_layer_positioning(self) -> None:
                 font_size=font_size,
                 docref=self.docref,
                 docsel=self.doc_selection)
+            # Abilities may have been moved or resized
+            bounds = [psd.get_layer_bounds(n) for n in self.ability_layers]
 
         # Align colons and shields to respective text layers
-        for i, ref_layer in enumerate(self.ability_layers):
+        for i, ability_bounds in enumerate(bounds):
             # Break if we encounter a length mismatch
             if len(self.icons) < (i + 1) or len(self.colons) < (i + 1):
                 self.raise_warning("Encountered bizarre Planeswalker data!")
                 break
             # Skip if this is a static ability
             if self.icons[i] and self.colons[i]:
-                before = self.colons[i].bounds[1]
-                psd.align_vertical(self.colons[i], ref_layer)
-                difference = self.colons[i].bounds[1] - before
+                difference = solve_align_vertical(psd.get_layer_bounds(self.colons[i]), ability_bounds)
+                self.colons[i].translate(0, difference)
                 self.icons[i].translate(0, difference)
 
     def pw_ability_mask(self) -> None:
         """Position the ragged edge ability mask."""
 
-        # Ragged line layers
+        # Ragged line layers, duplicates share the bounds of their source line
         line_top = psd.getLayer(LAYERS.TOP, self.mask_group)
         line_bottom = psd.getLayer(LAYERS.BOTTOM, self.mask_group)
+        line_bounds = {LAYERS.TOP: psd.get_layer_bounds(line_top), LAYERS.BOTTOM: psd.get_layer_bounds(line_bottom)}
 
         # Create our line mask pairs
         lines: list[list[ArtLayer]] = []
@@ -295,15 +310,19 @@ def pw_ability_mask(self) -> None:
                 lines[-1].append(line_bottom.duplicate(self.textbox_group, ElementPlacement.PlaceInside))
             else:
                 lines.append([line_top.duplicate(self.textbox_group, ElementPlacement.PlaceInside)])
+        psd.invalidate_layer_index()
 
-        # Position and fill each pair
+        # Position and fill each pair, solved from a single measurement of each ability
         n = 0
+        bounds = [psd.get_layer_bounds(lyr) for lyr in self.ability_layers]
         for i, group in enumerate(lines):
             # Position the top line, bottom if provided, then fill the area between
-            self.position_divider([self.ability_layers[n], self.ability_layers[n+1]], group[0])
-            if len(group) == 2:
-                self.position_divider([self.ability_layers[n+1], self.ability_layers[n+2]], group[1])
-            self.fill_between_dividers(group)
+            group_bounds = [self.position_divider(
+                layers=[bounds[n + k], bounds[n + k + 1]],
+                line=line,
+                line_bounds=line_bounds[LAYERS.BOTTOM if k else LAYERS.TOP]
+            ) for k, line in enumerate(group)]
+            self.fill_between_dividers(group, group_bounds)
             # Skip every other ability
             n += 2
 
@@ -335,21 +354,24 @@ def pw_add_ability(self, ability: dict) -> None:
         self.ability_layers.append(
             self.text_layer_static.duplicate() if static
             else self.text_layer_ability.duplicate())
+        psd.invalidate_layer_index()
         self.text.append(
             text_classes.FormattedTextField(
                 layer=self.ability_layers[-1],
                 contents=ability.get('text', '')
             ))
 
-    def fill_between_dividers(self, group: list[ArtLayer]) -> None:
+    def fill_between_dividers(self, group: list[ArtLayer], bounds: Optional[list[Bounds]] = None) -> None:
         """Fill area between two ragged lines, or a top line and the bottom of the document.
 
         Args:
             group: List containing 1 or 2 ragged lines to fill between.
+            bounds: Bounds of each ragged line, if already known.
         """
         # If no second line is provided use the bottom of the document
-        bottom_bound: int = (group[1].bounds[1] if len(group) == 2 else self.docref.height) + 1
-        top_bound = group[0].bounds
+        bounds = bounds or [psd.get_layer_bounds(n) for n in group]
+        bottom_bound: int = (bounds[1][1] if len(group) == 2 else self.docref.height) + 1
+        top_bound = bounds[0]
 
         # Create a new layer to fill the selection
         self.active_layer = self.docref.artLayers.add()
@@ -366,17 +388,26 @@ def fill_between_dividers(self, group: list[ArtLayer]) -> None:
         self.doc_selection.deselect()
 
     @staticmethod
-    def position_divider(layers: list[ArtLayer], line: ArtLayer) -> None:
+    def position_divider(
+        layers: list[Union[ArtLayer, Bounds]],
+        line: ArtLayer,
+        line_bounds: Optional[Bounds] = None
+    ) -> Bounds:
         """Positions a ragged divider line for an ability text mask.
 
         Args:
-            layers: Two layers to position the line between.
+            layers: Two layers, or their bounds, to position the line between.
             line: Line layer to be positioned.
+            line_bounds: Bounds of the line layer, if already known.
+
+        Returns:
+            Bounds of the line layer after positioning.
         """
-        delta = (layers[1].bounds[1] - layers[0].bounds[3]) / 2
-        reference_position = (line.bounds[3] + line.bounds[1]) / 2
-        target_position = delta + layers[0].bounds[3]
-        line.translate(0, (target_position - reference_position))
+        above, below = [n if isinstance(n, tuple) else psd.get_layer_bounds(n) for n in layers]
+        line_bounds = line_bounds or psd.get_layer_bounds(line)
+        delta = solve_divider(line_bounds, above, below)
+        line.translate(0, delta)
+        return solve_positions([line_bounds], [delta])[0]
 
 
 """
@@ -972,6 +972,11 @@ def is_normal(self) -> bool:
             return False
         return True
 
+    @property
+    def is_art_swap_supported(self) -> bool:
+        """bool: Textbox size is chosen from the art aspect, so the art can't be swapped in place."""
+        return False
+
     @cached_property
     def art_aspect(self) -> float:
         art_file = self.layout.art_file
@@ -2156,6 +2161,7 @@ def text_layers_saga(self):
             # Add ability text for this ability
             layer = self.text_layer_ability if i == 0 else self.text_layer_ability.duplicate()
             self.ability_layers.append(layer)
+            psd.invalidate_layer_index()
             self.text.append(
                 FormattedTextField(
                     layer=layer, contents=line['text']))
@@ -20,6 +20,15 @@
 from src.templates.transform import VectorTransformMod
 import src.text_layers as text_classes
 from src.utils.adobe import ReferenceLayer
+from src.utils.geometry import (
+    get_height,
+    merge_bounds,
+    solve_align_vertical,
+    solve_between,
+    solve_positions,
+    solve_spread,
+    solve_stack,
+    verify_positions)
 
 """
 * Modifier Classes
@@ -169,6 +178,7 @@ def text_layers_saga(self):
             # Add ability text for this ability
             layer = self.text_layer_ability if i == 0 else self.text_layer_ability.duplicate()
             self.ability_layers.append(layer)
+            psd.invalidate_layer_index()
             self.text.append(
                 text_classes.FormattedTextField(
                     layer=layer, contents=line['text']))
@@ -192,20 +202,26 @@ def layer_positioning_saga(self) -> None:
             text_layers=self.ability_layers,
             ref_height=total_height)
 
-        # Get the exact gap between each layer left over
-        layer_heights = sum([psd.get_layer_height(lyr) for lyr in self.ability_layers])
+        # Get the exact gap between each layer left over, measuring each line once
+        bounds = [psd.get_layer_bounds(lyr) for lyr in self.ability_layers]
+        layer_heights = sum([get_height(b) for b in bounds])
         gap = (ref_height - layer_heights) * (1 / spacing_total)
         inside_gap = (ref_height - layer_heights) * (1.5 / spacing_total)
 
         # Space Saga lines evenly apart
-        psd.spread_layers_over_reference(
-            layers=self.ability_layers,
-            ref=self.textbox_reference,
+        deltas = solve_spread(
+            bounds=bounds,
+            ref=self.textbox_reference.bounds,
             gap=gap,
             inside_gap=inside_gap)
+        for layer, delta in zip(self.ability_layers, deltas):
+            layer.translate(0, delta)
+        bounds = verify_positions(
+            solved=solve_positions(bounds, deltas),
+            measure=lambda i: psd.get_layer_bounds(self.ability_layers[i]))
 
         # Align icons to respective text layers
-        for i, ref_layer in enumerate(self.ability_layers):
+        for i, line_bounds in enumerate(bounds):
 
             # Skip if no icons present or icons are invalid
             if not (icons := self.icon_layers[i]):
@@ -213,22 +229,20 @@ def layer_positioning_saga(self) -> None:
             if not all(icons):
                 continue
 
-            # Space multiple icons apart
-            if len(icons) > 1:
-                psd.space_layers_apart(
-                    layers=icons,
-                    gap=spacing / 3)
-
-            # Combine icons and align them
-            layer = icons[0] if len(icons) == 1 else psd.merge_layers(icons)
-            psd.align_vertical(layer, ref_layer)
-
-        # Position divider lines
-        dividers = [self.ability_divider_layer.duplicate() for _ in range(len(self.ability_layers) - 1)]
-        psd.position_dividers(
-            dividers=dividers,
-            layers=self.ability_layers,
-            docref=self.docref)
+            # Space multiple icons apart, then align them together as one block
+            icon_bounds = [psd.get_layer_bounds(n) for n in icons]
+            icon_deltas = solve_stack(icon_bounds, gap=spacing / 3)
+            block = merge_bounds(solve_positions(icon_bounds, icon_deltas))
+            align_delta = solve_align_vertical(block, line_bounds)
+            for layer, delta in zip(icons, icon_deltas):
+                layer.translate(0, delta + align_delta)
+
+        # Position divider lines, duplicates share the bounds of their source
+        divider_bounds = psd.get_layer_bounds(self.ability_divider_layer)
+        for i in range(len(self.ability_layers) - 1):
+            self.ability_divider_layer.duplicate().translate(
+                0, solve_between(divider_bounds, bounds[i], bounds[i + 1]))
+        psd.invalidate_layer_index()
 
 
 class VectorSagaMod(SagaMod, VectorTemplate):
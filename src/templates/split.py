@@ -72,6 +72,11 @@ def post_text_methods(self):
     * Bool Properties
     """
 
+    @property
+    def is_art_swap_supported(self) -> bool:
+        """bool: Each side has its own art and artist credit, so split cards are never art swapped."""
+        return False
+
     @cached_property
     def is_centered(self) -> list[bool]:
         """Allow centered text for each side independently."""
@@ -275,6 +280,7 @@ def expansion_symbols(self) -> list[Optional[ArtLayer]]:
         """Expansion symbol layers for each side. Right side is generated duplicating the left side."""
         if self.expansion_symbol_layer:
             layer = self.expansion_symbol_layer.duplicate(self.expansion_reference_right, ElementPlacement.PlaceAfter)
+            psd.invalidate_layer_index()
             psd.align_right(layer, self.expansion_reference_right)
             return [self.expansion_symbol_layer, layer]
         return [None, None]
@@ -484,6 +490,7 @@ def enable_frame_layers(self) -> None:
                 self.textbox_groups[i], ElementPlacement.PlaceInside)
             textbox.visible = True
             self.active_layer = textbox
+            psd.invalidate_layer_index()
             psd.align_horizontal(textbox, self.textbox_reference[i].dims)
             if self.is_fuse:
                 psd.select_bounds(self.textbox_reference[i].bounds, self.doc_selection)
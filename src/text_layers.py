@@ -24,11 +24,12 @@
 from photoshop.api.text_item import TextItem
 
 # Local Imports
-from src import APP, CFG, CON, CONSOLE
+from src import APP, CFG, CON, CONSOLE, PATH
 from src.cards import generate_italics, locate_symbols, locate_italics, CardItalicString, CardSymbolString
 from src.enums.mtg import CardFonts
 from src.helpers import select_layer
-from src.helpers.bounds import get_layer_dimensions, LayerDimensions, get_layer_width
+from src.helpers.bounds import get_layer_dimensions, LayerDimensions, get_layer_width, get_textbox_width
+from src.helpers.document import get_document_metrics
 from src.helpers.colors import apply_color, get_text_item_color
 from src.helpers.position import position_between_layers, clear_reference_vertical
 from src.helpers.selection import select_layer_bounds
@@ -42,6 +43,7 @@
     scale_text_right_overlap)
 from src.schema.colors import ColorObject
 from src.utils.adobe import ReferenceLayer
+from src.utils.text_metrics import TextLayoutEstimator, TextStyles
 
 # QOL Definitions
 sID = APP.stringIDToTypeID
@@ -722,10 +724,55 @@ def fix_overflow_height(self) -> bool:
             return fix_overflow_height
         return False
 
+    @cached_property
+    def layout_estimator(self) -> Optional[TextLayoutEstimator]:
+        """Offline text layout estimator using this layer's fonts, if they are all found in the fonts directory."""
+        return TextLayoutEstimator.from_fonts(PATH.FONTS, TextStyles(
+            regular=self.font,
+            italic=self.font_italic,
+            bold=self.font_bold,
+            mana=self.font_mana))
+
+    @cached_property
+    def layout_scale(self) -> float:
+        """float: Points per pixel in this layer's document."""
+        return 72 / get_document_metrics()['resolution']
+
+    @cached_property
+    def layout_width(self) -> float:
+        """float: Width of this layer's paragraph text box in points, scaling the font doesn't change it."""
+        return get_textbox_width(self.layer) * self.layout_scale
+
     """
     * Methods
     """
 
+    def estimate_font_size(self, height: Union[int, float], font_size: float) -> Optional[float]:
+        """Estimate the font size at which the formatted text fits a given height, without measuring it in Photoshop.
+
+        Args:
+            height: Height the text must fit, in pixels.
+            font_size: Current font size of the text, in points.
+
+        Returns:
+            Estimated font size, or None if an estimate couldn't be made.
+        """
+        if not self.layout_estimator:
+            return
+        # Estimate is optional, fitting falls back to the measured height
+        with suppress(Exception):
+            return self.layout_estimator.fit_size(
+                text=self.input,
+                size=font_size,
+                width=self.layout_width,
+                height=height * self.layout_scale,
+                paragraph_space=self.line_break_lead if self.is_modal or self.is_flavor_text else 0,
+                italics=self.italics_indices,
+                symbols=self.symbol_indices,
+                bold=self.rules_range if self.bold_rules_text else None,
+                space_before={self.flavor_start: self.flavor_text_lead} if self.is_flavor_text else None)
+        return
+
     def insert_divider(self):
         """Inserts and correctly positions flavor text divider."""
 
@@ -753,7 +800,8 @@ def pre_scale_to_fit(self) -> Optional[float]:
         self.TI.contents = contents
         return scale_text_to_height(
             layer=self.layer,
-            height=int(self.reference_dims['height']*1.1))
+            height=int(self.reference_dims['height']*1.1),
+            estimate=self.estimate_font_size)
 
     def scale_to_fit(self, font_size: Optional[float] = None) -> None:
         """Scale font size to fit within any references."""
@@ -765,7 +813,8 @@ def scale_to_fit(self, font_size: Optional[float] = None) -> None:
             if self.scale_height:
                 font_size = scale_text_to_height(
                     layer=self.layer,
-                    height=self.reference_dims['height'])
+                    height=self.reference_dims['height'],
+                    estimate=self.estimate_font_size)
 
             # Resize the text until it fits the reference horizontally
             if self.scale_width:
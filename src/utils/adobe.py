@@ -2,14 +2,20 @@
 * Utils: Adobe Photoshop
 """
 # Standard Library
+import json
+import random
+import re
 from _ctypes import COMError, ArgumentError
-from contextlib import suppress
+from collections import OrderedDict
+from contextlib import suppress, contextmanager
 from ctypes import c_uint32
 from functools import cache, cached_property
-from typing import Union, Any, Optional, TypedDict, Callable
+from pathlib import Path
+from typing import Union, Any, Optional, TypedDict, Callable, Iterator
 
 # Third Party
 from comtypes.client.lazybind import Dispatch
+from omnitils.logs import logger
 from packaging.version import parse
 from photoshop.api import (
     ActionDescriptor,
@@ -17,6 +23,8 @@
     Application,
     DialogModes,
     PhotoshopPythonAPIError,
+    PurgeTarget,
+    SaveOptions,
     Units)
 from photoshop.api._artlayer import ArtLayer
 from photoshop.api._core import Photoshop
@@ -25,7 +33,11 @@
 from win32api import FormatMessage
 
 # Local Imports
-from src._state import AppEnvironment
+from src._state import AppEnvironment, PATH
+from src.utils.encoding import OutputEncoder
+from src.utils.filters import ArtFilterQueue
+from src.utils.images import ImageProbeCache, evict_art_cache
+from src.utils.profiling import RenderProfiler
 
 """
 * Types & Definitions
@@ -144,6 +156,9 @@ class PhotoshopHandler(ApplicationHandler):
     DIMS_600 = (1632, 2220)
     _instance = None
 
+    # Incremented whenever a document may have been opened or activated
+    document_epoch: int = 0
+
     def __new__(cls, env: Optional[Any] = None) -> 'PhotoshopHandler':
         """Always return the same Photoshop Application instance on successive calls.
 
@@ -178,8 +193,142 @@ def refresh_app(self):
             except Exception as e:
                 # Photoshop is either busy or unresponsive
                 return OSError(get_photoshop_error_message(e))
+
+            # Descriptors built by the previous instance can't be reused, IDs must be checked against its version
+            self.descriptors.clear()
+            self.clear_type_ids()
+            self.__dict__.pop('place_resizes_to_canvas', None)
+
+            # Load the ID table now, rather than during the first render
+            with suppress(Exception):
+                _ = self.type_ids
+        return
+
+    def clear_type_ids(self) -> None:
+        """Discard the ID table and every cached ID conversion, they may not match a new Photoshop instance."""
+        self.__dict__.pop('type_ids', None)
+        for func in (
+            self.CharIDToTypeID, self.cID, self.typeIDToCharID, self.t2c,
+            self.StringIDToTypeID, self.sID, self.typeIDToStringID, self.t2s,
+            self.charIDToStringID, self.stringIDToCharID
+        ):
+            func.cache_clear()
+
+    @cached_property
+    def type_ids(self) -> 'TypeIDTable':
+        """TypeIDTable: Char ID and String ID conversions, persisted for the running Photoshop version."""
+        version = None
+        with suppress(Exception):
+            version = self.version
+        table = TypeIDTable(path=PATH.SRC_DATA_TYPE_IDS, version=version)
+        if not version:
+            return table
+
+        # Load the saved table, then resolve any IDs it's missing, including IDs registered at runtime
+        table.load(verify=super().typeIDToStringID)
+        table.warm(
+            paths=self.type_id_sources,
+            resolve_char=super().charIDToTypeID,
+            resolve_string=super().stringIDToTypeID)
+        table.save()
+        return table
+
+    @property
+    def type_id_sources(self) -> list[Path]:
+        """list[Path]: Python modules whose literal Char IDs and String IDs are resolved when building the ID table."""
+        return [
+            *sorted((PATH.SRC / 'helpers').glob('*.py')),
+            PATH.SRC / 'text_layers.py',
+            *sorted(PATH.PLUGINS.glob('*/py/actions/*.py'))]
+
+    @cached_property
+    def art_probes(self) -> ImageProbeCache:
+        """ImageProbeCache: Art image headers probed in this or previous sessions."""
+        return ImageProbeCache(path=PATH.LOGS_ART_PROBES)
+
+    @cached_property
+    def place_resizes_to_canvas(self) -> Optional[bool]:
+        """Optional[bool]: Whether the 'Resize Image During Place' preference is enabled, None if it can't be read."""
+        with suppress(Exception):
+            ref = ActionReference()
+            ref.putProperty(self.stringIDToTypeID('property'), self.stringIDToTypeID('generalPreferences'))
+            ref.putEnumerated(
+                self.stringIDToTypeID('application'),
+                self.stringIDToTypeID('ordinal'),
+                self.stringIDToTypeID('targetEnum'))
+            prefs = self.executeActionGet(ref).getObjectValue(self.stringIDToTypeID('generalPreferences'))
+            return prefs.getBoolean(self.stringIDToTypeID('resizePastePlace'))
         return
 
+    def save_caches(self) -> None:
+        """Save any Char ID and String ID conversions or art image headers resolved since they were loaded,
+        then trim cached art to its size limit."""
+        if 'type_ids' in self.__dict__:
+            self.type_ids.save()
+        if 'art_probes' in self.__dict__:
+            self.art_probes.save()
+        evict_art_cache(PATH.LOGS_ART_CACHE, self._env.ART_CACHE_SIZE if self._env else 2048)
+
+    @cached_property
+    def descriptors(self) -> 'DescriptorCache':
+        """DescriptorCache: Reusable action descriptors built by helper functions."""
+        return DescriptorCache()
+
+    @cached_property
+    def bounds(self) -> 'BoundsCache':
+        """BoundsCache: Layer measurements reused by helper functions until a layer may have moved."""
+        return BoundsCache()
+
+    @cached_property
+    def session(self) -> 'DocumentSessionManager':
+        """DocumentSessionManager: Tracks template documents kept open across renders."""
+        budget = self._env.PS_MEMORY_BUDGET if self._env else DocumentSessionManager.DEFAULT_BUDGET
+        return DocumentSessionManager(app=self, budget=budget)
+
+    @cached_property
+    def profiler(self) -> RenderProfiler:
+        """RenderProfiler: Records render step timings and Photoshop round-trips when enabled."""
+        enabled = self._env.PROFILE_RENDERS if self._env else False
+        return RenderProfiler(enabled=enabled, path=PATH.LOGS_PROFILE)
+
+    @cached_property
+    def encoder(self) -> OutputEncoder:
+        """OutputEncoder: Encodes rendered images in the background after Photoshop saves a lossless copy."""
+        return OutputEncoder()
+
+    @cached_property
+    def art_filters(self) -> ArtFilterQueue:
+        """ArtFilterQueue: Applies template art filter pipelines in worker threads ahead of rendering."""
+        return ArtFilterQueue(cache_dir=PATH.LOGS_ART_CACHE)
+
+    """
+    * Loading Documents
+    """
+
+    def load(self, document_file_path: str) -> None:
+        """Load a document, marking the active document as changed.
+
+        Args:
+            document_file_path: Path to the document to load.
+        """
+        self.document_changed()
+        super().load(document_file_path)
+
+    def open(self, *args, **kwargs) -> Document:
+        """Open a document, marking the active document as changed.
+
+        Returns:
+            The opened document.
+        """
+        self.document_changed()
+        return super().open(*args, **kwargs)
+
+    def document_changed(self) -> None:
+        """Mark that the active document may have changed, layer indexes must verify their document
+        is still active before they can be trusted."""
+        self.document_epoch += 1
+        self.bounds.changed()
+
     """
     * Class Methods
     """
@@ -196,9 +345,8 @@ def is_running(cls) -> bool:
     * Action Descriptor ID Conversions
     """
 
-    @cache
     def charIDToTypeID(self, index: str) -> int:
-        """Caching handler for charIDToTypeID.
+        """Caching handler for charIDToTypeID, backed by the persistent ID table.
 
         Args:
             index: Char ID to convert to Type ID.
@@ -206,7 +354,7 @@ def charIDToTypeID(self, index: str) -> int:
         Returns:
             Type ID converted from Char ID.
         """
-        return super().charIDToTypeID(index)
+        return self.type_ids.get_char(index, super().charIDToTypeID)
 
     @cache
     def CharIDToTypeID(self, index: str) -> int:
@@ -239,9 +387,8 @@ def t2c(self, index: int) -> str:
     * String ID Conversions
     """
 
-    @cache
     def stringIDToTypeID(self, index: str) -> int:
-        """Caching handler for stringIDToTypeID.
+        """Caching handler for stringIDToTypeID, backed by the persistent ID table.
 
         Args:
             index: String ID to convert to Type ID.
@@ -249,7 +396,7 @@ def stringIDToTypeID(self, index: str) -> int:
         Returns:
             Type ID converted from string ID.
         """
-        return super().stringIDToTypeID(index)
+        return self.type_ids.get_string(index, super().stringIDToTypeID)
 
     @cache
     def StringIDToTypeID(self, index: str) -> int:
@@ -327,10 +474,25 @@ def executeAction(
         Returns:
             Result of the action descriptor execution.
         """
-        if self.is_error_dialog_enabled():
-            # Allow error dialogs if enabled in the app environment
-            return super().executeAction(event_id, descriptor, DialogModes.DisplayErrorDialogs)
-        return super().executeAction(event_id, descriptor, dialogs)
+        # Any action may move, resize, or redraw a layer
+        self.bounds.changed()
+        with self.profiler.call('executeAction'):
+            if self.is_error_dialog_enabled():
+                # Allow error dialogs if enabled in the app environment
+                return super().executeAction(event_id, descriptor, DialogModes.DisplayErrorDialogs)
+            return super().executeAction(event_id, descriptor, dialogs)
+
+    def executeActionGet(self, reference: ActionReference) -> ActionDescriptor:
+        """Middleware to record action getter round-trips in the render profiler.
+
+        Args:
+            reference: Action reference to retrieve a descriptor for.
+
+        Returns:
+            Action descriptor retrieved.
+        """
+        with self.profiler.call('executeActionGet'):
+            return super().executeActionGet(reference)
 
     def ExecuteAction(
             self, event_id: int,
@@ -517,6 +679,830 @@ def get_dimensions_from_bounds(bounds) -> type[LayerDimensions]:
             top=int(bounds[1]), bottom=int(bounds[3]))
 
 
+"""
+* Type ID Table
+"""
+
+
+class TypeIDTable:
+    """Char ID and String ID conversions resolved by Photoshop, persisted between sessions.
+
+    Notes:
+        - The table is saved alongside the Photoshop version which resolved it. A table saved by
+            any other version is discarded and rebuilt.
+        - Only String IDs which map to a fixed four character code are saved. IDs Photoshop registers
+            at runtime can change between launches, so they are resolved again in every session.
+        - A small random sample of the saved string IDs is verified against Photoshop when the
+            table is loaded, any mismatch discards the table.
+        - Every ID used as a literal in the helper modules, text layer classes, and plugin action
+            modules can be resolved eagerly when the table is loaded.
+    """
+    VERIFY_SAMPLE = 8
+    REG_STRING_ID = re.compile(r"\bs(?:ID|tringIDToTypeID)\(\s*[\"']([^\"'\\]+)[\"']\s*\)")
+    REG_CHAR_ID = re.compile(r"\bc(?:ID|harIDToTypeID)\(\s*[\"']([^\"'\\]{4})[\"']\s*\)")
+
+    def __init__(self, path: Optional[Path], version: Optional[str]):
+        """
+        Args:
+            path: JSON file the table is saved to, not saved if not provided.
+            version: Photoshop version resolving IDs, not saved if not provided.
+        """
+        self.path = path
+        self.version = version
+        self.char: dict[str, int] = {}
+        self.string: dict[str, int] = {}
+        self.dirty = False
+
+    """
+    * Loading and Saving
+    """
+
+    def load(self, verify: Optional[Callable[[int], str]] = None) -> bool:
+        """Load the saved table if it was resolved by the same Photoshop version.
+
+        Args:
+            verify: Function converting a Type ID back to its String ID, used to verify a sample of the table.
+
+        Returns:
+            True if a saved table was loaded, otherwise False.
+        """
+        if not self.path or not self.version or not self.path.is_file():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != self.version:
+            return False
+        char = data.get('char', {})
+        string = {k: v for k, v in data.get('string', {}).items() if self.is_fixed_id(v)}
+
+        # Verify a sample of the table still matches this Photoshop session
+        if verify and string:
+            for key in random.sample(sorted(string), min(self.VERIFY_SAMPLE, len(string))):
+                try:
+                    if verify(string[key]) != key:
+                        return False
+                except PS_EXCEPTIONS:
+                    return False
+        self.char, self.string = char, string
+        return True
+
+    def save(self) -> None:
+        """Save the table if any IDs were resolved since it was loaded."""
+        if not self.dirty or not self.path or not self.version:
+            return
+        with suppress(OSError):
+            string = {k: v for k, v in self.string.items() if self.is_fixed_id(v)}
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'char': self.char, 'string': string}, f)
+            self.dirty = False
+
+    @staticmethod
+    def is_fixed_id(type_id: int) -> bool:
+        """Check whether a Type ID is a fixed four character code, rather than an ID registered at runtime.
+
+        Args:
+            type_id: Type ID to check.
+
+        Returns:
+            True if every byte of the Type ID is a printable ASCII character, otherwise False.
+        """
+        if not 0 < type_id <= 0xFFFFFFFF:
+            return False
+        return all(0x20 <= b <= 0x7E for b in type_id.to_bytes(4, 'big'))
+
+    """
+    * Resolving IDs
+    """
+
+    def get_char(self, index: str, resolve: Callable[[str], int]) -> int:
+        """Get the Type ID of a Char ID, resolving it if it isn't in the table.
+
+        Args:
+            index: Char ID to convert.
+            resolve: Function which resolves the Char ID through Photoshop.
+
+        Returns:
+            Type ID of the Char ID.
+        """
+        if (type_id := self.char.get(index)) is None:
+            type_id = self.char[index] = resolve(index)
+            self.dirty = True
+        return type_id
+
+    def get_string(self, index: str, resolve: Callable[[str], int]) -> int:
+        """Get the Type ID of a String ID, resolving it if it isn't in the table.
+
+        Args:
+            index: String ID to convert.
+            resolve: Function which resolves the String ID through Photoshop.
+
+        Returns:
+            Type ID of the String ID.
+        """
+        if (type_id := self.string.get(index)) is None:
+            type_id = self.string[index] = resolve(index)
+            self.dirty = self.dirty or self.is_fixed_id(type_id)
+        return type_id
+
+    @classmethod
+    def find_ids(cls, paths: list[Path]) -> tuple[set[str], set[str]]:
+        """Find every Char ID and String ID used as a literal in a list of Python source files.
+
+        Args:
+            paths: Python source files to search.
+
+        Returns:
+            Tuple containing the set of Char IDs and the set of String IDs found.
+        """
+        char, string = set(), set()
+        for path in paths:
+            with suppress(OSError, UnicodeDecodeError):
+                source = path.read_text(encoding='utf-8')
+                char.update(cls.REG_CHAR_ID.findall(source))
+                string.update(cls.REG_STRING_ID.findall(source))
+        return char, string
+
+    def warm(
+        self,
+        paths: list[Path],
+        resolve_char: Callable[[str], int],
+        resolve_string: Callable[[str], int]
+    ) -> None:
+        """Resolve every ID used as a literal in a list of Python source files.
+
+        Args:
+            paths: Python source files to search.
+            resolve_char: Function which resolves a Char ID through Photoshop.
+            resolve_string: Function which resolves a String ID through Photoshop.
+        """
+        char, string = self.find_ids(paths)
+        for index in sorted(char):
+            with suppress(*PS_EXCEPTIONS):
+                self.get_char(index, resolve_char)
+        for index in sorted(string):
+            with suppress(*PS_EXCEPTIONS):
+                self.get_string(index, resolve_string)
+
+
+"""
+* Descriptor Cache
+"""
+
+
+class DescriptorCache:
+    """Reusable action descriptors, keyed by the values they were built from.
+
+    Notes:
+        - Each `put` on an action descriptor is a round-trip to Photoshop. Descriptors which don't
+            depend on the target layer, like colors, gradients, and layer effects, can be built once
+            and passed to any number of actions.
+        - Least recently used descriptors are discarded once the cache reaches its limit.
+        - Descriptors belong to the Photoshop instance which created them, the cache must be cleared
+            when the application is refreshed.
+    """
+    DEFAULT_LIMIT = 512
+
+    def __init__(self, limit: int = DEFAULT_LIMIT):
+        """
+        Args:
+            limit: Maximum number of descriptors to keep.
+        """
+        self.limit = limit
+        self.items: OrderedDict[Any, Any] = OrderedDict()
+        self.stats: dict[str, int] = {'hits': 0, 'builds': 0}
+
+    def get(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Get a cached descriptor, building it if it isn't cached.
+
+        Args:
+            key: Hashable key describing every value the descriptor is built from.
+            build: Function which builds the descriptor.
+
+        Returns:
+            The cached or newly built descriptor.
+        """
+        if key in self.items:
+            self.items.move_to_end(key)
+            self.stats['hits'] += 1
+            return self.items[key]
+        item = self.items[key] = build()
+        self.stats['builds'] += 1
+        while len(self.items) > self.limit:
+            self.items.popitem(last=False)
+        return item
+
+    def clear(self) -> None:
+        """Discard every cached descriptor."""
+        self.items.clear()
+
+
+"""
+* Bounds Cache
+"""
+
+
+class BoundsCache:
+    """Layer bounds and dimensions measured by helper functions, reused until something may have moved a layer.
+
+    Notes:
+        - Measurements are only cached inside a `scope`, outside of one every lookup measures the layer.
+            Cached measurements are discarded when the outermost scope exits.
+        - Each measurement is recorded with the mutation counter at the time it was taken, and is
+            only reused while the counter is unchanged. Every `executeAction` call advances the counter,
+            code which moves or edits a layer through its object model must call `changed`.
+        - When a single art layer was changed, only its own measurements and those of every group are
+            discarded, other art layers keep theirs.
+        - Measurements are keyed by layer ID when it's known without a round-trip, otherwise by the
+            layer object itself.
+    """
+
+    def __init__(self):
+        self.epoch: int = 0
+        self.depth: int = 0
+        self.items: dict[tuple, tuple[Any, int, Any]] = {}
+        self.stats: dict[str, int] = {'hits': 0, 'measures': 0}
+
+    @property
+    def active(self) -> bool:
+        """bool: Whether measurements are currently being cached."""
+        return self.depth > 0
+
+    @contextmanager
+    def scope(self) -> Iterator['BoundsCache']:
+        """Context manager which caches measurements made within its body, scopes can be nested."""
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if not self.depth:
+                self.items.clear()
+
+    def changed(self, layer: Any = None, layer_id: Optional[int] = None) -> None:
+        """Mark cached measurements stale after a layer may have moved, resized, or changed contents.
+
+        Args:
+            layer: Art layer which changed, marks every measurement stale if not provided or a group.
+            layer_id: ID of the changed layer, if known without a round-trip.
+        """
+        if layer is None or isinstance(layer, LayerSet) or not self.items:
+            self.epoch += 1
+            return
+        self.items = {
+            k: v for k, v in self.items.items()
+            if not isinstance(v[0], LayerSet)
+            and v[0] is not layer
+            and not (layer_id and k[1] == layer_id)}
+
+    def get(self, layer: Any, kind: str, measure: Callable[[], Any], layer_id: Optional[int] = None) -> Any:
+        """Get a measurement of a layer, measuring it if it isn't cached for the current mutation counter.
+
+        Args:
+            layer: ArtLayer or LayerSet object being measured.
+            kind: Kind of measurement, e.g. 'bounds' or 'boundsNoEffects'.
+            measure: Function which measures the layer.
+            layer_id: ID of the layer, if known without a round-trip.
+
+        Returns:
+            The cached or newly taken measurement.
+        """
+        if not self.depth:
+            return measure()
+        key = (kind, layer_id) if layer_id else (kind, None, id(layer))
+        item = self.items.get(key)
+        if item and item[1] == self.epoch and (layer_id or item[0] is layer):
+            self.stats['hits'] += 1
+            return item[2]
+        value = measure()
+        self.items[key] = (layer, self.epoch, value)
+        self.stats['measures'] += 1
+        return value
+
+
+"""
+* Layer Index
+"""
+
+
+class LayerIndexEntry(TypedDict):
+    """Layer details recorded by a `LayerIndex`."""
+    id: int
+    name: str
+    kind: str
+    visible: bool
+    bounds: LayerBounds
+
+
+class LayerIndex:
+    """Index of every layer in a document, keyed by the path of group names leading to each layer.
+
+    Notes:
+        - The whole layer tree is read with a single `sendDocumentInfoToNetworkClient` action, the
+            same document description Photoshop provides to Generator plugins.
+        - Layer objects resolved through the index are cached by path, so repeated lookups of the
+            same layer don't walk the document again.
+        - The index only answers lookups for layers it knows about. Unknown, ambiguous, or stale
+            lookups return None so callers can fall back to walking the document.
+        - Structural edits made through the layer helpers mark the index stale, it is then rebuilt
+            on the next lookup. Templates which duplicate or rename layers through the DOM must call
+            `invalidate_layer_index` themselves, or the index keeps returning the original layers.
+    """
+    KIND_GROUP = 'group'
+    KIND_LAYER = 'layer'
+
+    def __init__(self, app: Any, docref: Document):
+        """
+        Args:
+            app: Photoshop application object used to query the document.
+            docref: Document this index describes.
+        """
+        self.app = app
+        self.docref = docref
+        self.doc_id: int = docref.id
+        self.epoch: int = getattr(app, 'document_epoch', 0)
+        self.entries: dict[tuple[str, ...], LayerIndexEntry] = {}
+        self.ambiguous: set[tuple[str, ...]] = set()
+        self.objects: dict[tuple[str, ...], Any] = {}
+        self.ids: dict[int, int] = {}
+        self.containers: dict[int, tuple[Any, tuple[str, ...]]] = {}
+        self.available = True
+        self.stale = True
+        self.stats: dict[str, int] = {'builds': 0, 'hits': 0, 'misses': 0}
+
+    """
+    * Building the Index
+    """
+
+    def query(self) -> dict:
+        """Read a description of the document's layer tree from Photoshop.
+
+        Returns:
+            Document description in Generator JSON format.
+        """
+        s = self.app.stringIDToTypeID
+        desc = ActionDescriptor()
+        desc.putInteger(s('documentID'), self.doc_id)
+        desc.putString(s('version'), '1.6.1')
+        for key in [
+            'expandSmartObjects', 'getTextStyles', 'getFullTextStyles',
+            'getDefaultLayerFX', 'getPathData', 'getCompLayerSettings'
+        ]:
+            desc.putBoolean(s(key), False)
+        result = self.app.executeAction(s('sendDocumentInfoToNetworkClient'), desc, DialogModes.DisplayNoDialogs)
+        return json.loads(result.getString(s('json')))
+
+    def build(self) -> None:
+        """Rebuild the index from the document, disabling it if the document can't be described."""
+        self.entries, self.ambiguous = {}, set()
+        self.objects, self.ids, self.containers = {}, {}, {}
+        self.stale = False
+        try:
+            self.add_layers(self.query().get('layers', []))
+            self.stats['builds'] += 1
+        except Exception as e:
+            # Photoshop version can't describe the document
+            logger.warning(f"Layer index unavailable, layers will be found by walking the document: {e}")
+            self.available = False
+
+    def add_layers(self, layers: list[dict], parent: tuple[str, ...] = ()) -> None:
+        """Add a list of layers described in Generator JSON format to the index.
+
+        Args:
+            layers: Layers described at this level of the tree.
+            parent: Path of group names leading to these layers.
+        """
+        for layer in layers:
+            path = (*parent, layer.get('name', ''))
+            bounds = layer.get('bounds', {})
+            entry = LayerIndexEntry(
+                id=layer.get('id', 0),
+                name=layer.get('name', ''),
+                kind=self.KIND_GROUP if layer.get('type') == 'layerSection' else self.KIND_LAYER,
+                visible=layer.get('visible', True),
+                bounds=(
+                    bounds.get('left', 0), bounds.get('top', 0),
+                    bounds.get('right', 0), bounds.get('bottom', 0)))
+
+            # Duplicate names at the same level can't be resolved reliably
+            if path in self.entries or path in self.ambiguous:
+                self.entries.pop(path, None)
+                self.ambiguous.add(path)
+            else:
+                self.entries[path] = entry
+            if entry['kind'] == self.KIND_GROUP:
+                self.add_layers(layer.get('layers', []), path)
+
+    def invalidate(self) -> None:
+        """Mark the index stale, it will be rebuilt on the next lookup."""
+        self.stale = True
+        self.objects, self.ids, self.containers = {}, {}, {}
+
+    def is_current(self) -> bool:
+        """Check whether this index's document is still the active document.
+
+        Returns:
+            True if the index can be used for lookups in the active document, otherwise False.
+        """
+        if not self.available:
+            return False
+        epoch = getattr(self.app, 'document_epoch', 0)
+        if self.epoch == epoch:
+            return True
+        with suppress(Exception):
+            if self.app.activeDocument.id == self.doc_id:
+                self.epoch = epoch
+                return True
+        return False
+
+    """
+    * Lookups
+    """
+
+    def get_path(self, group: Any) -> Optional[tuple[str, ...]]:
+        """Get the path of group names representing a group reference accepted by `getLayer`.
+
+        Args:
+            group: Group name, LayerSet or Document object, or a list of these.
+
+        Returns:
+            Path of group names, or None if the group can't be resolved.
+        """
+        if not group:
+            return ()
+        if isinstance(group, str):
+            return group,
+        if isinstance(group, (tuple, list)):
+            path = ()
+            for g in group:
+                if isinstance(g, str):
+                    path = (*path, g)
+                elif (p := self.get_path(g)) is not None:
+                    path = p
+                else:
+                    return
+            return path
+
+        # LayerSet or Document object, cached by object identity
+        if cached := self.containers.get(id(group)):
+            return cached[1]
+        try:
+            if isinstance(group, Document):
+                path = () if group.id == self.doc_id else None
+            else:
+                path = next((p for p, e in self.entries.items() if e['id'] == group.id), None)
+        except PS_EXCEPTIONS:
+            return
+        if path is not None:
+            # Hold a reference so the object's identity can't be reused
+            self.containers[id(group)] = (group, path)
+        return path
+
+    def get_object(self, path: tuple[str, ...]) -> Any:
+        """Resolve the layer object at a known path, walking from the nearest cached group.
+
+        Args:
+            path: Path of group names ending with the name of the layer.
+
+        Returns:
+            The ArtLayer or LayerSet object at this path.
+        """
+        if not path:
+            return self.docref
+        if (obj := self.objects.get(path)) is not None:
+            return obj
+        parent = self.get_object(path[:-1])
+        if self.entries[path]['kind'] == self.KIND_GROUP:
+            obj = parent.layerSets[path[-1]]
+        else:
+            obj = parent.artLayers[path[-1]]
+        self.objects[path] = obj
+        self.ids[id(obj)] = self.entries[path]['id']
+        return obj
+
+    def get_id(self, layer: Any) -> Optional[int]:
+        """Get the ID of a layer object previously resolved through this index, without querying Photoshop.
+
+        Args:
+            layer: ArtLayer or LayerSet object.
+
+        Returns:
+            The layer's ID, or None if the object wasn't resolved through this index.
+        """
+        if self.stale or not self.available:
+            return
+        return self.ids.get(id(layer))
+
+    def lookup(self, name: str, group: Any = None, kind: str = KIND_LAYER) -> Any:
+        """Find a layer or group in the index.
+
+        Args:
+            name: Name of the layer or group.
+            group: Parent group reference, as accepted by `getLayer`.
+            kind: Kind of object to find, `KIND_LAYER` or `KIND_GROUP`.
+
+        Returns:
+            The ArtLayer or LayerSet object, or None if the index can't answer this lookup.
+        """
+        if self.stale:
+            self.build()
+        if not self.available or (parent := self.get_path(group)) is None:
+            return
+        path = (*parent, name)
+        entry = self.entries.get(path)
+        if not entry or entry['kind'] != kind:
+            self.stats['misses'] += 1
+            return
+        try:
+            obj = self.get_object(path)
+        except PS_EXCEPTIONS:
+            # Document changed in a way the index doesn't know about
+            self.invalidate()
+            return
+        self.stats['hits'] += 1
+        return obj
+
+
+"""
+* Document Sessions
+"""
+
+
+class DocumentMetrics(TypedDict):
+    """Canvas size and resolution of a document."""
+    width: int
+    height: int
+    resolution: float
+
+
+class SessionDocument:
+    """A template document held open by a `DocumentSessionManager`."""
+
+    def __init__(self, path: Path, docref: Document, size: int, index: Optional[LayerIndex] = None):
+        self.path = path
+        self.docref = docref
+        self.size = size
+        self.index = index
+        self.metrics: Optional[DocumentMetrics] = None
+        self.clean = True
+
+
+class DocumentSessionManager:
+    """Keeps template documents open across renders, restoring each to a clean snapshot between cards.
+
+    Notes:
+        - A named history snapshot is taken once, directly after a template is loaded. Every
+            subsequent card rendered with that template selects this snapshot instead of
+            reopening the PSD.
+        - A document which wasn't restored after its last render, e.g. a cancelled render, is restored
+            when it's reused, unless it was held open for an art swap. A document whose snapshot
+            can't be selected is reloaded from the PSD.
+        - Open documents are tracked in least recently used order. When the estimated memory
+            footprint of all open documents exceeds the budget, the least recently used documents
+            are closed until it no longer does. The most recent document is never evicted.
+        - The memory footprint of a document is estimated from its file size on disk, scaled by
+            `MEMORY_FACTOR` to account for decompression.
+    """
+    DEFAULT_BUDGET = 4096
+    MEMORY_FACTOR = 3
+    SNAPSHOT_NAME = 'Proxyshop Template'
+
+    def __init__(self, app: Any, budget: int = DEFAULT_BUDGET):
+        """
+        Args:
+            app: Photoshop application object used to load, activate, and close documents.
+            budget: Memory budget for all open template documents, in megabytes.
+        """
+        self.app = app
+        self.budget = int(budget) * 1024 * 1024
+        self.documents: OrderedDict[str, SessionDocument] = OrderedDict()
+        self.active: Optional[str] = None
+        self.held: Optional[str] = None
+        self.stats: dict[str, int] = {'loads': 0, 'reuses': 0, 'restores': 0, 'reloads': 0, 'evictions': 0}
+
+    """
+    * Properties
+    """
+
+    @property
+    def size(self) -> int:
+        """int: Estimated memory footprint of all open template documents, in bytes."""
+        return sum(d.size for d in self.documents.values())
+
+    @property
+    def active_index(self) -> Optional[LayerIndex]:
+        """Optional[LayerIndex]: Layer index of the most recently activated template document, if
+            it is still the active document."""
+        if entry := self.documents.get(self.active):
+            if entry.index and entry.index.is_current():
+                return entry.index
+        return
+
+    @property
+    def active_metrics(self) -> Optional[DocumentMetrics]:
+        """Optional[DocumentMetrics]: Canvas size and resolution of the most recently activated template
+            document, read once per document, if it is still the active document."""
+        entry = self.documents.get(self.active)
+        if not entry or not entry.index or not entry.index.is_current():
+            return
+        if entry.metrics is None:
+            entry.metrics = DocumentMetrics(
+                width=int(entry.docref.width),
+                height=int(entry.docref.height),
+                resolution=float(entry.docref.resolution))
+        return entry.metrics
+
+    """
+    * Snapshots
+    """
+
+    def make_snapshot(self, docref: Document) -> None:
+        """Create a named history snapshot of the document's current state.
+
+        Args:
+            docref: Document to create the snapshot in.
+        """
+        d1, d2 = ActionDescriptor(), ActionDescriptor()
+        r1, r2 = ActionReference(), ActionReference()
+        r1.putClass(self.app.stringIDToTypeID('snapshotClass'))
+        d1.putReference(self.app.stringIDToTypeID('target'), r1)
+        r2.putProperty(
+            self.app.stringIDToTypeID('historyState'),
+            self.app.stringIDToTypeID('currentHistoryState'))
+        d1.putReference(self.app.stringIDToTypeID('from'), r2)
+        d1.putString(self.app.stringIDToTypeID('name'), self.SNAPSHOT_NAME)
+        d1.putEnumerated(
+            self.app.stringIDToTypeID('using'),
+            self.app.stringIDToTypeID('historyState'),
+            self.app.stringIDToTypeID('fullDocument'))
+        self.app.executeAction(self.app.stringIDToTypeID('make'), d1, DialogModes.DisplayNoDialogs)
+
+    def select_snapshot(self, docref: Document) -> bool:
+        """Return the document to its session snapshot, falling back to the snapshot created on open.
+
+        Args:
+            docref: Document to restore.
+
+        Returns:
+            True if a snapshot was selected, otherwise False.
+        """
+        for name in [self.SNAPSHOT_NAME, docref.name]:
+            d1, r1 = ActionDescriptor(), ActionReference()
+            r1.putName(self.app.stringIDToTypeID('snapshotClass'), name)
+            d1.putReference(self.app.stringIDToTypeID('target'), r1)
+            try:
+                self.app.executeAction(self.app.stringIDToTypeID('select'), d1, DialogModes.DisplayNoDialogs)
+                return True
+            except PS_EXCEPTIONS:
+                continue
+        return False
+
+    """
+    * Managing Documents
+    """
+
+    @staticmethod
+    def is_open(docref: Document) -> bool:
+        """Check whether a document reference is still open in Photoshop.
+
+        Args:
+            docref: Document reference to check.
+
+        Returns:
+            True if the document can still be accessed, otherwise False.
+        """
+        with suppress(Exception):
+            _ = docref.name
+            return True
+        return False
+
+    def open(self, path: Union[str, Path]) -> Document:
+        """Activate a template document, loading it and taking a snapshot if it isn't already open.
+
+        Args:
+            path: Path to the PSD template file.
+
+        Returns:
+            The open template document, restored to its snapshot state unless it was held for an art swap.
+        """
+        path = Path(path)
+        key = str(path)
+        held, self.held = self.held == key, None
+
+        # Reuse an open document
+        if entry := self.documents.get(key):
+            if self.is_open(entry.docref):
+                self.documents.move_to_end(key)
+                self.app.activeDocument = entry.docref
+                if hasattr(self.app, 'document_changed'):
+                    self.app.document_changed()
+                self.active = key
+
+                # Restore a document left dirty by its last render
+                if held or entry.clean or self.select_snapshot(entry.docref):
+                    if not held and not entry.clean:
+                        if entry.index:
+                            entry.index.invalidate()
+                        self.stats['restores'] += 1
+                    entry.clean = False
+                    self.stats['reuses'] += 1
+                    return entry.docref
+
+                # Snapshot couldn't be selected, reload the document
+                self.close(key, purge=False)
+                self.stats['reloads'] += 1
+            else:
+                # Document was closed outside the session
+                self.documents.pop(key)
+
+        # Load the document and take a snapshot
+        self.app.load(key)
+        docref = self.app.activeDocument
+        self.make_snapshot(docref)
+        self.stats['loads'] += 1
+
+        # Track the document, then enforce memory budget
+        size = path.stat().st_size * self.MEMORY_FACTOR if path.is_file() else 0
+        self.documents[key] = SessionDocument(
+            path=path, docref=docref, size=size,
+            index=LayerIndex(app=self.app, docref=docref))
+        self.documents[key].clean = False
+        self.active = key
+        self.evict()
+        return docref
+
+    def restore(self, path: Union[str, Path]) -> bool:
+        """Restore a template document to its snapshot state, reloading it if the snapshot can't be selected.
+
+        Args:
+            path: Path to the PSD template file.
+
+        Returns:
+            True if the document was restored or reloaded, False if it isn't tracked by this session.
+        """
+        key = str(Path(path))
+        entry = self.documents.get(key)
+        if not entry or not self.is_open(entry.docref):
+            return False
+        if self.held == key:
+            self.held = None
+
+        # Snapshot couldn't be selected, reload the document
+        if not self.select_snapshot(entry.docref):
+            self.close(key, purge=False)
+            self.stats['reloads'] += 1
+            self.open(path)
+            self.documents[key].clean = True
+            return True
+
+        if entry.index:
+            entry.index.invalidate()
+        entry.clean = True
+        self.stats['restores'] += 1
+        return True
+
+    def hold(self, path: Union[str, Path]) -> None:
+        """Keep a template document's rendered state for an art swap, it won't be restored when next opened.
+
+        Args:
+            path: Path to the PSD template file.
+        """
+        self.held = str(Path(path))
+
+    def close(self, path: Union[str, Path], purge: bool = True) -> None:
+        """Close a template document and stop tracking it.
+
+        Args:
+            path: Path to the PSD template file.
+            purge: Whether to purge all caches after closing.
+        """
+        if not (entry := self.documents.pop(str(Path(path)), None)):
+            return
+        if self.active == str(entry.path):
+            self.active = None
+        with suppress(Exception):
+            entry.docref.close(SaveOptions.DoNotSaveChanges)
+        if purge:
+            with suppress(Exception):
+                self.app.purge(PurgeTarget.AllCaches)
+
+    def close_all(self) -> None:
+        """Close every tracked template document, then purge all caches."""
+        for key in list(self.documents.keys()):
+            self.close(key, purge=False)
+        with suppress(Exception):
+            self.app.purge(PurgeTarget.AllCaches)
+
+    def evict(self) -> None:
+        """Close least recently used documents until the memory budget is satisfied."""
+        while len(self.documents) > 1 and self.size > self.budget:
+            key = next(iter(self.documents))
+            self.close(key, purge=False)
+            self.stats['evictions'] += 1
+
+
 """
 * Utility Decorators
 """
@@ -0,0 +1,362 @@
+"""
+* Utils: Template Archives
+* Photoshop templates compressed as 7z archives in parallel, skipping templates unchanged since their last archive.
+"""
+# Standard Library Imports
+import ctypes
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from threading import Condition
+from time import perf_counter
+from typing import Callable, Iterator, Optional, TypedDict, Union
+
+# Third Party Imports
+from omnitils.files.archive import WordSize, DictionarySize, compress_7z
+from omnitils.strings import str_to_bool_safe
+
+# Local Imports
+from src.utils.encoding import CompressionManifest
+
+"""
+* Types
+"""
+
+
+class ArchiveResult(TypedDict):
+    """Outcome of compressing a template, with the timing and ratio it was compressed at."""
+    file: str
+    archive: Optional[str]
+    word_size: str
+    dict_size: str
+    skipped: bool
+    time: float
+    size: int
+    archive_size: int
+    ratio: float
+    error: Optional[str]
+
+
+# Word and dictionary size to compress a file with, as a 'word/dict' label like those `test_7z_compression` reports
+ArchiveSettings = dict[str, str]
+
+"""
+* Compression Settings
+"""
+
+# Word and dictionary size used unless a file has its own settings, matching `compress_7z`
+DEFAULT_WORD_SIZE = WordSize.WS16
+DEFAULT_DICT_SIZE = DictionarySize.DS1536
+
+# Memory used by LZMA per megabyte of dictionary with the BT4 match finder, plus a fixed overhead in megabytes
+LZMA_MEMORY_FACTOR = 11.5
+LZMA_MEMORY_OVERHEAD = 64
+
+# Dictionary size py7zr compresses with, in megabytes, it ignores the word and dictionary size settings
+PY7ZR_DICT_SIZE = 8
+
+# Fraction of physical memory compressions may reserve together, unless a limit is given
+DEFAULT_MEMORY_FRACTION = 0.5
+
+
+def is_7zip_enabled() -> bool:
+    """bool: Whether archives are compressed with the 7-Zip CLI rather than py7zr, see `compress_7z`."""
+    return str_to_bool_safe(os.environ.get('USE_7ZIP', '0'))
+
+
+def load_archive_settings(path: Path) -> ArchiveSettings:
+    """Load per-file compression settings from a JSON file.
+
+    Notes:
+        - The file maps template filenames to a 'word/dict' label, e.g. {"normal.psd": "64/768"}, so the
+            best result of a `test_7z_compression` sweep can be recorded for each template.
+
+    Args:
+        path: Path to the JSON file.
+
+    Returns:
+        Settings labels keyed by template filename.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return {str(k): str(v) for k, v in json.load(f).items()}
+
+
+def get_archive_settings(path: Path, settings: Optional[ArchiveSettings] = None) -> tuple[str, str]:
+    """Get the word and dictionary size to compress a file with.
+
+    Args:
+        path: Path to the file.
+        settings: Per-file settings labels keyed by filename.
+
+    Returns:
+        Word size and dictionary size.
+
+    Raises:
+        ValueError: If the file's settings label isn't a known word and dictionary size.
+    """
+    if not settings or path.name not in settings:
+        return DEFAULT_WORD_SIZE, DEFAULT_DICT_SIZE
+    ws, _, ds = settings[path.name].partition('/')
+    if ws not in WordSize or ds not in DictionarySize:
+        raise ValueError(f"Unknown 7z settings for '{path.name}': {settings[path.name]}")
+    return ws, ds
+
+
+def get_archive_memory(dict_size: str, use_7zip: bool) -> int:
+    """Estimate the memory used to compress a file, in megabytes.
+
+    Args:
+        dict_size: Dictionary size in megabytes.
+        use_7zip: Whether the 7-Zip CLI is used, otherwise py7zr with its own dictionary size.
+
+    Returns:
+        Estimated peak memory in megabytes.
+    """
+    size = int(dict_size) if use_7zip else PY7ZR_DICT_SIZE
+    return int(size * LZMA_MEMORY_FACTOR) + LZMA_MEMORY_OVERHEAD
+
+
+def get_physical_memory() -> Optional[int]:
+    """Get the physical memory installed in this machine.
+
+    Returns:
+        Physical memory in megabytes, or None if it can't be determined.
+    """
+    try:
+        if os.name == 'nt':
+            class MemoryStatus(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', ctypes.c_ulong),
+                    ('dwMemoryLoad', ctypes.c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong),
+                    ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong),
+                    ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong),
+                    ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+            status = MemoryStatus()
+            status.dwLength = ctypes.sizeof(MemoryStatus)
+            if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return
+            return status.ullTotalPhys // (1024 * 1024)
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, OSError, ValueError):
+        return
+
+
+def get_default_archive_memory() -> int:
+    """Get the memory compressions may reserve together when no limit is given.
+
+    Returns:
+        A fraction of physical memory in megabytes, or 0 if it can't be determined so that
+        templates are compressed one at a time.
+    """
+    if total := get_physical_memory():
+        return int(total * DEFAULT_MEMORY_FRACTION)
+    return 0
+
+
+class MemoryBudget:
+    """Limits the memory reserved by concurrent jobs, blocking jobs until enough is released.
+
+    Notes:
+        - A job larger than the whole budget runs once no other job holds memory, rather than never.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: Memory available to all jobs together, in megabytes.
+        """
+        self.limit = limit
+        self.used = 0
+        self._cond = Condition()
+
+    @contextmanager
+    def reserve(self, size: int) -> Iterator[None]:
+        """Hold memory from the budget while the context is open.
+
+        Args:
+            size: Memory to reserve, in megabytes.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.used == 0 or self.used + size <= self.limit)
+            self.used += size
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.used -= size
+                self._cond.notify_all()
+
+
+"""
+* Compressing Templates
+"""
+
+
+def get_archive_result(
+    path: Path,
+    word_size: str = DEFAULT_WORD_SIZE,
+    dict_size: str = DEFAULT_DICT_SIZE,
+    error: Optional[str] = None
+) -> ArchiveResult:
+    """Create the result of compressing a template, before it's compressed.
+
+    Args:
+        path: Path to the template.
+        word_size: Word size the template is compressed with.
+        dict_size: Dictionary size the template is compressed with.
+        error: Reason the template couldn't be compressed, if it failed.
+
+    Returns:
+        Result with no archive, time, or ratio recorded.
+    """
+    return ArchiveResult(
+        file=path.name,
+        archive=None,
+        word_size=str(word_size),
+        dict_size=str(dict_size),
+        skipped=False,
+        time=0.0,
+        size=path.stat().st_size if path.is_file() else 0,
+        archive_size=0,
+        ratio=0.0,
+        error=error)
+
+
+def compress_template(
+    path: Path,
+    path_out: Path,
+    word_size: str = DEFAULT_WORD_SIZE,
+    dict_size: str = DEFAULT_DICT_SIZE,
+    manifest: Optional[CompressionManifest] = None,
+    budget: Optional[MemoryBudget] = None,
+    force: bool = False
+) -> ArchiveResult:
+    """Compress a template as a 7z archive, unless it's unchanged since its archive was written.
+
+    Args:
+        path: Path to the template.
+        path_out: Directory to save the archive.
+        word_size: Word size to compress with, only used by the 7-Zip CLI.
+        dict_size: Dictionary size to compress with, only used by the 7-Zip CLI.
+        manifest: Content hash and settings of each archived template, used to skip unchanged templates.
+        budget: Memory budget to reserve the compression's estimated memory from.
+        force: Compress the template even if it's unchanged since its archive was written.
+
+    Returns:
+        Result of the compression, including its time and ratio.
+    """
+    archive = (path_out / path.name).with_suffix('.7z')
+    settings = {'archive': archive.name, 'word_size': str(word_size), 'dict_size': str(dict_size)}
+    result = get_archive_result(path, word_size, dict_size)
+
+    # Skip templates unchanged since they were archived with the same settings
+    if not force and manifest and archive.is_file() and manifest.is_compressed(path, settings):
+        result.update(skipped=True, archive=str(archive), archive_size=archive.stat().st_size)
+    else:
+        use_7zip = is_7zip_enabled()
+        memory = get_archive_memory(dict_size, use_7zip)
+        with budget.reserve(memory) if budget else nullcontext():
+            start = perf_counter()
+            out = compress_7z(
+                path_in=path,
+                path_out=archive,
+                use_7zip=use_7zip,
+                word_size=word_size,
+                dict_size=dict_size)
+            result['time'] = round(perf_counter() - start, 3)
+        if not out or not archive.is_file():
+            return result
+        result.update(archive=str(archive), archive_size=archive.stat().st_size)
+        if manifest:
+            manifest.add(path, settings)
+
+    # Archive size as a fraction of the template size
+    result['ratio'] = round(result['archive_size'] / max(result['size'], 1), 4)
+    return result
+
+
+def compress_templates(
+    paths: list[Path],
+    path_out: Optional[Path] = None,
+    workers: Optional[int] = None,
+    memory: Optional[int] = None,
+    settings: Optional[ArchiveSettings] = None,
+    force: bool = False,
+    callback: Optional[Callable[[ArchiveResult], None]] = None
+) -> list[ArchiveResult]:
+    """Compress templates as 7z archives in a worker pool, skipping templates unchanged since their last archive.
+
+    Notes:
+        - LZMA dictionaries are large, each job reserves its estimated memory from `memory` before it
+            starts, so fewer templates are compressed at once with larger dictionaries. Without a
+            limit, jobs share half the physical memory, or run one at a time if it can't be read.
+        - A template which can't be compressed, e.g. one with unknown settings, is reported in its
+            result without stopping the others.
+        - Largest templates are started first, so a long compression isn't left running alone at the end.
+        - The content hash and settings of each archived template are recorded in 'manifest.json' in
+            the output directory.
+
+    Args:
+        paths: Paths to the templates, all in the same directory if `path_out` isn't provided.
+        path_out: Directory to save the archives, uses a '.compressed' subdirectory if not provided.
+        workers: Maximum number of worker threads.
+        memory: Memory available to all jobs together, in megabytes, see `get_default_archive_memory`
+            if not provided.
+        settings: Per-file settings labels keyed by filename, see `load_archive_settings`.
+        force: Compress every template, even those unchanged since their last archive.
+        callback: Called with the result of each template as it completes.
+
+    Returns:
+        Result of each template, in the order they were given.
+    """
+    if not paths:
+        return []
+    path_out = path_out or Path(paths[0].parent, '.compressed')
+    path_out.mkdir(mode=777, parents=True, exist_ok=True)
+    manifest = CompressionManifest(path_out / 'manifest.json')
+    budget = MemoryBudget(memory or get_default_archive_memory())
+    results: dict[Path, ArchiveResult] = {}
+
+    def _complete(p: Path, result: ArchiveResult) -> None:
+        """Record the result of a template."""
+        results[p] = result
+        if callback:
+            callback(result)
+
+    # Compress the largest templates first
+    queue = sorted(paths, key=lambda p: p.stat().st_size, reverse=True)
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers or max((os.cpu_count() or 2) // 2, 1),
+            thread_name_prefix='compress_7z'
+        ) as executor:
+            futures: dict[Future, tuple[Path, str, str]] = {}
+            for p in queue:
+                try:
+                    word_size, dict_size = get_archive_settings(p, settings)
+                except ValueError as e:
+                    _complete(p, get_archive_result(p, error=str(e)))
+                    continue
+                futures[executor.submit(
+                    compress_template, p, path_out, word_size, dict_size,
+                    manifest=manifest, budget=budget, force=force)] = (p, word_size, dict_size)
+            for future in as_completed(futures):
+                p, word_size, dict_size = futures[future]
+                try:
+                    _complete(p, future.result())
+                except Exception as e:
+                    _complete(p, get_archive_result(p, word_size, dict_size, error=str(e)))
+    finally:
+        manifest.save()
+    return [results[p] for p in paths if p in results]
+
+
+def get_template_files(path: Union[str, Path]) -> list[Path]:
+    """list[Path]: Photoshop template files (PSD/PSB) in a directory."""
+    return sorted(p for p in Path(path).iterdir() if p.is_file() and p.suffix.lower() in ('.psd', '.psb'))
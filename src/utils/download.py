@@ -2,17 +2,27 @@
 * Utils: Downloads and Updates
 """
 # Standard Library Imports
-import shutil
+import hashlib
+import json
+import re
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from contextlib import suppress
 from dataclasses import dataclass
+from math import ceil
 from pathlib import Path
-from typing import Callable, Optional
+from threading import Event, Lock, RLock
+from time import monotonic, sleep
+from typing import Callable, Optional, TypedDict, Union
 
 # Third Party Imports
 import requests
 import yarl
-from omnitils.fetch import download_file
-from omnitils.files import get_temporary_file
+from omnitils.fetch import request_header_default
 from omnitils.files.archive import unpack_archive
+from omnitils.logs import logger
+
+# Local Imports
+from src.utils.tracing import TRACER
 
 
 @dataclass
@@ -25,33 +35,432 @@ class HEADERS:
                       "Chrome/39.0.2171.95 Safari/537.36"}
 
 
+"""
+* Types
+"""
+
+
+class DownloadState(TypedDict):
+    """Progress of a partial download, saved next to it so the download can be resumed."""
+    url: str
+    size: int
+    segments: list[list[int]]
+
+
+"""
+* Download Settings
+"""
+
+# Bytes read from the connection at a time
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Smallest range each connection of a multi-connection download is given
+DOWNLOAD_SEGMENT_SIZE = 16 * 1024 * 1024
+
+# Bytes downloaded between saves of the download state
+DOWNLOAD_STATE_INTERVAL = 8 * 1024 * 1024
+
+# Times a dropped connection is resumed before the download fails, and the base delay between attempts
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_RETRY_DELAY = 0.5
+
+# Seconds to wait for a connection or for data before the attempt fails
+DOWNLOAD_TIMEOUT = 30
+
+
+class BandwidthLimiter:
+    """Caps the combined transfer rate of every download sharing it, using a token bucket.
+
+    Notes:
+        - Up to one second of unused bandwidth is banked, so short stalls don't lower the average rate.
+    """
+
+    def __init__(self, rate: int = 0):
+        """
+        Args:
+            rate: Maximum bytes per second across all downloads, unlimited if 0.
+        """
+        self.rate = rate
+        self._tokens = float(rate)
+        self._time = monotonic()
+        self._lock = Lock()
+
+    def consume(self, size: int) -> None:
+        """Wait until a number of bytes can be transferred within the rate.
+
+        Args:
+            size: Number of bytes transferred.
+        """
+        if not self.rate:
+            return
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self._tokens + (now - self._time) * self.rate, self.rate) - size
+            self._time = now
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            sleep(wait)
+
+
 """
 * Download Utils
 """
 
 
-def download_cloudfront(url: yarl.URL, path: Path, callback: Optional[Callable] = None) -> bool:
-    """Download a template from cloudfront cached Amazon S3 bucket.
+def get_download_size(url: Union[str, yarl.URL], headers: Optional[dict] = None) -> tuple[Optional[int], bool]:
+    """Get the size of a hosted file and whether the host serves byte ranges of it.
+
+    Args:
+        url: URL of the hosted file.
+        headers: Headers to pass with the request.
+
+    Returns:
+        Size of the file in bytes if known, and True if byte ranges are supported.
+
+    Raises:
+        RequestException: If the request is unsuccessful.
+    """
+    headers = {**(headers or request_header_default), 'Range': 'bytes=0-0'}
+    with requests.get(str(url), headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
+        r.raise_for_status()
+        if r.status_code == 206:
+            if m := re.match(r'bytes \d+-\d+/(\d+)', r.headers.get('Content-Range', '')):
+                return int(m.group(1)), True
+        with suppress(ValueError):
+            return int(r.headers.get('Content-Length', '')), False
+    return None, False
+
+
+def get_file_md5(path: Path) -> str:
+    """str: MD5 digest of a file's contents, as reported by Google Drive."""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_download_state(path: Path, url: str, size: Optional[int]) -> Optional[DownloadState]:
+    """Load the saved progress of a partial download, if it matches the file being downloaded.
+
+    Args:
+        path: Path to the partial download.
+        url: URL being downloaded.
+        size: Size of the hosted file in bytes.
+
+    Returns:
+        Saved progress if the partial download can be resumed, otherwise None.
+    """
+    with suppress(OSError, ValueError, KeyError):
+        with open(path.with_name(f'{path.name}.json'), 'r', encoding='utf-8') as f:
+            state: DownloadState = json.load(f)
+        if state['url'] == url and state['size'] == size and path.stat().st_size == size:
+            return state
+    return None
+
+
+def save_download_state(path: Path, state: DownloadState) -> None:
+    """Save the progress of a partial download.
+
+    Args:
+        path: Path to the partial download.
+        state: Progress of the download.
+    """
+    with suppress(OSError):
+        temp = path.with_name(f'{path.name}.json.tmp')
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        temp.replace(path.with_name(f'{path.name}.json'))
+
+
+def download_segment(
+    url: str,
+    path: Path,
+    segment: list[int],
+    headers: dict,
+    on_chunk: Callable[[int], None],
+    limiter: Optional[BandwidthLimiter] = None,
+    event: Optional[Event] = None
+) -> None:
+    """Download a byte range of a hosted file into its place in a partial download, resuming from
+    the bytes already downloaded.
 
     Args:
-        url: URL to S3/cloudfront hosted file.
-        path: Path to save the archive.
-        callback: Callback function to update progress.
+        url: URL of the hosted file.
+        path: Path to the partial download.
+        segment: Start, end, and bytes downloaded of the range, updated as bytes are written. An end
+            of -1 downloads the whole file without a range.
+        headers: Headers to pass with the request.
+        on_chunk: Called with the number of bytes after each chunk is written.
+        limiter: Bandwidth limiter shared with other downloads.
+        event: Event which cancels the download when set.
+
+    Raises:
+        RequestException: If the request is unsuccessful.
+        OSError: If the host ignores the range or the connection ends before the range is complete.
+        InterruptedError: If the download is cancelled.
+    """
+    start, end, _ = segment
+    if end >= 0:
+        headers = {**headers, 'Range': f'bytes={start + segment[2]}-{end - 1}'}
+    with requests.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
+        r.raise_for_status()
+        if end >= 0 and r.status_code != 206:
+            raise OSError('Host ignored the requested byte range!')
+
+        # Write unbuffered, so saved progress never runs ahead of the file
+        with open(path, 'r+b', buffering=0) as f:
+            f.seek(start + segment[2])
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if event and event.is_set():
+                    raise InterruptedError('Download cancelled!')
+                if limiter:
+                    limiter.consume(len(chunk))
+                view = memoryview(chunk)
+                while view:
+                    view = view[f.write(view):]
+                segment[2] += len(chunk)
+                on_chunk(len(chunk))
+    if end >= 0 and start + segment[2] < end:
+        raise OSError('Connection closed before the download was complete!')
+
+
+def download_resumable(
+    url: Union[str, yarl.URL],
+    path: Path,
+    checksum: Optional[str] = None,
+    connections: int = 1,
+    limiter: Optional[BandwidthLimiter] = None,
+    callback: Optional[Callable[[int, int], None]] = None,
+    headers: Optional[dict] = None,
+    event: Optional[Event] = None
+) -> Path:
+    """Download a file, resuming from where a previous attempt stopped and verifying the result.
+
+    Notes:
+        - Bytes are written to a '.part' file next to `path`, with its progress saved alongside it. A
+            dropped connection is resumed with a byte range request, as is a download interrupted in a
+            previous session, as long as the host serves byte ranges and the file hasn't changed size.
+        - Large files are split into ranges downloaded over several connections at once if the host
+            serves byte ranges, each range resumes on its own.
+        - The finished file is checked against the size reported by the host and `checksum` if
+            provided, a mismatched download is discarded so the next attempt starts over.
+
+    Args:
+        url: URL of the hosted file.
+        path: Path to save the file to.
+        checksum: Expected MD5 digest of the file, not verified if not provided.
+        connections: Maximum number of connections to download the file over.
+        limiter: Bandwidth limiter shared with other downloads.
+        callback: Called after each chunk with the bytes downloaded so far and the total bytes.
+        headers: Headers to pass with each request, uses default if not provided.
+        event: Event which cancels the download when set, progress is kept so it can be resumed.
 
     Returns:
-        True if download is successful, otherwise False.
+        Path to the downloaded file.
+
+    Raises:
+        RequestException: If the host can't be reached after every retry.
+        OSError: If the download can't be completed, fails verification, or is cancelled.
     """
-    # Get a temp file
-    temp_path = get_temporary_file(path=path, ext='.amzn')
+    url, headers = str(url), headers or request_header_default.copy()
+    part = path.with_name(f'{path.name}.part')
+    path.parent.mkdir(mode=777, parents=True, exist_ok=True)
+
+    # Resume saved progress, or split the file into ranges
+    size, ranges = get_download_size(url, headers)
+    state = load_download_state(part, url, size) if ranges else None
+    if not state:
+        count = max(min(connections, ceil((size or 0) / DOWNLOAD_SEGMENT_SIZE)), 1) if ranges else 1
+        bounds = [size * i // count for i in range(count + 1)] if ranges else [0, -1]
+        state = DownloadState(url=url, size=size or 0, segments=[
+            [bounds[i], bounds[i + 1], 0] for i in range(count)])
+        with open(part, 'wb') as f:
+            f.truncate(size if ranges else 0)
+
+    # Track progress across connections
+    lock = Lock()
+    progress = {'done': sum(s[2] for s in state['segments']), 'saved': 0}
+
+    def on_chunk(n: int) -> None:
+        with lock:
+            progress['done'] += n
+            if ranges and progress['done'] - progress['saved'] >= DOWNLOAD_STATE_INTERVAL:
+                progress['saved'] = progress['done']
+                save_download_state(part, state)
+            if callback:
+                callback(progress['done'], max(progress['done'], size or 0))
 
-    # Start the download
+    def run_segment(segment: list[int]) -> None:
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                return download_segment(url, part, segment, headers, on_chunk, limiter, event)
+            except InterruptedError:
+                raise
+            except (requests.RequestException, OSError):
+                # Ranges resume from the last byte written, whole files start over
+                if attempt == DOWNLOAD_RETRIES:
+                    raise
+                if segment[1] < 0:
+                    with lock:
+                        progress['done'] -= segment[2]
+                    segment[2] = 0
+                    with open(part, 'wb'):
+                        pass
+                sleep(DOWNLOAD_RETRY_DELAY * 2 ** attempt)
+
+    # Download the remaining ranges
+    pending = [s for s in state['segments'] if s[1] < 0 or s[0] + s[2] < s[1]]
     try:
-        download_file(
-            url=url,
-            path=temp_path,
-            callback=callback)
-        shutil.move(temp_path, path)
-        unpack_archive(path)
-    except (requests.RequestException, FileExistsError, FileNotFoundError):
-        return False
-    return True
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='download') as executor:
+                [f.result() for f in [executor.submit(run_segment, s) for s in pending]]
+        elif pending:
+            run_segment(pending[0])
+    finally:
+        if ranges:
+            save_download_state(part, state)
+
+    # Verify the download, discarding it if it doesn't match
+    with TRACER.span('verify_download', 'download', file=path.name):
+        actual = part.stat().st_size
+        error = f'Expected {size} bytes, received {actual}' if size is not None and actual != size else None
+        if not error and checksum and get_file_md5(part) != checksum.lower():
+            error = 'Checksum does not match'
+    if error:
+        part.unlink(missing_ok=True)
+        part.with_name(f'{part.name}.json').unlink(missing_ok=True)
+        raise OSError(f'{error}: {path.name}')
+    part.replace(path)
+    part.with_name(f'{part.name}.json').unlink(missing_ok=True)
+    return path
+
+
+"""
+* Google Drive Utils
+"""
+
+
+def get_gdrive_metadata(file_id: str, api_key: str) -> Optional[dict]:
+    """Get the metadata of a Google Drive file, including the MD5 digest of its contents.
+
+    Args:
+        file_id: ID of the Google Drive file.
+        api_key: Google Drive API key.
+
+    Returns:
+        Metadata of the Google Drive file if found, otherwise None.
+    """
+    with suppress(Exception):
+        with requests.get(
+            f"https://www.googleapis.com/drive/v3/files/{file_id}",
+            headers=request_header_default,
+            params={
+                'alt': 'json',
+                'fields': 'description,name,size,md5Checksum',
+                'key': api_key},
+            timeout=DOWNLOAD_TIMEOUT
+        ) as r:
+            if r.status_code == 200 and 'name' in (data := r.json()) and 'size' in data:
+                return data
+    return None
+
+
+def get_gdrive_media_url(file_id: str, api_key: str) -> yarl.URL:
+    """yarl.URL: Google Drive API URL serving a file's contents, which supports byte range requests."""
+    return yarl.URL(
+        f'https://www.googleapis.com/drive/v3/files/{file_id}'
+    ).with_query({'alt': 'media', 'key': api_key})
+
+
+"""
+* Download Queue
+"""
+
+
+class DownloadQueue:
+    """Runs several downloads at once under a shared bandwidth cap, unpacking each archive as soon
+    as it's downloaded.
+
+    Notes:
+        - Template archives are 7z, which list their contents at the end of the file, so an archive
+            can't be unpacked while it's still downloading. Instead archives are unpacked on their own
+            worker, overlapping with the downloads still running.
+    """
+
+    def __init__(self, workers: int = 3, bandwidth: int = 0, connections: int = 1):
+        """
+        Args:
+            workers: Maximum number of files downloaded at once.
+            bandwidth: Maximum bytes per second across all downloads, unlimited if 0.
+            connections: Maximum number of connections each file is downloaded over.
+        """
+        self.limiter = BandwidthLimiter(bandwidth)
+        self.connections = connections
+        self.event = Event()
+        self._pending: set[Future] = set()
+        self._lock = RLock()
+        self._downloads = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix='download')
+        self._unpacks = ThreadPoolExecutor(max_workers=1, thread_name_prefix='unpack')
+
+    def submit(self, download: Callable[..., Optional[Path]], *args, **kwargs) -> Future:
+        """Queue a download, then unpack the file it returns.
+
+        Args:
+            download: Function that downloads a file and returns its path, or None if it failed. Must
+                accept `limiter`, `connections`, and `event` keyword arguments.
+            *args: Positional arguments passed to the download function.
+            **kwargs: Keyword arguments passed to the download function.
+
+        Returns:
+            Future resolving to True once the file is downloaded and unpacked, otherwise False.
+        """
+        result: Future = Future()
+        with self._lock:
+            self._pending.add(result)
+            result.add_done_callback(self._discard)
+
+        def unpack(path: Path) -> None:
+            try:
+                with TRACER.span('unpack_archive', 'download', file=path.name):
+                    unpack_archive(path)
+                self._resolve(result, True)
+            except Exception:
+                logger.exception(f"Unable to unpack archive: {path.name}")
+                self._resolve(result, False)
+
+        def run() -> None:
+            try:
+                path = download(
+                    *args, limiter=self.limiter, connections=self.connections, event=self.event, **kwargs)
+            except Exception:
+                logger.exception("Unable to download file")
+                path = None
+            if not path or self.event.is_set():
+                return self._resolve(result, False)
+            self._unpacks.submit(unpack, path)
+
+        self._downloads.submit(run)
+        return result
+
+    def _discard(self, result: Future) -> None:
+        """Stop tracking a resolved download."""
+        with self._lock:
+            self._pending.discard(result)
+
+    @staticmethod
+    def _resolve(result: Future, value: bool) -> None:
+        """Resolve a queued download's result, unless it was already resolved by a shutdown."""
+        with suppress(InvalidStateError):
+            result.set_result(value)
+
+    def shutdown(self) -> None:
+        """Cancel running and queued downloads, keeping their progress so they can be resumed, and
+        stop the workers."""
+        self.event.set()
+        self._downloads.shutdown(wait=False, cancel_futures=True)
+        self._unpacks.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            pending = list(self._pending)
+        for result in pending:
+            self._resolve(result, False)
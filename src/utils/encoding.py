@@ -0,0 +1,449 @@
+"""
+* Utils: Output Encoding
+* Rendered images encoded into their deliverable formats in the background, after Photoshop saves a lossless copy,
+* encoded to fit a file size budget, and tracked once compressed.
+"""
+# Standard Library Imports
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from io import BytesIO
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Optional, TypedDict
+
+# Third Party Imports
+from PIL import Image
+from PIL.Image import Resampling
+from omnitils.img import downscale_image_by_width
+
+"""
+* Types
+"""
+
+
+class EncodeOptions(TypedDict):
+    """Deliverables to encode from a rendered image."""
+    formats: list[str]
+    quality: int
+    downscale: Optional[int]
+
+
+class BudgetResult(TypedDict):
+    """Settings chosen to encode an image within a file size budget."""
+    file: str
+    output: Optional[str]
+    format: str
+    width: int
+    quality: int
+    size: int
+    fits: bool
+
+
+"""
+* Encoding Images
+"""
+
+
+def get_save_kwargs(img: Image.Image) -> dict:
+    """dict: Color profile and resolution of an image, passed along when saving it."""
+    return {k: v for k, v in [
+        ('icc_profile', img.info.get('icc_profile')),
+        ('dpi', img.info.get('dpi'))] if v}
+
+
+def save_image(img: Image.Image, path: Path, quality: int = 95) -> Path:
+    """Save an image in the format matching its file extension.
+
+    Notes:
+        - JPEG images are written without chroma subsampling, as Photoshop writes them at maximum
+            quality. Transparent images are flattened onto white.
+        - WebP images keep transparency.
+
+    Args:
+        img: Decoded image.
+        path: Path to save the image, extension determines the format.
+        quality: JPEG and WebP quality, from 1 to 100.
+
+    Returns:
+        Path to the saved image.
+    """
+    kwargs = get_save_kwargs(img)
+    suffix = path.suffix.lower()
+    if suffix in ['.jpg', '.jpeg']:
+        if img.mode in ('RGBA', 'LA', 'P'):
+            flat = Image.new('RGB', img.size, (255, 255, 255))
+            flat.paste(img.convert('RGBA'), mask=img.convert('RGBA').getchannel('A'))
+            img = flat
+        img.save(path, quality=quality, optimize=True, subsampling=0, **kwargs)
+    elif suffix == '.webp':
+        img.save(path, quality=quality, method=4, **kwargs)
+    else:
+        img.save(path, compress_level=6, **kwargs)
+    return path
+
+
+def encode_image(source: Path, path: Path, options: EncodeOptions) -> list[Path]:
+    """Encode every deliverable of a rendered image from its lossless intermediate, then remove the intermediate.
+
+    Notes:
+        - The intermediate is only removed once every deliverable is written. If encoding fails, it's
+            moved to the output path as a PNG instead, so the render isn't lost.
+
+    Args:
+        source: Lossless intermediate saved by Photoshop.
+        path: Output path of the rendered image, its extension is replaced for each format.
+        options: Deliverable formats, quality, and downscaled width.
+
+    Returns:
+        Paths to every encoded image.
+
+    Raises:
+        Exception: Any exception raised while encoding, after the intermediate is kept.
+    """
+    outputs: list[Path] = []
+    try:
+        with Image.open(source) as img:
+            img.load()
+            for fmt in options['formats']:
+                outputs.append(save_image(img, path.with_suffix(f'.{fmt}'), options['quality']))
+
+        # Downscaled copy of the first deliverable
+        if outputs and options['downscale']:
+            folder = path.parent / 'downscaled'
+            folder.mkdir(mode=777, parents=True, exist_ok=True)
+            downscale_image_by_width(
+                path_img=outputs[0],
+                path_save=folder / outputs[0].name,
+                max_width=options['downscale'],
+                optimize=True,
+                quality=options['quality'])
+            outputs.append(folder / outputs[0].name)
+    except Exception:
+        # Keep the lossless render unless a PNG deliverable was already written, left in place if it can't be moved
+        if path.with_suffix('.png') in outputs:
+            source.unlink(missing_ok=True)
+        else:
+            with suppress(OSError):
+                source.replace(path.with_suffix('.png'))
+        raise
+    source.unlink(missing_ok=True)
+    return outputs
+
+
+"""
+* Encoder Pool
+"""
+
+
+class OutputEncoder:
+    """Encodes rendered images in a worker pool, so the render thread is freed as soon as Photoshop
+    has saved a lossless copy.
+
+    Notes:
+        - At most `backlog` images are queued or encoding at once. Submitting another image blocks
+            until a worker finishes, so intermediates can't pile up if the encoders fall behind.
+    """
+
+    def __init__(self, workers: Optional[int] = None, backlog: Optional[int] = None):
+        """
+        Args:
+            workers: Maximum number of worker threads.
+            backlog: Maximum number of images queued or encoding at once, twice the number of workers if not provided.
+        """
+        self.workers = workers or max((os.cpu_count() or 2) - 1, 1)
+        self.backlog = backlog or self.workers * 2
+        self.pending: list[tuple[Path, Future]] = []
+        self._slots = BoundedSemaphore(self.backlog)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, source: Path, path: Path, options: EncodeOptions) -> Future:
+        """Queue a rendered image to be encoded, waiting for a free slot if the backlog is full.
+
+        Args:
+            source: Lossless intermediate saved by Photoshop.
+            path: Output path of the rendered image.
+            options: Deliverable formats, quality, and downscaled width.
+
+        Returns:
+            Future resolving to the paths of every encoded image.
+        """
+        self._slots.acquire()
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='encode')
+            future = self._executor.submit(encode_image, source, path, options)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self.pending.append((path, future))
+        return future
+
+    def join(self) -> list[tuple[Path, Exception]]:
+        """Wait for every queued image to be encoded.
+
+        Returns:
+            Output path and exception of each image which failed to encode.
+        """
+        failed: list[tuple[Path, Exception]] = []
+        for path, future in self.pending:
+            try:
+                future.result()
+            except Exception as e:
+                failed.append((path, e))
+        self.pending.clear()
+        return failed
+
+
+"""
+* Size Budgets
+"""
+
+# Widths tried in order when fitting an image to a budget, 1200 DPI then 800 DPI
+BUDGET_WIDTHS = (3264, 2176)
+
+# Scale of the trial image used to search for a quality setting
+BUDGET_TRIAL_SCALE = 0.5
+
+
+def get_encoded_size(img: Image.Image, fmt: str, quality: int) -> int:
+    """Get the size of an image encoded in memory, using the same settings as `save_image`.
+
+    Args:
+        img: Decoded image, flattened for JPEG.
+        fmt: Format to encode, 'jpg' or 'webp'.
+        quality: Quality to encode at, from 1 to 100.
+
+    Returns:
+        Size of the encoded image in bytes.
+    """
+    buffer, kwargs = BytesIO(), get_save_kwargs(img)
+    if fmt == 'webp':
+        img.save(buffer, format='WEBP', quality=quality, method=4, **kwargs)
+    else:
+        img.save(buffer, format='JPEG', quality=quality, optimize=True, subsampling=0, **kwargs)
+    return buffer.tell()
+
+
+def search_quality(measure: Callable[[int], float], budget: int, floor: int, ceiling: int = 100) -> Optional[int]:
+    """Bisect the highest quality whose encoded size is within a budget.
+
+    Args:
+        measure: Function returning the encoded size at a given quality.
+        budget: Maximum size in bytes.
+        floor: Lowest quality allowed.
+        ceiling: Highest quality allowed.
+
+    Returns:
+        Highest quality within the budget, or None if the floor exceeds it.
+    """
+    if measure(floor) > budget:
+        return
+    if measure(ceiling) <= budget:
+        return ceiling
+    lo, hi = floor, ceiling
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if measure(mid) <= budget:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def fit_image_to_budget(
+    path: Path,
+    output: Path,
+    budget: int,
+    floor: int = 80,
+    fmt: str = 'jpg',
+    widths: tuple[int, ...] = BUDGET_WIDTHS
+) -> BudgetResult:
+    """Encode an image at the highest quality which fits a file size budget.
+
+    Notes:
+        - Each width is tried in order, images are only resized if wider. A smaller width is used only if
+            the quality floor exceeds the budget at the larger width.
+        - Quality is bisected using trial encodes of a half size copy. Their sizes are scaled by the ratio of
+            a full size encode to a trial encode at the same quality, then the chosen quality is checked with
+            a full size encode and lowered until it fits.
+        - If no width fits at the quality floor, the image is written at the floor and smallest width.
+
+    Args:
+        path: Path to the image.
+        output: Directory to save the encoded image.
+        budget: Maximum file size in bytes.
+        floor: Lowest quality allowed, from 1 to 100.
+        fmt: Format to encode, 'jpg' or 'webp'.
+        widths: Maximum widths to try, largest first.
+
+    Returns:
+        Settings chosen for the image and the resulting file size.
+    """
+    with Image.open(path) as source:
+        source.load()
+        info = source.info
+        if fmt == 'jpg' and source.mode != 'RGB':
+            img = Image.new('RGB', source.size, (255, 255, 255))
+            img.paste(source.convert('RGBA'), mask=source.convert('RGBA').getchannel('A'))
+        else:
+            img = source.copy()
+    img.info = info
+
+    # Try each width until the quality floor fits
+    quality, size, scaled = floor, 0, img
+    for width in widths:
+        scaled = img if img.width <= width else img.resize(
+            size=(width, round(img.height * width / img.width)),
+            resample=Resampling.LANCZOS)
+        trial = scaled.resize(
+            size=(max(1, round(scaled.width * BUDGET_TRIAL_SCALE)), max(1, round(scaled.height * BUDGET_TRIAL_SCALE))),
+            resample=Resampling.LANCZOS)
+
+        # Calibrate trial sizes against a full size encode, then bisect on trial encodes
+        ratio = get_encoded_size(scaled, fmt, floor) / get_encoded_size(trial, fmt, floor)
+        found = search_quality(lambda q: get_encoded_size(trial, fmt, q) * ratio, budget, floor)
+        if found is None:
+            size = round(get_encoded_size(trial, fmt, floor) * ratio)
+            continue
+
+        # Confirm the estimate with full size encodes
+        quality, size = found, get_encoded_size(scaled, fmt, found)
+        while size > budget and quality > floor:
+            quality -= 1
+            size = get_encoded_size(scaled, fmt, quality)
+        if size <= budget:
+            break
+    else:
+        quality = floor
+
+    # Save the image with the chosen settings
+    out = save_image(scaled, (output / path.name).with_suffix(f'.{fmt}'), quality)
+    size = out.stat().st_size
+    return BudgetResult(
+        file=str(path),
+        output=str(out),
+        format=fmt,
+        width=scaled.width,
+        quality=quality,
+        size=size,
+        fits=size <= budget)
+
+
+def fit_images_to_budget(
+    paths: list[Path],
+    output: Path,
+    budget: int,
+    floor: int = 80,
+    fmt: str = 'jpg',
+    workers: Optional[int] = None
+) -> list[BudgetResult]:
+    """Encode images to fit a file size budget in a worker pool, then write a report of the chosen settings.
+
+    Args:
+        paths: Paths to the images.
+        output: Directory to save the encoded images and report.
+        budget: Maximum file size in bytes.
+        floor: Lowest quality allowed, from 1 to 100.
+        fmt: Format to encode, 'jpg' or 'webp'.
+        workers: Maximum number of worker threads.
+
+    Returns:
+        Settings chosen for each image, in the order given.
+    """
+    output.mkdir(mode=777, parents=True, exist_ok=True)
+    with ThreadPoolExecutor(
+        max_workers=workers or max((os.cpu_count() or 2) - 1, 1),
+        thread_name_prefix='budget'
+    ) as executor:
+        futures = [executor.submit(fit_image_to_budget, p, output, budget, floor, fmt) for p in paths]
+        results: list[BudgetResult] = []
+        for p, future in zip(paths, futures):
+            try:
+                results.append(future.result())
+            except Exception:
+                results.append(BudgetResult(
+                    file=str(p), output=None, format=fmt, width=0, quality=0, size=0, fits=False))
+
+    # Write a report of the chosen settings
+    with open(output / 'budget.json', 'w', encoding='utf-8') as f:
+        json.dump({'budget': budget, 'floor': floor, 'format': fmt, 'images': results}, f, indent=2)
+    return results
+
+
+"""
+* Compression Manifest
+"""
+
+
+def get_file_hash(path: Path) -> str:
+    """str: SHA-1 digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CompressionManifest:
+    """Settings each image was compressed with, keyed by a hash of the compressed file's contents.
+
+    Notes:
+        - An image whose contents match a compressed file with the same settings is skipped, images
+            modified or replaced since they were compressed are compressed again.
+        - New entries are written back to disk when `save` is called.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: JSON file the manifest is saved to, not saved if not provided.
+        """
+        self.path = path
+        self.items: dict[str, dict] = {}
+        self.dirty = False
+        self._lock = Lock()
+        if path and path.is_file():
+            with suppress(OSError, ValueError):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.items = json.load(f)
+
+    def is_compressed(self, path: Path, settings: dict) -> bool:
+        """Check whether an image was already compressed with the given settings.
+
+        Args:
+            path: Path to the image.
+            settings: Settings the image would be compressed with.
+
+        Returns:
+            True if the image is unchanged since it was compressed with these settings, otherwise False.
+        """
+        with suppress(OSError):
+            return self.items.get(get_file_hash(path)) == settings
+        return False
+
+    def add(self, path: Path, settings: dict) -> None:
+        """Record the settings a compressed image was written with.
+
+        Args:
+            path: Path to the compressed image.
+            settings: Settings the image was compressed with.
+        """
+        with suppress(OSError):
+            key = get_file_hash(path)
+            with self._lock:
+                self.items[key] = dict(settings)
+                self.dirty = True
+
+    def save(self) -> None:
+        """Save the manifest if any images were compressed since it was loaded."""
+        if not self.dirty or not self.path:
+            return
+        with suppress(OSError):
+            with self._lock:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(self.items, f)
+                self.dirty = False
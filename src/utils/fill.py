@@ -0,0 +1,250 @@
+"""
+* Utils: Edge Fill
+* Art extended past its edges with NumPy before it's imported, in place of Photoshop's content aware fill.
+"""
+# Standard Library Imports
+from math import ceil
+from pathlib import Path
+
+# Third Party Imports
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+# Local Imports
+from src.utils.encoding import get_file_hash
+from src.utils.images import Box, mark_cache_used
+
+"""
+* Fill Geometry
+"""
+
+# Art pixels filled beyond the canvas edge, covers rounding when the art is framed
+FILL_PADDING = 4
+
+
+def get_framed_box(size: tuple[int, int], ref: Box) -> Box:
+    """Get the bounds of an image framed to cover a reference, centered on both axes, as `frame_layer` would.
+
+    Args:
+        size: Width and height of the image.
+        ref: Bounds of the reference frame.
+
+    Returns:
+        Bounds of the framed image.
+    """
+    k = max((ref[2] - ref[0]) / size[0], (ref[3] - ref[1]) / size[1])
+    cx, cy = (ref[0] + ref[2]) / 2, (ref[1] + ref[3]) / 2
+    return cx - size[0] * k / 2, cy - size[1] * k / 2, cx + size[0] * k / 2, cy + size[1] * k / 2
+
+
+def get_fill_margins(
+    size: tuple[int, int],
+    ref: Box,
+    canvas: tuple[int, int],
+    padding: int = FILL_PADDING
+) -> tuple[int, int, int, int]:
+    """Get the margins an image must be extended by to cover the canvas once it's framed to a reference.
+
+    Args:
+        size: Width and height of the image.
+        ref: Bounds of the reference frame the image is framed to.
+        canvas: Width and height of the document canvas.
+        padding: Art pixels filled beyond the canvas edge.
+
+    Returns:
+        Left, top, right, and bottom margins in art pixels, all zero if the image covers the canvas.
+    """
+    box = get_framed_box(size, ref)
+    k = (box[2] - box[0]) / size[0]
+    gaps = (box[0], box[1], canvas[0] - box[2], canvas[1] - box[3])
+    if all(g <= 0 for g in gaps):
+        return 0, 0, 0, 0
+    return tuple(ceil(g / k) + padding if g > 0 else 0 for g in gaps)
+
+
+def get_extended_box(size: tuple[int, int], ref: Box, margins: tuple[int, int, int, int]) -> Box:
+    """Get the bounds an extended image must be framed to, so the original image keeps its framed position.
+
+    Args:
+        size: Width and height of the original image.
+        ref: Bounds of the reference frame the original image is framed to.
+        margins: Left, top, right, and bottom margins the image was extended by.
+
+    Returns:
+        Bounds of the extended image.
+    """
+    box = get_framed_box(size, ref)
+    k = (box[2] - box[0]) / size[0]
+    return box[0] - margins[0] * k, box[1] - margins[1] * k, box[2] + margins[2] * k, box[3] + margins[3] * k
+
+
+"""
+* Fill Methods
+"""
+
+
+def fill_mirror(art: np.ndarray, margins: tuple[int, int, int, int]) -> np.ndarray:
+    """Extend an image by mirroring it across each edge.
+
+    Args:
+        art: RGB image, shaped (height, width, 3).
+        margins: Left, top, right, and bottom margins to extend by.
+
+    Returns:
+        Extended image.
+    """
+    left, top, right, bottom = margins
+    return np.pad(art, ((top, bottom), (left, right), (0, 0)), mode='symmetric')
+
+
+def fill_blur(art: np.ndarray, margins: tuple[int, int, int, int]) -> np.ndarray:
+    """Extend an image by mirroring it, fading the mirrored pixels into a wide blur away from the edge,
+    so the mirrored shapes don't read as reflections.
+
+    Args:
+        art: RGB image, shaped (height, width, 3).
+        margins: Left, top, right, and bottom margins to extend by.
+
+    Returns:
+        Extended image.
+    """
+    mirrored = fill_mirror(art, margins)
+    radius = max(max(margins) / 4, 2)
+    blurred = np.asarray(Image.fromarray(mirrored).filter(ImageFilter.GaussianBlur(radius)))
+
+    # Fade from the mirror at the edge to the blur over a quarter of the widest margin
+    distance = get_edge_distance(art.shape[:2], margins)
+    weight = np.clip(distance / max(radius, 1), 0, 1)[:, :, None]
+    return np.rint(mirrored * (1 - weight) + blurred * weight).astype(np.uint8)
+
+
+def fill_diffuse(art: np.ndarray, margins: tuple[int, int, int, int]) -> np.ndarray:
+    """Extend an image by diffusing its edge colors outward, using a push-pull image pyramid.
+
+    Notes:
+        - Known pixels are averaged down a pyramid of halving resolutions, then each level fills its
+            missing pixels from the level below while scaling back up. The fill is smooth and
+            continuous with the art edge, approximating a diffusion inpaint in a handful of passes.
+
+    Args:
+        art: RGB image, shaped (height, width, 3).
+        margins: Left, top, right, and bottom margins to extend by.
+
+    Returns:
+        Extended image.
+    """
+    left, top, right, bottom = margins
+    h, w = art.shape[0] + top + bottom, art.shape[1] + left + right
+    color = np.zeros((h, w, 3), dtype=np.float32)
+    color[top:top + art.shape[0], left:left + art.shape[1]] = art
+    weight = np.zeros((h, w), dtype=np.float32)
+    weight[top:top + art.shape[0], left:left + art.shape[1]] = 1
+
+    # Pull: average known pixels down the pyramid
+    levels: list[tuple[np.ndarray, np.ndarray]] = []
+    while min(color.shape[:2]) > 1:
+        levels.append((color, weight))
+        color, weight = pull_level(color, weight)
+
+    # Push: fill missing pixels of each level from the level below
+    for known, alpha in reversed(levels):
+        up = np.stack([
+            np.asarray(Image.fromarray(color[:, :, c].astype(np.float32)).resize(
+                (known.shape[1], known.shape[0]), Image.Resampling.BILINEAR))
+            for c in range(3)], axis=2)
+        color = known + up * (1 - alpha[:, :, None])
+    out = np.rint(np.clip(color, 0, 255)).astype(np.uint8)
+    out[top:top + art.shape[0], left:left + art.shape[1]] = art
+    return out
+
+
+def pull_level(color: np.ndarray, weight: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Halve the resolution of a premultiplied image and its coverage, averaging only known pixels.
+
+    Args:
+        color: RGB image premultiplied by its coverage.
+        weight: Coverage of each pixel, from 0 to 1.
+
+    Returns:
+        Premultiplied image and coverage at half resolution.
+    """
+    pad = ((0, color.shape[0] % 2), (0, color.shape[1] % 2))
+    color, weight = np.pad(color, (*pad, (0, 0))), np.pad(weight, pad)
+    c = color[0::2, 0::2] + color[1::2, 0::2] + color[0::2, 1::2] + color[1::2, 1::2]
+    s = weight[0::2, 0::2] + weight[1::2, 0::2] + weight[0::2, 1::2] + weight[1::2, 1::2]
+    alpha = np.minimum(s, 1)
+    return c * (alpha / np.maximum(s, 1e-6))[:, :, None], alpha
+
+
+def get_edge_distance(size: tuple[int, int], margins: tuple[int, int, int, int]) -> np.ndarray:
+    """Get the distance of each pixel of an extended image from the original image, zero inside it.
+
+    Args:
+        size: Height and width of the original image.
+        margins: Left, top, right, and bottom margins the image was extended by.
+
+    Returns:
+        Distance in pixels, shaped like the extended image.
+    """
+    left, top, right, bottom = margins
+    ys = np.arange(size[0] + top + bottom, dtype=np.float32)
+    xs = np.arange(size[1] + left + right, dtype=np.float32)
+    dy = np.maximum(np.maximum(top - ys, ys - (top + size[0] - 1)), 0)
+    dx = np.maximum(np.maximum(left - xs, xs - (left + size[1] - 1)), 0)
+    return np.hypot(dy[:, None], dx[None, :])
+
+
+# Fill methods, keyed by the 'Edge.Fill' setting
+FILL_METHODS = {
+    'mirror': fill_mirror,
+    'blur': fill_blur,
+    'diffuse': fill_diffuse
+}
+
+"""
+* Filling Art
+"""
+
+
+def fill_art_edges(
+    path: Path,
+    ref: Box,
+    canvas: tuple[int, int],
+    method: str,
+    cache_dir: Path
+) -> tuple[Path, Box]:
+    """Extend an art image so it covers the canvas once framed to a reference, writing a cached PNG.
+
+    Notes:
+        - Results are named after a hash of the art file's contents, the fill method, and the margins,
+            so they are reused until the art or the template geometry changes.
+        - Embedded color profiles and resolution are kept, EXIF orientation is applied.
+
+    Args:
+        path: Path to the art image.
+        ref: Bounds of the reference frame the art is framed to.
+        canvas: Width and height of the document canvas.
+        method: Fill method, a key of `FILL_METHODS`.
+        cache_dir: Directory results are written to.
+
+    Returns:
+        Path to the extended image and the bounds to frame it to, or the original path and reference
+            if the art already covers the canvas.
+    """
+    with Image.open(path) as img:
+        info = {k: img.info[k] for k in ('icc_profile', 'dpi') if img.info.get(k)}
+        img = ImageOps.exif_transpose(img)
+        if not any(margins := get_fill_margins(img.size, ref, canvas)):
+            return path, ref
+        box = get_extended_box(img.size, ref, margins)
+        out = cache_dir / f"fill-{get_file_hash(path)[:16]}-{method}-{'x'.join(map(str, margins))}.png"
+        if out.is_file():
+            return mark_cache_used(out), box
+        art = np.asarray(img.convert('RGB'))
+
+    # Extend, then write the result
+    extended = Image.fromarray(FILL_METHODS[method](art, margins), mode='RGB')
+    temp = out.with_suffix('.tmp.png')
+    extended.save(temp, compress_level=1, **info)
+    temp.replace(out)
+    return out, box
@@ -0,0 +1,213 @@
+"""
+* Utils: Art Filters
+* Declarative art filter pipelines, applied to art files in worker threads before they reach Photoshop.
+"""
+# Standard Library Imports
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Optional, Union
+
+# Third Party Imports
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+
+# Local Imports
+from src.utils.encoding import get_file_hash
+from src.utils.images import mark_cache_used
+
+"""
+* Types
+"""
+
+# Filter function, takes an RGB image and keyword parameters and returns the filtered image
+ArtFilter = Callable[..., Image.Image]
+
+# Chain of named filters and their parameters, applied in order
+ArtPipeline = list[tuple[str, dict]]
+
+"""
+* Filter Registry
+"""
+
+# Filters available to art pipelines, keyed by name
+ART_FILTERS: dict[str, ArtFilter] = {}
+
+
+def register_art_filter(name: str) -> Callable[[ArtFilter], ArtFilter]:
+    """Register a function as a named art filter which art pipelines can use.
+
+    Notes:
+        - Filters must be thread safe and must not call Photoshop, they run on worker threads.
+        - Registering a name again replaces the previous filter.
+
+    Args:
+        name: Name art pipelines refer to the filter by.
+
+    Returns:
+        Decorator which registers the function and returns it unchanged.
+    """
+    def decorator(func: ArtFilter) -> ArtFilter:
+        ART_FILTERS[name] = func
+        return func
+    return decorator
+
+
+@register_art_filter('grayscale')
+def filter_grayscale(img: Image.Image) -> Image.Image:
+    """Image: Grayscale copy of an image, kept in RGB mode."""
+    return ImageOps.grayscale(img).convert('RGB')
+
+
+@register_art_filter('autocontrast')
+def filter_autocontrast(img: Image.Image, cutoff: float = 0.1) -> Image.Image:
+    """Image: Image stretched to the full tonal range, clipping a percentage of pixels at either end."""
+    return ImageOps.autocontrast(img, cutoff=cutoff)
+
+
+@register_art_filter('gaussian_blur')
+def filter_gaussian_blur(img: Image.Image, radius: float = 2) -> Image.Image:
+    """Image: Image blurred with a gaussian of the given radius, in pixels."""
+    return img.filter(ImageFilter.GaussianBlur(radius))
+
+
+@register_art_filter('unsharp_mask')
+def filter_unsharp_mask(img: Image.Image, radius: float = 2, percent: int = 150, threshold: int = 3) -> Image.Image:
+    """Image: Image sharpened with an unsharp mask."""
+    return img.filter(ImageFilter.UnsharpMask(radius, percent, threshold))
+
+
+@register_art_filter('posterize')
+def filter_posterize(img: Image.Image, bits: int = 4) -> Image.Image:
+    """Image: Image reduced to the given number of bits per channel."""
+    return ImageOps.posterize(img, bits)
+
+
+@register_art_filter('enhance')
+def filter_enhance(
+    img: Image.Image,
+    brightness: float = 1.0,
+    contrast: float = 1.0,
+    saturation: float = 1.0
+) -> Image.Image:
+    """Image: Image with its brightness, contrast, and saturation scaled, 1 leaves a property unchanged."""
+    for enhancer, factor in (
+        (ImageEnhance.Brightness, brightness),
+        (ImageEnhance.Contrast, contrast),
+        (ImageEnhance.Color, saturation)
+    ):
+        if factor != 1:
+            img = enhancer(img).enhance(factor)
+    return img
+
+
+"""
+* Applying Pipelines
+"""
+
+
+def get_pipeline_key(pipeline: ArtPipeline) -> str:
+    """str: Digest identifying a pipeline by its filter names and parameters, in order."""
+    spec = json.dumps([[name, params] for name, params in pipeline], sort_keys=True, default=str)
+    return hashlib.sha1(spec.encode('utf-8')).hexdigest()[:16]
+
+
+def apply_art_pipeline(path: Path, pipeline: ArtPipeline, cache_dir: Path) -> Path:
+    """Apply an art filter pipeline to an art file, writing the result as a cached PNG.
+
+    Notes:
+        - Results are named after a hash of the art file's contents and the pipeline, so they are reused
+            across sessions until the art or the pipeline changes.
+        - Embedded color profiles and resolution are kept, EXIF orientation is applied.
+
+    Args:
+        path: Path to the art image.
+        pipeline: Filters to apply, in order.
+        cache_dir: Directory results are written to.
+
+    Returns:
+        Path to the filtered image.
+
+    Raises:
+        KeyError: If the pipeline uses a filter which isn't registered.
+    """
+    filters = [(ART_FILTERS[name], params) for name, params in pipeline]
+    out = cache_dir / f'filter-{get_file_hash(path)[:16]}-{get_pipeline_key(pipeline)}.png'
+    if out.is_file():
+        return mark_cache_used(out)
+
+    # Decode, filter, then write the result
+    with Image.open(path) as img:
+        info = {k: img.info[k] for k in ('icc_profile', 'dpi') if img.info.get(k)}
+        img = ImageOps.exif_transpose(img).convert('RGB')
+    for func, params in filters:
+        img = func(img, **params)
+    temp = out.with_suffix('.tmp.png')
+    img.save(temp, compress_level=1, **info)
+    temp.replace(out)
+    return out
+
+
+class ArtFilterQueue:
+    """Applies art filter pipelines in a worker pool, ahead of the render thread.
+
+    Notes:
+        - Each art file and pipeline pair is only filtered once, however many times it's queued.
+    """
+
+    def __init__(self, cache_dir: Path, workers: Optional[int] = None):
+        """
+        Args:
+            cache_dir: Directory filtered images are written to.
+            workers: Maximum number of worker threads.
+        """
+        self.cache_dir = cache_dir
+        self.workers = workers or max((os.cpu_count() or 2) - 1, 1)
+        self.futures: dict[tuple[Path, str], Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+
+    def submit(self, path: Union[str, Path], pipeline: ArtPipeline) -> Future:
+        """Queue an art file to be filtered.
+
+        Args:
+            path: Path to the art image.
+            pipeline: Filters to apply, in order.
+
+        Returns:
+            Future resolving to the path of the filtered image.
+        """
+        key = (Path(path), get_pipeline_key(pipeline))
+        with self._lock:
+            if future := self.futures.get(key):
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='art_filter')
+            self.futures[key] = self._executor.submit(
+                apply_art_pipeline, Path(path), pipeline, self.cache_dir)
+            return self.futures[key]
+
+    def resolve(self, path: Union[str, Path], pipeline: ArtPipeline) -> Path:
+        """Wait for an art file to be filtered, queuing it first if needed.
+
+        Args:
+            path: Path to the art image.
+            pipeline: Filters to apply, in order.
+
+        Returns:
+            Path to the filtered image.
+
+        Raises:
+            Exception: Any exception raised while applying the pipeline.
+        """
+        return self.submit(path, pipeline).result()
+
+    def shutdown(self) -> None:
+        """Cancel any art still queued and stop the worker pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.futures.clear()
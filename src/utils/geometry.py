@@ -0,0 +1,217 @@
+"""
+* Utils: Layout Geometry
+* Offline solver for vertical ability layouts, computes every translation from bounds measured up front.
+"""
+# Standard Library Imports
+from typing import Callable, Optional, Union
+
+"""
+* Types
+"""
+
+# Layer bounds: left, top, right, bottom
+Bounds = tuple[Union[int, float], Union[int, float], Union[int, float], Union[int, float]]
+
+"""
+* Bounds Math
+"""
+
+
+def get_height(bounds: Bounds) -> int:
+    """Get the height of a set of bounds, matching the rounding of `get_dimensions_from_bounds`.
+
+    Args:
+        bounds: Bounds to measure.
+
+    Returns:
+        Height in pixels.
+    """
+    return int(bounds[3] - bounds[1])
+
+
+def get_center_y(bounds: Bounds) -> int:
+    """Get the vertical center of a set of bounds, matching the rounding of `get_dimensions_from_bounds`.
+
+    Args:
+        bounds: Bounds to measure.
+
+    Returns:
+        Vertical center in pixels.
+    """
+    return round((get_height(bounds) / 2) + bounds[1])
+
+
+def shift_bounds(bounds: Bounds, delta: Union[int, float]) -> Bounds:
+    """Shift a set of bounds vertically.
+
+    Args:
+        bounds: Bounds to shift.
+        delta: Pixels to shift the bounds by, positive moves them down.
+
+    Returns:
+        Shifted bounds.
+    """
+    return bounds[0], bounds[1] + delta, bounds[2], bounds[3] + delta
+
+
+def merge_bounds(bounds: list[Bounds]) -> Bounds:
+    """Get the bounds enclosing every set of bounds given.
+
+    Args:
+        bounds: Bounds to enclose.
+
+    Returns:
+        Enclosing bounds.
+    """
+    return (
+        min(b[0] for b in bounds),
+        min(b[1] for b in bounds),
+        max(b[2] for b in bounds),
+        max(b[3] for b in bounds))
+
+
+"""
+* Solving Positions
+"""
+
+
+def solve_align_vertical(bounds: Bounds, target: Bounds) -> int:
+    """Solve the translation which centers a layer vertically on a target, as `align_vertical` would.
+
+    Args:
+        bounds: Bounds of the layer to align.
+        target: Bounds to align the layer with.
+
+    Returns:
+        Vertical translation in pixels.
+    """
+    return get_center_y(target) - get_center_y(bounds)
+
+
+def solve_between(bounds: Bounds, above: Bounds, below: Bounds) -> int:
+    """Solve the translation which centers a layer in the space between two others, as `position_between_layers` would.
+
+    Args:
+        bounds: Bounds of the layer to position.
+        above: Bounds of the layer above.
+        below: Bounds of the layer below.
+
+    Returns:
+        Vertical translation in pixels.
+    """
+    return solve_align_vertical(bounds, (0, above[3], 0, below[1]))
+
+
+def solve_divider(bounds: Bounds, above: Bounds, below: Bounds) -> float:
+    """Solve the translation which centers a ragged divider line between two layers without rounding,
+    as the Planeswalker ability mask does.
+
+    Args:
+        bounds: Bounds of the divider line.
+        above: Bounds of the layer above.
+        below: Bounds of the layer below.
+
+    Returns:
+        Vertical translation in pixels.
+    """
+    target = ((below[1] - above[3]) / 2) + above[3]
+    return target - ((bounds[3] + bounds[1]) / 2)
+
+
+def solve_stack(bounds: list[Bounds], gap: Union[int, float]) -> list[int]:
+    """Solve the translations which stack layers below one another, as `space_layers_apart` would.
+
+    Notes:
+        - Photoshop moves layers by whole pixels, so each translation is rounded and the next layer is
+            stacked below where the rounded translation leaves this one, rather than drifting by the
+            fractions left over.
+
+    Args:
+        bounds: Bounds of each layer, top to bottom. The first layer doesn't move.
+        gap: Gap between each layer, in pixels.
+
+    Returns:
+        Vertical translation of each layer.
+    """
+    deltas, bottom = [0], bounds[0][3]
+    for b in bounds[1:]:
+        deltas.append(round(bottom + gap - b[1]))
+        bottom = b[3] + deltas[-1]
+    return deltas
+
+
+def solve_spread(
+    bounds: list[Bounds],
+    ref: Bounds,
+    gap: Optional[Union[int, float]] = None,
+    inside_gap: Optional[Union[int, float]] = None,
+    outside_matching: bool = True
+) -> list[int]:
+    """Solve the translations which spread layers apart across a reference, as `spread_layers_over_reference` would.
+
+    Args:
+        bounds: Bounds of each layer, top to bottom.
+        ref: Bounds of the reference used as the maximum height boundary for all layers.
+        gap: Gap between the top of the reference and the first layer, or between all layers if not provided.
+        inside_gap: Gap between each layer, calculated using leftover space if not provided.
+        outside_matching: If enabled, will enforce top and bottom gap to match.
+
+    Returns:
+        Vertical translation of each layer.
+    """
+    total_space = get_height(ref) - sum(get_height(b) for b in bounds)
+
+    # Calculate the outside gap if not provided
+    outside_gap = gap if gap else total_space / (len(bounds) + 1)
+
+    # Calculate the inside gap if not provided
+    if gap and not inside_gap:
+        ignored = 2 if outside_matching else 1
+        spaces = len(bounds) - 1 if outside_matching else len(bounds)
+        inside_gap = (total_space - (ignored * gap)) / spaces
+    elif not gap:
+        inside_gap = outside_gap
+
+    # Position the top layer relative to the reference, then stack the rest below it
+    top = round((ref[1] + outside_gap) - bounds[0][1])
+    return [top, *solve_stack([shift_bounds(bounds[0], top), *bounds[1:]], inside_gap)[1:]]
+
+
+def solve_positions(bounds: list[Bounds], deltas: list[Union[int, float]]) -> list[Bounds]:
+    """Get the bounds of each layer after applying solved translations.
+
+    Args:
+        bounds: Bounds of each layer.
+        deltas: Vertical translation of each layer.
+
+    Returns:
+        Bounds of each layer after translation.
+    """
+    return [shift_bounds(b, d) for b, d in zip(bounds, deltas)]
+
+
+def verify_positions(
+    solved: list[Bounds],
+    measure: Callable[[int], Bounds],
+    tolerance: Union[int, float] = 1
+) -> list[Bounds]:
+    """Check solved positions against the layers once they've been moved, measuring the last layer only.
+
+    Notes:
+        - Every translation is relative, so any drift accumulates in the last layer. If it isn't where
+            it was solved to be, every layer is measured again and the measured bounds are returned.
+
+    Args:
+        solved: Bounds of each layer after applying solved translations, see `solve_positions`.
+        measure: Function which measures the bounds of the layer at an index.
+        tolerance: Pixels each edge of the last layer may differ by.
+
+    Returns:
+        Solved bounds if the last layer is where it was solved to be, otherwise measured bounds of each layer.
+    """
+    if not solved:
+        return solved
+    last = measure(len(solved) - 1)
+    if all(abs(a - b) <= tolerance for a, b in zip(last, solved[-1])):
+        return solved
+    return [*[measure(i) for i in range(len(solved) - 1)], last]
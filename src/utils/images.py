@@ -0,0 +1,414 @@
+"""
+* Utils: Image Files
+* Image dimensions read from file headers, art framing geometry computed without Photoshop,
+* and art pre-conditioned ahead of rendering.
+"""
+# Standard Library Imports
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from threading import Lock
+from typing import Optional, TypedDict, Union
+
+# Third Party Imports
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
+from PIL.Image import Resampling
+
+"""
+* Types
+"""
+
+# Box bounds: left, top, right, bottom
+Box = tuple[float, float, float, float]
+
+
+class ImageHeader(TypedDict):
+    """Image details read from a file header without decoding pixel data."""
+    width: int
+    height: int
+    dpi: float
+    alpha: bool
+
+
+"""
+* Probing Images
+"""
+
+
+def probe_image(path: Union[str, Path]) -> Optional[ImageHeader]:
+    """Read the dimensions of an image from its file header, pixel data is not decoded.
+
+    Args:
+        path: Path to the image file.
+
+    Returns:
+        Image header details, or None if the file isn't a readable image.
+    """
+    try:
+        with Image.open(path) as img:
+            dpi = img.info.get('dpi', (72, 72))[0]
+            return ImageHeader(
+                width=img.width,
+                height=img.height,
+                dpi=float(dpi) if dpi and dpi > 1 else 72.0,
+                alpha=bool(img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info))
+    except (OSError, UnidentifiedImageError, ValueError, TypeError, IndexError):
+        return
+
+
+class ImageProbeCache:
+    """Image headers probed in previous sessions, keyed by file path, size, and modification time.
+
+    Notes:
+        - An entry is discarded as soon as its file is modified, moved, or replaced.
+        - New entries are written back to disk when `save` is called.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: JSON file the cache is saved to, not saved if not provided.
+        """
+        self.path = path
+        self.items: dict[str, dict] = {}
+        self.dirty = False
+        self._lock = Lock()
+        if path and path.is_file():
+            with suppress(OSError, ValueError):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.items = json.load(f)
+
+    @staticmethod
+    def get_key(path: Path) -> Optional[str]:
+        """Optional[str]: Cache key identifying the current version of a file, or None if it doesn't exist."""
+        with suppress(OSError):
+            stat = path.stat()
+            return f'{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}'
+        return
+
+    def get(self, path: Union[str, Path]) -> Optional[ImageHeader]:
+        """Get the header of an image file, probing it if it isn't cached.
+
+        Args:
+            path: Path to the image file.
+
+        Returns:
+            Image header details, or None if the file isn't a readable image.
+        """
+        if not (key := self.get_key(Path(path))):
+            return
+        if header := self.items.get(key):
+            return ImageHeader(**header)
+        if header := probe_image(path):
+            with self._lock:
+                self.items[key] = dict(header)
+                self.dirty = True
+        return header
+
+    def save(self) -> None:
+        """Save the cache if any images were probed since it was loaded."""
+        if not self.dirty or not self.path:
+            return
+        with suppress(OSError):
+            with self._lock:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(self.items, f)
+                self.dirty = False
+
+
+"""
+* Framing Geometry
+"""
+
+
+def get_placed_box(
+    header: ImageHeader,
+    canvas: tuple[int, int],
+    resolution: float,
+    resize_to_canvas: bool = True
+) -> Box:
+    """Predict where Photoshop places an image file in a document.
+
+    Notes:
+        - Placed images keep their physical size, so pixel dimensions are scaled by the ratio of
+            document resolution to image resolution. Images without a resolution are treated as 72 PPI.
+        - If the 'Resize Image During Place' preference is enabled, images larger than the canvas are
+            scaled down to fit inside it.
+        - Placed images are centered on the canvas.
+
+    Args:
+        header: Header details of the image file.
+        canvas: Width and height of the document canvas.
+        resolution: Resolution of the document.
+        resize_to_canvas: Whether the 'Resize Image During Place' preference is enabled.
+
+    Returns:
+        Predicted bounds of the placed layer.
+    """
+    width = header['width'] * resolution / header['dpi']
+    height = header['height'] * resolution / header['dpi']
+    if resize_to_canvas and (width > canvas[0] or height > canvas[1]):
+        fit = min(canvas[0] / width, canvas[1] / height)
+        width, height = width * fit, height * fit
+    left, top = (canvas[0] - width) / 2, (canvas[1] - height) / 2
+    return left, top, left + width, top + height
+
+
+def get_frame_transform(
+    box: Box,
+    ref: Box,
+    smallest: bool = False,
+    scale: Union[int, float] = 100
+) -> tuple[float, float, float]:
+    """Compute the scale and offset which frames a box within a reference, centered on both axes,
+    as `frame_layer` would.
+
+    Args:
+        box: Bounds of the layer to frame.
+        ref: Bounds of the reference frame.
+        smallest: Whether to scale to the smallest or largest edge.
+        scale: Percentage of the reference size to scale to.
+
+    Returns:
+        Scale percentage, then horizontal and vertical offset of the layer's center in pixels.
+    """
+    action = min if smallest else max
+    percent = scale * action(
+        (ref[2] - ref[0]) / (box[2] - box[0]),
+        (ref[3] - ref[1]) / (box[3] - box[1]))
+    dx = ((ref[0] + ref[2]) / 2) - ((box[0] + box[2]) / 2)
+    dy = ((ref[1] + ref[3]) / 2) - ((box[1] + box[3]) / 2)
+    return percent, dx, dy
+
+
+def apply_frame_transform(box: Box, percent: float, dx: float, dy: float) -> Box:
+    """Get the bounds of a box after scaling it around its center and offsetting it.
+
+    Args:
+        box: Bounds of the box.
+        percent: Scale percentage.
+        dx: Horizontal offset in pixels.
+        dy: Vertical offset in pixels.
+
+    Returns:
+        Transformed bounds.
+    """
+    cx, cy = ((box[0] + box[2]) / 2) + dx, ((box[1] + box[3]) / 2) + dy
+    w, h = (box[2] - box[0]) * percent / 200, (box[3] - box[1]) * percent / 200
+    return cx - w, cy - h, cx + w, cy + h
+
+
+"""
+* Art Pre-conditioning
+"""
+
+# Art is kept at least this much larger than the canvas it's rendered to
+PRECONDITION_MARGIN = 1.25
+
+# Image modes which can be saved as PNG without conversion
+PNG_MODES = ('1', 'L', 'LA', 'P', 'RGB', 'RGBA', 'I;16')
+
+
+def get_psd_canvas(path: Union[str, Path]) -> Optional[tuple[int, int]]:
+    """Read the canvas size of a PSD or PSB document from its file header.
+
+    Args:
+        path: Path to the PSD or PSB document.
+
+    Returns:
+        Width and height of the canvas, or None if the file isn't a readable Photoshop document.
+    """
+    with suppress(OSError):
+        with open(path, 'rb') as f:
+            header = f.read(26)
+        if len(header) == 26 and header[:4] == b'8BPS':
+            height, width = int.from_bytes(header[14:18], 'big'), int.from_bytes(header[18:22], 'big')
+            return width, height
+    return
+
+
+def get_precondition_scale(header: ImageHeader, canvas: tuple[int, int], margin: float = PRECONDITION_MARGIN) -> float:
+    """Get the scale an image can be reduced to while still covering a canvas, with a safety margin.
+
+    Args:
+        header: Header details of the image file.
+        canvas: Width and height of the canvas the image is rendered to.
+        margin: Factor by which the image must remain larger than the canvas.
+
+    Returns:
+        Scale factor, 1 or greater if the image shouldn't be reduced.
+    """
+    return margin * max(canvas[0] / header['width'], canvas[1] / header['height'])
+
+
+def precondition_art(
+    path: Path,
+    canvas: tuple[int, int],
+    cache_dir: Path,
+    convert: tuple[str, ...] = (),
+    margin: float = PRECONDITION_MARGIN
+) -> Path:
+    """Downscale an oversized art image and convert unsupported formats, writing a cached intermediate.
+
+    Notes:
+        - Images which don't need to be reduced or converted are returned as is.
+        - Intermediates are named after the source file's path, size, modification time, and target
+            canvas, so they are reused until the source changes.
+        - JPEG sources are written as JPEG, others are written as PNG unless the image mode requires TIFF.
+            Embedded color profiles are kept and EXIF orientation is applied.
+
+    Args:
+        path: Path to the art image.
+        canvas: Width and height of the template canvas the art is rendered to.
+        cache_dir: Directory intermediates are written to.
+        convert: Image formats which Photoshop can't open and must be converted, e.g. 'WEBP'.
+        margin: Factor by which the art must remain larger than the canvas.
+
+    Returns:
+        Path to the intermediate image, or the original path if it doesn't need pre-conditioning.
+    """
+    if not (header := probe_image(path)):
+        return path
+    with Image.open(path) as img:
+        fmt = img.format
+        # EXIF orientations 5-8 rotate the image a quarter turn, swapping its width and height
+        if img.getexif().get(ExifTags.Base.Orientation, 1) in (5, 6, 7, 8):
+            header = ImageHeader(**{**header, 'width': header['height'], 'height': header['width']})
+    scale = get_precondition_scale(header, canvas, margin)
+    if scale >= 1 and fmt not in convert:
+        return path
+
+    # Reuse an intermediate written by a previous run, temporary files from an interrupted write are ignored
+    stat = path.stat()
+    key = f'{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{canvas[0]}x{canvas[1]}|{margin}'
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    for suffix in ('.jpg', '.png', '.tif'):
+        if (existing := cache_dir / f'{name}{suffix}').is_file():
+            return mark_cache_used(existing)
+
+    # Decode, resample, then write the intermediate
+    with Image.open(path) as img:
+        icc = img.info.get('icc_profile')
+        img = ImageOps.exif_transpose(img)
+        if scale < 1:
+            img = img.resize(
+                size=(max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+                resample=Resampling.LANCZOS,
+                reducing_gap=3.0)
+        if fmt == 'JPEG':
+            out, kwargs = cache_dir / f'{name}.jpg', {'quality': 98, 'subsampling': 0}
+        elif img.mode in PNG_MODES:
+            out, kwargs = cache_dir / f'{name}.png', {'compress_level': 1}
+        else:
+            out, kwargs = cache_dir / f'{name}.tif', {}
+        temp = out.with_suffix(f'.tmp{out.suffix}')
+        img.save(temp, icc_profile=icc, **kwargs) if icc else img.save(temp, **kwargs)
+    temp.replace(out)
+    return out
+
+
+def mark_cache_used(path: Path) -> Path:
+    """Touch a cached art file so it's evicted after less recently used files, see `evict_art_cache`.
+
+    Args:
+        path: Path to the cached file.
+
+    Returns:
+        The same path.
+    """
+    with suppress(OSError):
+        os.utime(path)
+    return path
+
+
+def evict_art_cache(cache_dir: Path, limit: int) -> int:
+    """Remove the least recently used files from an art cache until it fits within a size limit.
+
+    Notes:
+        - Files are ordered by modification time, which cached art is touched with each time it's reused.
+
+    Args:
+        cache_dir: Directory of cached art.
+        limit: Size limit of the directory in megabytes.
+
+    Returns:
+        Number of files removed.
+    """
+    if not cache_dir.is_dir():
+        return 0
+    files = []
+    for p in cache_dir.iterdir():
+        with suppress(OSError):
+            if p.is_file():
+                files.append((p, p.stat()))
+    total, limit, removed = sum(s.st_size for _, s in files), limit * 1024 * 1024, 0
+    for p, s in sorted(files, key=lambda f: f[1].st_mtime):
+        if total <= limit:
+            break
+        with suppress(OSError):
+            p.unlink()
+            total -= s.st_size
+            removed += 1
+    return removed
+
+
+class ArtPreconditioner:
+    """Pre-conditions queued art images in a worker pool, ahead of the render thread.
+
+    Notes:
+        - Rendering a card waits only for its own art. Art which fails to pre-condition is rendered
+            from the original file.
+    """
+
+    def __init__(self, cache_dir: Path, workers: Optional[int] = None):
+        """
+        Args:
+            cache_dir: Directory intermediates are written to.
+            workers: Maximum number of worker threads.
+        """
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.futures: dict[Path, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, path: Path, canvas: tuple[int, int], convert: tuple[str, ...] = ()) -> None:
+        """Queue an art image to be pre-conditioned.
+
+        Args:
+            path: Path to the art image.
+            canvas: Width and height of the template canvas the art is rendered to.
+            convert: Image formats which Photoshop can't open and must be converted.
+        """
+        if path in self.futures:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='precondition')
+        self.futures[path] = self._executor.submit(precondition_art, path, canvas, self.cache_dir, convert)
+
+    def resolve(self, path: Union[Path, list[Path]]) -> Union[Path, list[Path]]:
+        """Wait for queued art to be pre-conditioned.
+
+        Args:
+            path: Path, or list of paths, to art images.
+
+        Returns:
+            Path, or list of paths, to use when rendering the art.
+        """
+        if isinstance(path, list):
+            return [self.resolve(p) for p in path]
+        if not (future := self.futures.get(path)):
+            return path
+        try:
+            return future.result()
+        except Exception:
+            return path
+
+    def shutdown(self) -> None:
+        """Cancel any art still queued and stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self.futures.clear()
@@ -0,0 +1,298 @@
+"""
+* Utils: Render Profiling
+"""
+# Standard Library Imports
+import json
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import Optional, Callable, Iterator, ContextManager
+
+"""
+* Profiler Classes
+"""
+
+
+class RenderProfiler:
+    """Records wall time spent in each render step and task function, as well as the number of Photoshop
+    round-trips made during each step.
+
+    Notes:
+        - Each card is written to the profile log as a JSON line when its render finishes.
+        - At the end of a batch, statistics aggregated per template are written as a final JSON line.
+        - When disabled, every recording method returns immediately.
+    """
+
+    def __init__(self, enabled: bool = False, path: Optional[Path] = None):
+        """
+        Args:
+            enabled: Whether to record render statistics.
+            path: JSON lines file the profile is written to, not written if not provided.
+        """
+        self.enabled = enabled
+        self.path = path
+        self.cards: list[dict] = []
+        self._card: Optional[dict] = None
+        self._step: Optional[dict] = None
+        self._lock = Lock()
+
+    """
+    * Card Records
+    """
+
+    def start_card(self, card: str, template: str, method: str = 'execute') -> None:
+        """Begin recording a new card render.
+
+        Args:
+            card: Display name of the card being rendered.
+            template: Name of the template class rendering the card.
+            method: Name of the template method rendering the card, e.g. 'execute' or 'execute_art_swap'.
+        """
+        if not self.enabled:
+            return
+        self._card = {
+            'type': 'card',
+            'card': card,
+            'template': template,
+            'method': method,
+            'success': False,
+            'time': 0.0,
+            'steps': {},
+            '_start': perf_counter()}
+        self._step = None
+
+    def end_card(self, success: bool) -> Optional[dict]:
+        """Finish recording the current card render and write it to the profile log.
+
+        Args:
+            success: Whether the card rendered successfully.
+
+        Returns:
+            The completed card record, or None if no card is being recorded.
+        """
+        if not self.enabled or not self._card:
+            return
+        card, self._card, self._step = self._card, None, None
+        card['time'] = round(perf_counter() - card.pop('_start'), 4)
+        card['success'] = success
+        self.cards.append(card)
+        self.write(card)
+        return card
+
+    """
+    * Step and Task Timing
+    """
+
+    @contextmanager
+    def _step_context(self, name: str) -> Iterator[dict]:
+        """Time a render step of the current card."""
+        step = self._card['steps'].setdefault(name, {'time': 0.0, 'tasks': {}, 'calls': {}, 'fits': {}})
+        self._step, start = step, perf_counter()
+        try:
+            yield step
+        finally:
+            step['time'] = round(step['time'] + perf_counter() - start, 4)
+            self._step = None
+
+    def step(self, name: str) -> ContextManager:
+        """Context manager which times a render step of the current card.
+
+        Args:
+            name: Name of the render step.
+
+        Returns:
+            Context manager recording the step, or a no-op context if not recording.
+        """
+        if not self.enabled or not self._card:
+            return nullcontext()
+        return self._step_context(name)
+
+    @contextmanager
+    def _task_context(self, name: str) -> Iterator[None]:
+        """Time a task function within the current step."""
+        tasks, start = self._step['tasks'], perf_counter()
+        try:
+            yield
+        finally:
+            tasks[name] = round(tasks.get(name, 0.0) + perf_counter() - start, 4)
+
+    def task(self, name: str) -> ContextManager:
+        """Context manager which times a task function within the current render step.
+
+        Args:
+            name: Name of the task function.
+
+        Returns:
+            Context manager recording the task, or a no-op context if not recording.
+        """
+        if not self.enabled or not self._step:
+            return nullcontext()
+        return self._task_context(name)
+
+    """
+    * Photoshop Round-trips
+    """
+
+    @contextmanager
+    def _call_context(self, kind: str) -> Iterator[None]:
+        """Time a Photoshop round-trip within the current step."""
+        step, start = self._step, perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            with self._lock:
+                stats = step['calls'].setdefault(kind, {'count': 0, 'time': 0.0})
+                stats['count'] += 1
+                stats['time'] = round(stats['time'] + elapsed, 4)
+
+    def call(self, kind: str) -> ContextManager:
+        """Context manager which counts and times a Photoshop round-trip, attributed to the current step.
+
+        Args:
+            kind: Kind of round-trip, e.g. 'executeAction' or 'getLayer'.
+
+        Returns:
+            Context manager recording the call, or a no-op context if not recording.
+        """
+        if not self.enabled or not self._step:
+            return nullcontext()
+        return self._call_context(kind)
+
+    def timed(self, kind: str) -> Callable:
+        """Decorator which records each call of the wrapped function as a Photoshop round-trip.
+
+        Args:
+            kind: Kind of round-trip to record the call as.
+
+        Returns:
+            Decorator function.
+        """
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.call(kind):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    """
+    * Text Fitting
+    """
+
+    def fit(self, kind: str, measurements: int) -> None:
+        """Record the number of measurements a text fitting call made, attributed to the current step.
+
+        Args:
+            kind: Kind of text fitting, e.g. 'scale_text_to_height'.
+            measurements: Number of times the text was resized and measured.
+        """
+        if not self.enabled or not self._step:
+            return
+        with self._lock:
+            stats = self._step['fits'].setdefault(kind, {'count': 0, 'measurements': 0})
+            stats['count'] += 1
+            stats['measurements'] += measurements
+
+    """
+    * Batch Summary
+    """
+
+    def summary(self) -> dict[str, dict]:
+        """Aggregate recorded cards per template.
+
+        Returns:
+            Dict of template names mapped to card counts, total and average times, average time
+                per step, total Photoshop round-trips per kind, total text fitting measurements per kind,
+                and card counts and average times per render method. Templates with both full and art
+                swap renders also record how many times faster the art swap renders were on average.
+        """
+        templates: dict[str, dict] = {}
+        for card in self.cards:
+            t = templates.setdefault(card['template'], {
+                'cards': 0, 'failed': 0, 'time': 0.0, 'steps': {}, 'calls': {}, 'fits': {}, 'methods': {}})
+            t['cards'] += 1
+            t['failed'] += 0 if card['success'] else 1
+            t['time'] += card['time']
+            method = t['methods'].setdefault(card.get('method', 'execute'), {'cards': 0, 'average': 0.0})
+            method['cards'] += 1
+            method['average'] += card['time']
+            for name, step in card['steps'].items():
+                t['steps'][name] = t['steps'].get(name, 0.0) + step['time']
+                for kind, stats in step['calls'].items():
+                    calls = t['calls'].setdefault(kind, {'count': 0, 'time': 0.0})
+                    calls['count'] += stats['count']
+                    calls['time'] += stats['time']
+                for kind, stats in step.get('fits', {}).items():
+                    fits = t['fits'].setdefault(kind, {'count': 0, 'measurements': 0})
+                    fits['count'] += stats['count']
+                    fits['measurements'] += stats['measurements']
+
+        # Convert totals to averages where useful
+        for t in templates.values():
+            n = t['cards']
+            t['average'] = round(t['time'] / n, 4)
+            t['time'] = round(t['time'], 4)
+            t['steps'] = {k: round(v / n, 4) for k, v in t['steps'].items()}
+            t['calls'] = {k: {'count': v['count'], 'time': round(v['time'], 4)} for k, v in t['calls'].items()}
+            for method in t['methods'].values():
+                method['average'] = round(method['average'] / method['cards'], 4)
+            full, swap = t['methods'].get('execute'), t['methods'].get('execute_art_swap')
+            if full and swap and swap['average']:
+                t['art_swap_speedup'] = round(full['average'] / swap['average'], 2)
+        return templates
+
+    def end_batch(self) -> Optional[dict]:
+        """Write statistics aggregated per template for the current batch, then clear recorded cards.
+
+        Returns:
+            The batch summary record, or None if no cards were recorded.
+        """
+        if not self.enabled or not self.cards:
+            return
+        batch = {'type': 'batch', 'templates': self.summary()}
+        self.write(batch)
+        self.cards = []
+        return batch
+
+    def write(self, record: dict) -> None:
+        """Append a record to the profile log as a JSON line.
+
+        Args:
+            record: Card or batch record to write.
+        """
+        if not self.path:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+"""
+* Decorators
+"""
+
+
+def profile_render(func: Callable) -> Callable:
+    """Decorator which records a template render method as a single card in the app's render profiler.
+
+    Args:
+        func: Template render method being wrapped, must return True on success.
+
+    Returns:
+        The wrapped function.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler: RenderProfiler = self.app.profiler
+        if not profiler.enabled:
+            return func(self, *args, **kwargs)
+        result = False
+        profiler.start_card(card=str(self.layout), template=type(self).__name__, method=func.__name__)
+        try:
+            result = func(self, *args, **kwargs)
+            return result
+        finally:
+            profiler.end_card(success=bool(result))
+    return wrapper
@@ -0,0 +1,557 @@
+"""
+* Utils: Print Sheets
+* Rendered card images imposed onto print sheets, composed in strips so memory use doesn't grow with sheet size.
+"""
+# Standard Library Imports
+import os
+import re
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, TypedDict, Iterator, BinaryIO
+
+# Third Party Imports
+from PIL import Image, ImageDraw
+from PIL.Image import Resampling
+
+"""
+* Types
+"""
+
+# Box in inches, measured from the top left corner of the sheet: left, top, right, bottom
+Box = tuple[float, float, float, float]
+
+# Line in inches, measured from the top left corner of the sheet: x1, y1, x2, y2
+Line = tuple[float, float, float, float]
+
+
+class SheetSpec(TypedDict):
+    """Layout of a print sheet, measured in inches."""
+    page: tuple[float, float]
+    rows: int
+    cols: int
+    dpi: int
+    bleed: float
+    marks: bool
+    duplex: bool
+    back_offset: tuple[float, float]
+
+
+class SheetCard(TypedDict):
+    """Rendered image of each face of a card."""
+    front: Path
+    back: Optional[Path]
+
+
+"""
+* Sheet Geometry
+"""
+
+# Page sizes in inches
+PAGE_SIZES = {
+    'letter': (8.5, 11.0),
+    'a4': (8.27, 11.69)
+}
+
+# Trimmed card size, and full rendered image size including bleed, in inches
+CARD_TRIM = (2.5, 3.5)
+CARD_RENDER = (2.72, 3.7)
+
+# Cut mark length, and gap between cut marks and the card grid, in inches
+MARK_LENGTH = 0.125
+MARK_GAP = 0.0625
+
+# Rows of pixels composed at a time when writing PNG sheets
+STRIP_HEIGHT = 256
+
+
+def get_sheet_spec(
+    page: str = 'letter',
+    rows: int = 3,
+    cols: int = 3,
+    dpi: int = 600,
+    bleed: float = 0.0,
+    marks: bool = True,
+    duplex: bool = False,
+    back_offset: tuple[float, float] = (0.0, 0.0)
+) -> SheetSpec:
+    """Build a sheet layout, checking the card grid fits the page.
+
+    Args:
+        page: Name of a page size in `PAGE_SIZES`.
+        rows: Rows of cards on each sheet.
+        cols: Columns of cards on each sheet.
+        dpi: Resolution of the sheet.
+        bleed: Bleed kept around each card, in inches.
+        marks: Whether to draw cut marks around the card grid.
+        duplex: Whether to follow each sheet with a sheet of back faces, for double-sided printing.
+        back_offset: Horizontal and vertical shift of back sheets in inches, to correct printer misalignment.
+
+    Returns:
+        Sheet layout.
+
+    Raises:
+        ValueError: If the page size is unknown, or the card grid doesn't fit the page.
+    """
+    if page.lower() not in PAGE_SIZES:
+        raise ValueError(f"Unknown page size '{page}', expected one of: {', '.join(PAGE_SIZES)}")
+    spec = SheetSpec(
+        page=PAGE_SIZES[page.lower()],
+        rows=rows,
+        cols=cols,
+        dpi=dpi,
+        bleed=bleed,
+        marks=marks,
+        duplex=duplex,
+        back_offset=back_offset)
+    width, height = get_grid_size(spec)
+    if width > spec['page'][0] or height > spec['page'][1]:
+        raise ValueError(f'A {rows}x{cols} grid of cards with {bleed}" bleed doesn\'t fit a {page} page!')
+    return spec
+
+
+def get_grid_size(spec: SheetSpec) -> tuple[float, float]:
+    """tuple[float, float]: Width and height of the card grid in inches, including bleed."""
+    return (
+        spec['cols'] * (CARD_TRIM[0] + 2 * spec['bleed']),
+        spec['rows'] * (CARD_TRIM[1] + 2 * spec['bleed']))
+
+
+def get_sheet_slots(spec: SheetSpec, back: bool = False) -> list[Box]:
+    """Get the box of each card on a sheet, including bleed, in row order.
+
+    Args:
+        spec: Sheet layout.
+        back: Whether to shift the slots by the back sheet offset.
+
+    Returns:
+        Box of each card slot.
+    """
+    width, height = get_grid_size(spec)
+    cell = (CARD_TRIM[0] + 2 * spec['bleed'], CARD_TRIM[1] + 2 * spec['bleed'])
+    left = (spec['page'][0] - width) / 2 + (spec['back_offset'][0] if back else 0)
+    top = (spec['page'][1] - height) / 2 + (spec['back_offset'][1] if back else 0)
+    return [(
+        left + c * cell[0], top + r * cell[1],
+        left + (c + 1) * cell[0], top + (r + 1) * cell[1]
+    ) for r in range(spec['rows']) for c in range(spec['cols'])]
+
+
+def get_cut_marks(spec: SheetSpec, back: bool = False) -> list[Line]:
+    """Get cut marks at each trim line, drawn in the margins outside the card grid.
+
+    Args:
+        spec: Sheet layout.
+        back: Whether to shift the marks by the back sheet offset.
+
+    Returns:
+        Each cut mark line.
+    """
+    if not spec['marks']:
+        return []
+    slots, b = get_sheet_slots(spec, back), spec['bleed']
+    left, top = slots[0][0], slots[0][1]
+    right, bottom = slots[-1][2], slots[-1][3]
+    xs = sorted({round(x, 6) for s in slots for x in (s[0] + b, s[2] - b)})
+    ys = sorted({round(y, 6) for s in slots for y in (s[1] + b, s[3] - b)})
+    marks: list[Line] = []
+    for x in xs:
+        marks.append((x, top - MARK_GAP - MARK_LENGTH, x, top - MARK_GAP))
+        marks.append((x, bottom + MARK_GAP, x, bottom + MARK_GAP + MARK_LENGTH))
+    for y in ys:
+        marks.append((left - MARK_GAP - MARK_LENGTH, y, left - MARK_GAP, y))
+        marks.append((right + MARK_GAP, y, right + MARK_GAP + MARK_LENGTH, y))
+    return marks
+
+
+"""
+* Sheet Contents
+"""
+
+# Rendered image name split into the card name and the rest, which must include the set and collector number
+REG_FACE_NAME = re.compile(r'^(?P<name>[^([{]+?)\s*(?P<rest>[(\[].*\[[^]]+].*\{[^}]+}.*)$')
+
+
+def get_face_key(path: Path) -> Optional[tuple[str, str]]:
+    """Split a rendered image name into its card name and the details shared by each face of a card.
+
+    Args:
+        path: Path to a rendered card image, named like "Delver of Secrets (Normal) [MID] {51}".
+
+    Returns:
+        Card name, and the frame, set, and collector number details, or None if the name can't be parsed.
+    """
+    if not (m := REG_FACE_NAME.match(path.stem)):
+        return
+    return m.group('name'), m.group('rest')
+
+
+def get_sheet_cards(paths: list[Path], duplex: bool = False) -> list[SheetCard]:
+    """Group rendered images into cards, pairing the faces of double-faced cards when printing duplex.
+
+    Notes:
+        - Faces are paired when exactly two images differ only by card name, e.g. "Delver of Secrets
+            (Normal) [MID] {51}" and "Insectile Aberration (Normal) [MID] {51}". Renders of one card with
+            different templates, and names which don't include a set and collector number, aren't paired.
+        - The front face is rendered first, so the older image is used as the front.
+
+    Args:
+        paths: Paths to rendered card images.
+        duplex: Whether to pair the faces of double-faced cards.
+
+    Returns:
+        Each card to impose, in the order given.
+    """
+    if not duplex:
+        return [SheetCard(front=p, back=None) for p in paths]
+    keys = {p: get_face_key(p) for p in paths}
+    groups: dict[str, list[Path]] = {}
+    for p, key in keys.items():
+        if key:
+            groups.setdefault(key[1], []).append(p)
+    cards: list[SheetCard] = []
+    for p in paths:
+        group = groups.get(keys[p][1], []) if keys[p] else []
+        if len(group) != 2 or keys[group[0]][0] == keys[group[1]][0]:
+            cards.append(SheetCard(front=p, back=None))
+            continue
+        front, back = sorted(group, key=lambda x: x.stat().st_mtime)
+        if p == front:
+            cards.append(SheetCard(front=front, back=back))
+    return cards
+
+
+def get_sheet_pages(
+    cards: list[SheetCard],
+    spec: SheetSpec,
+    back: Optional[Path] = None
+) -> list[tuple[list[Optional[Path]], bool]]:
+    """Assign cards to the slots of each sheet.
+
+    Notes:
+        - When printing duplex, each sheet is followed by a sheet of back faces mirrored left to right,
+            so they line up with their front faces when flipped on the long edge.
+
+    Args:
+        cards: Cards to impose.
+        spec: Sheet layout.
+        back: Image printed behind single-faced cards when printing duplex, left blank if not provided.
+
+    Returns:
+        Image for each slot of each sheet, and whether the sheet is a back sheet.
+    """
+    per_page = spec['rows'] * spec['cols']
+    pages: list[tuple[list[Optional[Path]], bool]] = []
+    for i in range(0, len(cards), per_page):
+        chunk = cards[i:i + per_page]
+        pages.append(([c['front'] for c in chunk] + [None] * (per_page - len(chunk)), False))
+        if spec['duplex']:
+            backs: list[Optional[Path]] = [None] * per_page
+            for n, c in enumerate(chunk):
+                r, col = divmod(n, spec['cols'])
+                backs[r * spec['cols'] + (spec['cols'] - 1 - col)] = c['back'] or back
+            pages.append((backs, True))
+    return pages
+
+
+def load_card_image(path: Path, size: tuple[int, int], bleed: float) -> Image.Image:
+    """Load a rendered card image, cropped to the trim size plus bleed and resized for the sheet.
+
+    Args:
+        path: Path to the rendered card image, including its full bleed.
+        size: Width and height of the card slot in pixels.
+        bleed: Bleed kept around the card, in inches.
+
+    Returns:
+        Card image sized to the slot.
+    """
+    with Image.open(path) as img:
+        # Decode JPEG images at a reduced scale when the sheet resolution allows it
+        scale = size[0] / (img.width * (CARD_TRIM[0] + 2 * bleed) / CARD_RENDER[0])
+        img.draft('RGB', (round(img.width * scale), round(img.height * scale)))
+        dpi = img.width / CARD_RENDER[0]
+        w, h = (CARD_TRIM[0] + 2 * bleed) * dpi, (CARD_TRIM[1] + 2 * bleed) * dpi
+        box = ((img.width - w) / 2, (img.height - h) / 2, (img.width + w) / 2, (img.height + h) / 2)
+        return img.convert('RGB').resize(size, resample=Resampling.LANCZOS, box=box, reducing_gap=3.0)
+
+
+def to_pixels(value: float, dpi: int) -> int:
+    """int: Inches converted to pixels at a given resolution."""
+    return round(value * dpi)
+
+
+"""
+* PNG Sheets
+"""
+
+
+def write_png_chunk(f: BinaryIO, kind: bytes, data: bytes) -> None:
+    """Write a PNG chunk with its length and checksum."""
+    f.write(struct.pack('>I', len(data)) + kind + data)
+    f.write(struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def iter_sheet_strips(faces: list[Optional[Path]], spec: SheetSpec, back: bool = False) -> Iterator[Image.Image]:
+    """Compose a sheet one strip of rows at a time.
+
+    Notes:
+        - Cards are loaded when the first strip they overlap is composed, and released after the last,
+            so at most one row of cards is held in memory.
+
+    Args:
+        faces: Image for each slot of the sheet.
+        spec: Sheet layout.
+        back: Whether this is a back sheet.
+
+    Yields:
+        Each strip of the sheet, top to bottom.
+    """
+    dpi = spec['dpi']
+    width, height = to_pixels(spec['page'][0], dpi), to_pixels(spec['page'][1], dpi)
+    slots = [tuple(to_pixels(v, dpi) for v in s) for s in get_sheet_slots(spec, back)]
+    marks = [tuple(to_pixels(v, dpi) for v in m) for m in get_cut_marks(spec, back)]
+    stroke = max(1, to_pixels(1 / 300, dpi))
+    loaded: dict[int, Image.Image] = {}
+
+    for y0 in range(0, height, STRIP_HEIGHT):
+        y1 = min(height, y0 + STRIP_HEIGHT)
+        strip = Image.new('RGB', (width, y1 - y0), (255, 255, 255))
+
+        # Paste the part of each card overlapping this strip
+        for i, (face, slot) in enumerate(zip(faces, slots)):
+            if not face or slot[3] <= y0 or slot[1] >= y1:
+                continue
+            if i not in loaded:
+                loaded[i] = load_card_image(face, (slot[2] - slot[0], slot[3] - slot[1]), spec['bleed'])
+            strip.paste(loaded[i], (slot[0], slot[1] - y0))
+            if slot[3] <= y1:
+                del loaded[i]
+
+        # Draw the cut marks overlapping this strip
+        draw = ImageDraw.Draw(strip)
+        for x1, my1, x2, my2 in marks:
+            if max(my1, my2) + stroke >= y0 and min(my1, my2) - stroke < y1:
+                draw.line((x1, my1 - y0, x2, my2 - y0), fill=(0, 0, 0), width=stroke)
+        yield strip
+
+
+def write_png_sheet(faces: list[Optional[Path]], spec: SheetSpec, path: Path, back: bool = False) -> Path:
+    """Write a sheet as a PNG image, compressing each strip as it's composed.
+
+    Args:
+        faces: Image for each slot of the sheet.
+        spec: Sheet layout.
+        path: Path to save the PNG image.
+        back: Whether this is a back sheet.
+
+    Returns:
+        Path to the PNG image.
+    """
+    dpi = spec['dpi']
+    width, height = to_pixels(spec['page'][0], dpi), to_pixels(spec['page'][1], dpi)
+    compressor = zlib.compressobj(6)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        write_png_chunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        write_png_chunk(f, b'pHYs', struct.pack('>IIB', round(dpi / 0.0254), round(dpi / 0.0254), 1))
+        for strip in iter_sheet_strips(faces, spec, back):
+            raw, stride = strip.tobytes(), width * 3
+            data = compressor.compress(b''.join(
+                b'\x00' + raw[y * stride:(y + 1) * stride] for y in range(strip.height)))
+            if data:
+                write_png_chunk(f, b'IDAT', data)
+        write_png_chunk(f, b'IDAT', compressor.flush())
+        write_png_chunk(f, b'IEND', b'')
+    return path
+
+
+"""
+* PDF Sheets
+"""
+
+
+def encode_pdf_sheet(
+    faces: list[Optional[Path]],
+    spec: SheetSpec,
+    quality: int = 95
+) -> list[Optional[tuple[int, int, bytes]]]:
+    """Encode the card images of a sheet as JPEG streams for a PDF page.
+
+    Args:
+        faces: Image for each slot of the sheet.
+        spec: Sheet layout.
+        quality: JPEG quality, from 1 to 100.
+
+    Returns:
+        Width, height, and JPEG data of each card image, or None for empty slots.
+    """
+    encoded: list[Optional[tuple[int, int, bytes]]] = []
+    for face, slot in zip(faces, get_sheet_slots(spec)):
+        if not face:
+            encoded.append(None)
+            continue
+        size = (to_pixels(slot[2] - slot[0], spec['dpi']), to_pixels(slot[3] - slot[1], spec['dpi']))
+        buffer = BytesIO()
+        load_card_image(face, size, spec['bleed']).save(buffer, format='JPEG', quality=quality, subsampling=0)
+        encoded.append((*size, buffer.getvalue()))
+    return encoded
+
+
+class PdfSheetWriter:
+    """Writes sheets to a PDF file one page at a time, each card placed as its own JPEG image.
+
+    Notes:
+        - Pages are composed by the PDF viewer or printer, so no page is ever held as a whole raster image.
+    """
+
+    def __init__(self, path: Path, spec: SheetSpec):
+        """
+        Args:
+            path: Path to save the PDF file.
+            spec: Sheet layout.
+        """
+        self.path = path
+        self.spec = spec
+        self.offsets: dict[int, int] = {}
+        self.pages: list[int] = []
+        self._next = 3
+        self._file: Optional[BinaryIO] = None
+
+    def __enter__(self) -> 'PdfSheetWriter':
+        self._file = open(self.path, 'wb')
+        self._file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if exc_type is None:
+                self.close()
+        finally:
+            self._file.close()
+
+    def write_object(self, body: bytes, stream: Optional[bytes] = None, num: Optional[int] = None) -> int:
+        """Write an object to the PDF file.
+
+        Args:
+            body: Object dictionary or value.
+            stream: Stream data following the object dictionary, if any.
+            num: Object number, the next free number if not provided.
+
+        Returns:
+            Object number.
+        """
+        if num is None:
+            num, self._next = self._next, self._next + 1
+        self.offsets[num] = self._file.tell()
+        self._file.write(f'{num} 0 obj\n'.encode() + body)
+        if stream is not None:
+            self._file.write(b'\nstream\n' + stream + b'\nendstream')
+        self._file.write(b'\nendobj\n')
+        return num
+
+    def add_page(self, images: list[Optional[tuple[int, int, bytes]]], back: bool = False) -> None:
+        """Write a sheet as a PDF page.
+
+        Args:
+            images: Width, height, and JPEG data of each card image, or None for empty slots.
+            back: Whether this is a back sheet.
+        """
+        page_w, page_h = self.spec['page'][0] * 72, self.spec['page'][1] * 72
+        content, resources = [], []
+        for i, (image, slot) in enumerate(zip(images, get_sheet_slots(self.spec, back))):
+            if not image:
+                continue
+            w, h, data = image
+            num = self.write_object(
+                f'<< /Type /XObject /Subtype /Image /Width {w} /Height {h} /ColorSpace /DeviceRGB '
+                f'/BitsPerComponent 8 /Filter /DCTDecode /Length {len(data)} >>'.encode(), data)
+            resources.append(f'/Im{i} {num} 0 R')
+            x, y = slot[0] * 72, page_h - slot[3] * 72
+            content.append(
+                f'q {(slot[2] - slot[0]) * 72:.3f} 0 0 {(slot[3] - slot[1]) * 72:.3f} {x:.3f} {y:.3f} cm /Im{i} Do Q')
+
+        # Cut marks
+        if marks := get_cut_marks(self.spec, back):
+            content.append('q 0 G 0.24 w')
+            content.extend(
+                f'{x1 * 72:.3f} {page_h - y1 * 72:.3f} m {x2 * 72:.3f} {page_h - y2 * 72:.3f} l S'
+                for x1, y1, x2, y2 in marks)
+            content.append('Q')
+
+        stream = '\n'.join(content).encode()
+        contents = self.write_object(f'<< /Length {len(stream)} >>'.encode(), stream)
+        self.pages.append(self.write_object((
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_w:.3f} {page_h:.3f}] '
+            f'/Resources << /XObject << {" ".join(resources)} >> >> /Contents {contents} 0 R >>').encode()))
+
+    def close(self) -> None:
+        """Write the page tree, cross-reference table, and trailer."""
+        kids = ' '.join(f'{n} 0 R' for n in self.pages)
+        self.write_object(f'<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>'.encode(), num=2)
+        self.write_object(b'<< /Type /Catalog /Pages 2 0 R >>', num=1)
+        xref, count = self._file.tell(), self._next
+        self._file.write(f'xref\n0 {count}\n0000000000 65535 f \n'.encode())
+        for n in range(1, count):
+            self._file.write(f'{self.offsets[n]:010d} 00000 n \n'.encode())
+        self._file.write(f'trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+
+
+"""
+* Imposing Sheets
+"""
+
+
+def impose_sheets(
+    paths: list[Path],
+    output: Path,
+    spec: SheetSpec,
+    fmt: str = 'pdf',
+    back: Optional[Path] = None,
+    workers: Optional[int] = None
+) -> list[Path]:
+    """Impose rendered card images onto print sheets, composing sheets in parallel.
+
+    Notes:
+        - At most twice as many sheets as there are workers are composed ahead of the sheet being written,
+            so memory use doesn't grow with the number of sheets.
+
+    Args:
+        paths: Paths to rendered card images.
+        output: Directory to save the sheets.
+        spec: Sheet layout.
+        fmt: Output format, 'pdf' for a single PDF file or 'png' for one image per sheet.
+        back: Image printed behind single-faced cards when printing duplex, left blank if not provided.
+        workers: Maximum number of worker threads.
+
+    Returns:
+        Paths to the written files.
+    """
+    output.mkdir(mode=777, parents=True, exist_ok=True)
+    pages = get_sheet_pages(get_sheet_cards(paths, spec['duplex']), spec, back)
+    workers = workers or max((os.cpu_count() or 2) - 1, 1)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sheets') as executor:
+
+        # PNG sheets are written by the workers
+        if fmt == 'png':
+            futures = [executor.submit(
+                write_png_sheet, faces, spec,
+                output / f"sheet_{n // (2 if spec['duplex'] else 1) + 1:03d}{'_back' if is_back else ''}.png",
+                is_back
+            ) for n, (faces, is_back) in enumerate(pages)]
+            return [f.result() for f in futures]
+
+        # PDF pages are encoded by the workers and written in order
+        path = output / 'sheets.pdf'
+        queue: list[tuple[Future, bool]] = []
+        with PdfSheetWriter(path, spec) as pdf:
+            for faces, is_back in pages:
+                queue.append((executor.submit(encode_pdf_sheet, faces, spec), is_back))
+                if len(queue) > workers * 2:
+                    future, is_back_page = queue.pop(0)
+                    pdf.add_page(future.result(), is_back_page)
+            for future, is_back_page in queue:
+                pdf.add_page(future.result(), is_back_page)
+        return [path]
@@ -0,0 +1,141 @@
+"""
+* Utils: Showcase Images
+* Rendered card images framed as showcases with rounded corners, drawn with Pillow instead of Photoshop.
+"""
+# Standard Library Imports
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import Optional
+
+# Third Party Imports
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+# Local Imports
+from src.utils.encoding import save_image
+
+"""
+* Showcase Geometry
+"""
+
+# Geometry of the showcase frame at 1200 DPI, measured from the Photoshop showcase tool
+SHOWCASE_WIDTH = 3264
+SHOWCASE_INSET = (145, 143.5)
+SHOWCASE_RADIUS = 146
+SHOWCASE_COLOR = (66, 66, 66)
+
+# Shadow cast by the card onto the frame: offset, blur, and opacity
+SHOWCASE_SHADOW_OFFSET = 17
+SHOWCASE_SHADOW_BLUR = 28
+SHOWCASE_SHADOW_OPACITY = 0.5
+
+# Supersampling factor used to anti-alias the rounded corners
+SHOWCASE_SUPERSAMPLE = 4
+
+
+def get_rounded_mask(size: tuple[int, int], inset: tuple[float, float], radius: float) -> Image.Image:
+    """Draw an anti-aliased rounded rectangle mask, inset from the edges of an image.
+
+    Args:
+        size: Width and height of the mask.
+        inset: Horizontal and vertical distance from the edges of the mask to the rectangle.
+        radius: Corner radius of the rectangle.
+
+    Returns:
+        Grayscale mask, white inside the rectangle.
+    """
+    n = SHOWCASE_SUPERSAMPLE
+    mask = Image.new('L', (size[0] * n, size[1] * n), 0)
+    ImageDraw.Draw(mask).rounded_rectangle(
+        xy=(round(inset[0] * n), round(inset[1] * n),
+            round((size[0] - inset[0]) * n) - 1, round((size[1] - inset[1]) * n) - 1),
+        radius=round(radius * n),
+        fill=255)
+    return mask.resize(size, resample=Image.Resampling.BOX)
+
+
+@cache
+def get_showcase_overlay(size: tuple[int, int], shadow: bool = True) -> tuple[Image.Image, Image.Image]:
+    """Build the showcase frame for card images of a given size, scaled from 1200 DPI.
+
+    Notes:
+        - Cached, so the frame and shadow are only drawn once per image size.
+
+    Args:
+        size: Width and height of the card image.
+        shadow: Whether the card casts a shadow onto the frame.
+
+    Returns:
+        Frame image, and the mask of the card visible through it.
+    """
+    scale = size[0] / SHOWCASE_WIDTH
+    inset = (SHOWCASE_INSET[0] * scale, SHOWCASE_INSET[1] * scale)
+    mask = get_rounded_mask(size, inset, SHOWCASE_RADIUS * scale)
+    frame = Image.new('RGB', size, SHOWCASE_COLOR)
+    if shadow:
+        offset = round(SHOWCASE_SHADOW_OFFSET * scale)
+        cast = ImageChops.offset(mask, offset, offset).filter(
+            ImageFilter.GaussianBlur(SHOWCASE_SHADOW_BLUR * scale))
+        cast = cast.point(lambda v: round(v * SHOWCASE_SHADOW_OPACITY))
+        frame = Image.composite(Image.new('RGB', size, (0, 0, 0)), frame, cast)
+    return frame, mask
+
+
+"""
+* Rendering Showcases
+"""
+
+
+def render_showcase(path: Path, output: Path, shadow: bool = True, quality: int = 95) -> Path:
+    """Frame a rendered card image as a showcase, matching the Photoshop showcase tool.
+
+    Args:
+        path: Path to the card image.
+        output: Directory to save the showcase image.
+        shadow: Whether the card casts a shadow onto the frame.
+        quality: JPEG quality, from 1 to 100.
+
+    Returns:
+        Path to the showcase image.
+    """
+    with Image.open(path) as img:
+        card = img.convert('RGB')
+        card.info = img.info
+    frame, mask = get_showcase_overlay(card.size, shadow)
+    showcase = Image.composite(card, frame, mask)
+    showcase.info = card.info
+    return save_image(showcase, (output / path.name).with_suffix('.jpg'), quality)
+
+
+def render_showcases(
+    paths: list[Path],
+    output: Path,
+    shadow: bool = True,
+    workers: Optional[int] = None
+) -> list[tuple[Path, Optional[Exception]]]:
+    """Frame rendered card images as showcases in a worker pool.
+
+    Args:
+        paths: Paths to the card images.
+        output: Directory to save the showcase images.
+        shadow: Whether the card casts a shadow onto the frame.
+        workers: Maximum number of worker threads.
+
+    Returns:
+        Path of each card image and the exception raised rendering it, if any.
+    """
+    output.mkdir(mode=777, parents=True, exist_ok=True)
+    with ThreadPoolExecutor(
+        max_workers=workers or max((os.cpu_count() or 2) - 1, 1),
+        thread_name_prefix='showcase'
+    ) as executor:
+        futures = [executor.submit(render_showcase, p, output, shadow) for p in paths]
+        results: list[tuple[Path, Optional[Exception]]] = []
+        for p, future in zip(paths, futures):
+            try:
+                future.result()
+                results.append((p, None))
+            except Exception as e:
+                results.append((p, e))
+    return results
@@ -0,0 +1,310 @@
+"""
+* Utils: Text Metrics
+* Offline text layout estimates built from font files, usable without Photoshop.
+"""
+# Standard Library Imports
+from functools import cache
+from pathlib import Path
+from typing import Optional, TypedDict, Union
+
+# Third Party Imports
+from fontTools.ttLib import TTFont, TTLibError
+
+"""
+* Types
+"""
+
+
+class TextStyles(TypedDict):
+    """PostScript font names used by each style of a formatted text block."""
+    regular: str
+    italic: str
+    bold: str
+    mana: str
+
+
+class TextLayoutEstimate(TypedDict):
+    """Estimated layout of a formatted text block, measured in points."""
+    lines: int
+    height: float
+    widest: float
+
+
+"""
+* Font Metrics
+"""
+
+
+class FontMetrics:
+    """Horizontal metrics read from a font file, used to measure text without rendering it."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Path to a TTF or OTF font file.
+        """
+        font = TTFont(str(path), lazy=True)
+        try:
+            self.units = font['head'].unitsPerEm
+            self.cmap: dict[int, str] = font.getBestCmap() or {}
+            self.advances: dict[str, int] = {k: v[0] for k, v in font['hmtx'].metrics.items()}
+        finally:
+            font.close()
+
+        # Fallback advance for characters the font doesn't map
+        self.default = self.advances.get('.notdef') or (
+            sum(self.advances.values()) / len(self.advances) if self.advances else self.units / 2)
+
+    def advance(self, char: str) -> float:
+        """Get the advance width of a character, in font units.
+
+        Args:
+            char: Character to measure.
+
+        Returns:
+            Advance width of the character.
+        """
+        if glyph := self.cmap.get(ord(char)):
+            return self.advances.get(glyph, self.default)
+        return self.default
+
+    def measure(self, text: str, size: float) -> float:
+        """Get the width of a string of text set at a given size.
+
+        Args:
+            text: Text to measure.
+            size: Font size, in points.
+
+        Returns:
+            Width of the text, in points.
+        """
+        return sum(self.advance(c) for c in text) * size / self.units
+
+
+@cache
+def get_font_index(fonts_dir: Path) -> dict[str, Path]:
+    """Map the PostScript name of every font file in a directory to its path.
+
+    Args:
+        fonts_dir: Directory containing font files.
+
+    Returns:
+        Dict of PostScript names mapped to font file paths.
+    """
+    index: dict[str, Path] = {}
+    for path in sorted(fonts_dir.iterdir()) if fonts_dir.is_dir() else []:
+        if path.suffix.lower() not in ['.ttf', '.otf']:
+            continue
+        try:
+            font = TTFont(str(path), lazy=True)
+            if name := font['name'].getDebugName(6):
+                index[name] = path
+            font.close()
+        except (TTLibError, KeyError, OSError):
+            continue
+    return index
+
+
+@cache
+def get_font_metrics(fonts_dir: Path, name: str) -> Optional[FontMetrics]:
+    """Load metrics for a font by its PostScript name.
+
+    Args:
+        fonts_dir: Directory containing font files.
+        name: PostScript name of the font.
+
+    Returns:
+        Font metrics if the font is available in the directory, otherwise None.
+    """
+    if path := get_font_index(fonts_dir).get(name):
+        try:
+            return FontMetrics(path)
+        except (TTLibError, KeyError, OSError):
+            return
+    return
+
+
+"""
+* Layout Estimation
+"""
+
+
+class TextLayoutEstimator:
+    """Estimates how a formatted text block wraps within a paragraph text box.
+
+    Notes:
+        - Each character is measured with the font of its style: mana symbols, italics ranges,
+            bold rules text, or the regular font.
+        - Paragraphs are separated by carriage returns and wrapped greedily at spaces, the same
+            way Photoshop's single line composer breaks lines. Kerning is not applied.
+        - All measurements are in points.
+    """
+
+    def __init__(self, regular: FontMetrics, italic: FontMetrics, bold: FontMetrics, mana: FontMetrics):
+        """
+        Args:
+            regular: Metrics of the regular text font.
+            italic: Metrics of the italic text font.
+            bold: Metrics of the bold text font.
+            mana: Metrics of the mana symbol font.
+        """
+        self.regular = regular
+        self.italic = italic
+        self.bold = bold
+        self.mana = mana
+
+    @classmethod
+    def from_fonts(cls, fonts_dir: Path, styles: TextStyles) -> Optional['TextLayoutEstimator']:
+        """Create an estimator using fonts from a fonts directory.
+
+        Args:
+            fonts_dir: Directory containing font files.
+            styles: PostScript names of the font used for each style.
+
+        Returns:
+            Text layout estimator, or None if any font isn't available in the directory.
+        """
+        metrics = {k: get_font_metrics(fonts_dir, v) for k, v in styles.items()}
+        if not all(metrics.values()):
+            return
+        return cls(**metrics)
+
+    """
+    * Styling
+    """
+
+    def get_char_fonts(
+        self,
+        text: str,
+        italics: Optional[list[tuple[int, int]]] = None,
+        symbols: Optional[list[tuple[int, list]]] = None,
+        bold: Optional[tuple[int, int]] = None
+    ) -> list[FontMetrics]:
+        """Get the font each character of a text block is set in.
+
+        Args:
+            text: Text block, with mana symbols already substituted.
+            italics: Start and end indices of each italicized range.
+            symbols: Start index and list of colors for each mana symbol, one color per character.
+            bold: Start and end indices of bolded text, if any.
+
+        Returns:
+            Font metrics for each character in the text.
+        """
+        fonts = [self.regular] * len(text)
+        if bold:
+            fonts[bold[0]:bold[1]] = [self.bold] * (bold[1] - bold[0])
+        for start, end in italics or []:
+            fonts[start:end] = [self.italic] * (end - start)
+        for start, colors in symbols or []:
+            n = max(len(colors), 1)
+            fonts[start:start + n] = [self.mana] * n
+        return fonts[:len(text)]
+
+    """
+    * Measuring
+    """
+
+    def layout(
+        self,
+        text: str,
+        size: float,
+        width: float,
+        leading: Optional[float] = None,
+        paragraph_space: float = 0,
+        italics: Optional[list[tuple[int, int]]] = None,
+        symbols: Optional[list[tuple[int, list]]] = None,
+        bold: Optional[tuple[int, int]] = None,
+        space_before: Optional[dict[int, float]] = None
+    ) -> TextLayoutEstimate:
+        """Estimate the layout of a text block wrapped to a given width.
+
+        Args:
+            text: Text block, with mana symbols already substituted.
+            size: Font size, in points.
+            width: Width of the paragraph text box, in points.
+            leading: Line leading, in points, matches the font size if not provided.
+            paragraph_space: Space added before every paragraph after the first, in points.
+            italics: Start and end indices of each italicized range.
+            symbols: Start index and list of colors for each mana symbol, one color per character.
+            bold: Start and end indices of bolded text, if any.
+            space_before: Overrides `paragraph_space` for paragraphs starting at a given index.
+
+        Returns:
+            Estimated line count, block height, and width of the widest line.
+        """
+        leading = leading or size
+        space_before = space_before or {}
+        fonts = self.get_char_fonts(text, italics, symbols, bold)
+        lines, height, widest, start = 0, 0.0, 0.0, 0
+
+        for paragraph in text.split('\r'):
+            if start > 0:
+                height += space_before.get(start, paragraph_space)
+            count, line_width = 1, 0.0
+            word_width, space_width = 0.0, 0.0
+
+            # Break lines greedily at spaces
+            for i, char in enumerate(paragraph, start=start):
+                advance = fonts[i].advance(char) * size / fonts[i].units
+                if char == ' ':
+                    line_width += word_width
+                    word_width, space_width = 0.0, advance
+                    line_width += space_width
+                    continue
+                word_width += advance
+                if line_width and line_width + word_width > width:
+                    widest = max(widest, line_width - space_width)
+                    count, line_width = count + 1, 0.0
+            line_width += word_width
+            widest = max(widest, line_width)
+
+            lines += count
+            height += count * leading
+            start += len(paragraph) + 1
+
+        return TextLayoutEstimate(lines=lines, height=height, widest=widest)
+
+    def fit_size(
+        self,
+        text: str,
+        size: float,
+        width: float,
+        height: float,
+        step: float = 0.2,
+        **kwargs
+    ) -> float:
+        """Estimate the largest font size, on a grid of `step` increments at or below the given size,
+        at which a text block fits a given height when wrapped to a given width.
+
+        Args:
+            text: Text block, with mana symbols already substituted.
+            size: Starting font size, in points.
+            width: Width of the paragraph text box, in points.
+            height: Height the text block must fit, in points.
+            step: Smallest font size increment to consider.
+
+        Keyword Args:
+            Passed to `layout`. Leading is scaled along with the font size, paragraph spacing is not.
+
+        Returns:
+            Estimated font size.
+        """
+        leading = kwargs.pop('leading', None) or size
+
+        def _fits(m: int) -> bool:
+            s = size - m * step
+            est = self.layout(text=text, size=s, width=width, leading=leading * s / size, **kwargs)
+            return est['height'] <= height
+
+        # Bisect the grid, smallest grid size is assumed to fit
+        lo, hi = 0, max(int(size / step) - 1, 0)
+        if _fits(lo):
+            return size
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if _fits(mid):
+                hi = mid
+            else:
+                lo = mid
+        return size - hi * step
@@ -0,0 +1,174 @@
+"""
+* Utils: Session Tracing
+"""
+# Standard Library Imports
+import json
+import os
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from threading import Lock, current_thread, get_ident
+from time import perf_counter_ns
+from typing import Optional, Callable, Iterator, ContextManager, Any
+
+"""
+* Tracer Classes
+"""
+
+
+class SpanTracer:
+    """Records timed spans across every thread of the app, exportable in Chrome trace event format.
+
+    Notes:
+        - Exported files can be opened with Perfetto (ui.perfetto.dev) or `chrome://tracing`.
+        - Spans are recorded as complete ('X') events, each thread is named using a metadata event.
+        - When disabled, `span` returns a shared no-op context and nothing is recorded.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled: Whether to record spans.
+        """
+        self.enabled = enabled
+        self.events: list[dict] = []
+        self._threads: dict[int, str] = {}
+        self._origin = perf_counter_ns()
+        self._lock = Lock()
+
+    """
+    * Recording Spans
+    """
+
+    def _timestamp(self) -> float:
+        """float: Microseconds elapsed since the tracer was created."""
+        return (perf_counter_ns() - self._origin) / 1000
+
+    def _thread_id(self) -> int:
+        """int: Identifier of the current thread, registering its name on first use."""
+        tid = get_ident()
+        if tid not in self._threads:
+            with self._lock:
+                self._threads[tid] = current_thread().name
+        return tid
+
+    @contextmanager
+    def _span_context(self, name: str, cat: str, args: dict) -> Iterator[None]:
+        """Record a complete event spanning the body of this context."""
+        tid, start = self._thread_id(), self._timestamp()
+        try:
+            yield
+        finally:
+            event = {
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': start,
+                'dur': self._timestamp() - start,
+                'pid': os.getpid(),
+                'tid': tid}
+            if args:
+                event['args'] = {k: str(v) for k, v in args.items()}
+            with self._lock:
+                self.events.append(event)
+
+    def span(self, name: str, cat: str = 'app', **args) -> ContextManager:
+        """Context manager which records a span on the current thread.
+
+        Args:
+            name: Name of the span.
+            cat: Category of the span, e.g. 'render', 'scryfall', 'download'.
+            args: Optional details shown with the span in the viewer.
+
+        Returns:
+            Context manager recording the span, or a no-op context if tracing is disabled.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span_context(name, cat, args)
+
+    def instant(self, name: str, cat: str = 'app', **args) -> None:
+        """Record an instant event on the current thread.
+
+        Args:
+            name: Name of the event.
+            cat: Category of the event.
+            args: Optional details shown with the event in the viewer.
+        """
+        if not self.enabled:
+            return
+        event = {
+            'name': name,
+            'cat': cat,
+            'ph': 'i',
+            's': 't',
+            'ts': self._timestamp(),
+            'pid': os.getpid(),
+            'tid': self._thread_id()}
+        if args:
+            event['args'] = {k: str(v) for k, v in args.items()}
+        with self._lock:
+            self.events.append(event)
+
+    def traced(self, name: Optional[str] = None, cat: str = 'app') -> Callable:
+        """Decorator which records each call of the wrapped function as a span.
+
+        Args:
+            name: Name of the span, uses the function's qualified name if not provided.
+            cat: Category of the span.
+
+        Returns:
+            Decorator function.
+        """
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                with self.span(name or func.__qualname__, cat):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    """
+    * Exporting
+    """
+
+    def to_chrome_trace(self) -> dict:
+        """Build a Chrome trace event document from the recorded spans.
+
+        Returns:
+            Dict in Chrome trace event JSON object format.
+        """
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        meta = [{
+            'name': 'thread_name',
+            'ph': 'M',
+            'pid': os.getpid(),
+            'tid': tid,
+            'args': {'name': name}
+        } for tid, name in threads.items()]
+        return {'traceEvents': [*meta, *events], 'displayTimeUnit': 'ms'}
+
+    def export(self, path: Path) -> Optional[Path]:
+        """Write every span recorded this session to a Chrome trace event JSON file.
+
+        Args:
+            path: Path to write the trace file.
+
+        Returns:
+            Path to the trace file, or None if tracing is disabled or nothing was recorded.
+        """
+        if not self.enabled or not self.events:
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+
+"""
+* Global Tracer
+"""
+
+# Session tracer, enabled on app load if requested by the environment
+TRACER = SpanTracer()